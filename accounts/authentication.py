@@ -0,0 +1,141 @@
+"""
+인증용 사용자 캐시 (JWT 인증 시 default DB 조회 생략).
+
+access token 수명이 30일이라 인증 때마다 조회하는 사용자 행은 거의 바뀌지 않는다.
+인증에 필요한 최소 컬럼(PROJECTION_FIELDS)만 프로세스 메모리 + Redis 에 캐시하고,
+캐시된 값으로 User 인스턴스를 만든다 (나머지 컬럼은 deferred 로 접근 시에만 조회).
+
+- 프로세스 메모리: LOCAL_CACHE_TTL_S 동안 유지 (다른 워커의 무효화는 이 시간 안에 반영)
+- Redis: USER_CACHE_TTL_S 동안 유지, 사용자 저장/삭제(signals)와 계정 삭제 시 무효화
+- Redis 장애 시에는 DB 조회로 동작한다.
+
+QuerySet.update() 로 PROJECTION_FIELDS 를 바꾸는 코드는 invalidate_user() 를 직접 호출해야 한다.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+
+from django.core.cache import cache
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import User
+
+logger = logging.getLogger(__name__)
+
+# Model.from_db 가 모델 필드 정의 순서로 값을 받으므로 순서를 User 필드 순서와 맞춘다
+PROJECTION_FIELDS = ("id", "kakao_id", "nickname", "is_active", "created_at")
+
+USER_CACHE_TTL_S = int(os.getenv("AUTH_USER_CACHE_TTL_SECONDS", "600"))
+LOCAL_CACHE_TTL_S = float(os.getenv("AUTH_USER_LOCAL_CACHE_TTL_SECONDS", "30"))
+LOCAL_CACHE_MAX_ENTRIES = 10000
+
+_local_cache: dict[int, tuple[float, tuple]] = {}
+_local_lock = threading.Lock()
+
+
+def _cache_key(user_id: int) -> str:
+    return f"auth_user:v1:{user_id}"
+
+
+def _local_get(user_id: int) -> tuple | None:
+    entry = _local_cache.get(user_id)
+    if entry is None:
+        return None
+    expires_at, values = entry
+    if expires_at < time.monotonic():
+        _local_cache.pop(user_id, None)
+        return None
+    return values
+
+
+def _local_set(user_id: int, values: tuple) -> None:
+    with _local_lock:
+        if len(_local_cache) >= LOCAL_CACHE_MAX_ENTRIES:
+            # 가득 차면 통째로 비운다 (TTL 이 짧아 다시 채워지는 비용이 작음)
+            _local_cache.clear()
+        _local_cache[user_id] = (time.monotonic() + LOCAL_CACHE_TTL_S, values)
+
+
+def _build_user(values: tuple, db_alias: str) -> User:
+    # 캐시 적중마다 새 인스턴스를 만들어 요청 간에 상태를 공유하지 않는다
+    return User.from_db(db_alias, PROJECTION_FIELDS, values)
+
+
+def get_cached_user(user_id, *, db_alias: str | None = None) -> User | None:
+    """
+    인증용 User (PROJECTION_FIELDS 만 채워진 인스턴스). 없으면 None.
+    프로세스 메모리 → Redis → DB 순서로 찾는다.
+    """
+    try:
+        user_id = int(user_id)
+    except (TypeError, ValueError):
+        return None
+    alias = db_alias or router.db_for_read(User)
+
+    values = _local_get(user_id)
+    if values is not None:
+        return _build_user(values, alias)
+
+    key = _cache_key(user_id)
+    try:
+        values = cache.get(key)
+    except Exception as exc:
+        logger.debug("auth user cache get failed user=%s: %s", user_id, exc)
+        values = None
+
+    if values is None:
+        values = User.objects.using(alias).filter(id=user_id).values_list(*PROJECTION_FIELDS).first()
+        if values is None:
+            return None
+        values = tuple(values)
+        try:
+            cache.set(key, values, timeout=USER_CACHE_TTL_S)
+        except Exception as exc:
+            logger.debug("auth user cache set failed user=%s: %s", user_id, exc)
+    else:
+        values = tuple(values)
+
+    _local_set(user_id, values)
+    return _build_user(values, alias)
+
+
+def invalidate_user(user_id) -> None:
+    """사용자 행이 바뀌거나 삭제됐을 때 캐시를 지운다."""
+    if user_id is None:
+        return
+    user_id = int(user_id)
+    with _local_lock:
+        _local_cache.pop(user_id, None)
+    try:
+        cache.delete(_cache_key(user_id))
+    except Exception as exc:
+        logger.warning("auth user cache delete failed user=%s: %s", user_id, exc)
+
+
+def clear_local_cache() -> None:
+    with _local_lock:
+        _local_cache.clear()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication 과 같은 검증을 하되 사용자 조회를 get_cached_user() 로 대신한다."""
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = get_cached_user(user_id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
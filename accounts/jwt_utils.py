@@ -1,8 +1,8 @@
-from rest_framework_simplejwt.tokens import RefreshToken
+from .tokens import RegistryRefreshToken
 
 
 def generate_tokens_for_user(user):
-    refresh = RefreshToken.for_user(user)
+    refresh = RegistryRefreshToken.for_user(user)
     return {
         'access': str(refresh.access_token),
         'refresh': str(refresh)
@@ -0,0 +1,95 @@
+"""
+탈퇴 요청으로 등록된 계정 삭제 작업(AccountDeletionJob)을 처리합니다.
+
+연관 데이터(쿠폰/스탬프/초대코드/추천/토큰 등)를 --batch-size 개씩 지우고 마지막에 계정 행을 지웁니다.
+단계별 진행 상황이 작업에 남으므로 --time-budget 으로 끊어도 다음 실행이 이어서 처리합니다.
+Cloud Scheduler 등에서 주기적으로 실행하세요.
+
+사용 예:
+  python manage.py process_account_deletions
+  python manage.py process_account_deletions --time-budget 240 --batch-size 2000
+  python manage.py process_account_deletions --users-per-group 50             # bulk 모드
+  python manage.py process_account_deletions --enqueue-user-ids 12,34,56      # 여러 계정 삭제 등록 후 처리
+  python manage.py process_account_deletions --retry-failed
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import router
+
+from accounts.models import AccountDeletionJob, User
+from accounts.services.account_deletion import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_SLEEP_S,
+    enqueue_account_deletions,
+    run_deletion_jobs,
+)
+
+
+class Command(BaseCommand):
+    help = "계정 삭제 작업을 배치 단위로 처리합니다 (탈퇴 요청 후 연관 데이터 삭제)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f"DELETE 한 번에 지울 최대 행 수 (기본: {DEFAULT_BATCH_SIZE})",
+        )
+        parser.add_argument(
+            "--users-per-group",
+            type=int,
+            default=1,
+            help="한 번에 묶어 처리할 사용자 수 (2 이상이면 bulk 모드, 기본: 1)",
+        )
+        parser.add_argument("--sleep", type=float, default=DEFAULT_SLEEP_S, help="배치 사이 대기 초")
+        parser.add_argument("--max-groups", type=int, default=None, help="이번 실행에서 처리할 최대 묶음 수")
+        parser.add_argument("--time-budget", type=float, default=None, help="이번 실행 최대 소요 시간(초)")
+        parser.add_argument(
+            "--enqueue-user-ids",
+            type=str,
+            default=None,
+            help="쉼표로 구분한 user id 들을 삭제 작업으로 등록한 뒤 처리",
+        )
+        parser.add_argument("--retry-failed", action="store_true", help="실패(failed) 작업을 다시 대기 상태로")
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size 는 1 이상이어야 합니다.")
+        if options["users_per_group"] < 1:
+            raise CommandError("--users-per-group 은 1 이상이어야 합니다.")
+
+        if options["enqueue_user_ids"]:
+            try:
+                user_ids = [int(value) for value in options["enqueue_user_ids"].split(",") if value.strip()]
+            except ValueError:
+                raise CommandError("--enqueue-user-ids 는 숫자 id 를 쉼표로 구분해 입력하세요.")
+            existing = list(
+                User.objects.using(router.db_for_read(User)).filter(id__in=user_ids).values_list("id", flat=True)
+            )
+            missing = sorted(set(user_ids) - set(existing))
+            if missing:
+                self.stdout.write(self.style.WARNING(f"존재하지 않는 user id (건너뜀): {missing}"))
+            queued = enqueue_account_deletions(existing)
+            self.stdout.write(self.style.SUCCESS(f"삭제 작업 {queued}건을 등록했습니다."))
+
+        if options["retry_failed"]:
+            reopened = AccountDeletionJob.objects.filter(status=AccountDeletionJob.STATUS_FAILED).update(
+                status=AccountDeletionJob.STATUS_PENDING, attempts=0
+            )
+            self.stdout.write(f"실패 작업 {reopened}건을 다시 대기 상태로 바꿨습니다.")
+
+        result = run_deletion_jobs(
+            users_per_group=options["users_per_group"],
+            max_groups=options["max_groups"],
+            batch_size=options["batch_size"],
+            sleep_s=options["sleep"],
+            time_budget_s=options["time_budget"],
+        )
+        deleted = ", ".join(f"{name}={count:,}" for name, count in result["deleted"].items()) or "-"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"완료 {result['done']}건, 실패 {result['failed']}건 ({result['groups']}묶음, {result['elapsed_s']}s)"
+            )
+        )
+        self.stdout.write(f"삭제 행 수: {deleted}")
+        if not result["finished"]:
+            self.stdout.write(self.style.WARNING("남은 작업이 있습니다. 다음 실행에서 이어서 처리합니다."))
@@ -0,0 +1,63 @@
+"""
+시작 시점의 모듈별 import 비용을 측정합니다 (python -X importtime 을 새 프로세스로 실행).
+
+target
+  setup: django.setup() 까지 (manage.py 명령 시작 비용)
+  urls : setup + URLConf/모든 뷰 import (Cloud Run 새 인스턴스의 첫 요청 전 비용)
+  wsgi : wouldulike_backend.wsgi import (warm-up 제외)
+
+--check 를 주면 wouldulike_backend.importprof.BUDGETS 기준(무거운 모듈 import 여부, 전체 시간)을 넘을 때 실패합니다.
+
+사용 예:
+  python manage.py profile_imports
+  python manage.py profile_imports --target setup --sort self --limit 20
+  python manage.py profile_imports --prefix coupons --json
+  python manage.py profile_imports --target urls --check
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from wouldulike_backend.importprof import BUDGETS, check_budget, profile
+
+
+class Command(BaseCommand):
+    help = "시작 시점의 모듈별 import 비용(self / cumulative)을 측정합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--target", choices=sorted(BUDGETS), default="urls", help="측정할 단계 (기본: urls)")
+        parser.add_argument("--sort", choices=("cumulative", "self"), default="cumulative", help="정렬 기준")
+        parser.add_argument("--limit", type=int, default=30, help="출력할 모듈 수 (기본: 30)")
+        parser.add_argument("--prefix", default=None, help="이 이름으로 시작하는 모듈만 출력 (예: coupons)")
+        parser.add_argument("--json", action="store_true", help="JSON 으로 출력")
+        parser.add_argument("--check", action="store_true", help="회귀 기준을 넘으면 실패")
+
+    def handle(self, *args, **options):
+        try:
+            result = profile(options["target"])
+        except RuntimeError as exc:
+            raise CommandError(str(exc)) from exc
+        problems = check_budget(result)
+        view = dict(sort=options["sort"], limit=options["limit"], prefix=options["prefix"])
+
+        if options["json"]:
+            payload = result.as_dict(**view)
+            payload["problems"] = problems
+            self.stdout.write(json.dumps(payload, ensure_ascii=False, indent=2))
+        else:
+            self.stdout.write(
+                f"[{result.target}] import {result.total_ms:.0f}ms (실행 {result.wall_ms:.0f}ms), "
+                f"모듈 {len(result.modules):,}개"
+            )
+            self.stdout.write(f"{'cumulative':>12} {'self':>10}  module")
+            for module in result.top(**view):
+                self.stdout.write(
+                    f"{module.cumulative_us / 1000:>10.1f}ms {module.self_us / 1000:>8.1f}ms  {module.name}"
+                )
+            for problem in problems:
+                self.stdout.write(self.style.WARNING(problem))
+
+        if options["check"]:
+            if problems:
+                raise CommandError(f"import 회귀 기준 초과: {'; '.join(problems)}")
+            self.stdout.write(self.style.SUCCESS(f"{result.target}: 기준 {BUDGETS[result.target]['total_ms']}ms 이내"))
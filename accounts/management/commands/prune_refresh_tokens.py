@@ -0,0 +1,56 @@
+"""
+만료된 OutstandingToken/BlacklistedToken 을 배치 단위로 정리합니다.
+
+refresh token 은 발급할 때 기록하지 않으므로(accounts.tokens) 더 이상 OutstandingToken 이
+늘어나지 않지만, 이전에 쌓인 행과 감사 기록(REFRESH_TOKEN_AUDIT_DB=1)은 이 명령어로 정리합니다.
+
+사용 예:
+  python manage.py prune_refresh_tokens
+  python manage.py prune_refresh_tokens --batch-size 5000 --time-budget 300
+  python manage.py prune_refresh_tokens --flush-audit      # Redis 감사 큐 → OutstandingToken
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.tokens import (
+    DEFAULT_PRUNE_BATCH_SIZE,
+    flush_audit_queue,
+    prune_expired_outstanding_tokens,
+)
+
+
+class Command(BaseCommand):
+    help = "만료된 refresh token 기록(OutstandingToken/BlacklistedToken)을 배치 단위로 정리합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_PRUNE_BATCH_SIZE,
+            help=f"배치당 삭제 건수 (기본: {DEFAULT_PRUNE_BATCH_SIZE})",
+        )
+        parser.add_argument("--sleep", type=float, default=0.1, help="배치 사이 대기 초 (기본: 0.1)")
+        parser.add_argument("--max-batches", type=int, default=None, help="이번 실행에서 처리할 최대 배치 수")
+        parser.add_argument("--time-budget", type=float, default=None, help="이번 실행 최대 소요 시간(초)")
+        parser.add_argument("--flush-audit", action="store_true", help="Redis 감사 큐를 OutstandingToken 에 기록")
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size 는 1 이상이어야 합니다.")
+
+        if options["flush_audit"]:
+            written = flush_audit_queue(batch_size=options["batch_size"])
+            self.stdout.write(self.style.SUCCESS(f"감사 기록 {written:,}건을 OutstandingToken 에 기록했습니다."))
+
+        result = prune_expired_outstanding_tokens(
+            batch_size=options["batch_size"],
+            max_batches=options["max_batches"],
+            sleep_s=options["sleep"],
+            time_budget_s=options["time_budget"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"만료 토큰 {result['deleted']:,}건 삭제 ({result['batches']}배치, {result['elapsed_s']}s)"
+            )
+        )
+        if not result["finished"]:
+            self.stdout.write(self.style.WARNING("남은 대상이 있습니다. 다음 실행에서 이어서 처리합니다."))
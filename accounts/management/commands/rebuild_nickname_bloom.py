@@ -0,0 +1,27 @@
+"""
+닉네임 블룸 필터(Redis 비트맵)를 DB 의 nickname_key 로 다시 만듭니다.
+
+닉네임이 바뀌거나 탈퇴한 사용자의 비트는 필터에 남아 오탐(DB 확인)을 늘리므로 주기적으로 실행합니다.
+처음 배포할 때와 Redis 가 비트맵을 잃은 뒤(eviction/flush)에도 실행해야 필터가 다시 동작합니다 (그 전에는 항상 DB 로 확인).
+
+사용 예:
+  python manage.py rebuild_nickname_bloom
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.services.nicknames import BLOOM_BITS, BLOOM_HASHES, rebuild_bloom
+
+
+class Command(BaseCommand):
+    help = "닉네임 블룸 필터(Redis 비트맵)를 DB 의 nickname_key 로 다시 만듭니다."
+
+    def handle(self, *args, **options):
+        try:
+            count = rebuild_bloom()
+        except Exception as exc:
+            raise CommandError(f"블룸 필터를 만들지 못했습니다: {exc}") from exc
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"닉네임 {count:,}개로 블룸 필터를 만들었습니다 (bits={BLOOM_BITS:,}, hashes={BLOOM_HASHES})."
+            )
+        )
@@ -0,0 +1,73 @@
+"""
+User.nickname_key 추가.
+
+nickname 을 NFKC + casefold 로 정규화한 값을 채운 뒤 unique 인덱스를 건다.
+기존 데이터에 대소문자만 다른 중복 닉네임이 있으면 가장 먼저 가입한 사용자(id 최소)만 키를 갖고
+나머지는 NULL 로 둔다 (닉네임 자체는 그대로 유지되고, 다음에 닉네임을 바꿀 때 키가 채워진다).
+"""
+import logging
+import unicodedata
+
+from django.db import migrations, models
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(nickname):
+    # accounts.services.nicknames.normalize_nickname 과 같은 규칙 (마이그레이션 시점 고정)
+    if nickname is None:
+        return None
+    key = unicodedata.normalize("NFKC", str(nickname)).strip().casefold()
+    return key or None
+
+
+def backfill_nickname_key(apps, schema_editor):
+    User = apps.get_model("accounts", "User")
+    db_alias = schema_editor.connection.alias
+    seen = set()
+    batch = []
+    duplicates = 0
+    rows = (
+        User.objects.using(db_alias)
+        .exclude(nickname__isnull=True)
+        .exclude(nickname="")
+        .order_by("id")
+        .values_list("id", "nickname")
+        .iterator(chunk_size=2000)
+    )
+    for user_id, nickname in rows:
+        key = _normalize(nickname)
+        if key is None:
+            continue
+        if key in seen:
+            duplicates += 1
+            continue
+        seen.add(key)
+        batch.append(User(id=user_id, nickname_key=key))
+        if len(batch) >= 1000:
+            User.objects.using(db_alias).bulk_update(batch, ["nickname_key"])
+            batch = []
+    if batch:
+        User.objects.using(db_alias).bulk_update(batch, ["nickname_key"])
+    logger.info("nickname_key backfill complete: keys=%d, duplicates_left_null=%d", len(seen), duplicates)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0009_backfill_user_restaurant_wishlist"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="nickname_key",
+            field=models.CharField(blank=True, editable=False, max_length=100, null=True),
+        ),
+        migrations.RunPython(backfill_nickname_key, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="user",
+            name="nickname_key",
+            field=models.CharField(blank=True, editable=False, max_length=100, null=True, unique=True),
+        ),
+    ]
@@ -3,6 +3,9 @@ from django.contrib.auth.models import (
     AbstractBaseUser, PermissionsMixin, BaseUserManager
 )
 
+# from_db 에서 nickname 을 불러오지 않았을 때(defer)의 표시
+_NOT_LOADED = object()
+
 
 class UserManager(BaseUserManager):
     def create_user(self, kakao_id=None, apple_id=None, password=None, **extra_fields):
@@ -43,6 +46,8 @@ class User(AbstractBaseUser, PermissionsMixin):
     apple_id = models.CharField(max_length=255, unique=True, db_index=True, null=True, blank=True)
     email = models.EmailField(max_length=254, null=True, blank=True)
     nickname = models.CharField(max_length=50, null=True, blank=True)
+    # 닉네임 중복 검사용 정규화 키 (NFKC + casefold). save() 에서 nickname 으로부터 채운다.
+    nickname_key = models.CharField(max_length=100, null=True, blank=True, unique=True, editable=False)
     student_id = models.CharField(max_length=20, null=True, blank=True)
     department = models.CharField(max_length=100, null=True, blank=True)
     school = models.CharField(max_length=100, null=True, blank=True)
@@ -65,6 +70,36 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     objects = UserManager()
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_nickname = instance.__dict__.get("nickname", _NOT_LOADED)
+        return instance
+
+    def _nickname_changed(self, update_fields) -> bool:
+        if update_fields is not None:
+            return "nickname" in update_fields
+        if self._state.adding:
+            return True
+        loaded = getattr(self, "_loaded_nickname", _NOT_LOADED)
+        if loaded is _NOT_LOADED:
+            # nickname 을 불러오지 않은(defer) 인스턴스는 직접 값을 넣었을 때만 바뀐 것으로 본다
+            return "nickname" in self.__dict__
+        return loaded != self.nickname
+
+    def save(self, *args, **kwargs):
+        from .services.nicknames import normalize_nickname
+
+        # 닉네임이 바뀐 경우에만 키를 다시 계산한다. 대소문자만 다른 기존 중복 닉네임은 migration 0010 에서
+        # 한 명만 키를 갖고 나머지는 NULL 이라, 전체 저장(admin 등)마다 계산하면 unique 위반이 난다.
+        update_fields = kwargs.get("update_fields")
+        if self._nickname_changed(update_fields):
+            self.nickname_key = normalize_nickname(self.nickname)
+            if update_fields is not None:
+                kwargs["update_fields"] = set(update_fields) | {"nickname_key"}
+        super().save(*args, **kwargs)
+        self._loaded_nickname = self.nickname
+
     def __str__(self):
         if self.kakao_id is not None:
             return f"User {self.kakao_id}"
@@ -116,4 +151,40 @@ class UserRestaurantWishlist(models.Model):
         ]
 
     def __str__(self):
-        return f"{self.user_id} ♡ {self.restaurant_name}"
\ No newline at end of file
+        return f"{self.user_id} ♡ {self.restaurant_name}"
+
+class AccountDeletionJob(models.Model):
+    """
+    계정 삭제 작업. 탈퇴 요청 시 계정을 비활성화/익명화하고 이 행만 만든 뒤,
+    연관 데이터는 process_account_deletions 가 배치 단위로 지운다.
+    step 에 진행 중인 단계를 남겨 중간에 멈춰도 그 단계부터 이어서 처리한다.
+    """
+
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_DONE, "Done"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    # 마지막 단계에서 계정 행이 지워지므로 FK 가 아닌 id 로 둔다
+    user_id = models.BigIntegerField(unique=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    step = models.CharField(max_length=32, blank=True, default="")
+    deleted_counts = models.JSONField(default=dict, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default="")
+    requested_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "accounts_deletion_job"
+        indexes = [models.Index(fields=["status", "id"], name="ix_deletion_job_status")]
+
+    def __str__(self):
+        return f"AccountDeletionJob user={self.user_id} {self.status}:{self.step or '-'}"
@@ -1,14 +1,54 @@
+"""
+계정 삭제.
+
+탈퇴 요청 경로(request_account_deletion)에서는
+- 계정을 비활성화하고 kakao_id/apple_id/username/닉네임 등을 비워 같은 소셜 계정으로 바로 재가입할 수 있게 하고
+- SocialAccount 삭제, 게스트 연결 해제처럼 작은 작업만 한 뒤
+- AccountDeletionJob 을 만들고 바로 반환한다.
+
+연관 데이터(쿠폰/스탬프/초대코드/추천/토큰 등)는 run_deletion_jobs() 가
+DELETE ... WHERE id IN (SELECT id ... LIMIT batch_size) 로 나눠 지우고, 마지막에 계정 행을 지운다.
+- 단계(PURGE_STEPS)마다 진행 상황을 job.step 에 남겨 중간에 멈추거나 실패해도 그 단계부터 이어서 처리한다.
+  각 배치는 user_id 조건의 삭제라 다시 실행해도 안전하다.
+- users_per_group > 1 이면 여러 사용자의 작업을 묶어 user_id IN (...) 으로 함께 지운다 (bulk 모드).
+  이때 삭제 건수는 사용자별로 나눌 수 없어 실행 요약에만 합계로 남긴다.
+"""
+from __future__ import annotations
+
 import logging
+import time
+from dataclasses import dataclass
+from datetime import timedelta
 
-from django.db import DatabaseError, connections, transaction
+from django.db import connections, router, transaction
+from django.db.models import CharField, F, Q, Value
+from django.db.models.functions import Cast, Concat
+from django.utils import timezone
 from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
 
-from accounts.models import SocialAccount, User
-from coupons.models import Coupon, InviteCode, Referral, StampEvent, StampWallet
+from accounts.authentication import invalidate_user
+from accounts.models import AccountDeletionJob, SocialAccount, User, UserRestaurantWishlist
+from coupons.models import (
+    Coupon,
+    CouponArchive,
+    InviteCode,
+    Referral,
+    StampEvent,
+    StampEventArchive,
+    StampWallet,
+)
 from guests.models import GuestUser
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_SLEEP_S = 0.05
+MAX_ATTEMPTS = 5
+# running 상태로 이 시간 넘게 갱신이 없으면 작업자가 죽은 것으로 보고 다시 가져간다
+STALE_RUNNING_S = 15 * 60
+
+FINAL_STEP = "user"
+
 
 def _resolve_coupon_db_alias() -> str:
     # 운영에서는 cloudsql, 로컬/테스트에서는 default만 있는 경우가 있다.
@@ -17,70 +57,289 @@ def _resolve_coupon_db_alias() -> str:
     return "default"
 
 
-def _delete_external_user_rows_or_raise(model_class, user_id: int, field_name: str, db_alias: str) -> int:
-    """
-    꼬임 방지용(strict) 삭제:
-    - 외부 DB(cloudsql 등)에서 삭제가 실패하면 계정 삭제 전체를 중단하기 위해 예외를 올린다.
-    """
-    queryset = model_class.objects.using(db_alias).filter(**{field_name: user_id})
-    count = queryset.count()
-    if count:
-        queryset.delete()
-    return count
+@dataclass(frozen=True)
+class PurgeStep:
+    name: str
+    model: type
+    user_field: str
+    external: bool = False
+
+    def alias(self) -> str:
+        if self.external:
+            return _resolve_coupon_db_alias()
+        return router.db_for_write(self.model)
+
+
+PURGE_STEPS = (
+    PurgeStep("coupons", Coupon, "user_id", external=True),
+    PurgeStep("archived_coupons", CouponArchive, "user_id", external=True),
+    PurgeStep("stamp_wallets", StampWallet, "user_id", external=True),
+    PurgeStep("stamp_events", StampEvent, "user_id", external=True),
+    PurgeStep("archived_stamp_events", StampEventArchive, "user_id", external=True),
+    PurgeStep("invite_codes", InviteCode, "user_id", external=True),
+    PurgeStep("referrals_made", Referral, "referrer_id", external=True),
+    PurgeStep("referrals_received", Referral, "referee_id", external=True),
+    PurgeStep("wishlist", UserRestaurantWishlist, "user_id"),
+    PurgeStep("blacklisted_tokens", BlacklistedToken, "token__user_id"),
+    PurgeStep("outstanding_tokens", OutstandingToken, "user_id"),
+)
+STEP_NAMES = tuple(step.name for step in PURGE_STEPS) + (FINAL_STEP,)
+
 
+def _step_index(name: str) -> int:
+    # 아직 시작하지 않은 작업(step="")은 첫 단계부터
+    return STEP_NAMES.index(name) if name in STEP_NAMES else 0
 
-def delete_user_account(user: User) -> dict:
+
+def _job_alias() -> str:
+    return router.db_for_write(AccountDeletionJob)
+
+
+def request_account_deletion(user: User) -> AccountDeletionJob:
+    """계정을 '삭제 중'으로 바꾸고 삭제 작업을 등록한다. 연관 데이터 삭제는 작업자가 한다."""
     user_id = user.id
-    coupon_db_alias = _resolve_coupon_db_alias()
-
-    deleted_counts = {
-        "coupons": 0,
-        "stamp_wallets": 0,
-        "stamp_events": 0,
-        "invite_codes": 0,
-        "referrals_made": 0,
-        "referrals_received": 0,
-        "guest_unlinked": 0,
-        "social_accounts": 0,
-        "blacklisted_tokens": 0,
-        "outstanding_tokens": 0,
-    }
+    alias = router.db_for_write(User)
+    with transaction.atomic(using=alias):
+        guest_unlinked = GuestUser.objects.filter(linked_user_id=user_id).update(linked_user=None)
+        social_accounts = SocialAccount.objects.using(alias).filter(user_id=user_id).delete()[0]
+        User.objects.using(alias).filter(pk=user_id).update(
+            is_active=False,
+            username=f"deleting:{user_id}",
+            kakao_id=None,
+            apple_id=None,
+            email=None,
+            nickname=None,
+            nickname_key=None,
+            fcm_token=None,
+            updated_at=timezone.now(),
+        )
+        job, created = AccountDeletionJob.objects.using(_job_alias()).get_or_create(
+            user_id=user_id,
+            defaults={"deleted_counts": {"guest_unlinked": guest_unlinked, "social_accounts": social_accounts}},
+        )
+        if not created and job.status == AccountDeletionJob.STATUS_FAILED:
+            # 다시 요청하면 실패한 작업을 처음 시도처럼 다시 연다
+            job.status = AccountDeletionJob.STATUS_PENDING
+            job.attempts = 0
+            job.save(update_fields=["status", "attempts", "updated_at"])
 
-    # 1) 외부 DB(쿠폰/스탬프 등)부터 strict 삭제: 실패하면 계정 삭제 전체를 중단
-    try:
-        deleted_counts["coupons"] = _delete_external_user_rows_or_raise(Coupon, user_id, "user_id", coupon_db_alias)
-        deleted_counts["stamp_wallets"] = _delete_external_user_rows_or_raise(StampWallet, user_id, "user_id", coupon_db_alias)
-        deleted_counts["stamp_events"] = _delete_external_user_rows_or_raise(StampEvent, user_id, "user_id", coupon_db_alias)
-        deleted_counts["invite_codes"] = _delete_external_user_rows_or_raise(InviteCode, user_id, "user_id", coupon_db_alias)
-        deleted_counts["referrals_made"] = _delete_external_user_rows_or_raise(Referral, user_id, "referrer_id", coupon_db_alias)
-        deleted_counts["referrals_received"] = _delete_external_user_rows_or_raise(Referral, user_id, "referee_id", coupon_db_alias)
-    except Exception as exc:
-        logger.error(
-            "external deletion failed; aborting account deletion for user_id=%s (db=%s): %s",
-            user_id,
-            coupon_db_alias,
-            exc,
-            exc_info=True,
+    # update() 로 바꿔 post_save 시그널이 없으므로 인증 캐시를 직접 비운다
+    invalidate_user(user_id)
+    transaction.on_commit(lambda: invalidate_user(user_id), using=alias)
+    return job
+
+
+def enqueue_account_deletions(user_ids) -> int:
+    """여러 사용자를 한 번에 '삭제 중'으로 바꾸고 작업을 등록한다 (bulk 모드). 반환: 등록한 작업 수."""
+    user_ids = sorted(set(user_ids))
+    if not user_ids:
+        return 0
+    alias = router.db_for_write(User)
+    now = timezone.now()
+    with transaction.atomic(using=alias):
+        GuestUser.objects.filter(linked_user_id__in=user_ids).update(linked_user=None)
+        SocialAccount.objects.using(alias).filter(user_id__in=user_ids).delete()
+        for chunk_start in range(0, len(user_ids), DEFAULT_BATCH_SIZE):
+            chunk = user_ids[chunk_start:chunk_start + DEFAULT_BATCH_SIZE]
+            User.objects.using(alias).filter(pk__in=chunk).update(
+                is_active=False,
+                # username 은 unique 라 사용자마다 다른 값이 필요해 id 를 붙인다
+                username=Concat(Value("deleting:"), Cast("id", output_field=CharField())),
+                kakao_id=None,
+                apple_id=None,
+                email=None,
+                nickname=None,
+                nickname_key=None,
+                fcm_token=None,
+                updated_at=now,
+            )
+        AccountDeletionJob.objects.using(_job_alias()).bulk_create(
+            [AccountDeletionJob(user_id=user_id) for user_id in user_ids],
+            ignore_conflicts=True,
         )
-        raise
+    for user_id in user_ids:
+        invalidate_user(user_id)
+    return len(user_ids)
+
+
+def _purge_batch(step: PurgeStep, user_ids, batch_size: int) -> int:
+    alias = step.alias()
+    manager = step.model.objects.using(alias)
+    target_ids = manager.filter(**{f"{step.user_field}__in": user_ids}).order_by().values("pk")[:batch_size]
+    return manager.filter(pk__in=target_ids).delete()[0]
+
+
+def _delete_user_rows(user_ids) -> int:
+    # cross-db CASCADE로 인한 오류를 피하기 위해 계정 레코드는 SQL로 직접 삭제한다.
+    alias = router.db_for_write(User)
+    placeholders = ",".join(["%s"] * len(user_ids))
+    with transaction.atomic(using=alias):
+        with connections[alias].cursor() as cursor:
+            cursor.execute(f"DELETE FROM accounts_user WHERE id IN ({placeholders})", list(user_ids))
+            deleted = cursor.rowcount
+    for user_id in user_ids:
+        invalidate_user(user_id)
+    return deleted
+
 
-    # 2) default DB 내 정리 작업은 트랜잭션으로 묶어서 부분 완료를 줄인다.
-    with transaction.atomic(using="default"):
-        deleted_counts["guest_unlinked"] = GuestUser.objects.filter(linked_user_id=user_id).update(linked_user=None)
+def _claim_jobs(limit: int, job_ids=None, exclude_ids=()) -> list[AccountDeletionJob]:
+    alias = _job_alias()
+    now = timezone.now()
+    stale_before = now - timedelta(seconds=STALE_RUNNING_S)
+    with transaction.atomic(using=alias):
+        qs = AccountDeletionJob.objects.using(alias).filter(
+            Q(status=AccountDeletionJob.STATUS_PENDING)
+            | Q(status=AccountDeletionJob.STATUS_RUNNING, updated_at__lt=stale_before)
+        )
+        if job_ids is not None:
+            qs = qs.filter(pk__in=job_ids)
+        if exclude_ids:
+            qs = qs.exclude(pk__in=exclude_ids)
+        jobs = list(qs.select_for_update(skip_locked=True).order_by("id")[:limit])
+        if not jobs:
+            return []
+        AccountDeletionJob.objects.using(alias).filter(pk__in=[job.pk for job in jobs]).update(
+            status=AccountDeletionJob.STATUS_RUNNING,
+            attempts=F("attempts") + 1,
+            updated_at=now,
+        )
+    for job in jobs:
+        job.status = AccountDeletionJob.STATUS_RUNNING
+        job.attempts += 1
+    return jobs
+
+
+def _save_progress(jobs, step_name: str) -> None:
+    for job in jobs:
+        job.step = step_name
+    if len(jobs) == 1:
+        jobs[0].save(update_fields=["step", "deleted_counts", "updated_at"])
+    else:
+        AccountDeletionJob.objects.using(_job_alias()).filter(pk__in=[job.pk for job in jobs]).update(
+            step=step_name, updated_at=timezone.now()
+        )
 
-        deleted_counts["social_accounts"] = SocialAccount.objects.filter(user_id=user_id).count()
-        SocialAccount.objects.filter(user_id=user_id).delete()
 
-        # 토큰 테이블이 있으면 반드시 정리 (꼬임 방지)
-        deleted_counts["blacklisted_tokens"] = BlacklistedToken.objects.filter(token__user_id=user_id).delete()[0]
-        deleted_counts["outstanding_tokens"] = OutstandingToken.objects.filter(user_id=user_id).delete()[0]
+def _run_group(jobs, *, batch_size: int, sleep_s: float, deadline: float | None, totals: dict) -> bool:
+    """jobs 의 남은 단계를 순서대로 처리한다. 시간이 다 되면 False (진행 상황은 저장됨)."""
+    single = len(jobs) == 1
+    for index, step in enumerate(PURGE_STEPS):
+        group = [job for job in jobs if _step_index(job.step) <= index]
+        if not group:
+            continue
+        user_ids = [job.user_id for job in group]
+        while True:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            deleted = _purge_batch(step, user_ids, batch_size)
+            totals[step.name] = totals.get(step.name, 0) + deleted
+            if single:
+                counts = group[0].deleted_counts
+                counts[step.name] = counts.get(step.name, 0) + deleted
+            if deleted < batch_size:
+                break
+            _save_progress(group, step.name)
+            if sleep_s > 0:
+                time.sleep(sleep_s)
+        next_step = STEP_NAMES[index + 1]
+        _save_progress(group, next_step)
 
-        # cross-db CASCADE로 인한 오류를 피하기 위해 계정 레코드는 SQL로 직접 삭제한다.
-        with connections["default"].cursor() as cursor:
-            cursor.execute("DELETE FROM accounts_user WHERE id = %s", [user_id])
-            deleted_row_count = cursor.rowcount
+    user_ids = [job.user_id for job in jobs]
+    deleted_users = _delete_user_rows(user_ids)
+    totals["users"] = totals.get("users", 0) + deleted_users
+    now = timezone.now()
+    if single:
+        jobs[0].deleted_counts["users"] = deleted_users
+    for job in jobs:
+        job.status = AccountDeletionJob.STATUS_DONE
+        job.step = FINAL_STEP
+        job.finished_at = now
+        job.last_error = ""
+    AccountDeletionJob.objects.using(_job_alias()).bulk_update(
+        jobs, ["status", "step", "finished_at", "last_error", "deleted_counts"]
+    )
+    return True
 
-        if deleted_row_count != 1:
-            raise ValueError(f"failed to delete user row for user_id={user_id}")
 
-    return deleted_counts
+def _release_jobs(jobs, *, error: str = "") -> None:
+    """시간 초과/실패로 멈춘 작업을 다음 실행이 바로 가져가도록 되돌린다."""
+    for job in jobs:
+        if error and job.attempts >= MAX_ATTEMPTS:
+            job.status = AccountDeletionJob.STATUS_FAILED
+        else:
+            job.status = AccountDeletionJob.STATUS_PENDING
+        if error:
+            job.last_error = error[:2000]
+    AccountDeletionJob.objects.using(_job_alias()).bulk_update(jobs, ["status", "last_error", "step", "deleted_counts"])
+
+
+def run_deletion_jobs(
+    *,
+    users_per_group: int = 1,
+    max_groups: int | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    sleep_s: float = DEFAULT_SLEEP_S,
+    time_budget_s: float | None = None,
+    job_ids=None,
+) -> dict:
+    """대기 중인 삭제 작업을 users_per_group 명씩 묶어 처리한다."""
+    started = time.monotonic()
+    deadline = started + time_budget_s if time_budget_s is not None else None
+    totals: dict = {}
+    done = failed = groups = 0
+    finished = False
+    # 이번 실행에서 실패한 작업은 다시 가져가지 않는다 (다음 실행에서 재시도)
+    errored_ids: list[int] = []
+    while max_groups is None or groups < max_groups:
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+        jobs = _claim_jobs(users_per_group, job_ids=job_ids, exclude_ids=errored_ids)
+        if not jobs:
+            finished = True
+            break
+        groups += 1
+        try:
+            completed = _run_group(jobs, batch_size=batch_size, sleep_s=sleep_s, deadline=deadline, totals=totals)
+        except Exception as exc:
+            logger.error(
+                "account deletion job failed user_ids=%s step=%s: %s",
+                [job.user_id for job in jobs],
+                [job.step for job in jobs],
+                exc,
+                exc_info=True,
+            )
+            _release_jobs(jobs, error=str(exc))
+            errored_ids.extend(job.pk for job in jobs)
+            failed += sum(1 for job in jobs if job.status == AccountDeletionJob.STATUS_FAILED)
+            continue
+        if not completed:
+            _release_jobs(jobs)
+            break
+        done += len(jobs)
+    return {
+        "done": done,
+        "failed": failed,
+        "groups": groups,
+        "deleted": totals,
+        "finished": finished,
+        "elapsed_s": round(time.monotonic() - started, 3),
+    }
+
+
+def delete_user_account(user: User, *, batch_size: int = DEFAULT_BATCH_SIZE) -> dict:
+    """
+    삭제 작업을 등록하고 이 자리에서 끝까지 처리한다 (관리 명령어 등 동기 삭제용).
+    외부 DB(cloudsql) 삭제가 실패하면 예외를 올리고, 작업은 남아 있어 작업자가 이어서 처리한다.
+    """
+    job = request_account_deletion(user)
+    claimed = _claim_jobs(1, job_ids=[job.pk])
+    if not claimed:
+        # 이미 작업자가 처리 중이다
+        return job.deleted_counts
+    job = claimed[0]
+    try:
+        _run_group([job], batch_size=batch_size, sleep_s=0, deadline=None, totals={})
+    except Exception as exc:
+        _release_jobs([job], error=str(exc))
+        raise
+    return job.deleted_counts
@@ -14,6 +14,8 @@ import requests
 from django.conf import settings
 from django.core.cache import cache
 
+from wouldulike_backend.green import release_db_connections
+
 logger = logging.getLogger(__name__)
 
 APPLE_JWKS_URL = "https://appleid.apple.com/auth/keys"
@@ -24,6 +26,7 @@ APPLE_JWKS_CACHE_TIMEOUT = 3600  # 1시간
 
 def _fetch_jwks_uncached() -> dict:
     """Apple JWKS를 fetch (캐시 무시)"""
+    release_db_connections()
     try:
         resp = requests.get(APPLE_JWKS_URL, timeout=10)
         resp.raise_for_status()
@@ -43,6 +46,11 @@ def _get_jwks() -> dict:
     return jwks
 
 
+def warm_jwks_cache() -> None:
+    """JWKS 가 캐시에 없으면 미리 받아 둔다 (이후 verify_identity_token 은 네트워크 없이 끝난다)"""
+    _get_jwks()
+
+
 def _get_signing_key(header: dict) -> Any:
     """토큰 헤더의 kid에 해당하는 공개키 반환"""
     kid = header.get("kid")
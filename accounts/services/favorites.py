@@ -0,0 +1,213 @@
+"""
+찜한 식당(favorites) 동기화.
+
+찜 목록은 세 곳에 저장된다.
+- User.favorite_restaurants: 앱이 읽는 JSON 문자열 (원본)
+- GuestUser.favorite_restaurants: 연결된 게스트 계정의 사본
+- UserRestaurantWishlist: 식당 알림 발송 대상 조회용 정규화 테이블
+
+이전/새 목록을 비교해 바뀐 부분만 반영한다.
+- 위시리스트: 추가분은 bulk_create(ignore_conflicts=True), 삭제분은 DELETE ... IN 한 번
+- 게스트: filter(linked_user=user).update() 한 번 (게스트 수만큼 save() 하지 않음)
+목록 전체 교체는 set_favorites, 하트 하나를 누르는 경우는 add_favorite/remove_favorite 를 쓴다.
+모두 사용자 행을 select_for_update 로 잠근 뒤 최신 목록에 한 건만 더하거나 빼므로
+동시에 여러 하트를 눌러도 서로의 변경을 덮어쓰지 않는다.
+"""
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass, field
+
+from django.db import router, transaction
+from django.utils import timezone
+
+from accounts.models import User, UserRestaurantWishlist
+from guests.models import GuestUser
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FavoritesDiff:
+    favorites: list
+    added: list = field(default_factory=list)
+    removed: list = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.removed)
+
+
+def parse_favorites(value) -> list:
+    if value in (None, ""):
+        return []
+    if isinstance(value, list):
+        return value
+    if isinstance(value, str):
+        try:
+            parsed = json.loads(value)
+            return parsed if isinstance(parsed, list) else []
+        except (TypeError, json.JSONDecodeError):
+            return []
+    return []
+
+
+def clean_favorites(value) -> list:
+    """
+    PATCH 로 받은 찜 목록(list, JSON 문자열, None/"")을 검증해 중복 없는 list 로 돌려준다.
+    항목은 식당 id 또는 (예전 클라이언트의) 식당 이름만 받는다. 그 밖의 값은 ValueError.
+    """
+    if value in (None, ""):
+        return []
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except json.JSONDecodeError:
+            raise ValueError("favorite_restaurants must be a JSON list") from None
+    if not isinstance(value, list):
+        raise ValueError("favorite_restaurants must be a list, string, or null")
+    for fav in value:
+        if isinstance(fav, bool) or not isinstance(fav, (str, int)):
+            raise ValueError("favorite_restaurants items must be restaurant ids or names")
+    return list(dict.fromkeys(value))
+
+
+def _favorite_key(fav):
+    # 검증 전에 저장된 예전 데이터에는 dict/list 항목이 남아 있을 수 있다
+    return json.dumps(fav, sort_keys=True) if isinstance(fav, (dict, list)) else fav
+
+
+def diff_favorites(previous: list, current: list) -> tuple[list, list]:
+    """(추가된 항목, 빠진 항목). 순서는 각 목록의 순서를 따른다."""
+    previous_keys = {_favorite_key(fav) for fav in previous}
+    current_keys = {_favorite_key(fav) for fav in current}
+    added = [fav for fav in current if _favorite_key(fav) not in previous_keys]
+    removed = [fav for fav in previous if _favorite_key(fav) not in current_keys]
+    return added, removed
+
+
+def _restaurant_ids(favorites) -> list[int]:
+    # 예전 클라이언트가 식당 이름을 넣던 항목은 위시리스트 대상이 아니다
+    ids = []
+    for fav in favorites:
+        if isinstance(fav, (dict, list)):
+            continue
+        try:
+            ids.append(int(str(fav).strip()))
+        except (TypeError, ValueError):
+            continue
+    return ids
+
+
+def _restaurant_names(restaurant_ids) -> dict[int, str]:
+    from restaurants.models import AffiliateRestaurant
+
+    if not restaurant_ids:
+        return {}
+    return dict(
+        AffiliateRestaurant.objects.filter(restaurant_id__in=restaurant_ids).values_list("restaurant_id", "name")
+    )
+
+
+def sync_wishlist(user, added, removed) -> None:
+    """위시리스트 테이블에 추가/삭제분만 반영한다."""
+    alias = router.db_for_write(UserRestaurantWishlist)
+    added_ids = _restaurant_ids(added)
+    removed_ids = _restaurant_ids(removed)
+    if removed_ids:
+        UserRestaurantWishlist.objects.using(alias).filter(user_id=user.pk, restaurant_id__in=removed_ids).delete()
+    if added_ids:
+        names = _restaurant_names(added_ids)
+        UserRestaurantWishlist.objects.using(alias).bulk_create(
+            [
+                UserRestaurantWishlist(
+                    user_id=user.pk,
+                    restaurant_id=rid,
+                    restaurant_name=names.get(rid) or f"식당#{rid}",
+                )
+                for rid in dict.fromkeys(added_ids)
+            ],
+            ignore_conflicts=True,
+        )
+
+
+def sync_linked_guests(user, **fields) -> int:
+    """연결된 게스트 계정에 필드를 UPDATE 한 번으로 복사한다."""
+    if not fields:
+        return 0
+    return GuestUser.objects.filter(linked_user_id=user.pk).update(updated_at=timezone.now(), **fields)
+
+
+def _write_favorites(user, favorites: list, added: list, removed: list, *, alias: str) -> None:
+    serialized = json.dumps(favorites)
+    now = timezone.now()
+    User.objects.using(alias).filter(pk=user.pk).update(favorite_restaurants=serialized, updated_at=now)
+    user.favorite_restaurants = serialized
+    user.updated_at = now
+    sync_linked_guests(user, favorite_restaurants=serialized)
+    _sync_wishlist_safely(user, added, removed)
+
+
+def _sync_wishlist_safely(user, added, removed) -> None:
+    # 위시리스트는 알림 대상 조회용 보조 데이터라 실패해도 찜 자체는 유지한다
+    try:
+        with transaction.atomic(using=router.db_for_write(UserRestaurantWishlist)):
+            sync_wishlist(user, added, removed)
+    except Exception:
+        logger.exception("UserRestaurantWishlist sync failed (user_id=%s)", user.pk)
+
+
+def _locked_favorites(user, alias: str) -> list:
+    current = (
+        User.objects.using(alias)
+        .select_for_update()
+        .values_list("favorite_restaurants", flat=True)
+        .get(pk=user.pk)
+    )
+    return parse_favorites(current)
+
+
+def set_favorites(user, favorites: list) -> FavoritesDiff:
+    """
+    찜 목록 전체를 favorites(clean_favorites 로 검증한 목록)로 바꾼다 (PATCH /users/me).
+    바뀐 항목만 위시리스트/게스트에 반영한다.
+    """
+    alias = router.db_for_write(User)
+    favorites = list(dict.fromkeys(favorites))
+    with transaction.atomic(using=alias):
+        previous = _locked_favorites(user, alias)
+        added, removed = diff_favorites(previous, favorites)
+        if previous == favorites:
+            user.favorite_restaurants = json.dumps(previous)
+            return FavoritesDiff(favorites=previous)
+        _write_favorites(user, favorites, added, removed, alias=alias)
+    return FavoritesDiff(favorites=favorites, added=added, removed=removed)
+
+
+def add_favorite(user, restaurant_id: str) -> FavoritesDiff:
+    alias = router.db_for_write(User)
+    with transaction.atomic(using=alias):
+        favorites = _locked_favorites(user, alias)
+        if restaurant_id in favorites:
+            user.favorite_restaurants = json.dumps(favorites)
+            # 이전 버전에서 위시리스트 동기화가 빠진 항목이면 채워 넣는다
+            _sync_wishlist_safely(user, [restaurant_id], [])
+            return FavoritesDiff(favorites=favorites)
+        favorites.append(restaurant_id)
+        _write_favorites(user, favorites, [restaurant_id], [], alias=alias)
+    return FavoritesDiff(favorites=favorites, added=[restaurant_id])
+
+
+def remove_favorite(user, restaurant_id: str) -> FavoritesDiff:
+    alias = router.db_for_write(User)
+    with transaction.atomic(using=alias):
+        favorites = _locked_favorites(user, alias)
+        if restaurant_id not in favorites:
+            user.favorite_restaurants = json.dumps(favorites)
+            # JSON 에는 없지만 위시리스트에 남은 행이 있으면 함께 정리한다
+            _sync_wishlist_safely(user, [], [restaurant_id])
+            return FavoritesDiff(favorites=favorites)
+        favorites = [fav for fav in favorites if fav != restaurant_id]
+        _write_favorites(user, favorites, [], [restaurant_id], alias=alias)
+    return FavoritesDiff(favorites=favorites, removed=[restaurant_id])
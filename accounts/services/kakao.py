@@ -0,0 +1,322 @@
+"""
+Kakao API 클라이언트 (로그인 사용자 조회 / 인가 코드 교환 / 연결 끊기).
+
+- 프로세스당 하나의 requests.Session 을 재사용해 커넥션 풀(keep-alive)을 쓴다.
+- access_token 으로 조회한 프로필은 토큰 해시(sha256)를 키로 짧게(PROFILE_CACHE_TTL_S) 캐시한다.
+  푸시 직후처럼 같은 토큰으로 재시도가 몰릴 때 Kakao 호출을 한 번으로 줄인다.
+- 연속 실패(타임아웃/연결 오류/5xx)가 FAILURE_THRESHOLD 번 나면 RESET_TIMEOUT_S 동안 호출하지 않고
+  바로 KakaoUnavailable("circuit_open") 을 낸다 (이후 한 건만 시험 호출).
+- 호출 수/실패/캐시 적중/지연 시간은 get_metrics() 로 조회한다.
+
+토큰이 만료/무효인 응답(4xx)은 실패로 세지 않고 KakaoRejected 로 올려 호출 측이 응답 본문을 판단한다.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+
+import requests
+from django.core.cache import cache
+from requests.adapters import HTTPAdapter
+
+from wouldulike_backend.green import release_db_connections
+
+logger = logging.getLogger(__name__)
+
+KAKAO_API_BASE_URL = os.getenv("KAKAO_API_BASE_URL", "https://kapi.kakao.com")
+KAKAO_AUTH_BASE_URL = os.getenv("KAKAO_AUTH_BASE_URL", "https://kauth.kakao.com")
+
+CONNECT_TIMEOUT_S = float(os.getenv("KAKAO_CONNECT_TIMEOUT_SECONDS", "3"))
+READ_TIMEOUT_S = float(os.getenv("KAKAO_USERINFO_TIMEOUT_SECONDS", "10"))
+POOL_MAXSIZE = int(os.getenv("KAKAO_HTTP_POOL_MAXSIZE", "20"))
+
+PROFILE_CACHE_TTL_S = int(os.getenv("KAKAO_PROFILE_CACHE_TTL_SECONDS", "60"))
+PROFILE_CACHE_PREFIX = "kakao_profile:v1:"
+
+FAILURE_THRESHOLD = int(os.getenv("KAKAO_CIRCUIT_FAILURE_THRESHOLD", "5"))
+RESET_TIMEOUT_S = float(os.getenv("KAKAO_CIRCUIT_RESET_SECONDS", "30"))
+
+
+class KakaoUnavailable(Exception):
+    """Kakao 호출 자체가 실패 (timeout / connection_error / circuit_open / invalid_response / unknown)."""
+
+    def __init__(self, code: str, message: str = ""):
+        super().__init__(message or code)
+        self.code = code
+
+
+class KakaoRejected(Exception):
+    """Kakao 가 200 이 아닌 응답을 돌려줌 (토큰 만료/무효 등). response 로 원본 응답을 확인한다."""
+
+    def __init__(self, response):
+        super().__init__(f"kakao responded {response.status_code}")
+        self.response = response
+
+
+@dataclass(frozen=True)
+class KakaoProfile:
+    kakao_id: int | None
+    nickname: str = ""
+    profile_image_url: str = ""
+    cached: bool = False
+    raw: dict = field(default_factory=dict, compare=False, repr=False)
+
+
+class CircuitBreaker:
+    """연속 실패 횟수 기반 서킷 브레이커 (프로세스 단위)."""
+
+    def __init__(self, failure_threshold: int = FAILURE_THRESHOLD, reset_timeout_s: float = RESET_TIMEOUT_S):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_s = reset_timeout_s
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state_locked()
+
+    def _state_locked(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_timeout_s:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self._state_locked()
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info("kakao circuit closed")
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    logger.warning("kakao circuit opened after %s consecutive failures", self._failures)
+                self._opened_at = time.monotonic()
+
+
+def token_cache_key(access_token: str) -> str:
+    return PROFILE_CACHE_PREFIX + hashlib.sha256(access_token.encode("utf-8")).hexdigest()
+
+
+def _parse_json(response) -> dict | None:
+    """Kakao 가 간헐적으로 UTF-8 BOM 이 붙은 본문이나 JSON 이 아닌 MIME 을 주는 경우까지 파싱."""
+    try:
+        return response.json()
+    except ValueError:
+        pass
+    for payload in (response.content, response.text):
+        if not payload:
+            continue
+        try:
+            text = payload.decode("utf-8-sig") if isinstance(payload, (bytes, bytearray)) else str(payload).lstrip("\ufeff")
+            return json.loads(text)
+        except (UnicodeDecodeError, ValueError):
+            continue
+    return None
+
+
+class KakaoClient:
+    def __init__(
+        self,
+        *,
+        api_base_url: str = KAKAO_API_BASE_URL,
+        auth_base_url: str = KAKAO_AUTH_BASE_URL,
+        connect_timeout_s: float = CONNECT_TIMEOUT_S,
+        read_timeout_s: float = READ_TIMEOUT_S,
+        pool_maxsize: int = POOL_MAXSIZE,
+        profile_cache_ttl_s: int = PROFILE_CACHE_TTL_S,
+        breaker: CircuitBreaker | None = None,
+    ):
+        self.api_base_url = api_base_url.rstrip("/")
+        self.auth_base_url = auth_base_url.rstrip("/")
+        self.timeout = (connect_timeout_s, read_timeout_s)
+        self.profile_cache_ttl_s = profile_cache_ttl_s
+        self.breaker = breaker or CircuitBreaker()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._metrics_lock = threading.Lock()
+        self._metrics = {
+            "requests": 0,
+            "failures": 0,
+            "rejected": 0,
+            "circuit_open": 0,
+            "cache_hits": 0,
+            "latency_ms_total": 0,
+            "latency_ms_max": 0,
+        }
+
+    # --- metrics -------------------------------------------------------
+
+    def _incr(self, name: str, value: int = 1) -> None:
+        with self._metrics_lock:
+            self._metrics[name] += value
+
+    def _observe_latency(self, started: float) -> None:
+        elapsed_ms = int((time.perf_counter() - started) * 1000)
+        with self._metrics_lock:
+            self._metrics["latency_ms_total"] += elapsed_ms
+            self._metrics["latency_ms_max"] = max(self._metrics["latency_ms_max"], elapsed_ms)
+
+    def get_metrics(self) -> dict:
+        with self._metrics_lock:
+            snapshot = dict(self._metrics)
+        snapshot["circuit_state"] = self.breaker.state
+        return snapshot
+
+    # --- transport -----------------------------------------------------
+
+    def _request(self, method: str, url: str, **kwargs):
+        if not self.breaker.allow():
+            self._incr("circuit_open")
+            raise KakaoUnavailable("circuit_open", "kakao circuit is open")
+
+        self._incr("requests")
+        release_db_connections()
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+        except requests.exceptions.Timeout as exc:
+            self._fail()
+            raise KakaoUnavailable("timeout", str(exc)) from exc
+        except requests.exceptions.ConnectionError as exc:
+            self._fail()
+            raise KakaoUnavailable("connection_error", str(exc)) from exc
+        except requests.RequestException as exc:
+            self._fail()
+            raise KakaoUnavailable("unknown", str(exc)) from exc
+        finally:
+            self._observe_latency(started)
+
+        if response.status_code >= 500:
+            self._fail()
+        else:
+            self.breaker.record_success()
+        return response
+
+    def _fail(self) -> None:
+        self._incr("failures")
+        self.breaker.record_failure()
+
+    # --- API -----------------------------------------------------------
+
+    def get_profile(self, access_token: str) -> KakaoProfile:
+        """/v2/user/me. 200 이 아니면 KakaoRejected, 호출 실패면 KakaoUnavailable."""
+        key = token_cache_key(access_token)
+        try:
+            cached = cache.get(key)
+        except Exception as exc:
+            logger.debug("kakao profile cache get failed: %s", exc)
+            cached = None
+        if cached:
+            self._incr("cache_hits")
+            return KakaoProfile(
+                kakao_id=cached["kakao_id"],
+                nickname=cached["nickname"],
+                profile_image_url=cached["profile_image_url"],
+                cached=True,
+            )
+
+        response = self._request(
+            "GET",
+            f"{self.api_base_url}/v2/user/me",
+            headers={"Authorization": f"Bearer {access_token}"},
+        )
+        if response.status_code != 200:
+            self._incr("rejected")
+            raise KakaoRejected(response)
+
+        data = _parse_json(response)
+        if not isinstance(data, dict):
+            logger.error(
+                "Failed to parse Kakao profile response",
+                extra={
+                    "status_code": response.status_code,
+                    "content_type": response.headers.get("Content-Type"),
+                    "content_length": len(response.content or b""),
+                },
+            )
+            raise KakaoUnavailable("invalid_response")
+
+        profile_data = (data.get("kakao_account") or {}).get("profile") or {}
+        profile = KakaoProfile(
+            kakao_id=data.get("id"),
+            nickname=profile_data.get("nickname") or "",
+            profile_image_url=profile_data.get("profile_image_url") or "",
+            raw=data,
+        )
+        if profile.kakao_id and self.profile_cache_ttl_s > 0:
+            try:
+                cache.set(
+                    key,
+                    {
+                        "kakao_id": profile.kakao_id,
+                        "nickname": profile.nickname,
+                        "profile_image_url": profile.profile_image_url,
+                    },
+                    timeout=self.profile_cache_ttl_s,
+                )
+            except Exception as exc:
+                logger.debug("kakao profile cache set failed: %s", exc)
+        return profile
+
+    def exchange_code(self, code: str, *, client_id: str, redirect_uri: str):
+        """인가 코드 → 토큰 교환 (/oauth/token). 원본 응답을 반환한다."""
+        return self._request(
+            "POST",
+            f"{self.auth_base_url}/oauth/token",
+            data={
+                "grant_type": "authorization_code",
+                "client_id": client_id,
+                "redirect_uri": redirect_uri,
+                "code": code,
+            },
+        )
+
+    def unlink(self, kakao_id: int, *, admin_key: str):
+        """관리자 키로 사용자 연결 끊기 (/v1/user/unlink). 원본 응답을 반환한다."""
+        return self._request(
+            "POST",
+            f"{self.api_base_url}/v1/user/unlink",
+            headers={"Authorization": f"KakaoAK {admin_key}"},
+            data={"target_id_type": "user_id", "target_id": kakao_id},
+        )
+
+
+_client: KakaoClient | None = None
+_client_lock = threading.Lock()
+
+
+def get_kakao_client() -> KakaoClient:
+    """프로세스 공용 클라이언트 (세션/서킷 브레이커/지표 공유)."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = KakaoClient()
+    return _client
@@ -0,0 +1,244 @@
+"""
+닉네임 중복 검사.
+
+- User.nickname_key: NFKC + casefold 로 정규화한 닉네임 (unique 인덱스). nickname__iexact 스캔 대신 쓴다.
+- 블룸 필터: 사용 중인 nickname_key 의 비트맵을 Redis(BLOOM_KEY)에 두고 프로세스마다 BLOOM_REFRESH_S 주기로
+  받아 온다. 필터에 없으면 "확실히 사용 가능"이라 DB 를 조회하지 않는다. 있으면(오탐 가능) DB 로 확인한다.
+  닉네임이 저장될 때마다 비트를 추가하고(accounts.signals), 바뀌거나 지워진 닉네임의 비트는
+  rebuild_nickname_bloom 명령어로 주기적으로 정리한다.
+  rebuild 가 만든 비트맵만 믿는다: 끝에 완성 표시 바이트(BLOOM_BUILT_MARKER)를 붙여 두고, 표시가 없거나 길이가
+  다른 비트맵(배포 직후, Redis eviction/flush 뒤 SETBIT 이 새로 만든 일부 비트맵)은 "알 수 없음"으로 보고 DB 로 확인한다.
+- 예약: 확인 후 저장 사이에 다른 사용자가 같은 닉네임을 가져가지 않도록 Redis 에 RESERVATION_TTL_S 동안
+  SET NX 로 선점한다. 저장 후에도 TTL 까지 남겨 두어, 다른 프로세스의 필터가 새 비트를 받아 오기 전까지
+  예약 키로 막는다 (RESERVATION_TTL_S > BLOOM_REFRESH_S).
+
+Redis 를 쓸 수 없으면 필터/예약 없이 DB(nickname_key unique 인덱스)만으로 판단한다.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+import time
+import unicodedata
+
+from django.core.cache import cache
+from django.db import router
+
+logger = logging.getLogger(__name__)
+
+BLOOM_KEY = "nickname_bloom:v1"
+BLOOM_BITS = int(os.getenv("NICKNAME_BLOOM_BITS", str(1 << 21)))
+BLOOM_HASHES = int(os.getenv("NICKNAME_BLOOM_HASHES", "7"))
+BLOOM_REFRESH_S = float(os.getenv("NICKNAME_BLOOM_REFRESH_SECONDS", "60"))
+BLOOM_BYTES = (BLOOM_BITS + 7) // 8
+# 비트맵 바로 뒤 한 바이트. SETBIT 은 BLOOM_BITS 안쪽만 건드리므로 빈 키에 SETBIT 해도 이 바이트는 생기지 않는다
+BLOOM_BUILT_MARKER = b"\x01"
+
+RESERVATION_KEY_PREFIX = "nickname:reserve:"
+RESERVATION_TTL_S = int(os.getenv("NICKNAME_RESERVATION_TTL_SECONDS", "120"))
+
+
+def normalize_nickname(nickname) -> str | None:
+    if nickname is None:
+        return None
+    key = unicodedata.normalize("NFKC", str(nickname)).strip().casefold()
+    return key or None
+
+
+def _raw_client():
+    return cache.client.get_client(True)  # type: ignore[attr-defined]
+
+
+def bloom_positions(key: str, *, bits: int = BLOOM_BITS, hashes: int = BLOOM_HASHES) -> list[int]:
+    """이중 해싱(Kirsch–Mitzenmacher)으로 비트 위치 hashes 개를 만든다."""
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+    h1 = int.from_bytes(digest[:8], "big")
+    h2 = int.from_bytes(digest[8:], "big") | 1
+    return [(h1 + i * h2) % bits for i in range(hashes)]
+
+
+def _bit_is_set(bitmap: bytes, position: int) -> bool:
+    # Redis SETBIT 은 바이트 안에서 최상위 비트가 offset 0 이다
+    index = position >> 3
+    if index >= len(bitmap):
+        return False
+    return bool(bitmap[index] & (0x80 >> (position & 7)))
+
+
+def _set_bit(bitmap: bytearray, position: int) -> None:
+    bitmap[position >> 3] |= 0x80 >> (position & 7)
+
+
+def _built_bitmap(raw) -> bytearray | None:
+    """rebuild_bloom 이 만든 완전한 비트맵이면 표시 바이트를 뺀 비트맵, 아니면 None(알 수 없음)."""
+    if not raw or len(raw) != BLOOM_BYTES + 1 or raw[-1:] != BLOOM_BUILT_MARKER:
+        return None
+    return bytearray(raw[:-1])
+
+
+class NicknameBloomFilter:
+    """Redis 비트맵의 프로세스 로컬 사본."""
+
+    def __init__(self, refresh_s: float = BLOOM_REFRESH_S):
+        self.refresh_s = refresh_s
+        self._bitmap: bytearray | None = None
+        self._loaded_at: float | None = None
+        self._lock = threading.Lock()
+
+    def _refresh_if_stale(self) -> None:
+        now = time.monotonic()
+        if self._loaded_at is not None and now - self._loaded_at < self.refresh_s:
+            return
+        with self._lock:
+            if self._loaded_at is not None and now - self._loaded_at < self.refresh_s:
+                return
+            try:
+                raw = _raw_client().get(BLOOM_KEY)
+            except Exception as exc:
+                logger.debug("nickname bloom refresh failed: %s", exc)
+                raw = None
+            # 아직 만들어지지 않았거나, 일부만 남았거나, Redis 장애면 필터 없이 DB 로 확인한다
+            self._bitmap = _built_bitmap(raw)
+            self._loaded_at = now
+
+    def might_contain(self, key: str) -> bool:
+        self._refresh_if_stale()
+        bitmap = self._bitmap
+        if bitmap is None:
+            return True
+        return all(_bit_is_set(bitmap, pos) for pos in bloom_positions(key))
+
+    def add_local(self, key: str) -> None:
+        bitmap = self._bitmap
+        if bitmap is None:
+            return
+        for pos in bloom_positions(key):
+            if (pos >> 3) < len(bitmap):
+                _set_bit(bitmap, pos)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._bitmap = None
+            self._loaded_at = None
+
+
+bloom_filter = NicknameBloomFilter()
+
+
+def add_to_bloom(nickname_key: str) -> None:
+    """저장된 닉네임을 Redis 비트맵과 로컬 사본에 추가한다. 완성된 비트맵이 없으면 rebuild 에 맡긴다."""
+    bloom_filter.add_local(nickname_key)
+    try:
+        client = _raw_client()
+        # 확인과 SETBIT 사이에 키가 사라져 일부 비트맵이 생겨도 표시 바이트가 없어 읽는 쪽은 DB 로 확인한다
+        if client.strlen(BLOOM_KEY) != BLOOM_BYTES + 1:
+            return
+        pipe = client.pipeline(transaction=False)
+        for pos in bloom_positions(nickname_key):
+            pipe.setbit(BLOOM_KEY, pos, 1)
+        pipe.execute()
+    except Exception as exc:
+        logger.warning("nickname bloom update failed: %s", exc)
+
+
+def build_bloom_bitmap(keys) -> bytearray:
+    bitmap = bytearray(BLOOM_BYTES)
+    for key in keys:
+        for pos in bloom_positions(key):
+            _set_bit(bitmap, pos)
+    return bitmap
+
+
+def rebuild_bloom(*, chunk_size: int = 5000) -> int:
+    """DB 의 nickname_key 전체로 비트맵을 새로 만들어 교체한다. 반환: 반영한 닉네임 수."""
+    from accounts.models import User
+
+    alias = router.db_for_read(User)
+    keys = (
+        User.objects.using(alias)
+        .exclude(nickname_key__isnull=True)
+        .values_list("nickname_key", flat=True)
+        .iterator(chunk_size=chunk_size)
+    )
+    count = 0
+
+    def counted():
+        nonlocal count
+        for key in keys:
+            count += 1
+            yield key
+
+    bitmap = build_bloom_bitmap(counted())
+    # 교체 직전 사이에 추가된 비트는 사라질 수 있지만 예약 키와 unique 인덱스가 막는다
+    client = _raw_client()
+    tmp_key = f"{BLOOM_KEY}:tmp"
+    client.set(tmp_key, bytes(bitmap) + BLOOM_BUILT_MARKER)
+    client.rename(tmp_key, BLOOM_KEY)
+    bloom_filter.reset()
+    return count
+
+
+def _reservation_key(nickname_key: str) -> str:
+    return f"{RESERVATION_KEY_PREFIX}{nickname_key}"
+
+
+def reserve_nickname(nickname: str, user_id) -> bool:
+    """닉네임을 user_id 로 RESERVATION_TTL_S 동안 선점한다. 다른 사용자가 선점 중이면 False."""
+    key = normalize_nickname(nickname)
+    if key is None:
+        return True
+    redis_key = _reservation_key(key)
+    owner = str(user_id)
+    try:
+        client = _raw_client()
+        if client.set(redis_key, owner, nx=True, ex=RESERVATION_TTL_S):
+            return True
+        current = client.get(redis_key)
+        if current is not None and current.decode() == owner:
+            client.expire(redis_key, RESERVATION_TTL_S)
+            return True
+        return current is None and bool(client.set(redis_key, owner, nx=True, ex=RESERVATION_TTL_S))
+    except Exception as exc:
+        logger.debug("nickname reservation unavailable: %s", exc)
+        return True
+
+
+def release_nickname(nickname: str, user_id) -> None:
+    key = normalize_nickname(nickname)
+    if key is None:
+        return
+    try:
+        client = _raw_client()
+        redis_key = _reservation_key(key)
+        current = client.get(redis_key)
+        if current is not None and current.decode() == str(user_id):
+            client.delete(redis_key)
+    except Exception:
+        pass
+
+
+def _reserved_by_other(nickname_key: str, user_id) -> bool:
+    try:
+        current = _raw_client().get(_reservation_key(nickname_key))
+    except Exception:
+        return False
+    return current is not None and current.decode() != str(user_id)
+
+
+def is_nickname_taken(nickname: str, *, exclude_user_id=None) -> bool:
+    """다른 사용자가 쓰고 있거나 선점 중인 닉네임이면 True."""
+    from accounts.models import User
+
+    key = normalize_nickname(nickname)
+    if key is None:
+        return False
+    if _reserved_by_other(key, exclude_user_id):
+        return True
+    if not bloom_filter.might_contain(key):
+        return False
+    qs = User.objects.filter(nickname_key=key)
+    if exclude_user_id is not None:
+        qs = qs.exclude(id=exclude_user_id)
+    return qs.exists()
@@ -0,0 +1,105 @@
+"""
+같은 refresh token 으로 동시에 들어온 갱신 요청을 하나로 합친다 (single-flight).
+
+- 키: refresh token 전체의 sha256 (JWT 앞부분은 헤더라 사용자끼리 겹친다)
+- 먼저 락을 잡은 요청(leader)만 실제 갱신을 하고 결과를 RESULT_TTL_S 동안 Redis 에 남긴다.
+- 나머지 요청은 결과가 생길 때까지 짧게 기다렸다가 그대로 재사용한다.
+  leader 가 실패해 결과 없이 락이 풀리면 각자 직접 처리한다 (같은 오류를 그대로 받게 됨).
+- Redis 를 쓸 수 없으면 합치지 않고 바로 처리한다.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import time
+import uuid
+from typing import Any, Callable
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+RESULT_TTL_S = 5
+LOCK_TTL_S = 10
+WAIT_TIMEOUT_S = 3.0
+POLL_INTERVAL_S = 0.05
+
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def token_fingerprint(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def _result_key(fingerprint: str) -> str:
+    return f"token_refresh:v2:{fingerprint}"
+
+
+def _lock_key(fingerprint: str) -> str:
+    return f"lock:token_refresh:{fingerprint}"
+
+
+def coalesce_refresh(refresh_token: str, compute: Callable[[], Any]) -> tuple[Any, bool]:
+    """
+    compute() 결과를 같은 토큰의 동시 요청과 공유한다.
+    반환: (결과, leader 여부). leader 가 아니면 다른 요청이 만든 결과를 재사용한 것이다.
+    compute() 결과는 캐시에 저장 가능한(pickle) 값이어야 한다.
+    """
+    fingerprint = token_fingerprint(refresh_token)
+    result_key = _result_key(fingerprint)
+    lock_key = _lock_key(fingerprint)
+
+    try:
+        client = cache.client.get_client(True)  # type: ignore[attr-defined]
+        cached = cache.get(result_key)
+    except Exception as exc:
+        logger.debug("token refresh coalescing disabled: %s", exc)
+        return compute(), True
+    if cached is not None:
+        return cached, False
+
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + WAIT_TIMEOUT_S
+    while True:
+        try:
+            if client.set(lock_key, token, nx=True, ex=LOCK_TTL_S):
+                break
+            cached = cache.get(result_key)
+            if cached is not None:
+                return cached, False
+            lock_alive = client.exists(lock_key)
+        except Exception as exc:
+            logger.warning("token refresh coalescing fell back to direct refresh: %s", exc)
+            return compute(), True
+        if not lock_alive:
+            # leader 가 결과 없이 끝남 → 다시 락 경쟁
+            continue
+        if time.monotonic() >= deadline:
+            logger.warning("token refresh wait timed out; refreshing directly")
+            return compute(), True
+        time.sleep(POLL_INTERVAL_S)
+
+    try:
+        # 직전 leader 가 결과를 남기고 락을 푼 직후에 락을 잡았을 수 있다
+        try:
+            cached = cache.get(result_key)
+        except Exception:
+            cached = None
+        if cached is not None:
+            return cached, False
+        result = compute()
+        try:
+            cache.set(result_key, result, timeout=RESULT_TTL_S)
+        except Exception as exc:
+            logger.warning("token refresh result cache failed: %s", exc)
+        return result, True
+    finally:
+        try:
+            client.eval(_RELEASE_SCRIPT, 1, lock_key, token)
+        except Exception:
+            pass
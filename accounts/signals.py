@@ -0,0 +1,25 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import invalidate_user
+from .services.nicknames import add_to_bloom
+from .models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_auth_user_cache(sender, instance, using, **kwargs):
+    # 커밋 전에 지우면 다른 요청이 이전 값으로 다시 채울 수 있어 커밋 후에도 한 번 더 지운다
+    invalidate_user(instance.pk)
+    transaction.on_commit(lambda: invalidate_user(instance.pk), using=using)
+
+
+@receiver(post_save, sender=User)
+def add_nickname_to_bloom(sender, instance, using, update_fields=None, **kwargs):
+    if not instance.nickname_key:
+        return
+    if update_fields is not None and "nickname" not in update_fields:
+        return
+    key = instance.nickname_key
+    transaction.on_commit(lambda: add_to_bloom(key), using=using)
@@ -0,0 +1,9 @@
+from celery import shared_task
+
+from .services.account_deletion import run_deletion_jobs
+
+
+@shared_task
+def process_account_deletions():
+    # 탈퇴 요청 후 남은 연관 데이터를 배치로 삭제 (한 번 실행당 최대 2분, 남은 건 다음 실행이 이어서)
+    return run_deletion_jobs(time_budget_s=120)
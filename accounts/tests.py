@@ -33,7 +33,7 @@ class DisableCouponSignalMixin:
 
 
 class KakaoLoginTests(DisableCouponSignalMixin, APITestCase):
-    @patch('accounts.views.requests.get')
+    @patch('accounts.services.kakao.requests.Session.request')
     def test_new_user_login(self, mock_get):
         mock_get.return_value.status_code = 200
         mock_get.return_value.json.return_value = KAKAO_RESPONSE
@@ -42,7 +42,7 @@ class KakaoLoginTests(DisableCouponSignalMixin, APITestCase):
         self.assertTrue(response.data['is_new'])
         self.assertEqual(User.objects.count(), 1)
 
-    @patch('accounts.views.requests.get')
+    @patch('accounts.services.kakao.requests.Session.request')
     def test_existing_user_login(self, mock_get):
         User.objects.create_user(kakao_id=12345)
         mock_get.return_value.status_code = 200
@@ -52,13 +52,13 @@ class KakaoLoginTests(DisableCouponSignalMixin, APITestCase):
         self.assertFalse(response.data['is_new'])
         self.assertEqual(User.objects.count(), 1)
 
-    @patch('accounts.views.requests.get')
+    @patch('accounts.services.kakao.requests.Session.request')
     def test_invalid_token(self, mock_get):
         mock_get.return_value.status_code = 401
         response = self.client.post('/api/auth/kakao', {'access_token': 'bad'})
         self.assertEqual(response.status_code, 401)
 
-    @patch('accounts.views.requests.get')
+    @patch('accounts.services.kakao.requests.Session.request')
     def test_guest_merge(self, mock_get):
         guest = GuestUser.objects.create(type_code='AAAA')
         mock_get.return_value.status_code = 200
@@ -76,7 +76,7 @@ class KakaoLoginTests(DisableCouponSignalMixin, APITestCase):
         self.assertEqual(guest.linked_user, user)
         self.assertEqual(guest.type_code, 'AAAA')
 
-    @patch('accounts.views.requests.get')
+    @patch('accounts.services.kakao.requests.Session.request')
     def test_guest_merge_overwrites_existing_type_code(self, mock_get):
         existing_user = User.objects.create_user(kakao_id=12345, type_code='BBBB')
         guest = GuestUser.objects.create(type_code='AAAA')
@@ -97,7 +97,7 @@ class KakaoLoginTests(DisableCouponSignalMixin, APITestCase):
         self.assertEqual(guest.linked_user, existing_user)
         self.assertEqual(guest.type_code, 'AAAA')
 
-    @patch('accounts.views.requests.get')
+    @patch('accounts.services.kakao.requests.Session.request')
     def test_guest_data_backfills_missing_fields(self, mock_get):
         existing_user = User.objects.create_user(
             kakao_id=12345,
@@ -190,7 +190,7 @@ class UserMeTests(DisableCouponSignalMixin, APITestCase):
         guest.refresh_from_db()
         self.assertIsNone(guest.linked_user)
 
-    @patch('accounts.views.requests.get')
+    @patch('accounts.services.kakao.requests.Session.request')
     def test_delete_then_relogin_with_same_kakao_id_creates_fresh_account(self, mock_get):
         """
         계정 삭제 후 같은 kakao_id로 재로그인해도
@@ -260,6 +260,45 @@ class UserMeTests(DisableCouponSignalMixin, APITestCase):
         self.assertEqual(response.data.get('code'), 'invalid_profile_code')
 
 
+class LoginRateLimitTests(DisableCouponSignalMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        from wouldulike_backend import throttling
+
+        limiter = throttling.RateLimiter()
+        limiter._redis_retry_at = float('inf')
+        patcher = patch.object(throttling, 'limiter', limiter)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @override_settings(
+        RATE_LIMITS_ENABLED=True,
+        RATE_LIMITS={'login': {'ip': ('1/m',)}, 'token_refresh': {'user': ('1/m',)}},
+    )
+    def test_refresh_logins_behind_one_ip_are_limited_per_user(self):
+        # 테스트 클라이언트는 요청 끝에 캐시를 닫으므로(Redis 설정 없음) 뷰를 직접 호출한다
+        from rest_framework.test import APIRequestFactory
+        from accounts.tokens import RegistryRefreshToken
+        from accounts.views import KakaoLoginView
+
+        view = KakaoLoginView.as_view()
+        factory = APIRequestFactory()
+
+        def login(refresh):
+            request = factory.post('/api/auth/kakao', {'refresh': refresh}, format='json', REMOTE_ADDR='10.1.1.1')
+            return view(request).status_code
+
+        tokens = [
+            str(RegistryRefreshToken.for_user(User.objects.create_user(kakao_id=kakao_id)))
+            for kakao_id in (81001, 81002)
+        ]
+        self.assertNotIn(429, [login(token) for token in tokens])
+        self.assertEqual(login(tokens[0]), 429)
+
+        # 서명이 맞지 않는 refresh 는 카카오 검증 경로와 같이 IP 기준으로 센다
+        self.assertEqual((login('bogus'), login('bogus')), (400, 429))
+
+
 class NicknameAvailabilityTests(DisableCouponSignalMixin, APITestCase):
     def setUp(self):
         super().setUp()
@@ -439,3 +478,581 @@ class AccountDeletionAppleFlowTests(DisableCouponSignalMixin, APITestCase):
         self.assertNotEqual(new_user_id, created_user_id)
         self.assertTrue(User.objects.filter(id=new_user_id, apple_id=self.VALID_CLAIMS['sub']).exists())
         self.assertTrue(SocialAccount.objects.filter(provider='apple', provider_user_id=self.VALID_CLAIMS['sub']).exists())
+
+
+class CachedAuthUserTests(DisableCouponSignalMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        from django.core.cache.backends.locmem import LocMemCache
+        from accounts.authentication import clear_local_cache
+        cache_patcher = patch('accounts.authentication.cache', LocMemCache('auth-user-test', {}))
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+        clear_local_cache()
+        self.addCleanup(clear_local_cache)
+        self.user = User.objects.create_user(kakao_id=77001, nickname='캐시', password='pass')
+
+    def test_authenticate_skips_db_after_first_lookup(self):
+        from rest_framework_simplejwt.tokens import AccessToken
+        from accounts.authentication import CachedJWTAuthentication, clear_local_cache
+
+        token = AccessToken.for_user(self.user)
+        auth = CachedJWTAuthentication()
+        self.assertEqual(auth.get_user(token).kakao_id, 77001)
+
+        clear_local_cache()  # Redis 적중도 DB 를 보지 않아야 함
+        with self.assertNumQueries(0):
+            user = auth.get_user(token)
+        self.assertEqual((user.id, user.nickname), (self.user.id, '캐시'))
+
+    def test_save_and_delete_invalidate(self):
+        from rest_framework_simplejwt.exceptions import AuthenticationFailed
+        from rest_framework_simplejwt.tokens import AccessToken
+        from accounts.authentication import CachedJWTAuthentication, get_cached_user
+
+        self.assertEqual(get_cached_user(self.user.id).nickname, '캐시')
+        self.user.nickname = '변경'
+        self.user.save()
+        self.assertEqual(get_cached_user(self.user.id).nickname, '변경')
+
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            CachedJWTAuthentication().get_user(AccessToken.for_user(self.user))
+
+        user_id = self.user.id
+        self.user.delete()
+        self.assertIsNone(get_cached_user(user_id))
+
+
+class KakaoClientStubServerTests(APITestCase):
+    """로컬 stub 서버로 Kakao 클라이언트의 캐시/서킷 브레이커 동작 확인."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        import json as _json
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        cls.hits = []
+        cls.status_by_token = {}
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                token = self.headers.get('Authorization', '').replace('Bearer ', '')
+                cls.hits.append(token)
+                code = cls.status_by_token.get(token, 200)
+                body = _json.dumps(KAKAO_RESPONSE if code == 200 else {'code': -401, 'msg': 'expired'}).encode()
+                self.send_response(code)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        thread.start()
+        cls.addClassCleanup(cls.server.server_close)
+        cls.addClassCleanup(cls.server.shutdown)
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_address[1]}'
+
+    def setUp(self):
+        from django.core.cache.backends.locmem import LocMemCache
+        from accounts.services.kakao import CircuitBreaker, KakaoClient
+
+        self.hits.clear()
+        self.status_by_token.clear()
+        cache_patcher = patch('accounts.services.kakao.cache', LocMemCache('kakao-client-test', {}))
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+        self.kakao = KakaoClient(
+            api_base_url=self.base_url,
+            read_timeout_s=2,
+            breaker=CircuitBreaker(failure_threshold=2, reset_timeout_s=60),
+        )
+
+    def test_profile_is_cached_by_token_hash(self):
+        first = self.kakao.get_profile('token-a')
+        second = self.kakao.get_profile('token-a')
+
+        self.assertEqual((first.kakao_id, first.nickname, first.cached), (12345, 'Jaemin', False))
+        self.assertEqual((second.kakao_id, second.cached), (12345, True))
+        self.assertEqual(self.hits, ['token-a'])
+        self.assertEqual(self.kakao.get_metrics()['cache_hits'], 1)
+
+    def test_rejected_token_does_not_trip_breaker_but_5xx_does(self):
+        from accounts.services.kakao import KakaoRejected, KakaoUnavailable
+
+        self.status_by_token.update({'expired': 401, 'broken': 503})
+        for _ in range(3):
+            with self.assertRaises(KakaoRejected):
+                self.kakao.get_profile('expired')
+        self.assertEqual(self.kakao.breaker.state, 'closed')
+
+        for _ in range(2):
+            with self.assertRaises(KakaoRejected):
+                self.kakao.get_profile('broken')
+        with self.assertRaises(KakaoUnavailable) as ctx:
+            self.kakao.get_profile('token-b')
+        self.assertEqual(ctx.exception.code, 'circuit_open')
+        self.assertNotIn('token-b', self.hits)
+        self.assertEqual(self.kakao.get_metrics()['circuit_state'], 'open')
+
+
+class RefreshTokenRegistryTests(DisableCouponSignalMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        from django.core.cache.backends.locmem import LocMemCache
+        cache_patcher = patch('accounts.tokens.cache', LocMemCache('refresh-registry-test', {}))
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+        self.user = User.objects.create_user(kakao_id=77101, password='pass')
+
+    def test_issue_skips_outstanding_table_and_blacklist_uses_registry(self):
+        from rest_framework_simplejwt.exceptions import TokenError
+        from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+        from accounts.jwt_utils import generate_tokens_for_user
+        from accounts.tokens import RegistryRefreshToken
+
+        tokens = generate_tokens_for_user(self.user)
+        self.assertEqual(OutstandingToken.objects.count(), 0)
+
+        # 폐기 목록에 없는 토큰은 DB 블랙리스트를 한 번 조회한다
+        with self.assertNumQueries(1):
+            refresh = RegistryRefreshToken(tokens['refresh'])
+        refresh.blacklist()
+        with self.assertNumQueries(0), self.assertRaises(TokenError):
+            RegistryRefreshToken(tokens['refresh'])
+
+    def test_revoked_token_stays_rejected_after_registry_loses_key(self):
+        from rest_framework_simplejwt.exceptions import TokenError
+        from accounts import tokens as token_module
+        from accounts.tokens import REVOKED_KEY_PREFIX, RegistryRefreshToken
+
+        refresh = RegistryRefreshToken.for_user(self.user)
+        jti = refresh['jti']
+        refresh.blacklist()
+        # eviction/flush/failover 로 폐기 키를 잃은 경우 (레지스트리 도입 전 블랙리스트도 같은 상태)
+        token_module.cache.clear()
+
+        with self.assertRaises(TokenError):
+            RegistryRefreshToken(str(refresh))
+        # DB 에서 찾은 폐기 기록은 Redis 에 다시 써 둔다
+        self.assertIsNotNone(token_module.cache.get(f'{REVOKED_KEY_PREFIX}{jti}'))
+
+    def test_prune_deletes_expired_rows_in_batches(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+        from accounts.tokens import prune_expired_outstanding_tokens
+
+        now = timezone.now()
+        for idx in range(5):
+            OutstandingToken.objects.create(
+                user=self.user, jti=f'old-{idx}', token='t', expires_at=now - timedelta(days=1)
+            )
+        alive = OutstandingToken.objects.create(
+            user=self.user, jti='alive', token='t', expires_at=now + timedelta(days=1)
+        )
+        BlacklistedToken.objects.create(token=OutstandingToken.objects.get(jti='old-0'))
+
+        result = prune_expired_outstanding_tokens(now=now, batch_size=2, sleep_s=0)
+
+        self.assertEqual((result['deleted'], result['batches'], result['finished']), (5, 3, True))
+        self.assertEqual(list(OutstandingToken.objects.values_list('id', flat=True)), [alive.id])
+        self.assertEqual(BlacklistedToken.objects.count(), 0)
+
+
+class RefreshCoalescerTests(APITestCase):
+    """같은 refresh token 동시 갱신은 한 번만 처리하고 결과를 공유."""
+
+    def setUp(self):
+        import threading
+        from django.core.cache.backends.locmem import LocMemCache
+
+        class FakeLockClient:
+            def __init__(self):
+                self.values = {}
+                self.lock = threading.Lock()
+
+            def set(self, key, value, nx=False, ex=None):
+                with self.lock:
+                    if nx and key in self.values:
+                        return False
+                    self.values[key] = value
+                    return True
+
+            def exists(self, key):
+                return int(key in self.values)
+
+            def eval(self, script, numkeys, key, token):
+                with self.lock:
+                    if self.values.get(key) == token:
+                        del self.values[key]
+
+        fake_cache = LocMemCache('refresh-coalescer-test', {})
+        fake_client = FakeLockClient()
+        fake_cache.client = SimpleNamespace(get_client=lambda write=True: fake_client)
+        cache_patcher = patch('accounts.services.refresh_coalescer.cache', fake_cache)
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+
+    def test_concurrent_refreshes_share_one_result(self):
+        import threading
+        import time
+        from accounts.services.refresh_coalescer import coalesce_refresh
+
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return {'access': f'new-{len(calls)}'}
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(coalesce_refresh('header.same-prefix.sig', compute)))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual({result[0]['access'] for result in results}, {'new-1'})
+        self.assertEqual(sum(1 for _, is_leader in results if is_leader), 1)
+
+        # 앞부분이 같은 다른 토큰은 결과를 공유하지 않는다
+        other, is_leader = coalesce_refresh('header.same-prefix.other', compute)
+        self.assertTrue(is_leader)
+        self.assertEqual(other['access'], 'new-2')
+
+
+class FavoritesSyncTests(DisableCouponSignalMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(kakao_id=88001, password='pass')
+        self.guests = [GuestUser.objects.create(linked_user=self.user) for _ in range(3)]
+        names_patcher = patch(
+            'accounts.services.favorites._restaurant_names',
+            side_effect=lambda ids: {rid: f'name-{rid}' for rid in ids},
+        )
+        names_patcher.start()
+        self.addCleanup(names_patcher.stop)
+
+    def _wishlist_ids(self):
+        from accounts.models import UserRestaurantWishlist
+
+        return set(
+            UserRestaurantWishlist.objects.filter(user=self.user).values_list('restaurant_id', flat=True)
+        )
+
+    def test_add_and_remove_update_guests_and_wishlist(self):
+        from accounts.services.favorites import add_favorite, remove_favorite
+
+        add_favorite(self.user, '10')
+        result = add_favorite(self.user, '20')
+        self.assertEqual(result.favorites, ['10', '20'])
+        self.assertEqual(self._wishlist_ids(), {10, 20})
+        for guest in GuestUser.objects.filter(linked_user=self.user):
+            self.assertEqual(guest.get_favorite_restaurants(), ['10', '20'])
+
+        again = add_favorite(self.user, '10')
+        self.assertFalse(again.changed)
+
+        result = remove_favorite(self.user, '10')
+        self.assertEqual(result.removed, ['10'])
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.favorite_restaurants, '["20"]')
+        self.assertEqual(self._wishlist_ids(), {20})
+
+    def test_set_favorites_applies_only_the_diff(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from accounts.services.favorites import add_favorite, set_favorites
+
+        add_favorite(self.user, '1')
+        add_favorite(self.user, '2')
+
+        with CaptureQueriesContext(connection) as ctx:
+            diff = set_favorites(self.user, ['2', '3', '4', 'legacy-name'])
+        self.assertEqual(diff.added, ['3', '4', 'legacy-name'])
+        self.assertEqual(diff.removed, ['1'])
+        self.assertEqual(self._wishlist_ids(), {2, 3, 4})
+        guest_updates = [q for q in ctx.captured_queries if q['sql'].startswith('UPDATE "guests_guestuser"')]
+        self.assertEqual(len(guest_updates), 1)
+        for guest in GuestUser.objects.filter(linked_user=self.user):
+            self.assertEqual(guest.get_favorite_restaurants(), ['2', '3', '4', 'legacy-name'])
+
+
+    def test_patch_rejects_non_scalar_items_and_replaces_legacy_entries(self):
+        from rest_framework.test import APIRequestFactory, force_authenticate
+        from accounts.views import UserMeView
+
+        def patch_me(favorites):
+            request = APIRequestFactory().patch(
+                '/api/users/me/', {'favorite_restaurants': favorites}, format='json'
+            )
+            force_authenticate(request, user=self.user)
+            return UserMeView.as_view()(request)
+
+        self.assertEqual(patch_me([{'id': 1}]).status_code, 400)
+        self.assertEqual(patch_me('not json').status_code, 400)
+
+        # 검증 전에 저장된 dict 항목이 있어도 목록 교체가 500 없이 동작한다
+        User.objects.filter(pk=self.user.pk).update(favorite_restaurants='[{"id": 1}, "5"]')
+        self.user.refresh_from_db()
+        response = patch_me(['5', '6', '6'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['favorite_restaurants'], ['5', '6'])
+        self.assertEqual(self._wishlist_ids(), {6})
+        for guest in GuestUser.objects.filter(linked_user=self.user):
+            self.assertEqual(guest.get_favorite_restaurants(), ['5', '6'])
+
+
+class NicknameKeyBloomTests(DisableCouponSignalMixin, APITestCase):
+    class FakeRedis:
+        def __init__(self):
+            self.values = {}
+
+        def get(self, key):
+            return self.values.get(key)
+
+        def set(self, key, value, nx=False, ex=None):
+            if nx and key in self.values:
+                return False
+            self.values[key] = value.encode() if isinstance(value, str) else value
+            return True
+
+        def expire(self, key, seconds):
+            return key in self.values
+
+        def delete(self, key):
+            self.values.pop(key, None)
+
+        def rename(self, src, dst):
+            self.values[dst] = self.values.pop(src)
+
+        def strlen(self, key):
+            return len(self.values.get(key, b''))
+
+        def setbit(self, key, offset, value):
+            bitmap = bytearray(self.values.get(key, b''))
+            if len(bitmap) <= offset >> 3:
+                bitmap.extend(b'\x00' * ((offset >> 3) + 1 - len(bitmap)))
+            bitmap[offset >> 3] |= 0x80 >> (offset & 7)
+            self.values[key] = bytes(bitmap)
+
+        def pipeline(self, transaction=True):
+            redis = self
+            calls = []
+
+            class Pipe:
+                def setbit(self, *args):
+                    calls.append(args)
+
+                def execute(self):
+                    for args in calls:
+                        redis.setbit(*args)
+
+            return Pipe()
+
+    def setUp(self):
+        super().setUp()
+        from accounts.services.nicknames import bloom_filter
+
+        self.redis = self.FakeRedis()
+        fake_cache = SimpleNamespace(client=SimpleNamespace(get_client=lambda write=True: self.redis))
+        cache_patcher = patch('accounts.services.nicknames.cache', fake_cache)
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+        bloom_filter.reset()
+        self.addCleanup(bloom_filter.reset)
+
+    def test_nickname_key_is_normalized_and_unique(self):
+        from django.db import IntegrityError, transaction
+
+        user = User.objects.create_user(kakao_id=91001, password='pass', nickname='Jaemin')
+        self.assertEqual(user.nickname_key, 'jaemin')
+        user.nickname = 'ＪＡＥＭＩＮ2'
+        user.save(update_fields=['nickname'])
+        user.refresh_from_db()
+        self.assertEqual(user.nickname_key, 'jaemin2')
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            User.objects.create_user(kakao_id=91002, password='pass', nickname='jaemin2')
+
+    def test_full_save_keeps_null_key_of_legacy_case_duplicate(self):
+        User.objects.create_user(kakao_id=91021, password='pass', nickname='Mina')
+        legacy = User.objects.create_user(kakao_id=91022, password='pass')
+        # migration 0010 이 대소문자만 다른 중복 닉네임에 키를 비워 둔 상태
+        User.objects.filter(pk=legacy.pk).update(nickname='MINA', nickname_key=None)
+
+        legacy = User.objects.get(pk=legacy.pk)
+        legacy.department = '컴퓨터학부'
+        legacy.save()  # admin 변경 폼처럼 update_fields 없이 전체 저장
+        legacy.refresh_from_db()
+        self.assertIsNone(legacy.nickname_key)
+
+        legacy.nickname = 'Mina2'
+        legacy.save()
+        legacy.refresh_from_db()
+        self.assertEqual(legacy.nickname_key, 'mina2')
+
+    def test_bloom_answers_available_without_db_and_reservation_blocks_others(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from accounts.services.nicknames import is_nickname_taken, rebuild_bloom, reserve_nickname
+
+        owner = User.objects.create_user(kakao_id=91011, password='pass', nickname='Taken')
+        other = User.objects.create_user(kakao_id=91012, password='pass')
+        self.assertEqual(rebuild_bloom(), 1)
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertFalse(is_nickname_taken('FreeName', exclude_user_id=other.id))
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+        self.assertTrue(is_nickname_taken('taken', exclude_user_id=other.id))
+        self.assertFalse(is_nickname_taken('taken', exclude_user_id=owner.id))
+
+        self.assertTrue(reserve_nickname('FreeName', other.id))
+        self.assertTrue(reserve_nickname('freename', other.id))
+        self.assertFalse(reserve_nickname('FREENAME', owner.id))
+        self.assertTrue(is_nickname_taken('freename', exclude_user_id=owner.id))
+        self.assertFalse(is_nickname_taken('freename', exclude_user_id=other.id))
+
+    def test_missing_or_partial_bitmap_falls_back_to_db(self):
+        from accounts.services.nicknames import (
+            BLOOM_KEY,
+            add_to_bloom,
+            bloom_filter,
+            bloom_positions,
+            is_nickname_taken,
+            rebuild_bloom,
+        )
+
+        User.objects.create_user(kakao_id=91031, password='pass', nickname='Existing')
+        # 비트맵이 없을 때(배포 직후, eviction) 저장된 닉네임은 비트를 만들지 않는다
+        add_to_bloom('newcomer')
+        self.assertNotIn(BLOOM_KEY, self.redis.values)
+        self.assertTrue(is_nickname_taken('existing'))
+
+        # SETBIT 이 빈 키에 만든 일부 비트맵도 믿지 않는다
+        for pos in bloom_positions('newcomer'):
+            self.redis.setbit(BLOOM_KEY, pos, 1)
+        bloom_filter.reset()
+        self.assertTrue(is_nickname_taken('existing'))
+
+        rebuild_bloom()
+        add_to_bloom('newcomer')
+        bloom_filter.reset()
+        self.assertTrue(bloom_filter.might_contain('newcomer'))
+        self.assertTrue(is_nickname_taken('existing'))
+        self.assertFalse(is_nickname_taken('freename'))
+
+
+class AccountDeletionJobTests(DisableCouponSignalMixin, APITestCase):
+    def _user_with_data(self, kakao_id, events=5):
+        from coupons.models import StampEvent, StampWallet
+
+        user = User.objects.create_user(kakao_id=kakao_id, password='pass', nickname=f'del{kakao_id}')
+        StampWallet.objects.create(user=user, restaurant_id=1, stamps=events)
+        StampEvent.objects.bulk_create([StampEvent(user=user, restaurant_id=1) for _ in range(events)])
+        GuestUser.objects.create(linked_user=user)
+        return user
+
+    def test_request_marks_user_deleting_and_worker_purges_in_resumable_batches(self):
+        from accounts.models import AccountDeletionJob
+        from accounts.services.account_deletion import request_account_deletion, run_deletion_jobs
+        from coupons.models import StampEvent
+
+        user = self._user_with_data(94001)
+        job = request_account_deletion(user)
+
+        user.refresh_from_db()
+        self.assertFalse(user.is_active)
+        self.assertIsNone(user.kakao_id)
+        self.assertIsNone(user.nickname_key)
+        self.assertEqual(job.status, AccountDeletionJob.STATUS_PENDING)
+        self.assertEqual(job.deleted_counts['guest_unlinked'], 1)
+        # 삭제 작업이 끝나기 전에도 같은 카카오 계정으로 새로 가입할 수 있다
+        fresh = User.objects.create_user(kakao_id=94001, password='pass', nickname='del94001')
+        self.assertNotEqual(fresh.id, user.id)
+
+        # 시간 예산이 0 이면 아무것도 지우지 않고 작업을 대기 상태로 돌려 둔다
+        first = run_deletion_jobs(batch_size=2, sleep_s=0, time_budget_s=0)
+        self.assertFalse(first['finished'])
+        self.assertEqual(StampEvent.objects.filter(user_id=user.id).count(), 5)
+
+        result = run_deletion_jobs(batch_size=2, sleep_s=0)
+        self.assertTrue(result['finished'])
+        self.assertEqual(result['done'], 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, AccountDeletionJob.STATUS_DONE)
+        self.assertEqual(job.deleted_counts['stamp_events'], 5)
+        self.assertEqual(job.deleted_counts['users'], 1)
+        self.assertFalse(User.objects.filter(id=user.id).exists())
+        self.assertFalse(StampEvent.objects.filter(user_id=user.id).exists())
+        self.assertTrue(User.objects.filter(id=fresh.id).exists())
+
+    def test_failed_step_resumes_from_saved_step(self):
+        from accounts.models import AccountDeletionJob
+        from accounts.services import account_deletion
+        from coupons.models import StampEvent, StampWallet
+
+        user = self._user_with_data(94011)
+        job = account_deletion.request_account_deletion(user)
+
+        original = account_deletion._purge_batch
+
+        def fail_on_events(step, user_ids, batch_size):
+            if step.name == 'stamp_events':
+                raise RuntimeError('cloudsql unavailable')
+            return original(step, user_ids, batch_size)
+
+        with patch('accounts.services.account_deletion._purge_batch', side_effect=fail_on_events):
+            result = account_deletion.run_deletion_jobs(sleep_s=0)
+        job.refresh_from_db()
+        self.assertEqual(job.status, AccountDeletionJob.STATUS_PENDING)
+        self.assertEqual(job.step, 'stamp_events')
+        self.assertIn('cloudsql unavailable', job.last_error)
+        self.assertFalse(StampWallet.objects.filter(user_id=user.id).exists())
+        self.assertEqual(StampEvent.objects.filter(user_id=user.id).count(), 5)
+        self.assertTrue(result['finished'])
+
+        calls = []
+
+        def record(step, user_ids, batch_size):
+            calls.append(step.name)
+            return original(step, user_ids, batch_size)
+
+        with patch('accounts.services.account_deletion._purge_batch', side_effect=record):
+            account_deletion.run_deletion_jobs(sleep_s=0)
+        self.assertEqual(calls[0], 'stamp_events')
+        self.assertNotIn('coupons', calls)
+        self.assertFalse(User.objects.filter(id=user.id).exists())
+
+    def test_bulk_mode_deletes_many_users_together(self):
+        from accounts.models import AccountDeletionJob
+        from accounts.services.account_deletion import enqueue_account_deletions, run_deletion_jobs
+        from coupons.models import StampEvent
+
+        users = [self._user_with_data(94100 + i, events=3) for i in range(4)]
+        self.assertEqual(enqueue_account_deletions([u.id for u in users]), 4)
+        self.assertEqual(
+            set(User.objects.filter(id__in=[u.id for u in users]).values_list('username', flat=True)),
+            {f'deleting:{u.id}' for u in users},
+        )
+
+        result = run_deletion_jobs(users_per_group=4, batch_size=5, sleep_s=0)
+        self.assertEqual(result['groups'], 1)
+        self.assertEqual(result['done'], 4)
+        self.assertEqual(result['deleted']['stamp_events'], 12)
+        self.assertEqual(result['deleted']['users'], 4)
+        self.assertFalse(StampEvent.objects.filter(user_id__in=[u.id for u in users]).exists())
+        self.assertEqual(AccountDeletionJob.objects.filter(status=AccountDeletionJob.STATUS_DONE).count(), 4)
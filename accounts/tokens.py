@@ -0,0 +1,210 @@
+"""
+Refresh token 레지스트리 (Redis).
+
+simplejwt token_blacklist 앱의 RefreshToken.for_user() 는 발급할 때마다 OutstandingToken 행을
+default DB 에 쓰고, 180일짜리 토큰이라 테이블이 계속 커진다. 여기서는
+- 발급: 아무것도 쓰지 않는다 (DB, Redis 모두). 서명과 만료만으로 검증하고 폐기된 jti 만 기록한다
+- 폐기(로그아웃 등): jti 를 Redis 폐기 목록에 만료 시각까지 저장 + 기존처럼 DB 블랙리스트에도 기록
+- 검증: Redis 폐기 목록에 있으면 바로 거부하고, 없거나 Redis 장애면 DB BlacklistedToken 을 조회한다.
+  eviction/flush/failover 로 폐기 키를 잃어도 로그아웃한 토큰이 되살아나지 않고, 레지스트리 도입 전에
+  블랙리스트에 오른 토큰도 따로 옮기지 않아도 거부된다 (DB 에서 찾으면 Redis 에 다시 써 둔다)
+- 감사 기록이 필요하면 REFRESH_TOKEN_AUDIT_DB=1 로 발급 내역을 Redis 큐에 쌓고
+  prune_refresh_tokens 명령어가 OutstandingToken 에 모아서 넣는다 (write-behind)
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.core.cache import cache
+from django.db import router, transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import BlacklistMixin, RefreshToken
+
+from .models import User
+
+logger = logging.getLogger(__name__)
+
+REFRESH_TOKEN_AUDIT_DB = os.getenv("REFRESH_TOKEN_AUDIT_DB", "0") in ("1", "true", "True")
+
+REVOKED_KEY_PREFIX = "jwt:revoked:"
+AUDIT_QUEUE_KEY = "jwt:refresh:audit"
+
+DEFAULT_PRUNE_BATCH_SIZE = 2000
+
+
+def _remaining_seconds(exp: int) -> int:
+    return max(int(exp - timezone.now().timestamp()), 1)
+
+
+def _raw_client():
+    return cache.client.get_client(True)  # type: ignore[attr-defined]
+
+
+def register_refresh_token(token: RefreshToken, user_id) -> None:
+    """REFRESH_TOKEN_AUDIT_DB=1 일 때만 발급 내역을 감사 큐에 쌓는다."""
+    if not REFRESH_TOKEN_AUDIT_DB:
+        return
+    jti = token[api_settings.JTI_CLAIM]
+    entry = {
+        "jti": jti,
+        "user_id": user_id,
+        "token": str(token),
+        "created_at": int(token.current_time.replace(tzinfo=dt_timezone.utc).timestamp()),
+        "exp": token["exp"],
+    }
+    try:
+        _raw_client().rpush(AUDIT_QUEUE_KEY, json.dumps(entry))
+    except Exception as exc:
+        # 감사 기록은 보조 정보라 발급 자체는 막지 않는다
+        logger.warning("refresh token audit enqueue failed jti=%s: %s", jti, exc)
+
+
+def is_revoked(jti: str, exp: int | None = None) -> bool:
+    """Redis 폐기 목록에 없으면 DB 블랙리스트로 확인한다 (토큰 갱신/로그아웃 때만 불리므로 조회 한 번은 싸다)."""
+    registry_ok = True
+    try:
+        if cache.get(f"{REVOKED_KEY_PREFIX}{jti}") is not None:
+            return True
+    except Exception as exc:
+        registry_ok = False
+        logger.warning("refresh token registry unavailable, falling back to DB blacklist: %s", exc)
+    alias = router.db_for_read(BlacklistedToken)
+    revoked = BlacklistedToken.objects.using(alias).filter(token__jti=jti).exists()
+    if revoked and registry_ok and exp is not None:
+        try:
+            mark_revoked(jti, exp)
+        except Exception as exc:
+            logger.warning("refresh token revoke (redis) failed jti=%s: %s", jti, exc)
+    return revoked
+
+
+def mark_revoked(jti: str, exp: int) -> None:
+    cache.set(f"{REVOKED_KEY_PREFIX}{jti}", 1, timeout=_remaining_seconds(exp))
+
+
+class RegistryRefreshToken(RefreshToken):
+    """OutstandingToken 대신 Redis 레지스트리를 쓰는 RefreshToken."""
+
+    @classmethod
+    def for_user(cls, user):
+        # BlacklistMixin.for_user(OutstandingToken 쓰기)를 건너뛴다
+        token = super(BlacklistMixin, cls).for_user(user)
+        register_refresh_token(token, getattr(user, api_settings.USER_ID_FIELD))
+        return token
+
+    def check_blacklist(self) -> None:
+        if is_revoked(self.payload[api_settings.JTI_CLAIM], self.payload.get("exp")):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        jti = self.payload[api_settings.JTI_CLAIM]
+        exp = self.payload["exp"]
+        try:
+            mark_revoked(jti, exp)
+        except Exception as exc:
+            logger.warning("refresh token revoke (redis) failed jti=%s: %s", jti, exc)
+        # Redis 유실에 대비해 DB 블랙리스트에도 남긴다 (로그아웃은 드물다)
+        outstanding, _ = OutstandingToken.objects.get_or_create(
+            jti=jti,
+            defaults={
+                "user_id": self.payload.get(api_settings.USER_ID_CLAIM),
+                "token": str(self),
+                "expires_at": datetime.fromtimestamp(exp, tz=dt_timezone.utc),
+            },
+        )
+        return BlacklistedToken.objects.get_or_create(token=outstanding)
+
+
+def flush_audit_queue(*, batch_size: int = DEFAULT_PRUNE_BATCH_SIZE, max_batches: int | None = None) -> int:
+    """Redis 감사 큐에 쌓인 발급 내역을 OutstandingToken 에 bulk_create (write-behind)."""
+    client = _raw_client()
+    alias = router.db_for_write(OutstandingToken)
+    written = batches = 0
+    while max_batches is None or batches < max_batches:
+        pipe = client.pipeline()
+        pipe.lrange(AUDIT_QUEUE_KEY, 0, batch_size - 1)
+        pipe.ltrim(AUDIT_QUEUE_KEY, batch_size, -1)
+        raw_entries, _ = pipe.execute()
+        if not raw_entries:
+            break
+        entries = [json.loads(raw) for raw in raw_entries]
+        # 큐에 있는 동안 탈퇴한 사용자는 FK 오류가 나므로 제외
+        live_user_ids = set(
+            User.objects.using(alias)
+            .filter(id__in={entry["user_id"] for entry in entries})
+            .values_list("id", flat=True)
+        )
+        rows = []
+        for entry in entries:
+            if entry["user_id"] not in live_user_ids:
+                continue
+            rows.append(
+                OutstandingToken(
+                    jti=entry["jti"],
+                    user_id=entry["user_id"],
+                    token=entry["token"],
+                    created_at=datetime.fromtimestamp(entry["created_at"], tz=dt_timezone.utc),
+                    expires_at=datetime.fromtimestamp(entry["exp"], tz=dt_timezone.utc),
+                )
+            )
+        OutstandingToken.objects.using(alias).bulk_create(rows, ignore_conflicts=True)
+        written += len(rows)
+        batches += 1
+    return written
+
+
+def prune_expired_outstanding_tokens(
+    *,
+    now: datetime | None = None,
+    batch_size: int = DEFAULT_PRUNE_BATCH_SIZE,
+    max_batches: int | None = None,
+    sleep_s: float = 0.1,
+    time_budget_s: float | None = None,
+) -> dict:
+    """
+    만료된 OutstandingToken(+ 연결된 BlacklistedToken)을 id 순서로 batch_size 개씩 지운다.
+    simplejwt 의 flushexpiredtokens 는 한 번의 DELETE 로 지워 큰 테이블에서 락이 길어진다.
+    """
+    alias = router.db_for_write(OutstandingToken)
+    now = now or timezone.now()
+    started = time.monotonic()
+    after_id = 0
+    deleted = batches = 0
+    finished = False
+    while max_batches is None or batches < max_batches:
+        if time_budget_s is not None and time.monotonic() - started >= time_budget_s:
+            break
+        ids = list(
+            OutstandingToken.objects.using(alias)
+            .filter(expires_at__lt=now, id__gt=after_id)
+            .order_by("id")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not ids:
+            finished = True
+            break
+        with transaction.atomic(using=alias):
+            BlacklistedToken.objects.using(alias).filter(token_id__in=ids).delete()
+            deleted += OutstandingToken.objects.using(alias).filter(id__in=ids).delete()[0]
+        batches += 1
+        after_id = ids[-1]
+        if len(ids) < batch_size:
+            finished = True
+            break
+        if sleep_s > 0:
+            time.sleep(sleep_s)
+    return {
+        "deleted": deleted,
+        "batches": batches,
+        "finished": finished,
+        "elapsed_s": round(time.monotonic() - started, 3),
+    }
+
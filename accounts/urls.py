@@ -1,8 +1,11 @@
 from django.urls import path
 from rest_framework_simplejwt.views import TokenRefreshView
+from wouldulike_backend.async_support import maybe_async
 from .views import (
     KakaoLoginView,
     AppleLoginView,
+    prefetch_apple_jwks,
+    prefetch_kakao_profile,
     LogoutView,
     UnlinkView,
     DevLoginView,
@@ -11,8 +14,9 @@ from .views import (
 )
 
 urlpatterns = [
-    path('kakao', KakaoLoginView.as_view(), name='kakao-login'),
-    path('apple/login/', AppleLoginView.as_view(), name='apple-login'),
+    # ASGI 모드에서는 Kakao/Apple 호출을 I/O 풀에서 먼저 끝내고 DB 작업만 ORM 풀에서 한다
+    path('kakao', maybe_async(KakaoLoginView.as_view(), prefetch=prefetch_kakao_profile), name='kakao-login'),
+    path('apple/login/', maybe_async(AppleLoginView.as_view(), prefetch=prefetch_apple_jwks), name='apple-login'),
     path('refresh', CustomTokenRefreshView.as_view(), name='token-refresh'),
     path('token/refresh/', CustomTokenRefreshView.as_view(), name='token-refresh-alt'),  # 프론트엔드 요구사항
     path('verify', TokenVerifyView.as_view(), name='token-verify'),  # 토큰 검증 API
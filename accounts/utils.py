@@ -1,3 +1,5 @@
+from django.utils import timezone
+
 from guests.models import GuestUser
 
 
@@ -49,6 +51,10 @@ def merge_guest_data(guest_uuid, user):
         guest.linked_user = user
         guest_update_fields.add("linked_user")
 
+    # 연결 직후의 게스트는 앱이 아직 uuid 를 쓸 수 있어 compact_guest_users 가 바로 지우지 않도록 한다
+    guest.last_seen_at = timezone.now()
+    guest_update_fields.add("last_seen_at")
+
     if guest_update_fields:
         guest_update_fields.add("updated_at")
         guest.save(update_fields=list(guest_update_fields))
@@ -1,17 +1,18 @@
 import json
 import re
-import requests
 import jwt
 from django.conf import settings
 from django.db import router
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework_simplejwt.tokens import RefreshToken, AccessToken
+from rest_framework_simplejwt.tokens import AccessToken
 from rest_framework_simplejwt.authentication import JWTAuthentication
-from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.exceptions import TokenBackendError, TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_api_settings
+from rest_framework_simplejwt.state import token_backend
 from rest_framework_simplejwt.views import TokenRefreshView as BaseTokenRefreshView
 from django.utils import timezone
 from django.utils.decorators import method_decorator
@@ -20,18 +21,31 @@ from django.core.cache import cache
 import os
 import logging
 
+from .authentication import get_cached_user
 from .models import User, SocialAccount
-from guests.models import GuestUser
 from .jwt_utils import generate_tokens_for_user
+from .tokens import RegistryRefreshToken
 from .serializers import AppleLoginSerializer
-from .services.apple_auth import verify_identity_token
-from .services.account_deletion import delete_user_account
+from .services.apple_auth import verify_identity_token, warm_jwks_cache
+from .services.account_deletion import request_account_deletion
+from .services.kakao import KakaoRejected, KakaoUnavailable, get_kakao_client
+from .services.refresh_coalescer import coalesce_refresh
+from .services.favorites import (
+    add_favorite,
+    clean_favorites,
+    parse_favorites,
+    remove_favorite,
+    set_favorites,
+    sync_linked_guests,
+)
+from .services.nicknames import is_nickname_taken, normalize_nickname, release_nickname, reserve_nickname
 from coupons.service import issue_signup_coupon, issue_app_open_coupon
+from wouldulike_backend.resilience import query_budget
+from wouldulike_backend.throttling import RateLimitedMixin
 from .utils import merge_guest_data
 
 logger = logging.getLogger(__name__)
 
-KAKAO_USERINFO_TIMEOUT_SECONDS = float(os.getenv("KAKAO_USERINFO_TIMEOUT_SECONDS", "10"))
 AUTH_ISSUE_SIGNUP_COUPON_ON_LOGIN = os.getenv("AUTH_ISSUE_SIGNUP_COUPON_ON_LOGIN", "1") in ("1", "true", "True")
 AUTH_ISSUE_APP_OPEN_COUPON_ON_LOGIN = os.getenv("AUTH_ISSUE_APP_OPEN_COUPON_ON_LOGIN", "1") in ("1", "true", "True")
 AUTH_ISSUE_APP_OPEN_COUPON_ON_REFRESH = os.getenv("AUTH_ISSUE_APP_OPEN_COUPON_ON_REFRESH", "1") in ("1", "true", "True")
@@ -89,9 +103,50 @@ def _log_kakao_non_200(user_agent, client_ip, response, is_token_expired):
         logger.warning(log_msg)
 
 
+def prefetch_kakao_profile(request):
+    """
+    ASGI 모드에서 KakaoLoginView 보다 먼저 I/O 풀에서 실행된다 (accounts/urls.py).
+    JSON body 에 access_token 만 있는 일반 로그인이면 Kakao 프로필을 미리 받아 request 에 붙여 둔다.
+    실패도 예외 그대로 붙여 두어 뷰가 같은 응답을 만들게 한다.
+    """
+    try:
+        data = json.loads(request.body or b"{}")
+    except ValueError:
+        return
+    if not isinstance(data, dict):
+        return
+    # refresh 우선 로그인 / 인가 코드 교환은 Kakao 조회가 필요 없거나 순서가 달라 뷰에 맡긴다
+    if data.get('refresh') or data.get('refresh_token') or data.get('code'):
+        return
+    access_token = data.get('access_token') or data.get('accessToken')
+    if not access_token or not isinstance(access_token, str):
+        return
+    try:
+        result = get_kakao_client().get_profile(access_token)
+    except Exception as exc:
+        result = exc
+    request.prefetched_kakao_profile = (access_token, result)
+
+
+def _get_kakao_profile(request, access_token):
+    prefetched = getattr(request, 'prefetched_kakao_profile', None)
+    if prefetched is None or prefetched[0] != access_token:
+        return get_kakao_client().get_profile(access_token)
+    result = prefetched[1]
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+
+def prefetch_apple_jwks(request):
+    """ASGI 모드에서 AppleLoginView 보다 먼저 I/O 풀에서 Apple 공개키(JWKS) 캐시를 채운다."""
+    warm_jwks_cache()
+
+
 def _mint_tokens_with_expiry(user):
     tokens = generate_tokens_for_user(user)
-    refresh = RefreshToken(tokens["refresh"])
+    # 방금 발급한 토큰이라 폐기 확인(DB 조회)은 건너뛴다
+    refresh = RegistryRefreshToken(tokens["refresh"], verify=False)
     access_token_obj = refresh.access_token
     tokens["access_expires_at"] = access_token_obj["exp"]
     tokens["refresh_expires_at"] = refresh["exp"]
@@ -99,31 +154,22 @@ def _mint_tokens_with_expiry(user):
 
 
 def _resolve_user_from_refresh_token(refresh_token: str):
-    refresh_obj = RefreshToken(refresh_token)
+    refresh_obj = RegistryRefreshToken(refresh_token)
     user_id = refresh_obj.get("user_id")
     if not user_id:
         raise TokenError("token_missing_user_id")
 
     user_db_alias = router.db_for_read(User)
-    user = User.objects.using(user_db_alias).filter(id=user_id).first()
-    if user is None:
+    user = get_cached_user(user_id, db_alias=user_db_alias)
+    if user is None or not user.is_active:
+        # 탈퇴 요청 후 삭제 작업이 끝나기 전까지는 비활성 계정으로 남아 있다
         raise TokenError("token_user_not_found")
 
     return refresh_obj, user, user_id, user_db_alias
 
 
 def _parse_favorite_restaurants(value):
-    if value in (None, ""):
-        return []
-    if isinstance(value, list):
-        return value
-    if isinstance(value, str):
-        try:
-            parsed = json.loads(value)
-            return parsed if isinstance(parsed, list) else []
-        except (TypeError, json.JSONDecodeError):
-            return []
-    return []
+    return parse_favorites(value)
 
 
 def _serialize_user(user: User):
@@ -151,19 +197,6 @@ def _serialize_user(user: User):
     }
 
 
-def _save_user_favorites(user: User, favorites):
-    serialized = json.dumps(favorites)
-    if serialized == user.favorite_restaurants:
-        return
-
-    user.favorite_restaurants = serialized
-    user.save(update_fields=["favorite_restaurants", "updated_at"])
-
-    for guest in GuestUser.objects.filter(linked_user=user):
-        guest.favorite_restaurants = serialized
-        guest.save(update_fields=["favorite_restaurants", "updated_at"])
-
-
 class UserFavoritesView(APIView):
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
@@ -181,31 +214,9 @@ class UserFavoritesView(APIView):
         if not restaurant_id:
             return Response({"detail": "restaurantId is required"}, status=status.HTTP_400_BAD_REQUEST)
 
-        user = request.user
-        favorites = _parse_favorite_restaurants(user.favorite_restaurants)
-        if restaurant_id not in favorites:
-            favorites.append(restaurant_id)
-            _save_user_favorites(user, favorites)
-
-        # UserRestaurantWishlist 동기화
-        try:
-            from accounts.models import UserRestaurantWishlist
-            from restaurants.models import AffiliateRestaurant
-            rid_int = int(restaurant_id)
-            try:
-                r_name = AffiliateRestaurant.objects.get(restaurant_id=rid_int).name
-            except AffiliateRestaurant.DoesNotExist:
-                r_name = f"식당#{rid_int}"
-            UserRestaurantWishlist.objects.get_or_create(
-                user=user,
-                restaurant_id=rid_int,
-                defaults={"restaurant_name": r_name},
-            )
-        except Exception:
-            logger.exception("UserRestaurantWishlist sync failed on add (restaurant_id=%s)", restaurant_id)
-
+        result = add_favorite(request.user, restaurant_id)
         return Response(
-            {"ok": True, "added": restaurant_id, "favorites": favorites},
+            {"ok": True, "added": restaurant_id, "favorites": result.favorites},
             status=status.HTTP_200_OK,
         )
 
@@ -219,32 +230,41 @@ class UserFavoriteDeleteView(APIView):
         if not restaurant_id:
             return Response({"detail": "restaurantId is required"}, status=status.HTTP_400_BAD_REQUEST)
 
-        user = request.user
-        favorites = _parse_favorite_restaurants(user.favorite_restaurants)
-        if restaurant_id in favorites:
-            favorites = [fav for fav in favorites if fav != restaurant_id]
-            _save_user_favorites(user, favorites)
-
-        # UserRestaurantWishlist 동기화
-        try:
-            from accounts.models import UserRestaurantWishlist
-            UserRestaurantWishlist.objects.filter(
-                user=user, restaurant_id=int(restaurant_id)
-            ).delete()
-        except Exception:
-            logger.exception("UserRestaurantWishlist sync failed on remove (restaurant_id=%s)", restaurant_id)
-
+        result = remove_favorite(request.user, restaurant_id)
         return Response(
-            {"ok": True, "removed": restaurant_id, "favorites": favorites},
+            {"ok": True, "removed": restaurant_id, "favorites": result.favorites},
             status=status.HTTP_200_OK,
         )
 
 
-class KakaoLoginView(APIView):
+class KakaoLoginView(RateLimitedMixin, APIView):
     # Kakao 로그인은 로그인 전 엔드포인트이므로 JWT 인증 비적용
     permission_classes = [AllowAny]
     authentication_classes = []
+    throttle_scope = "login"
+
+    # refresh token 으로 들어오는 앱 접속은 토큰의 사용자 기준으로, 카카오 토큰/코드 검증은 IP 기준으로 센다.
+    # 서명이 맞는 refresh token 만 사용자로 구분하고, 아니면 카카오 검증 경로로 떨어지므로 IP 한도를 쓴다.
+    def get_throttle_scope(self, request):
+        return "token_refresh" if self._refresh_token_user_id(request) else "login"
+
+    def get_throttle_user_id(self, request):
+        return self._refresh_token_user_id(request)
 
+    def _refresh_token_user_id(self, request):
+        if not hasattr(request, "_refresh_token_user_id"):
+            refresh_token = request.data.get('refresh') or request.data.get('refresh_token')
+            user_id = None
+            if isinstance(refresh_token, str) and refresh_token:
+                try:
+                    user_id = token_backend.decode(refresh_token, verify=True).get(jwt_api_settings.USER_ID_CLAIM)
+                except TokenBackendError:
+                    user_id = None
+            request._refresh_token_user_id = user_id
+        return request._refresh_token_user_id
+
+    # 3초가 지나도록 끝나지 않은 로그인은 앱 접속 쿠폰 발급을 건너뛰고, 25초를 넘기면 추가 쿼리 없이 끝낸다
+    @method_decorator(query_budget("kakao_login", max_ms=25000, degrade_after_ms=3000))
     def post(self, request):
         # 요청 스펙: JSON body로 refresh(선택), access_token(선택), guest_uuid(선택)
         user_agent = request.META.get('HTTP_USER_AGENT', 'Unknown')
@@ -261,15 +281,10 @@ class KakaoLoginView(APIView):
                 kakao_redirect_uri = os.getenv('KAKAO_REDIRECT_URI', '')
                 kakao_rest_api_key = os.getenv('KAKAO_REST_API_KEY', '')
                 try:
-                    token_res = requests.post(
-                        'https://kauth.kakao.com/oauth/token',
-                        data={
-                            'grant_type': 'authorization_code',
-                            'client_id': kakao_rest_api_key,
-                            'redirect_uri': kakao_redirect_uri,
-                            'code': kakao_code,
-                        },
-                        timeout=10,
+                    token_res = get_kakao_client().exchange_code(
+                        kakao_code,
+                        client_id=kakao_rest_api_key,
+                        redirect_uri=kakao_redirect_uri,
                     )
                     if not token_res.ok:
                         logger.warning(
@@ -352,24 +367,11 @@ class KakaoLoginView(APIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            # 1) Kakao 프로필 조회
+            # 1) Kakao 프로필 조회 (같은 토큰의 연속 요청은 캐시 적중)
             try:
-                kakao_response = requests.get(
-                    'https://kapi.kakao.com/v2/user/me',
-                    headers={'Authorization': f'Bearer {access_token}'},
-                    timeout=KAKAO_USERINFO_TIMEOUT_SECONDS,
-                )
-            except requests.exceptions.Timeout:
-                logger.error(f'Kakao API timeout - User-Agent: {user_agent}, IP: {client_ip}')
-                return Response({'detail': 'kakao_api_error', 'code': 'timeout'}, status=status.HTTP_502_BAD_GATEWAY)
-            except requests.exceptions.ConnectionError as e:
-                logger.error(f'Kakao API connection error - User-Agent: {user_agent}, IP: {client_ip}, Error: {str(e)}')
-                return Response({'detail': 'kakao_api_error', 'code': 'connection_error'}, status=status.HTTP_502_BAD_GATEWAY)
-            except Exception as e:
-                logger.error(f'Kakao API unexpected error - User-Agent: {user_agent}, IP: {client_ip}, Error: {str(e)}', exc_info=True)
-                return Response({'detail': 'kakao_api_error', 'code': 'unknown'}, status=status.HTTP_502_BAD_GATEWAY)
-
-            if kakao_response.status_code != 200:
+                profile = _get_kakao_profile(request, access_token)
+            except KakaoRejected as exc:
+                kakao_response = exc.response
                 is_token_expired = _is_kakao_token_expired_response(kakao_response)
                 _log_kakao_non_200(
                     user_agent=user_agent,
@@ -385,55 +387,21 @@ class KakaoLoginView(APIView):
                     },
                     status=status.HTTP_401_UNAUTHORIZED,
                 )
+            except KakaoUnavailable as exc:
+                logger.error(
+                    f'Kakao API error ({exc.code}) - User-Agent: {user_agent}, IP: {client_ip}, Error: {str(exc)}'
+                )
+                return Response({'detail': 'kakao_api_error', 'code': exc.code}, status=status.HTTP_502_BAD_GATEWAY)
+            except Exception as e:
+                logger.error(f'Kakao API unexpected error - User-Agent: {user_agent}, IP: {client_ip}, Error: {str(e)}', exc_info=True)
+                return Response({'detail': 'kakao_api_error', 'code': 'unknown'}, status=status.HTTP_502_BAD_GATEWAY)
 
-            # JSON 파싱 처리 (UTF-8 BOM 및 잘못된 MIME 타입 대비)
-            try:
-                data = kakao_response.json()
-            except ValueError:
-                raw_text = kakao_response.text
-                data = None
-                # Kakao가 간헐적으로 UTF-8 BOM이 포함된 텍스트나 JSON MIME이 아닌 응답을
-                # 반환하는 경우를 대비해 content를 우선 활용한 수동 파싱을 시도한다.
-                fallback_sources = [
-                    kakao_response.content,
-                    raw_text,
-                ]
-                for payload in fallback_sources:
-                    if not payload:
-                        continue
-                    try:
-                        cleaned_text = (
-                            payload.decode('utf-8-sig') if isinstance(payload, (bytes, bytearray)) 
-                            else str(payload).lstrip('\ufeff')
-                        )
-                        data = json.loads(cleaned_text)
-                        logger.info(f'Successfully parsed Kakao response using fallback method - User-Agent: {user_agent}')
-                        break
-                    except (UnicodeDecodeError, ValueError, json.JSONDecodeError):
-                        continue
-                
-                if data is None:
-                    logger.error(
-                        'Failed to parse Kakao profile response',
-                        extra={
-                            'status_code': kakao_response.status_code,
-                            'content_type': kakao_response.headers.get('Content-Type'),
-                            'content_length': len(kakao_response.content or b''),
-                            'text': raw_text[:500] if raw_text else None,
-                            'user_agent': user_agent,
-                            'client_ip': client_ip,
-                        },
-                    )
-                    return Response({'detail': 'kakao_api_error', 'code': 'invalid_response'}, status=status.HTTP_502_BAD_GATEWAY)
-            
-            kakao_id = data.get('id')
-            kakao_account = data.get('kakao_account') or {}
-            profile = kakao_account.get('profile') or {}
-            nickname = profile.get('nickname') or ''
-            profile_image_url = profile.get('profile_image_url') or ''
+            kakao_id = profile.kakao_id
+            nickname = profile.nickname
+            profile_image_url = profile.profile_image_url
 
             if not kakao_id:
-                logger.warning(f'Kakao profile invalid (no kakao_id) - User-Agent: {user_agent}, Data: {str(data)[:200]}')
+                logger.warning(f'Kakao profile invalid (no kakao_id) - User-Agent: {user_agent}, Data: {str(profile.raw)[:200]}')
                 return Response({'detail': 'kakao_profile_invalid'}, status=status.HTTP_400_BAD_REQUEST)
 
             # 2) 사용자 매핑/생성: kakao_id 기준
@@ -514,14 +482,16 @@ class KakaoLoginView(APIView):
             return Response({'detail': 'internal_error', 'code': 'unexpected_error'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class AppleLoginView(APIView):
+class AppleLoginView(RateLimitedMixin, APIView):
     """
     Sign in with Apple 로그인 엔드포인트.
     Flutter 클라이언트가 identity_token(JWT)을 전달하면 검증 후 유저 생성/로그인 처리.
     """
     permission_classes = [AllowAny]
     authentication_classes = []
+    throttle_scope = "login"
 
+    @method_decorator(query_budget("apple_login", max_ms=25000, degrade_after_ms=3000))
     def post(self, request):
         user_agent = request.META.get('HTTP_USER_AGENT', 'Unknown')
         client_ip = request.META.get('REMOTE_ADDR', 'Unknown')
@@ -614,9 +584,15 @@ class AppleLoginView(APIView):
                     if email:
                         user.email = email
                         user.save(update_fields=['email', 'updated_at'])
-                    if full_name and not user.nickname:
+                    if full_name and not user.nickname and not is_nickname_taken(full_name[:50]):
                         user.nickname = full_name[:50]
-                        user.save(update_fields=['nickname', 'updated_at'])
+                        try:
+                            with transaction.atomic(using=router.db_for_write(User)):
+                                user.save(update_fields=['nickname', 'updated_at'])
+                        except IntegrityError:
+                            # 동시에 같은 이름이 저장된 경우 닉네임 없이 진행
+                            user.nickname = None
+                            user.nickname_key = None
         except IntegrityError as e:
             logger.error(
                 'Apple user creation error - User-Agent: %s, IP: %s, sub: %s, Error: %s',
@@ -704,10 +680,11 @@ class CustomTokenRefreshView(BaseTokenRefreshView):
     - 프론트엔드 요구사항에 맞는 응답 형식 제공
     - 에러 처리 개선
     - 로깅 추가
-    - 동시성 처리 (같은 refresh token으로 동시 요청 시 동일한 새 토큰 반환)
+    - 동시성 처리 (같은 refresh token으로 동시 요청 시 한 요청만 갱신하고 동일한 새 토큰 반환)
     """
     permission_classes = [AllowAny]
 
+    @method_decorator(query_budget("token_refresh", max_ms=15000, degrade_after_ms=2000))
     def post(self, request, *args, **kwargs):
         refresh_token = request.data.get('refresh')
         
@@ -721,43 +698,47 @@ class CustomTokenRefreshView(BaseTokenRefreshView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # 동시성 처리: 같은 refresh token으로 짧은 시간 내 요청이 오면 캐시된 새 토큰 반환
-        cache_key = f'token_refresh:{refresh_token[:20]}'
-        cached_response = cache.get(cache_key)
-        if cached_response:
-            logger.info('Returning cached token refresh response')
-            return Response(cached_response, status=status.HTTP_200_OK)
+        resolved = {}
 
-        try:
+        def _refresh():
             # 기존 refresh token 검증
             refresh, user, user_id, user_db_alias = _resolve_user_from_refresh_token(refresh_token)
-            
+            resolved.update(user=user, user_id=user_id, user_db_alias=user_db_alias)
+
             # ROTATE_REFRESH_TOKENS가 True일 때, 새로운 refresh token 생성
             # BaseTokenRefreshView의 로직을 따름
             if settings.SIMPLE_JWT.get('ROTATE_REFRESH_TOKENS', False):
                 # 기존 refresh token을 blacklist에 추가
                 refresh.blacklist()
                 # 새로운 refresh token 생성
-                new_refresh = RefreshToken.for_user(user)
+                new_refresh = RegistryRefreshToken.for_user(user)
                 new_access = new_refresh.access_token
-                
-                response_data = {
+
+                return {
                     'access': str(new_access),
                     'refresh': str(new_refresh),
                     'access_expires_at': new_access['exp'],  # Unix timestamp
                     'refresh_expires_at': new_refresh['exp'],  # Unix timestamp
                 }
-            else:
-                # ROTATE_REFRESH_TOKENS가 False인 경우 기존 refresh token 재사용
-                new_access = refresh.access_token
-                response_data = {
-                    'access': str(new_access),
-                    'refresh': str(refresh),
-                    'access_expires_at': new_access['exp'],  # Unix timestamp
-                    'refresh_expires_at': refresh['exp'],  # Unix timestamp
-                }
+            # ROTATE_REFRESH_TOKENS가 False인 경우 기존 refresh token 재사용
+            new_access = refresh.access_token
+            return {
+                'access': str(new_access),
+                'refresh': str(refresh),
+                'access_expires_at': new_access['exp'],  # Unix timestamp
+                'refresh_expires_at': refresh['exp'],  # Unix timestamp
+            }
 
-            # 앱 접속(토큰 갱신) 쿠폰 발급 - 실패해도 토큰 갱신은 계속 진행
+        try:
+            # 동시성 처리: 같은 refresh token 동시 요청은 하나만 갱신하고 나머지는 그 결과를 재사용
+            response_data, is_leader = coalesce_refresh(refresh_token, _refresh)
+            if not is_leader:
+                logger.info('Returning coalesced token refresh response')
+                return Response(response_data, status=status.HTTP_200_OK)
+
+            # 앱 접속(토큰 갱신) 쿠폰 발급 - 락을 푼 뒤 실제로 갱신한 요청에서만 실행
+            # 실패해도 토큰 갱신은 계속 진행
+            user = resolved.get('user')
             if AUTH_ISSUE_APP_OPEN_COUPON_ON_REFRESH:
                 try:
                     if user is not None:
@@ -770,10 +751,11 @@ class CustomTokenRefreshView(BaseTokenRefreshView):
                         exc_info=True,
                     )
 
-            # 캐시에 저장 (5초 동안 유효) - 동시 요청 방지
-            cache.set(cache_key, response_data, timeout=5)
-
-            logger.info("Token refreshed successfully for user %s (db=%s)", user_id, user_db_alias)
+            logger.info(
+                "Token refreshed successfully for user %s (db=%s)",
+                resolved.get('user_id'),
+                resolved.get('user_db_alias'),
+            )
             return Response(response_data, status=status.HTTP_200_OK)
 
         except TokenError as e:
@@ -878,7 +860,7 @@ class LogoutView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         try:
-            token = RefreshToken(refresh_token)
+            token = RegistryRefreshToken(refresh_token)
             token.blacklist()
             logger.info(f'User {request.user.id} logged out successfully')
         except TokenError as e:
@@ -908,9 +890,10 @@ class UnlinkView(APIView):
 
     def post(self, request):
         user = request.user
-        headers = {'Authorization': f'KakaoAK {settings.KAKAO_ADMIN_KEY}'}
-        data = {'target_id_type': 'user_id', 'target_id': user.kakao_id}
-        response = requests.post('https://kapi.kakao.com/v1/user/unlink', headers=headers, data=data)
+        try:
+            response = get_kakao_client().unlink(user.kakao_id, admin_key=settings.KAKAO_ADMIN_KEY)
+        except KakaoUnavailable:
+            return Response({'detail': 'Failed to unlink from Kakao'}, status=status.HTTP_502_BAD_GATEWAY)
         if response.status_code != 200:
             return Response({'detail': 'Failed to unlink from Kakao'}, status=status.HTTP_502_BAD_GATEWAY)
         user.delete()
@@ -977,7 +960,7 @@ class DevLoginView(APIView):
         tokens = generate_tokens_for_user(user)
         
         # 토큰 만료 시간 정보 추가
-        refresh = RefreshToken(tokens['refresh'])
+        refresh = RegistryRefreshToken(tokens['refresh'], verify=False)
         access_token = refresh.access_token
         tokens['access_expires_at'] = access_token['exp']  # Unix timestamp
         tokens['refresh_expires_at'] = refresh['exp']  # Unix timestamp
@@ -1030,8 +1013,14 @@ class NicknameAvailabilityView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        exists = User.objects.filter(nickname__iexact=nickname).exclude(id=request.user.id).exists()
-        if exists:
+        if is_nickname_taken(nickname, exclude_user_id=request.user.id):
+            return Response(
+                {"available": False, "code": "nickname_duplicated"},
+                status=status.HTTP_200_OK,
+            )
+
+        # reserve=1: 확인 직후 저장까지 잠시 선점 (입력 중 호출에는 쓰지 않는다)
+        if request.query_params.get("reserve") in ("1", "true") and not reserve_nickname(nickname, request.user.id):
             return Response(
                 {"available": False, "code": "nickname_duplicated"},
                 status=status.HTTP_200_OK,
@@ -1075,9 +1064,8 @@ class UserMeView(APIView):
             else:
                 nickname = None
 
-            if nickname:
-                is_duplicated = User.objects.filter(nickname__iexact=nickname).exclude(id=user.id).exists()
-                if is_duplicated:
+            if nickname and normalize_nickname(nickname) != user.nickname_key:
+                if is_nickname_taken(nickname, exclude_user_id=user.id) or not reserve_nickname(nickname, user.id):
                     return Response(
                         {'detail': 'nickname already exists', 'code': 'nickname_duplicated'},
                         status=status.HTTP_409_CONFLICT,
@@ -1139,20 +1127,15 @@ class UserMeView(APIView):
                 user.type_code = type_code
                 update_fields.add('type_code')
 
+        favorites = None
         if 'favorite_restaurants' in data:
-            favorites = data.get('favorite_restaurants')
-            if favorites in (None, ''):
-                serialized_favorites = None
-            elif isinstance(favorites, list):
-                serialized_favorites = json.dumps(favorites)
-            elif isinstance(favorites, str):
-                serialized_favorites = favorites
-            else:
-                return Response({'detail': 'favorite_restaurants must be a list, string, or null'}, status=status.HTTP_400_BAD_REQUEST)
-
-            if serialized_favorites != user.favorite_restaurants:
-                user.favorite_restaurants = serialized_favorites
-                update_fields.add('favorite_restaurants')
+            try:
+                favorites = clean_favorites(data.get('favorite_restaurants'))
+            except ValueError as exc:
+                return Response(
+                    {'detail': str(exc), 'code': 'invalid_favorite_restaurants'},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
 
         for attr in ('preferences', 'survey_responses', 'fcm_token'):
             if attr in data:
@@ -1170,6 +1153,7 @@ class UserMeView(APIView):
                 user.save(update_fields=list(update_fields))
             except IntegrityError:
                 if 'nickname' in update_fields:
+                    release_nickname(user.nickname, user.id)
                     return Response(
                         {'detail': 'nickname already exists', 'code': 'nickname_duplicated'},
                         status=status.HTTP_409_CONFLICT,
@@ -1177,16 +1161,15 @@ class UserMeView(APIView):
                 raise
 
             sync_fields = {}
-            for field in ('type_code', 'favorite_restaurants', 'fcm_token'):
+            for field in ('type_code', 'fcm_token'):
                 if field in update_fields:
                     sync_fields[field] = getattr(user, field)
 
-            if sync_fields:
-                guest_update_fields = list(sync_fields.keys()) + ['updated_at']
-                for guest in GuestUser.objects.filter(linked_user=user):
-                    for field_name, value in sync_fields.items():
-                        setattr(guest, field_name, value)
-                    guest.save(update_fields=guest_update_fields)
+            sync_linked_guests(user, **sync_fields)
+
+        if favorites is not None:
+            # 사용자 행을 잠그고 최신 목록과 비교해 바뀐 부분만 게스트/위시리스트에 반영한다
+            set_favorites(user, favorites)
         return Response(_serialize_user(user), status=status.HTTP_200_OK)
 
     def put(self, request):
@@ -1197,10 +1180,10 @@ class UserMeView(APIView):
         user_id = user.id
 
         try:
-            deleted_counts = delete_user_account(user)
+            job = request_account_deletion(user)
         except Exception as exc:
             logger.error(
-                "account deletion failed for user_id=%s: %s",
+                "account deletion request failed for user_id=%s: %s",
                 user_id,
                 exc,
                 exc_info=True,
@@ -1210,12 +1193,15 @@ class UserMeView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
-        logger.info("account deleted successfully for user_id=%s", user_id)
+        # 연관 데이터는 process_account_deletions 작업자가 배치로 지운다
+        logger.info("account deletion queued for user_id=%s job_id=%s", user_id, job.id)
         return Response(
             {
                 "ok": True,
                 "deleted_user_id": user_id,
-                "deleted_counts": deleted_counts,
+                "deletion_job_id": job.id,
+                "deletion_status": job.status,
+                "deleted_counts": job.deleted_counts,
             },
             status=status.HTTP_200_OK,
         )
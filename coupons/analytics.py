@@ -0,0 +1,347 @@
+"""
+쿠폰 통계(발급/사용/만료) 공용 분석 모듈.
+
+show_coupon_* 리포트 커맨드들이 식당 × 쿠폰 타입 × 기간마다 COUNT 쿼리를 따로 날리던 것을
+한 번의 스트리밍 조회로 바꾼다.
+
+- load_coupon_frame(): 필요한 Coupon 컬럼만 values_list().iterator() 로 읽는다.
+  PostgreSQL 에서는 서버 사이드 커서로 chunk 단위로 받아오므로 전체 행을 메모리에 한꺼번에 올리지 않는다.
+- CouponFrame: 컬럼별 array 로 보관 (행 객체 대신 정수 배열 → 메모리/순회 비용 최소화).
+  날짜는 KST 기준 date.toordinal() 로 저장해 일자 범위 필터/일별 그룹이 정수 비교로 끝난다.
+- CouponFrame.pivot(): 식당 / 쿠폰 타입 / 캠페인 / KST 발급일·사용일 / 상태 / 리포트 그룹 기준 집계를 한 번 순회로 계산.
+- write_csv() / write_json(): pivot 결과 내보내기.
+"""
+from __future__ import annotations
+
+import csv
+import json
+from array import array
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, time
+from zoneinfo import ZoneInfo
+
+from django.db import router
+from django.db.models import Q
+
+from .models import Campaign, Coupon, CouponArchive, CouponType
+
+KST = ZoneInfo("Asia/Seoul")
+
+STATUSES = ("ISSUED", "REDEEMED", "EXPIRED", "CANCELED")
+_STATUS_INDEX = {code: idx for idx, code in enumerate(STATUSES)}
+
+# 리포트에서 쓰는 쿠폰 타입 묶음 (출력 순서 유지)
+SIGNUP_GROUP = "신규가입"
+REFERRAL_GROUP = "친구초대"
+STAMP5_GROUP = "스탬프 5개"
+STAMP10_GROUP = "스탬프 10개"
+TYPE_GROUPS = {
+    SIGNUP_GROUP: ("WELCOME_3000",),
+    REFERRAL_GROUP: ("REFERRAL_BONUS_REFERRER", "REFERRAL_BONUS_REFEREE"),
+    STAMP5_GROUP: ("STAMP_REWARD_5",),
+    STAMP10_GROUP: ("STAMP_REWARD_10",),
+}
+# 이벤트별 집계에서 제외하는 기본 캠페인
+BASE_CAMPAIGN_CODES = ("SIGNUP_WELCOME", "REFERRAL")
+
+# day: 발급일(KST), redeemed_day: 사용일(KST)
+DIMENSIONS = ("restaurant", "coupon_type", "campaign", "day", "redeemed_day", "status", "group")
+
+_MISSING = -1
+_STREAM_CHUNK_SIZE = 5000
+
+
+def kst_day(value: datetime | None) -> int:
+    """aware datetime → KST 날짜 ordinal (없으면 -1)."""
+    if value is None:
+        return _MISSING
+    return value.astimezone(KST).date().toordinal()
+
+
+def kst_range(start: date, end: date) -> tuple[datetime, datetime]:
+    """KST 기준 [start 00:00, end 다음날 00:00) 를 aware datetime 으로."""
+    start_dt = datetime.combine(start, time.min, tzinfo=KST)
+    end_dt = datetime.combine(date.fromordinal(end.toordinal() + 1), time.min, tzinfo=KST)
+    return start_dt, end_dt
+
+
+@dataclass
+class CouponFrame:
+    """Coupon 컬럼 배열 묶음. 행 i 는 모든 배열의 i 번째 원소."""
+
+    restaurant_id: array = field(default_factory=lambda: array("q"))
+    coupon_type_id: array = field(default_factory=lambda: array("q"))
+    campaign_id: array = field(default_factory=lambda: array("q"))
+    user_id: array = field(default_factory=lambda: array("q"))
+    status: array = field(default_factory=lambda: array("b"))
+    issued_day: array = field(default_factory=lambda: array("l"))
+    redeemed_day: array = field(default_factory=lambda: array("l"))
+    expires_day: array = field(default_factory=lambda: array("l"))
+    # 차원 라벨 (id → code/name)
+    coupon_types: dict[int, tuple[str, str]] = field(default_factory=dict)
+    campaigns: dict[int, tuple[str, str]] = field(default_factory=dict)
+
+    _COLUMNS = (
+        "restaurant_id",
+        "coupon_type_id",
+        "campaign_id",
+        "user_id",
+        "status",
+        "issued_day",
+        "redeemed_day",
+        "expires_day",
+    )
+
+    def __len__(self) -> int:
+        return len(self.status)
+
+    def append(self, restaurant_id, coupon_type_id, campaign_id, user_id, status, issued_at, redeemed_at, expires_at):
+        self.restaurant_id.append(_MISSING if restaurant_id is None else restaurant_id)
+        self.coupon_type_id.append(coupon_type_id)
+        self.campaign_id.append(_MISSING if campaign_id is None else campaign_id)
+        self.user_id.append(user_id)
+        self.status.append(_STATUS_INDEX.get(status, _MISSING))
+        self.issued_day.append(kst_day(issued_at))
+        self.redeemed_day.append(kst_day(redeemed_at))
+        self.expires_day.append(kst_day(expires_at))
+
+    # ---- 필터 ----
+    def take(self, indexes) -> "CouponFrame":
+        indexes = list(indexes)
+        subset = CouponFrame(coupon_types=self.coupon_types, campaigns=self.campaigns)
+        for name in self._COLUMNS:
+            src = getattr(self, name)
+            setattr(subset, name, array(src.typecode, (src[i] for i in indexes)))
+        return subset
+
+    def where(self, *, restaurant_id=None, status=None, issued=None, redeemed=None) -> "CouponFrame":
+        """
+        조건에 맞는 행만 남긴 새 프레임.
+        issued / redeemed: (start_date, end_date) KST 날짜 범위 (양 끝 포함)
+        """
+        checks = []
+        if restaurant_id is not None:
+            checks.append((self.restaurant_id, restaurant_id, restaurant_id))
+        if status is not None:
+            code = _STATUS_INDEX[status]
+            checks.append((self.status, code, code))
+        if issued is not None:
+            checks.append((self.issued_day, issued[0].toordinal(), issued[1].toordinal()))
+        if redeemed is not None:
+            checks.append((self.redeemed_day, redeemed[0].toordinal(), redeemed[1].toordinal()))
+        if not checks:
+            return self
+        return self.take(
+            i for i in range(len(self)) if all(low <= column[i] <= high for column, low, high in checks)
+        )
+
+    # ---- 라벨 ----
+    def coupon_type_code(self, coupon_type_id: int) -> str:
+        return self.coupon_types.get(coupon_type_id, ("N/A", ""))[0]
+
+    def campaign_label(self, campaign_id: int) -> tuple[str, str]:
+        """(code, name). 캠페인 없으면 ('', '')."""
+        if campaign_id == _MISSING:
+            return "", ""
+        return self.campaigns.get(campaign_id, ("N/A", "N/A"))
+
+    def _group_of(self) -> dict[int, str]:
+        code_to_group = {code: group for group, codes in TYPE_GROUPS.items() for code in codes}
+        return {
+            type_id: code_to_group.get(code, "")
+            for type_id, (code, _title) in self.coupon_types.items()
+        }
+
+    def _dimension_column(self, dim: str):
+        if dim == "restaurant":
+            return [None if rid == _MISSING else rid for rid in self.restaurant_id]
+        if dim == "coupon_type":
+            return [self.coupon_type_code(tid) for tid in self.coupon_type_id]
+        if dim == "campaign":
+            return [self.campaign_label(cid)[0] for cid in self.campaign_id]
+        if dim in ("day", "redeemed_day"):
+            days = self.issued_day if dim == "day" else self.redeemed_day
+            return [date.fromordinal(day).isoformat() if day > 0 else "" for day in days]
+        if dim == "status":
+            return [STATUSES[code] if code >= 0 else "" for code in self.status]
+        if dim == "group":
+            group_of = self._group_of()
+            return [group_of.get(tid, "") for tid in self.coupon_type_id]
+        raise ValueError(f"unknown dimension: {dim}")
+
+    # ---- 집계 ----
+    def status_counts(self) -> dict[str, int]:
+        counts = [0] * len(STATUSES)
+        for code in self.status:
+            if code >= 0:
+                counts[code] += 1
+        return {status: counts[idx] for idx, status in enumerate(STATUSES)}
+
+    def pivot(self, dims: tuple[str, ...] | list[str]) -> list[dict]:
+        """
+        dims 기준 그룹별 total / 상태별 건수. 한 번 순회로 계산한다.
+        반환: [{dim...: value, "total": n, "issued": n, "redeemed": n, "expired": n, "canceled": n}, ...]
+        """
+        keys = list(zip(*(self._dimension_column(dim) for dim in dims))) if dims else [()] * len(self)
+        buckets: dict[tuple, list[int]] = defaultdict(lambda: [0] * len(STATUSES))
+        for key, code in zip(keys, self.status):
+            if code >= 0:
+                buckets[key][code] += 1
+
+        rows = []
+        for key in sorted(buckets, key=lambda k: tuple((v is None, v) for v in k)):
+            counts = buckets[key]
+            row = dict(zip(dims, key))
+            row["total"] = sum(counts)
+            for idx, status in enumerate(STATUSES):
+                row[status.lower()] = counts[idx]
+            rows.append(row)
+        return rows
+
+
+# Coupon / CouponArchive 공통 컬럼 (CouponFrame.append 인자 순서)
+_FRAME_FIELDS = (
+    "restaurant_id",
+    "coupon_type_id",
+    "campaign_id",
+    "user_id",
+    "status",
+    "issued_at",
+    "redeemed_at",
+    "expires_at",
+)
+
+
+def load_coupon_frame(
+    *filters: Q,
+    db_alias: str | None = None,
+    chunk_size: int = _STREAM_CHUNK_SIZE,
+    include_archive: bool = False,
+    **lookups,
+) -> CouponFrame:
+    """
+    Coupon 테이블을 필요한 컬럼만 스트리밍해서 CouponFrame 으로 적재한다.
+    filters / lookups 는 QuerySet.filter() 에 그대로 전달 (DB 에서 먼저 범위를 줄이는 용도).
+    include_archive=True 면 CouponArchive(coupons.archiver 로 옮긴 쿠폰)도 같은 조건으로 함께 읽는다.
+    """
+    alias = db_alias or router.db_for_read(Coupon)
+    frame = CouponFrame(
+        coupon_types={
+            row[0]: (row[1], row[2])
+            for row in CouponType.objects.using(alias).values_list("id", "code", "title")
+        },
+        campaigns={
+            row[0]: (row[1], row[2])
+            for row in Campaign.objects.using(alias).values_list("id", "code", "name")
+        },
+    )
+    sources = (Coupon, CouponArchive) if include_archive else (Coupon,)
+    for model in sources:
+        rows = (
+            model.objects.using(alias)
+            .filter(*filters, **lookups)
+            .order_by()
+            .values_list(*_FRAME_FIELDS)
+            .iterator(chunk_size=chunk_size)
+        )
+        for row in rows:
+            frame.append(*row)
+    return frame
+
+
+@dataclass
+class RestaurantTypeReport:
+    """식당 한 곳의 리포트 그룹별 / 이벤트 캠페인별 발급·사용 건수."""
+
+    restaurant_id: int
+    groups: dict[str, tuple[int, int]]
+    events: list[tuple[str, str, int, int]]
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.events and not any(issued or used for issued, used in self.groups.values())
+
+
+def restaurant_type_reports(frame: CouponFrame) -> dict[int, RestaurantTypeReport]:
+    """
+    식당별 신규가입/친구초대/스탬프 5·10개 그룹과 이벤트(기본 캠페인 제외) 캠페인별
+    (발급, 사용) 건수. '사용' 은 해당 프레임 안에서 status=REDEEMED 인 건수.
+    """
+    group_of = frame._group_of()
+    base_campaign_ids = {
+        cid for cid, (code, _name) in frame.campaigns.items() if code in BASE_CAMPAIGN_CODES
+    }
+    redeemed = _STATUS_INDEX["REDEEMED"]
+
+    groups: dict[int, dict[str, list[int]]] = defaultdict(lambda: defaultdict(lambda: [0, 0]))
+    events: dict[int, dict[int, list[int]]] = defaultdict(lambda: defaultdict(lambda: [0, 0]))
+    for rid, tid, cid, code in zip(frame.restaurant_id, frame.coupon_type_id, frame.campaign_id, frame.status):
+        if rid == _MISSING:
+            continue
+        used = 1 if code == redeemed else 0
+        group = group_of.get(tid)
+        if group:
+            bucket = groups[rid][group]
+            bucket[0] += 1
+            bucket[1] += used
+        if cid != _MISSING and cid not in base_campaign_ids:
+            bucket = events[rid][cid]
+            bucket[0] += 1
+            bucket[1] += used
+
+    reports = {}
+    for rid in set(groups) | set(events):
+        event_rows = []
+        for cid, (issued, used) in events[rid].items():
+            code, name = frame.campaign_label(cid)
+            event_rows.append((code or "N/A", name or "N/A", issued, used))
+        event_rows.sort(key=lambda row: row[0])
+        reports[rid] = RestaurantTypeReport(
+            restaurant_id=rid,
+            groups={group: tuple(groups[rid].get(group, (0, 0))) for group in TYPE_GROUPS},
+            events=event_rows,
+        )
+    return reports
+
+
+def format_rate(issued: int, redeemed: int) -> str:
+    """발급/사용 건수로 사용률 문자열 생성"""
+    if issued <= 0:
+        return "0.0%"
+    return f"{(redeemed / issued * 100):.1f}%"
+
+
+def write_restaurant_blocks(stdout, reports: dict[int, RestaurantTypeReport], names: dict[int, str]) -> None:
+    """식당별 그룹/이벤트 통계 블록 출력 (show_coupon_overall_stats / show_coupon_issued_by_date 공용)."""
+    sep = "--------------------------------------------"
+    for rid in sorted(reports):
+        report = reports[rid]
+        if rid not in names or report.is_empty:
+            continue
+        stdout.write(f"🍽️  식당 ID {rid}: {names[rid] or 'N/A'}")
+        stdout.write(sep)
+        for group, (issued, used) in report.groups.items():
+            if issued > 0 or used > 0:
+                stdout.write(f"  {group}: 발급 {issued}개 / 사용 {used}개 ({format_rate(issued, used)})")
+        if report.events:
+            stdout.write("")
+            stdout.write("  이벤트별:")
+            for code, name, issued, used in report.events:
+                stdout.write(
+                    f"    - {name} ({code}): 발급 {issued}개 / 사용 {used}개 ({format_rate(issued, used)})"
+                )
+        stdout.write("")
+
+
+def write_csv(rows: list[dict], fp) -> None:
+    if not rows:
+        return
+    writer = csv.DictWriter(fp, fieldnames=list(rows[0].keys()))
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+def write_json(rows: list[dict], fp) -> None:
+    json.dump(rows, fp, ensure_ascii=False, indent=2)
+    fp.write("\n")
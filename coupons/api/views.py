@@ -2,14 +2,14 @@ import os
 import logging
 from datetime import timedelta
 
-from django.core.cache import cache
 from django.core.exceptions import ValidationError as DjangoValidationError
 from django.utils import timezone
+from django.utils.decorators import method_decorator
 from rest_framework.exceptions import ValidationError as DRFValidationError
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from accounts.authentication import CachedJWTAuthentication
 
 from ..models import Coupon, StampWallet
 from ..utils import format_issued_coupons
@@ -32,9 +32,12 @@ from ..service import (
     claim_gaehwalike_coupon,
     claim_pub_jujeom_event_coupon,
     issue_app_open_coupon,
-    delete_expired_coupons_for_user,
 )
+from ..expired_sweeper import expired_coupons_q
 from .serializers import CouponSerializer, InviteCodeSerializer
+from wouldulike_backend.db_routers import prefer_replica
+from wouldulike_backend.resilience import query_budget
+from wouldulike_backend.throttling import RateLimitedMixin
 
 
 logger = logging.getLogger(__name__)
@@ -44,14 +47,9 @@ AUTH_ISSUE_APP_OPEN_COUPON_ON_COUPON_LIST = (
     os.getenv("AUTH_ISSUE_APP_OPEN_COUPON_ON_COUPON_LIST", "1") in ("1", "true", "True")
 )
 
-# 만료 쿠폰 삭제는 연속 요청(예: ?status=ISSUED 후 전체 목록)마다 돌리지 않도록 짧게 스로틀
-_COUPON_EXPIRED_CLEANUP_CACHE_TTL_S = int(
-    os.getenv("COUPON_EXPIRED_CLEANUP_CACHE_TTL_S", "120")
-)
-
 
 class MyCouponsView(generics.ListAPIView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = CouponSerializer
 
@@ -60,14 +58,6 @@ class MyCouponsView(generics.ListAPIView):
         request_id = getattr(self.request, "_request_id", "n/a")
         logger.info("[req:%s] MyCouponsView.get_queryset start user=%s", request_id, getattr(user, "id", None))
 
-        cache_key = f"coupons:expired_cleanup:{user.id}"
-        try:
-            if not cache.get(cache_key):
-                delete_expired_coupons_for_user(user)
-                cache.set(cache_key, 1, _COUPON_EXPIRED_CLEANUP_CACHE_TTL_S)
-        except Exception:  # noqa: BLE001 — 캐시 실패 시에도 목록은 동작해야 함
-            delete_expired_coupons_for_user(user)
-
         # 앱 접속(쿠폰 목록 진입) 시 앱 접속 쿠폰 발급 시도
         # 신규가입 직후(1시간 이내)에는 스킵 - 이미 신규가입 쿠폰 1개만 발급됨
         self._issued_app_open_coupons = []
@@ -104,9 +94,11 @@ class MyCouponsView(generics.ListAPIView):
                     exc_info=True,
                 )
 
+        # 만료 쿠폰 삭제는 배치 정리(expire_coupons)가 담당하고, 목록에서는 조회 시점에 제외만 한다
         qs = (
             Coupon.objects.select_related("coupon_type", "campaign")
             .filter(user=user)
+            .exclude(expired_coupons_q(timezone.now()))
             .order_by("-issued_at")
         )
         status_q = self.request.query_params.get("status")
@@ -115,6 +107,8 @@ class MyCouponsView(generics.ListAPIView):
         logger.info("[req:%s] MyCouponsView.get_queryset end user=%s", request_id, getattr(user, "id", None))
         return qs
 
+    @method_decorator(query_budget("my_coupons", max_ms=10000, degrade_after_ms=2000))
+    @prefer_replica()
     def list(self, request, *args, **kwargs):
         response = super().list(request, *args, **kwargs)
         issued = getattr(self, "_issued_app_open_coupons", [])
@@ -128,7 +122,7 @@ class MyCouponsView(generics.ListAPIView):
 
 
 class SignupCompleteView(APIView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request):
@@ -144,9 +138,10 @@ class SignupCompleteView(APIView):
         return Response(payload, status=201)
 
 
-class RedeemView(APIView):
-    authentication_classes = [JWTAuthentication]
+class RedeemView(RateLimitedMixin, APIView):
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = "redeem"
 
     def post(self, request):
         code = request.data.get("coupon_code")
@@ -181,7 +176,7 @@ class RedeemView(APIView):
 
 
 class CheckCouponView(APIView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request):
@@ -203,7 +198,7 @@ class CheckCouponView(APIView):
 
 
 class MyInviteCodeView(APIView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
@@ -211,9 +206,10 @@ class MyInviteCodeView(APIView):
         return Response(InviteCodeSerializer(ic).data)
 
 
-class AcceptReferralView(APIView):
-    authentication_classes = [JWTAuthentication]
+class AcceptReferralView(RateLimitedMixin, APIView):
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = "coupon_code"
 
     def post(self, request):
         ref_code = request.data.get("ref_code")
@@ -285,7 +281,7 @@ class AcceptReferralView(APIView):
 
 
 class QualifyReferralView(APIView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request):
@@ -297,9 +293,10 @@ class QualifyReferralView(APIView):
         return Response(payload)
 
 
-class FlashClaimView(APIView):
-    authentication_classes = [JWTAuthentication]
+class FlashClaimView(RateLimitedMixin, APIView):
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = "claim"
 
     def post(self, request):
         idem_key = request.headers.get("Idempotency-Key") or request.data.get("idem_key")
@@ -312,9 +309,10 @@ class FlashClaimView(APIView):
         return Response(payload, status=201)
 
 
-class AddStampView(APIView):
-    authentication_classes = [JWTAuthentication]
+class AddStampView(RateLimitedMixin, APIView):
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = "stamp"
 
     def post(self, request):
         restaurant_id = request.data.get("restaurant_id")
@@ -398,9 +396,10 @@ class AddStampView(APIView):
 
 
 class MyStampStatusView(APIView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
+    @prefer_replica()
     def get(self, request):
         restaurant_id = request.query_params.get("restaurant_id")
         if not restaurant_id:
@@ -410,9 +409,10 @@ class MyStampStatusView(APIView):
 
 
 class MyAllStampStatusView(APIView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
+    @prefer_replica()
     def get(self, request):
         from coupons.festival_jungdunbam import RESTAURANT_ID as JUNGDUNBAM_FESTIVAL_RESTAURANT_ID
 
@@ -438,9 +438,10 @@ class MyAllStampStatusView(APIView):
         )
 
 
-class ClaimFinalExamCouponView(APIView):
-    authentication_classes = [JWTAuthentication]
+class ClaimFinalExamCouponView(RateLimitedMixin, APIView):
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = "claim"
 
     def post(self, request):
         coupon_code = request.data.get("coupon_code")
@@ -470,9 +471,10 @@ class ClaimFinalExamCouponView(APIView):
             return Response({"detail": "internal error"}, status=500)
 
 
-class ClaimMidtermStudylikeCouponView(APIView):
-    authentication_classes = [JWTAuthentication]
+class ClaimMidtermStudylikeCouponView(RateLimitedMixin, APIView):
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = "claim"
 
     def post(self, request):
         coupon_code = request.data.get("coupon_code")
@@ -511,9 +513,10 @@ class ClaimMidtermStudylikeCouponView(APIView):
             return Response({"detail": "internal error"}, status=500)
 
 
-class ClaimMidtermDailyCodeCouponView(APIView):
-    authentication_classes = [JWTAuthentication]
+class ClaimMidtermDailyCodeCouponView(RateLimitedMixin, APIView):
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = "claim"
 
     def post(self, request):
         coupon_code = request.data.get("coupon_code")
@@ -552,9 +555,10 @@ class ClaimMidtermDailyCodeCouponView(APIView):
             return Response({"detail": "internal error"}, status=500)
 
 
-class ClaimGaehwalikeCouponView(APIView):
-    authentication_classes = [JWTAuthentication]
+class ClaimGaehwalikeCouponView(RateLimitedMixin, APIView):
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = "claim"
 
     def post(self, request):
         coupon_code = request.data.get("coupon_code")
@@ -593,9 +597,10 @@ class ClaimGaehwalikeCouponView(APIView):
             return Response({"detail": "internal error"}, status=500)
 
 
-class ClaimPubJujeomEventCouponView(APIView):
-    authentication_classes = [JWTAuthentication]
+class ClaimPubJujeomEventCouponView(RateLimitedMixin, APIView):
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = "claim"
 
     def post(self, request):
         coupon_code = request.data.get("coupon_code")
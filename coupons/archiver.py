@@ -0,0 +1,177 @@
+"""
+오래된 쿠폰/스탬프 이벤트를 cold 아카이브 테이블로 옮긴다 (CouponArchive / StampEventArchive).
+
+hot 테이블(Coupon, StampEvent)에는 발급·적립 경로가 실제로 읽는 최근 데이터만 남긴다.
+- 쿠폰: 사용(REDEEMED) 후 보관 기간이 지나고 만료일도 지난 것, 만료(EXPIRED)된 지 보관 기간이 지난 것.
+  단 캠페인이 아직 active 인 쿠폰은 옮기지 않는다. 이벤트별 1회 발급 확인(existing_qs.exists())과
+  uq_coupon_issue_guard 는 hot 테이블만 보므로, 옮기면 진행 중인 이벤트 쿠폰을 같은 사용자가 다시 받을 수 있다.
+- 스탬프 이벤트: 생성 후 보관 기간이 지난 것 (적립 경로는 당일 이벤트만 읽는다)
+
+id 순서로 batch_size 개씩 짧은 트랜잭션으로 "아카이브에 복사 → hot 에서 삭제" 를 반복한다.
+같은 행이 두 번 복사돼도 original_id unique 로 무시되므로 중간에 끊겨도 다시 돌리면 된다.
+기준 시각은 UTC 자정으로 내려서, 하루치 이벤트가 hot/아카이브에 나뉘지 않게 한다
+(일별 순방문자 집계 coupons.rollups 가 두 테이블을 더해서 읽는다).
+
+통계/리포트는 coupons.analytics.load_coupon_frame(include_archive=True) 로 두 테이블을 함께 읽는다.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from datetime import datetime, timedelta
+
+from django.db import router, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Coupon, CouponArchive, StampEvent, StampEventArchive
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COUPON_RETENTION_DAYS = 90
+DEFAULT_STAMP_RETENTION_DAYS = 180
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_SLEEP_S = 0.1
+
+
+def archive_cutoff(now: datetime, days: int) -> datetime:
+    """보관 기간 기준 시각 (UTC 자정으로 내림)."""
+    return (now - timedelta(days=days)).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def aged_coupons_q(cutoff: datetime) -> Q:
+    """아카이브 대상 쿠폰 조건 (캠페인이 없거나 종료(active=False)된 쿠폰만)."""
+    aged = Q(status="REDEEMED", redeemed_at__lt=cutoff, expires_at__lt=cutoff) | Q(
+        status="EXPIRED", expires_at__lt=cutoff
+    )
+    return aged & (Q(campaign__isnull=True) | Q(campaign__active=False))
+
+
+def _coupon_batch(alias: str, cutoff: datetime, after_id: int, batch_size: int, now: datetime) -> tuple[int, int]:
+    with transaction.atomic(using=alias):
+        rows = list(
+            Coupon.objects.using(alias)
+            .filter(aged_coupons_q(cutoff), id__gt=after_id)
+            .select_for_update(skip_locked=True, of=("self",))
+            .order_by("id")
+            .values(*CouponArchive.SOURCE_FIELDS)[:batch_size]
+        )
+        if not rows:
+            return 0, after_id
+        CouponArchive.objects.using(alias).bulk_create(
+            [CouponArchive.from_values(row, reason="AGED", archived_at=now) for row in rows],
+            ignore_conflicts=True,
+        )
+        ids = [row["id"] for row in rows]
+        # 잠근 뒤 상태가 바뀐 행은 지우지 않도록 조건을 한 번 더 건다
+        Coupon.objects.using(alias).filter(aged_coupons_q(cutoff), id__in=ids).delete()
+    return len(rows), rows[-1]["id"]
+
+
+def _stamp_batch(alias: str, cutoff: datetime, after_id: int, batch_size: int, now: datetime) -> tuple[int, int]:
+    with transaction.atomic(using=alias):
+        rows = list(
+            StampEvent.objects.using(alias)
+            .filter(created_at__lt=cutoff, id__gt=after_id)
+            .select_for_update(skip_locked=True)
+            .order_by("id")
+            .values(*StampEventArchive.SOURCE_FIELDS)[:batch_size]
+        )
+        if not rows:
+            return 0, after_id
+        StampEventArchive.objects.using(alias).bulk_create(
+            [StampEventArchive.from_values(row, archived_at=now) for row in rows],
+            ignore_conflicts=True,
+        )
+        StampEvent.objects.using(alias).filter(id__in=[row["id"] for row in rows]).delete()
+    return len(rows), rows[-1]["id"]
+
+
+def _run_batches(
+    name: str,
+    batch_fn,
+    *,
+    alias: str,
+    cutoff: datetime,
+    now: datetime,
+    batch_size: int,
+    max_batches: int | None,
+    sleep_s: float,
+    time_budget_s: float | None,
+) -> dict:
+    started = time.monotonic()
+    after_id = 0
+    moved = batches = 0
+    finished = False
+    while max_batches is None or batches < max_batches:
+        if time_budget_s is not None and time.monotonic() - started >= time_budget_s:
+            break
+        count, after_id = batch_fn(alias, cutoff, after_id, batch_size, now)
+        if not count:
+            finished = True
+            break
+        batches += 1
+        moved += count
+        logger.info("%s archive batch=%s rows=%s last_id=%s", name, batches, count, after_id)
+        if count < batch_size:
+            finished = True
+            break
+        if sleep_s > 0:
+            time.sleep(sleep_s)
+    return {
+        "moved": moved,
+        "batches": batches,
+        "cutoff": cutoff,
+        "finished": finished,
+        "elapsed_s": round(time.monotonic() - started, 3),
+    }
+
+
+def archive_aged_coupons(
+    *,
+    older_than_days: int = DEFAULT_COUPON_RETENTION_DAYS,
+    now: datetime | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_batches: int | None = None,
+    sleep_s: float = DEFAULT_SLEEP_S,
+    time_budget_s: float | None = None,
+    db_alias: str | None = None,
+) -> dict:
+    """사용/만료 후 older_than_days 가 지난 쿠폰을 CouponArchive 로 옮긴다."""
+    now = now or timezone.now()
+    return _run_batches(
+        "coupon",
+        _coupon_batch,
+        alias=db_alias or router.db_for_write(Coupon),
+        cutoff=archive_cutoff(now, older_than_days),
+        now=now,
+        batch_size=batch_size,
+        max_batches=max_batches,
+        sleep_s=sleep_s,
+        time_budget_s=time_budget_s,
+    )
+
+
+def archive_old_stamp_events(
+    *,
+    older_than_days: int = DEFAULT_STAMP_RETENTION_DAYS,
+    now: datetime | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_batches: int | None = None,
+    sleep_s: float = DEFAULT_SLEEP_S,
+    time_budget_s: float | None = None,
+    db_alias: str | None = None,
+) -> dict:
+    """생성 후 older_than_days 가 지난 StampEvent 를 StampEventArchive 로 옮긴다."""
+    now = now or timezone.now()
+    return _run_batches(
+        "stamp_event",
+        _stamp_batch,
+        alias=db_alias or router.db_for_write(StampEvent),
+        cutoff=archive_cutoff(now, older_than_days),
+        now=now,
+        batch_size=batch_size,
+        max_batches=max_batches,
+        sleep_s=sleep_s,
+        time_budget_s=time_budget_s,
+    )
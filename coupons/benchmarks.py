@@ -0,0 +1,276 @@
+"""
+coupons.service 핵심 함수 마이크로 벤치마크 (호출당 시간 + 쿼리 수).
+
+HTTP/인증/직렬화 계층 없이 서비스 함수 하나만 반복 호출해, 시즌 이벤트가 추가될 때마다
+앱 접속 발급·스탬프·쿠폰 사용·코드 입력 경로가 얼마나 느려지고 쿼리가 늘었는지 본다.
+- 데이터: coupons.synthetic 으로 만든 로컬 DB (seed_loadtest_data). 벤치마크마다 트랜잭션 안에서 돌리고 롤백한다.
+- 캐시: Redis 대신 프로세스 내 캐시(locmem)를 쓴다. redis_lock 은 no-op 으로 빠지므로 Redis 왕복은 재지 않는다.
+- 측정: 호출마다 perf_counter 시간과 CaptureQueriesContext 쿼리 수. 처음 warmup 회는 버린다.
+- 회귀 기준: 벤치마크마다 max_queries(코드에 고정, 테스트에서 확인)와, 저장해 둔 baseline JSON 대비
+  쿼리 수 증가 / 중앙값 시간 증가(tolerance 배, NOISE_FLOOR_MS 이하 차이는 무시).
+"""
+from __future__ import annotations
+
+import json
+import statistics
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable
+
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ValidationError
+from django.db import connections, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from accounts.models import User
+
+from . import synthetic
+from .api.serializers import CouponSerializer
+from .expired_sweeper import expired_coupons_q
+from .models import Coupon, CouponType, InviteCode, MerchantPin
+from .service import (
+    _select_restaurant_for_coupon,
+    accept_referral,
+    add_stamp,
+    get_all_stamp_statuses,
+    issue_app_open_coupon,
+    redeem_coupon,
+)
+
+NOISE_FLOOR_MS = 1.0
+DEFAULT_TOLERANCE = 0.5
+
+
+@dataclass
+class Fixture:
+    users: list[User]
+    restaurants: list[tuple[int, str]]
+    coupons: list[Coupon]
+    invite_codes: list[str]
+    coupon_type: CouponType
+
+    def user(self, i: int) -> User:
+        return self.users[i % len(self.users)]
+
+    def restaurant(self, i: int) -> tuple[int, str]:
+        return self.restaurants[i % len(self.restaurants)]
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    name: str
+    run: Callable[[Fixture, int], object]
+    max_queries: int
+    # 코드 추측처럼 실패가 정상 결과인 경로
+    expect_error: bool = False
+
+
+# max_queries 는 합성 데이터에서 잰 호출당 최대 쿼리 수에 약간 여유를 둔 값이다.
+# 새 이벤트 분기로 쿼리가 늘면 테스트가 실패하므로, 의도한 증가라면 이유와 함께 숫자를 올린다.
+BENCHMARKS: dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, *, max_queries: int, expect_error: bool = False):
+    def register(func):
+        BENCHMARKS[name] = Benchmark(name, func, max_queries, expect_error)
+        return func
+
+    return register
+
+
+# --- 대상 함수 -------------------------------------------------------------
+
+
+@benchmark("issue_app_open_coupon", max_queries=60)
+def _issue_app_open_coupon(fx: Fixture, i: int):
+    return issue_app_open_coupon(fx.user(i))
+
+
+@benchmark("select_restaurant_for_coupon", max_queries=5)
+def _select_restaurant(fx: Fixture, i: int):
+    return _select_restaurant_for_coupon(fx.coupon_type)
+
+
+@benchmark("add_stamp", max_queries=12)
+def _add_stamp(fx: Fixture, i: int):
+    # 사용자별 하루 적립 한도에 걸리지 않도록 호출마다 다른 사용자
+    restaurant_id, pin = fx.restaurant(i)
+    return add_stamp(fx.user(i), restaurant_id, pin, idem_key=f"bench-{i}")
+
+
+@benchmark("redeem_coupon", max_queries=10)
+def _redeem_coupon(fx: Fixture, i: int):
+    coupon = fx.coupons[i % len(fx.coupons)]
+    pin = synthetic.restaurant_pin(coupon.restaurant_id)
+    return redeem_coupon(coupon.user, coupon.code, coupon.restaurant_id, pin)
+
+
+@benchmark("get_all_stamp_statuses", max_queries=8)
+def _get_all_stamp_statuses(fx: Fixture, i: int):
+    return get_all_stamp_statuses(fx.user(i))
+
+
+@benchmark("accept_referral.unknown_code", max_queries=2, expect_error=True)
+def _accept_unknown_code(fx: Fixture, i: int):
+    # 이벤트 코드 분기를 전부 지나 초대 코드 조회에서 실패하는 경로 (코드 추측)
+    return accept_referral(referee=fx.user(i), ref_code=f"ZZ{i:06d}")
+
+
+@benchmark("accept_referral.invite_code", max_queries=36)
+def _accept_invite_code(fx: Fixture, i: int):
+    referee = fx.user(2 * i)
+    code = fx.invite_codes[(2 * i + 1) % len(fx.invite_codes)]
+    return accept_referral(referee=referee, ref_code=code)
+
+
+@benchmark("coupon_list.serialize", max_queries=2)
+def _serialize_coupon_list(fx: Fixture, i: int):
+    # MyCouponsView 와 같은 쿼리셋 + CouponSerializer(many=True). 쿠폰 수와 관계없이 쿼리 2개(쿠폰, 식당 메타)여야 한다
+    qs = (
+        Coupon.objects.select_related("coupon_type", "campaign")
+        .filter(user=fx.user(i))
+        .exclude(expired_coupons_q(timezone.now()))
+        .order_by("-issued_at")
+    )
+    return CouponSerializer(qs, many=True).data
+
+
+# --- 실행 -------------------------------------------------------------------
+
+
+def load_fixture(alias: str = "default", *, size: int = 200) -> Fixture:
+    """합성 데이터에서 벤치마크 입력(사용자, 식당 PIN, 사용 가능한 쿠폰, 초대 코드)을 고른다."""
+    users = list(
+        User.objects.using(alias).filter(username__startswith=synthetic.USERNAME_PREFIX).order_by("username")[:size]
+    )
+    if not users:
+        raise RuntimeError("합성 데이터가 없습니다. 먼저 seed_loadtest_data 를 실행하세요.")
+    restaurant_ids = list(
+        MerchantPin.objects.using(alias)
+        .filter(restaurant_id__gte=synthetic.RESTAURANT_ID_BASE)
+        .order_by("restaurant_id")
+        .values_list("restaurant_id", flat=True)
+    )
+    coupons = list(
+        Coupon.objects.using(alias)
+        .select_related("user")
+        .filter(code__startswith=synthetic.CODE_PREFIX, status="ISSUED", expires_at__gt=timezone.now())
+        .order_by("code")[:size]
+    )
+    invite_codes = list(
+        InviteCode.objects.using(alias)
+        .filter(user__in=users)
+        .order_by("user__username")
+        .values_list("code", flat=True)
+    )
+    return Fixture(
+        users=users,
+        restaurants=[(rid, synthetic.restaurant_pin(rid)) for rid in restaurant_ids],
+        coupons=coupons,
+        invite_codes=invite_codes,
+        coupon_type=CouponType.objects.using(alias).get(code="WELCOME_3000"),
+    )
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+@contextmanager
+def _local_cache():
+    # override_settings(CACHES=...) 는 기존 캐시를 닫으면서 Redis 설정이 없으면 실패하므로 연결만 바꿔 끼운다
+    previous = getattr(caches._connections, "default", None)
+    caches["default"] = LocMemCache("coupons-bench", {})
+    try:
+        yield
+    finally:
+        if previous is None:
+            del caches["default"]
+        else:
+            caches["default"] = previous
+
+
+def measure(bench: Benchmark, fx: Fixture, *, repeat: int = 20, warmup: int = 2, alias: str = "default") -> dict:
+    """bench 를 warmup + repeat 회 호출하고 시간/쿼리 수 분포를 돌려준다. DB 변경은 롤백한다."""
+    times_ms: list[float] = []
+    queries: list[int] = []
+    errors = 0
+    connection = connections[alias]
+    with _local_cache(), transaction.atomic(using=alias):
+        for i in range(warmup + repeat):
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                try:
+                    bench.run(fx, i)
+                except ValidationError:
+                    if not bench.expect_error:
+                        errors += 1
+                elapsed_ms = (time.perf_counter() - started) * 1000
+            if i >= warmup:
+                times_ms.append(elapsed_ms)
+                queries.append(len(captured))
+        transaction.set_rollback(True, using=alias)
+    return {
+        "repeat": repeat,
+        "errors": errors,
+        "queries": max(queries),
+        "queries_min": min(queries),
+        "max_queries": bench.max_queries,
+        "time_ms": {
+            "median": round(statistics.median(times_ms), 3),
+            "p95": round(_percentile(times_ms, 0.95), 3),
+            "min": round(min(times_ms), 3),
+        },
+    }
+
+
+def run_all(names: list[str] | None = None, *, repeat: int = 20, warmup: int = 2, alias: str = "default") -> dict:
+    synthetic.ensure_local_database(alias)
+    fx = load_fixture(alias, size=max(200, 2 * (warmup + repeat)))
+    return {name: measure(BENCHMARKS[name], fx, repeat=repeat, warmup=warmup, alias=alias) for name in names or BENCHMARKS}
+
+
+# --- baseline ---------------------------------------------------------------
+
+
+def over_budget(results: dict) -> list[str]:
+    return [
+        f"{name}: 쿼리 {result['queries']}개 > max_queries {result['max_queries']}"
+        for name, result in sorted(results.items())
+        if result["queries"] > result["max_queries"]
+    ]
+
+
+def compare(baseline: dict, results: dict, *, tolerance: float = DEFAULT_TOLERANCE) -> tuple[list[str], list[str]]:
+    """(출력 줄, 회귀 목록). 쿼리 수가 늘거나 중앙값이 baseline * (1 + tolerance) 를 넘으면 회귀."""
+    lines, regressions = [], []
+    for name, result in sorted(results.items()):
+        base = baseline.get("benchmarks", {}).get(name)
+        if base is None:
+            lines.append(f"{name:<30} (baseline 없음)")
+            continue
+        before, after = base["time_ms"]["median"], result["time_ms"]["median"]
+        delta = f"{(after - before) / before * 100:+.0f}%" if before else "n/a"
+        lines.append(
+            f"{name:<30} median {before}→{after}ms ({delta}), queries {base['queries']}→{result['queries']}"
+        )
+        if result["queries"] > base["queries"]:
+            regressions.append(f"{name}: 쿼리 {base['queries']}→{result['queries']}")
+        if after > before * (1 + tolerance) and after - before > NOISE_FLOOR_MS:
+            regressions.append(f"{name}: median {before}→{after}ms ({delta})")
+    return lines, regressions
+
+
+def read_baseline(path: str) -> dict:
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def write_baseline(path: str, report: dict) -> None:
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, ensure_ascii=False, indent=2, sort_keys=True)
+        fh.write("\n")
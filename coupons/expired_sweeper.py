@@ -0,0 +1,155 @@
+"""
+만료 쿠폰(ISSUED/EXPIRED + expires_at 경과) 배치 정리.
+
+한 번에 DELETE ... WHERE expires_at < now 를 돌리면 대상이 많을 때 긴 트랜잭션/락이 생긴다.
+여기서는
+- ix_coupon_sweep_expires_at (부분 인덱스) 순서대로 batch_size 개씩 잘라서
+- 배치마다 짧은 트랜잭션으로 (선택) CouponArchive 에 복사 후 삭제하고
+- 배치 사이에 sleep, 배치가 느리면 sleep 을 늘리는 backoff 를 두며
+- 처리한 expires_at 지점을 StatsRollupCheckpoint 에 남겨 다음 실행이 이어서 진행한다.
+
+요청 경로(/coupons/my/)에서는 더 이상 삭제하지 않고, 만료 쿠폰을 조회에서만 제외한다.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from datetime import datetime
+
+from django.db import router, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Coupon, CouponArchive, StatsRollupCheckpoint
+
+logger = logging.getLogger(__name__)
+
+SWEEP_CHECKPOINT_NAME = "expired_coupon_sweep"
+SWEEPABLE_STATUSES = ("ISSUED", "EXPIRED")
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_SLEEP_S = 0.2
+# 배치 하나가 이 시간보다 오래 걸리면 다음 sleep 을 두 배로 (최대 MAX_SLEEP_S)
+SLOW_BATCH_S = 1.0
+MAX_SLEEP_S = 5.0
+
+
+def expired_coupons_q(now: datetime) -> Q:
+    """정리 대상(만료된 미사용 쿠폰) 조건. 조회 경로에서 제외할 때도 같은 조건을 쓴다."""
+    return Q(status__in=SWEEPABLE_STATUSES, expires_at__lt=now)
+
+
+def _load_checkpoint(alias: str) -> datetime | None:
+    return (
+        StatsRollupCheckpoint.objects.using(alias)
+        .filter(name=SWEEP_CHECKPOINT_NAME)
+        .values_list("rolled_up_until", flat=True)
+        .first()
+    )
+
+
+def _save_checkpoint(alias: str, value: datetime) -> None:
+    StatsRollupCheckpoint.objects.using(alias).update_or_create(
+        name=SWEEP_CHECKPOINT_NAME,
+        defaults={"rolled_up_until": value},
+    )
+
+
+def _sweep_batch(alias: str, now: datetime, after: tuple[datetime, int] | None, batch_size: int, archive: bool):
+    """
+    (expires_at, id) 가 after 보다 큰 정리 대상 batch_size 개를 처리.
+    반환: (처리 건수, 마지막 (expires_at, id) 또는 None)
+    """
+    with transaction.atomic(using=alias):
+        qs = Coupon.objects.using(alias).filter(expired_coupons_q(now))
+        if after is not None:
+            last_expires_at, last_id = after
+            qs = qs.filter(Q(expires_at__gt=last_expires_at) | Q(expires_at=last_expires_at, id__gt=last_id))
+        # 건너뛴(skip_locked) 행은 checkpoint 뒤에 남아 다시 훑지 않으므로, 다른 트랜잭션(쿠폰 사용 등)이
+        # 잡고 있는 행은 건너뛰지 않고 기다린다. 쿠폰 단위 트랜잭션이라 대기는 짧고, 배치도 작게 잡는다.
+        rows = list(
+            qs.select_for_update()
+            .order_by("expires_at", "id")
+            .values(*CouponArchive.SOURCE_FIELDS)[:batch_size]
+        )
+        if not rows:
+            return 0, None
+        if archive:
+            CouponArchive.objects.using(alias).bulk_create(
+                [CouponArchive.from_values(row, reason="EXPIRED_SWEEP", archived_at=now) for row in rows],
+                ignore_conflicts=True,
+            )
+        ids = [row["id"] for row in rows]
+        Coupon.objects.using(alias).filter(expired_coupons_q(now), id__in=ids).delete()
+    last = rows[-1]
+    return len(rows), (last["expires_at"], last["id"])
+
+
+def sweep_expired_coupons(
+    *,
+    now: datetime | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_batches: int | None = None,
+    sleep_s: float = DEFAULT_SLEEP_S,
+    time_budget_s: float | None = None,
+    archive: bool = False,
+    from_checkpoint: bool = True,
+    db_alias: str | None = None,
+) -> dict:
+    """
+    만료 쿠폰을 배치 단위로 정리(삭제 또는 아카이브 후 삭제)한다.
+
+    from_checkpoint=True 면 직전 실행이 처리한 expires_at 지점부터 이어서 진행한다.
+    (만료일이 과거로 수정된 쿠폰까지 다시 훑으려면 from_checkpoint=False)
+    max_batches / time_budget_s 에 도달하면 남은 대상이 있어도 멈추고, 다음 실행이 이어받는다.
+    """
+    alias = db_alias or router.db_for_write(Coupon)
+    now = now or timezone.now()
+    started = time.monotonic()
+
+    after = None
+    if from_checkpoint:
+        checkpoint = _load_checkpoint(alias)
+        if checkpoint is not None:
+            # 같은 expires_at 을 가진 행이 남아 있을 수 있으므로 id 0 부터
+            after = (checkpoint, 0)
+
+    processed = batches = 0
+    current_sleep = sleep_s
+    finished = False
+    while max_batches is None or batches < max_batches:
+        if time_budget_s is not None and time.monotonic() - started >= time_budget_s:
+            break
+        batch_started = time.monotonic()
+        count, last = _sweep_batch(alias, now, after, batch_size, archive)
+        if not count:
+            finished = True
+            break
+        batches += 1
+        processed += count
+        after = last
+        _save_checkpoint(alias, last[0])
+
+        elapsed = time.monotonic() - batch_started
+        logger.info(
+            "expired coupon sweep batch=%s rows=%s elapsed=%.3fs last_expires_at=%s",
+            batches,
+            count,
+            elapsed,
+            last[0],
+        )
+        if count < batch_size:
+            finished = True
+            break
+        if sleep_s > 0:
+            current_sleep = min(current_sleep * 2, MAX_SLEEP_S) if elapsed > SLOW_BATCH_S else sleep_s
+            time.sleep(current_sleep)
+
+    return {
+        "processed": processed,
+        "batches": batches,
+        "archived": archive,
+        "finished": finished,
+        "checkpoint": after[0] if after else None,
+        "elapsed_s": round(time.monotonic() - started, 3),
+    }
@@ -0,0 +1,107 @@
+"""
+오래된 쿠폰/스탬프 이벤트를 아카이브 테이블(CouponArchive / StampEventArchive)로 옮깁니다.
+
+- 쿠폰: 사용 후 또는 만료 후 --coupon-days 가 지난 것
+- 스탬프 이벤트: 생성 후 --stamp-days 가 지난 것
+
+id 순서로 --batch-size 개씩 짧은 트랜잭션으로 복사 후 삭제하므로 중간에 멈춰도 다시 실행하면 이어집니다.
+통계 명령어(show_coupon_*, coupon_analytics --include-archive)와 대시보드 백필은 아카이브를 함께 읽습니다.
+
+사용 예:
+  python manage.py archive_cold_data --dry-run
+  python manage.py archive_cold_data --coupon-days 90 --stamp-days 180
+  python manage.py archive_cold_data --only coupons --time-budget 300
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import router
+from django.utils import timezone
+
+from coupons.archiver import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_COUPON_RETENTION_DAYS,
+    DEFAULT_SLEEP_S,
+    DEFAULT_STAMP_RETENTION_DAYS,
+    aged_coupons_q,
+    archive_aged_coupons,
+    archive_cutoff,
+    archive_old_stamp_events,
+)
+from coupons.models import Coupon, StampEvent
+
+
+class Command(BaseCommand):
+    help = "오래된 쿠폰/스탬프 이벤트를 아카이브 테이블로 옮깁니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--coupon-days",
+            type=int,
+            default=DEFAULT_COUPON_RETENTION_DAYS,
+            help=f"사용/만료 후 보관 일수 (기본: {DEFAULT_COUPON_RETENTION_DAYS})",
+        )
+        parser.add_argument(
+            "--stamp-days",
+            type=int,
+            default=DEFAULT_STAMP_RETENTION_DAYS,
+            help=f"스탬프 이벤트 보관 일수 (기본: {DEFAULT_STAMP_RETENTION_DAYS})",
+        )
+        parser.add_argument("--only", choices=["coupons", "stamps"], help="한 종류만 처리")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f"배치당 처리 건수 (기본: {DEFAULT_BATCH_SIZE})",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=DEFAULT_SLEEP_S,
+            help=f"배치 사이 대기 초 (기본: {DEFAULT_SLEEP_S})",
+        )
+        parser.add_argument("--max-batches", type=int, default=None, help="종류별 최대 배치 수")
+        parser.add_argument("--time-budget", type=float, default=None, help="종류별 최대 소요 시간(초)")
+        parser.add_argument("--dry-run", action="store_true", help="대상 건수만 출력")
+
+    def handle(self, *args, **options):
+        if options["coupon_days"] < 1 or options["stamp_days"] < 1:
+            raise CommandError("보관 일수는 1 이상이어야 합니다.")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size 는 1 이상이어야 합니다.")
+
+        now = timezone.now()
+        only = options.get("only")
+        batch_kwargs = {
+            "now": now,
+            "batch_size": options["batch_size"],
+            "max_batches": options["max_batches"],
+            "sleep_s": options["sleep"],
+            "time_budget_s": options["time_budget"],
+        }
+
+        if only in (None, "coupons"):
+            cutoff = archive_cutoff(now, options["coupon_days"])
+            if options["dry_run"]:
+                count = Coupon.objects.using(router.db_for_read(Coupon)).filter(aged_coupons_q(cutoff)).count()
+                self.stdout.write(f"쿠폰 아카이브 대상: {count:,}건 (기준: {cutoff:%Y-%m-%d})")
+            else:
+                result = archive_aged_coupons(older_than_days=options["coupon_days"], **batch_kwargs)
+                self._report("쿠폰", result)
+
+        if only in (None, "stamps"):
+            cutoff = archive_cutoff(now, options["stamp_days"])
+            if options["dry_run"]:
+                count = StampEvent.objects.using(router.db_for_read(StampEvent)).filter(created_at__lt=cutoff).count()
+                self.stdout.write(f"스탬프 이벤트 아카이브 대상: {count:,}건 (기준: {cutoff:%Y-%m-%d})")
+            else:
+                result = archive_old_stamp_events(older_than_days=options["stamp_days"], **batch_kwargs)
+                self._report("스탬프 이벤트", result)
+
+    def _report(self, label, result):
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{label} {result['moved']:,}건 아카이브 완료 "
+                f"({result['batches']}배치, {result['elapsed_s']}s, 기준: {result['cutoff']:%Y-%m-%d})"
+            )
+        )
+        if not result["finished"]:
+            self.stdout.write(self.style.WARNING(f"{label}: 남은 대상이 있습니다. 다시 실행하면 이어서 처리합니다."))
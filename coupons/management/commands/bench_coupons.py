@@ -0,0 +1,88 @@
+"""
+coupons.service 핵심 함수 마이크로 벤치마크 (coupons.benchmarks).
+
+합성 데이터(seed_loadtest_data)가 있는 로컬 DB 에서 함수마다 호출당 시간(median/p95/min)과 쿼리 수를 잰다.
+DB 변경은 벤치마크마다 롤백하므로 같은 데이터로 몇 번이든 다시 돌릴 수 있다.
+--save-baseline 으로 결과를 저장해 두고, 변경 뒤 --check 로 비교하면 쿼리 수 증가나
+중앙값 시간 증가(--tolerance, 기본 50%)가 있을 때 실패한다. 쿼리 수 상한(max_queries)은 항상 확인한다.
+
+사용 예:
+  DJANGO_USE_LOCAL_SQLITE=1 DJANGO_SQLITE_PATH=/tmp/load.sqlite3 python manage.py bench_coupons --save-baseline
+  python manage.py bench_coupons --check --only add_stamp --only redeem_coupon
+"""
+import logging
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from coupons import benchmarks
+from wouldulike_backend.loadscenarios import git_revision
+
+
+class Command(BaseCommand):
+    help = "coupons.service 핵심 함수의 호출당 시간과 쿼리 수를 재고 baseline 과 비교합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--only",
+            action="append",
+            choices=sorted(benchmarks.BENCHMARKS),
+            help="실행할 벤치마크 (여러 번 지정 가능, 기본: 전부)",
+        )
+        parser.add_argument("--repeat", type=int, default=20, help="벤치마크당 측정 횟수 (기본: 20)")
+        parser.add_argument("--warmup", type=int, default=2, help="측정 전에 버리는 호출 수 (기본: 2)")
+        parser.add_argument("--baseline", default="bench_coupons_baseline.json", help="baseline JSON 경로")
+        parser.add_argument("--save-baseline", action="store_true", help="결과를 baseline 으로 저장")
+        parser.add_argument("--check", action="store_true", help="baseline 대비 회귀가 있으면 실패")
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=benchmarks.DEFAULT_TOLERANCE,
+            help="허용하는 중앙값 시간 증가 비율 (기본: 0.5)",
+        )
+
+    def handle(self, *args, **options):
+        if options["repeat"] < 1:
+            raise CommandError("--repeat 는 1 이상이어야 합니다.")
+        # 로컬 캐시라 redis_lock 이 호출마다 경고를 남기므로 서비스 로그는 오류만 출력한다
+        logging.getLogger("coupons").setLevel(logging.ERROR)
+        try:
+            results = benchmarks.run_all(options["only"], repeat=options["repeat"], warmup=options["warmup"])
+        except RuntimeError as exc:
+            raise CommandError(str(exc)) from exc
+
+        for name, result in results.items():
+            timing = result["time_ms"]
+            self.stdout.write(
+                f"{name:<30} median {timing['median']:>8.3f}ms  p95 {timing['p95']:>8.3f}ms  "
+                f"queries {result['queries']:>3}/{result['max_queries']:<3} errors {result['errors']}"
+            )
+
+        failures = benchmarks.over_budget(results)
+        if options["check"]:
+            try:
+                baseline = benchmarks.read_baseline(options["baseline"])
+            except OSError as exc:
+                raise CommandError(f"baseline 을 읽을 수 없습니다 (먼저 --save-baseline): {exc}") from exc
+            lines, regressions = benchmarks.compare(baseline, results, tolerance=options["tolerance"])
+            for line in lines:
+                self.stdout.write(line)
+            failures += regressions
+
+        if options["save_baseline"]:
+            report = {
+                "meta": {
+                    "revision": git_revision(),
+                    "database": settings.DATABASES["default"]["ENGINE"].rsplit(".", 1)[-1],
+                    "measured_at": timezone.now().isoformat(timespec="seconds"),
+                    "repeat": options["repeat"],
+                    "warmup": options["warmup"],
+                },
+                "benchmarks": results,
+            }
+            benchmarks.write_baseline(options["baseline"], report)
+            self.stdout.write(self.style.SUCCESS(f"baseline 저장: {options['baseline']}"))
+
+        if failures:
+            raise CommandError("성능 회귀:\n" + "\n".join(failures))
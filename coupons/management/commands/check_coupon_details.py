@@ -62,15 +62,17 @@ class Command(BaseCommand):
             self.stdout.write(self.style.ERROR(f"캠페인 {campaign_code}을 찾을 수 없습니다."))
             return
         
-        coupons = Coupon.objects.using(alias).filter(
-            user=user,
-            campaign=campaign
-        ).select_related('coupon_type')
+        # count/exists/슬라이스마다 쿼리하지 않도록 한 번에 읽는다
+        coupons = list(
+            Coupon.objects.using(alias)
+            .filter(user=user, campaign=campaign)
+            .select_related('coupon_type')
+        )
         
         self.stdout.write(f'\n=== {campaign_code} 캠페인 쿠폰 ===')
-        self.stdout.write(f'총 쿠폰 수: {coupons.count()}개')
+        self.stdout.write(f'총 쿠폰 수: {len(coupons)}개')
         
-        if coupons.exists():
+        if coupons:
             for idx, coupon in enumerate(coupons[:10], 1):  # 최대 10개만 표시
                 self.stdout.write(f'\n[{idx}] 쿠폰 코드: {coupon.code}')
                 self.stdout.write(f'  - 쿠폰 타입 코드: {coupon.coupon_type.code}')
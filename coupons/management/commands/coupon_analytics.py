@@ -0,0 +1,121 @@
+"""
+쿠폰 발급/사용/만료 피벗 통계를 조회하고 CSV/JSON 으로 내보내는 명령어
+
+Coupon 테이블을 한 번만 스트리밍해서(coupons.analytics) 원하는 기준으로 집계합니다.
+기준: restaurant, coupon_type, campaign, day(발급일 KST), redeemed_day(사용일 KST), status, group
+
+사용 예:
+  python manage.py coupon_analytics --by restaurant --by coupon_type
+  python manage.py coupon_analytics --by day --start-date 2026-03-01 --end-date 2026-03-31
+  python manage.py coupon_analytics --by restaurant --by campaign --format csv --output report.csv
+  python manage.py coupon_analytics --by restaurant --include-archive   # 아카이브된 오래된 쿠폰 포함
+  python manage.py coupon_analytics --by redeemed_day --date-field redeemed --start-date 2026-03-01 --end-date 2026-03-07 --format json
+"""
+import io
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from coupons.analytics import DIMENSIONS, kst_range, load_coupon_frame, write_csv, write_json
+from wouldulike_backend.db_routers import prefer_replica
+
+
+class Command(BaseCommand):
+    help = "쿠폰 발급/사용/만료 통계를 식당/쿠폰 타입/캠페인/일자 기준으로 피벗하고 CSV/JSON 으로 내보냅니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--by",
+            action="append",
+            choices=DIMENSIONS,
+            dest="dims",
+            help="집계 기준 (여러 번 지정 가능, 기본: restaurant)",
+        )
+        parser.add_argument("--start-date", type=str, help="조회 시작 날짜 (YYYY-MM-DD, KST)")
+        parser.add_argument("--end-date", type=str, help="조회 종료 날짜 (YYYY-MM-DD, KST, 포함)")
+        parser.add_argument(
+            "--date-field",
+            choices=["issued", "redeemed"],
+            default="issued",
+            help="기간 필터 기준 (issued: 발급일, redeemed: 사용일, 기본: issued)",
+        )
+        parser.add_argument("--restaurant-id", type=int, help="특정 식당 ID만 조회")
+        parser.add_argument("--coupon-type", type=str, help="특정 쿠폰 타입 코드만 조회")
+        parser.add_argument("--campaign", type=str, help="특정 캠페인 코드만 조회")
+        parser.add_argument(
+            "--include-archive",
+            action="store_true",
+            help="CouponArchive 로 옮긴 오래된 쿠폰도 함께 집계",
+        )
+        parser.add_argument(
+            "--format",
+            choices=["table", "csv", "json"],
+            default="table",
+            help="출력 형식 (기본: table)",
+        )
+        parser.add_argument("--output", type=str, help="결과 파일 경로 (미지정 시 표준 출력)")
+
+    def _parse_date(self, value):
+        try:
+            return datetime.strptime(value, "%Y-%m-%d").date()
+        except ValueError:
+            raise CommandError(f"날짜 형식이 올바르지 않습니다: {value} (YYYY-MM-DD 형식 사용)")
+
+    @prefer_replica(force=True)
+    def handle(self, *args, **options):
+        dims = options.get("dims") or ["restaurant"]
+
+        filters = []
+        start_str, end_str = options.get("start_date"), options.get("end_date")
+        if bool(start_str) != bool(end_str):
+            raise CommandError("--start-date 와 --end-date 는 함께 지정해주세요.")
+        if start_str:
+            start_date, end_date = self._parse_date(start_str), self._parse_date(end_str)
+            if start_date > end_date:
+                raise CommandError("시작 날짜가 종료 날짜보다 늦을 수 없습니다.")
+            start_dt, end_dt = kst_range(start_date, end_date)
+            field = "issued_at" if options["date_field"] == "issued" else "redeemed_at"
+            filters.append(Q(**{f"{field}__gte": start_dt, f"{field}__lt": end_dt}))
+        if options.get("restaurant_id"):
+            filters.append(Q(restaurant_id=options["restaurant_id"]))
+        if options.get("coupon_type"):
+            filters.append(Q(coupon_type__code=options["coupon_type"]))
+        if options.get("campaign"):
+            filters.append(Q(campaign__code=options["campaign"]))
+
+        frame = load_coupon_frame(*filters, include_archive=options["include_archive"])
+        rows = frame.pivot(dims)
+
+        buffer = io.StringIO(newline="")
+        fmt = options["format"]
+        if fmt == "csv":
+            write_csv(rows, buffer)
+        elif fmt == "json":
+            write_json(rows, buffer)
+        else:
+            self._write_table(rows, dims, buffer)
+
+        output_path = options.get("output")
+        if not output_path:
+            self.stdout.write(buffer.getvalue(), ending="")
+            return
+        with open(output_path, "w", encoding="utf-8", newline="") as fp:
+            fp.write(buffer.getvalue())
+        self.stdout.write(self.style.SUCCESS(f"{len(rows)}행 → {output_path} (쿠폰 {len(frame):,}건 집계)"))
+
+    def _write_table(self, rows, dims, fp):
+        columns = list(dims) + ["total", "issued", "redeemed", "expired", "canceled"]
+        widths = {
+            col: max([len(col)] + [len("" if row[col] is None else str(row[col])) for row in rows])
+            for col in columns
+        }
+        fp.write("  ".join(col.ljust(widths[col]) for col in columns) + "\n")
+        fp.write("  ".join("-" * widths[col] for col in columns) + "\n")
+        for row in rows:
+            fp.write(
+                "  ".join(
+                    ("" if row[col] is None else str(row[col])).ljust(widths[col]) for col in columns
+                )
+                + "\n"
+            )
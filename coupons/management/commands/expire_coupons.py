@@ -1,51 +1,98 @@
+"""
+만료된 미사용 쿠폰(ISSUED/EXPIRED)을 배치 단위로 정리합니다.
+
+expires_at 인덱스 순서대로 --batch-size 개씩 짧은 트랜잭션으로 삭제(또는 CouponArchive 로 이동)하고,
+처리 지점을 체크포인트로 남겨 다음 실행이 이어서 진행합니다.
+/coupons/my/ 요청 경로에서는 더 이상 삭제하지 않으므로 Cloud Scheduler 등에서 주기적으로 실행하세요.
+
+사용 예:
+  python manage.py expire_coupons                      # 대상 요약 후 확인 입력
+  python manage.py expire_coupons --yes --archive      # 확인 없이 아카이브 후 삭제
+  python manage.py expire_coupons --yes --time-budget 60 --batch-size 1000
+"""
 from django.core.management.base import BaseCommand
-from django.utils import timezone
+from django.db import router
 from django.db.models import Count
+from django.utils import timezone
 
+from coupons.expired_sweeper import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_SLEEP_S,
+    expired_coupons_q,
+    sweep_expired_coupons,
+)
 from coupons.models import Coupon
 
 
 class Command(BaseCommand):
-    help = "Delete expired coupons"
+    help = "만료 쿠폰을 배치 단위로 삭제(또는 아카이브)합니다."
 
-    def handle(self, *args, **kwargs):
-        now = timezone.now()
-        expired_qs = Coupon.objects.filter(
-            status__in=["ISSUED", "EXPIRED"],
-            expires_at__lt=now,
+    def add_arguments(self, parser):
+        parser.add_argument("--yes", action="store_true", help="확인 입력 없이 바로 실행 (스케줄러용)")
+        parser.add_argument("--archive", action="store_true", help="삭제 전에 CouponArchive 로 복사")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f"배치당 처리 건수 (기본: {DEFAULT_BATCH_SIZE})",
         )
-
-        total_all = Coupon.objects.count()
-        total_expired = expired_qs.count()
-        by_status = (
-            Coupon.objects.values("status")
-            .annotate(cnt=Count("id"))
-            .order_by("status")
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=DEFAULT_SLEEP_S,
+            help=f"배치 사이 대기 초 (느린 배치 뒤에는 자동으로 늘어남, 기본: {DEFAULT_SLEEP_S})",
         )
-        by_type = (
-            expired_qs.values("coupon_type__code")
-            .annotate(cnt=Count("id"))
-            .order_by("coupon_type__code")
+        parser.add_argument("--max-batches", type=int, default=None, help="이번 실행에서 처리할 최대 배치 수")
+        parser.add_argument("--time-budget", type=float, default=None, help="이번 실행 최대 소요 시간(초)")
+        parser.add_argument(
+            "--full-scan",
+            action="store_true",
+            help="체크포인트를 무시하고 처음부터 훑기 (만료일이 과거로 수정된 쿠폰 정리용)",
         )
 
-        self.stdout.write(f"총 쿠폰 수: {total_all}")
-        self.stdout.write(f"삭제 대상 만료 쿠폰 수: {total_expired}")
-        self.stdout.write("상태별 쿠폰 수:")
-        for row in by_status:
-            self.stdout.write(f"- {row['status']}: {row['cnt']}")
-        self.stdout.write("삭제 대상 쿠폰 종류별 수:")
-        for row in by_type:
-            code = row["coupon_type__code"] or "UNKNOWN"
-            self.stdout.write(f"- {code}: {row['cnt']}")
-
-        if total_expired == 0:
-            self.stdout.write(self.style.WARNING("삭제할 만료 쿠폰이 없습니다."))
-            return
-
-        confirm = input("만료 쿠폰을 삭제하려면 'yes'를 입력하세요: ")
-        if confirm.strip().lower() != "yes":
-            self.stdout.write(self.style.WARNING("삭제를 취소했습니다."))
-            return
-
-        deleted, _ = expired_qs.delete()
-        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired coupons"))
+    def handle(self, *args, **options):
+        alias = router.db_for_write(Coupon)
+        now = timezone.now()
+
+        if not options["yes"]:
+            expired_qs = Coupon.objects.using(alias).filter(expired_coupons_q(now))
+            total_expired = expired_qs.count()
+            by_type = (
+                expired_qs.values("coupon_type__code")
+                .annotate(cnt=Count("id"))
+                .order_by("coupon_type__code")
+            )
+            self.stdout.write(f"삭제 대상 만료 쿠폰 수: {total_expired}")
+            self.stdout.write("삭제 대상 쿠폰 종류별 수:")
+            for row in by_type:
+                code = row["coupon_type__code"] or "UNKNOWN"
+                self.stdout.write(f"- {code}: {row['cnt']}")
+
+            if total_expired == 0:
+                self.stdout.write(self.style.WARNING("삭제할 만료 쿠폰이 없습니다."))
+                return
+
+            confirm = input("만료 쿠폰을 삭제하려면 'yes'를 입력하세요: ")
+            if confirm.strip().lower() != "yes":
+                self.stdout.write(self.style.WARNING("삭제를 취소했습니다."))
+                return
+
+        result = sweep_expired_coupons(
+            now=now,
+            batch_size=options["batch_size"],
+            max_batches=options["max_batches"],
+            sleep_s=options["sleep"],
+            time_budget_s=options["time_budget"],
+            archive=options["archive"],
+            from_checkpoint=not options["full_scan"],
+            db_alias=alias,
+        )
+        action = "Archived and deleted" if result["archived"] else "Deleted"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{action} {result['processed']} expired coupons "
+                f"in {result['batches']} batches ({result['elapsed_s']}s, checkpoint={result['checkpoint']})"
+            )
+        )
+        if not result["finished"]:
+            self.stdout.write(self.style.WARNING("남은 대상이 있습니다. 다음 실행에서 이어서 처리합니다."))
@@ -0,0 +1,61 @@
+"""
+점주 대시보드 지표 집계 테이블(RestaurantDailyStats / RestaurantUserVisitStats)을 갱신합니다.
+
+기본은 증분 모드로, 직전 체크포인트 이후 구간만 반영합니다.
+Cloud Scheduler 등에서 5~10분 간격으로 돌려 두면 DashboardStatsView 가 합산해야 할
+실시간 꼬리 구간이 그만큼 짧아집니다.
+
+사용 예:
+  python manage.py rollup_dashboard_stats
+  python manage.py rollup_dashboard_stats --backfill
+  python manage.py rollup_dashboard_stats --backfill --since 2026-03-01
+"""
+from datetime import datetime, timezone as dt_timezone
+
+from django.core.management.base import BaseCommand, CommandError
+
+from coupons.rollups import backfill_dashboard_stats, rollup_dashboard_stats
+
+
+class Command(BaseCommand):
+    help = "점주 대시보드 지표 집계 테이블을 증분 갱신하거나 백필합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--backfill",
+            action="store_true",
+            help="집계 테이블을 다시 만듭니다 (--since 미지정 시 전체 기간)",
+        )
+        parser.add_argument(
+            "--since",
+            type=str,
+            help="백필 시작 날짜 (YYYY-MM-DD, UTC). 해당 월 1일부터 다시 집계합니다.",
+        )
+        parser.add_argument(
+            "--database",
+            type=str,
+            default=None,
+            help="집계 대상 DB alias (기본: 라우터 기준)",
+        )
+
+    def handle(self, *args, **options):
+        since = None
+        if options.get("since"):
+            if not options["backfill"]:
+                raise CommandError("--since 는 --backfill 과 함께 사용하세요.")
+            try:
+                since = datetime.strptime(options["since"], "%Y-%m-%d").replace(tzinfo=dt_timezone.utc)
+            except ValueError as exc:
+                raise CommandError("--since 는 YYYY-MM-DD 형식이어야 합니다.") from exc
+
+        db_alias = options.get("database")
+        if options["backfill"]:
+            result = backfill_dashboard_stats(since=since, db_alias=db_alias)
+        else:
+            result = rollup_dashboard_stats(db_alias=db_alias)
+
+        self.stdout.write(
+            f"mode={result['mode']} from={result['from']} until={result['until']} "
+            f"daily_rows={result['daily_rows']} visit_rows={result['visit_rows']}"
+        )
+        self.stdout.write(self.style.SUCCESS("대시보드 지표 집계 완료"))
@@ -0,0 +1,137 @@
+"""
+합성 데이터(seed_loadtest_data)에 대해 사용 흐름 시나리오 부하를 주고 엔드포인트별 p50/p95/p99 를 JSON 으로 남깁니다.
+
+시나리오: login_storm, wallet_browse, lunch_rush, referral_burst (wouldulike_backend.loadscenarios)
+--boot 를 주면 gunicorn(Procfile 과 같은 --preload)으로 앱을 직접 띄우고, 가짜 Kakao API 와
+(--fake-redis-port 를 주면) fakeredis 서버를 같이 띄워 서버에 연결합니다. 이미 띄운 서버는 --url 로 지정합니다.
+결과 파일은 키를 정렬해 쓰므로 커밋끼리 diff 하거나 --compare 로 이전 결과와 비교할 수 있습니다.
+
+사용 예:
+  python manage.py run_load_scenarios --boot --fake-redis-port 6390 --duration 30 --output load-$(git rev-parse --short HEAD).json
+  python manage.py run_load_scenarios --url http://127.0.0.1:8000 --scenario lunch_rush --concurrency 50
+  python manage.py run_load_scenarios --boot --scenario referral_burst --compare load-before.json
+"""
+import json
+import logging
+import socket
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from wouldulike_backend import loadscenarios
+from wouldulike_backend.loadtest import start_fake_kakao
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class Command(BaseCommand):
+    help = "시나리오 부하 테스트를 실행하고 엔드포인트별 지연 분포를 JSON 으로 저장합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            choices=sorted(loadscenarios.SCENARIOS),
+            help="실행할 시나리오 (여러 번 지정 가능, 기본: 전부)",
+        )
+        parser.add_argument("--manifest", default="loadtest_manifest.json", help="seed_loadtest_data manifest")
+        parser.add_argument("--url", help="이미 실행 중인 서버 주소 (--boot 와 함께 쓰지 않음)")
+        parser.add_argument("--boot", action="store_true", help="gunicorn 으로 앱을 직접 띄움")
+        parser.add_argument("--workers", type=int, default=4, help="--boot 워커 수 (기본: 4)")
+        parser.add_argument("--fake-redis-port", type=int, help="fakeredis 서버 포트 (--boot 서버의 REDIS_URL)")
+        parser.add_argument("--fake-kakao-port", type=int, help="가짜 Kakao API 포트 (기본: 빈 포트)")
+        parser.add_argument("--fake-kakao-delay-ms", type=float, default=100.0, help="가짜 Kakao 응답 지연(ms)")
+        parser.add_argument("--concurrency", type=int, default=20, help="가상 사용자 수 (기본: 20)")
+        parser.add_argument("--duration", type=float, default=30.0, help="시나리오별 실행 시간(초)")
+        parser.add_argument("--sessions", type=int, help="시나리오별 세션 수 (--duration 보다 먼저 끝나면 종료)")
+        parser.add_argument("--seed", type=int, default=42, help="요청 구성 난수 seed")
+        parser.add_argument("--output", default="loadtest_result.json", help="결과 JSON 경로")
+        parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+
+    def handle(self, *args, **options):
+        if bool(options["url"]) == bool(options["boot"]):
+            raise CommandError("--url 과 --boot 중 하나만 지정하세요.")
+        try:
+            with open(options["manifest"], encoding="utf-8") as fh:
+                manifest = json.load(fh)
+        except OSError as exc:
+            raise CommandError(f"manifest 를 읽을 수 없습니다 (먼저 seed_loadtest_data 실행): {exc}") from exc
+        scenarios = options["scenario"] or list(loadscenarios.SCENARIOS)
+        logging.getLogger("urllib3").setLevel(logging.WARNING)
+
+        kakao_port = options["fake_kakao_port"] or _free_port()
+        fake_kakao = start_fake_kakao(kakao_port, options["fake_kakao_delay_ms"])
+        fake_redis = server = None
+        try:
+            url = options["url"]
+            if options["boot"]:
+                env = {"KAKAO_API_BASE_URL": f"http://127.0.0.1:{kakao_port}"}
+                if options["fake_redis_port"]:
+                    fake_redis = loadscenarios.start_fake_redis(options["fake_redis_port"])
+                    env["REDIS_URL"] = f"redis://127.0.0.1:{options['fake_redis_port']}/0"
+                port = _free_port()
+                self.stdout.write(f"앱 서버 시작: 127.0.0.1:{port} (workers={options['workers']})")
+                server = loadscenarios.boot_server(port, workers=options["workers"], env=env)
+                url = f"http://127.0.0.1:{port}"
+            else:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"login_storm 은 서버를 KAKAO_API_BASE_URL=http://127.0.0.1:{kakao_port} 로 띄워야 합니다."
+                    )
+                )
+
+            results = {}
+            for scenario in scenarios:
+                self.stdout.write(f"[{scenario}] {options['concurrency']} users, {options['duration']:.0f}s")
+                results[scenario] = loadscenarios.run_scenario(
+                    scenario,
+                    manifest,
+                    url=url,
+                    concurrency=options["concurrency"],
+                    duration_s=options["duration"],
+                    sessions=options["sessions"],
+                    seed=options["seed"],
+                )
+                overall = results[scenario]["overall"]
+                self.stdout.write(
+                    f"  {overall['rps']} req/s, p50 {overall['latency_ms']['p50']}ms, "
+                    f"p95 {overall['latency_ms']['p95']}ms, p99 {overall['latency_ms']['p99']}ms, "
+                    f"errors {overall['errors']}"
+                )
+        except RuntimeError as exc:
+            raise CommandError(str(exc)) from exc
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait(timeout=30)
+            if fake_redis is not None:
+                fake_redis.shutdown()
+            fake_kakao.shutdown()
+
+        report = {
+            "meta": {
+                "revision": loadscenarios.git_revision(),
+                "started_at": timezone.now().isoformat(timespec="seconds"),
+                "database": settings.DATABASES["default"]["ENGINE"].rsplit(".", 1)[-1],
+                "manifest": {"seed": manifest.get("seed"), "scale": manifest.get("scale")},
+                "concurrency": options["concurrency"],
+                "duration_s": options["duration"],
+                "sessions": options["sessions"],
+                "seed": options["seed"],
+                "workers": options["workers"] if options["boot"] else None,
+            },
+            "scenarios": results,
+        }
+        loadscenarios.write_report(options["output"], report)
+        self.stdout.write(self.style.SUCCESS(f"결과 저장: {options['output']}"))
+
+        if options["compare"]:
+            with open(options["compare"], encoding="utf-8") as fh:
+                baseline = json.load(fh)
+            for line in loadscenarios.compare(baseline, report):
+                self.stdout.write(line)
@@ -0,0 +1,58 @@
+"""
+부하 테스트 / 벤치마크용 합성 데이터를 로컬 DB 에 만듭니다 (coupons.synthetic).
+
+기본 규모: 사용자 10만, 쿠폰 200만, 제휴 식당 300, 스탬프 적립 100만 (--scale 로 줄이거나 늘림).
+로컬 DB 설정(DJANGO_USE_LOCAL_SQLITE=1 또는 DJANGO_DISABLE_EXTERNAL_DBS=1 + localhost)에서만 동작합니다.
+빈 DB 는 migrate 대신 --create-schema 로 테이블을 만듭니다.
+시나리오 실행기(run_load_scenarios)가 읽는 manifest(사용자 id, 초대 코드, 식당 PIN)를 --manifest 에 씁니다.
+
+사용 예:
+  DJANGO_USE_LOCAL_SQLITE=1 DJANGO_SQLITE_PATH=/tmp/load.sqlite3 \\
+    python manage.py seed_loadtest_data --create-schema --scale 0.1
+  python manage.py seed_loadtest_data --reset --seed 7
+  python manage.py seed_loadtest_data --reset-only
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from coupons import synthetic
+
+
+class Command(BaseCommand):
+    help = "부하 테스트용 합성 사용자/쿠폰/스탬프 데이터를 로컬 DB 에 만듭니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", type=float, default=1.0, help="기본 규모 대비 배율 (기본: 1.0)")
+        parser.add_argument("--seed", type=int, default=42, help="난수 seed (같으면 같은 데이터)")
+        parser.add_argument("--manifest", default="loadtest_manifest.json", help="manifest 출력 경로")
+        parser.add_argument("--create-schema", action="store_true", help="없는 테이블을 먼저 만듦")
+        parser.add_argument("--reset", action="store_true", help="기존 합성 데이터를 지우고 다시 만듦")
+        parser.add_argument("--reset-only", action="store_true", help="기존 합성 데이터만 지움")
+
+    def handle(self, *args, **options):
+        try:
+            synthetic.ensure_local_database()
+            if options["create_schema"]:
+                created = synthetic.create_schema()
+                self.stdout.write(f"테이블 {len(created)}개 생성")
+            if options["reset"] or options["reset_only"]:
+                deleted = synthetic.reset()
+                self.stdout.write("삭제: " + ", ".join(f"{name} {count:,}" for name, count in deleted.items()))
+            if options["reset_only"]:
+                return
+            volumes = synthetic.scaled_volumes(options["scale"])
+            self.stdout.write("생성: " + ", ".join(f"{name} {count:,}" for name, count in volumes.items()))
+            result = synthetic.seed(scale=options["scale"], seed=options["seed"], progress=self.stdout.write)
+        except RuntimeError as exc:
+            raise CommandError(str(exc)) from exc
+
+        with open(options["manifest"], "w", encoding="utf-8") as fh:
+            json.dump(result.manifest, fh, ensure_ascii=False, indent=2)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"완료 {result.elapsed_s:.0f}초: "
+                + ", ".join(f"{name} {count:,}" for name, count in result.counts.items())
+                + f" → {options['manifest']}"
+            )
+        )
@@ -6,6 +6,7 @@ from django.db.models import Count
 from django.utils import timezone
 
 from coupons.models import Coupon
+from wouldulike_backend.db_routers import prefer_replica
 
 
 class Command(BaseCommand):
@@ -29,6 +30,7 @@ class Command(BaseCommand):
             help="쿠폰 타입별 건수를 함께 출력합니다.",
         )
 
+    @prefer_replica(force=True)
     def handle(self, *args, **options):
         year = options["year"]
         alias = router.db_for_read(Coupon)
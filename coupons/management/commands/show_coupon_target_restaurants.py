@@ -5,9 +5,7 @@
    - 제휴식당 총 21개, 쿠폰 발급 17개 (4개 제외)
 2) DB 기준: AffiliateRestaurant + RestaurantCouponBenefit + 제외 설정
 """
-import csv
-import re
-from pathlib import Path
+from collections import defaultdict
 
 from django.core.management.base import BaseCommand
 from django.db import router
@@ -145,10 +143,25 @@ class Command(BaseCommand):
                 self.style.WARNING(f"\n⚠ DB에 있으나 CSV NAME_TO_ID 없음: {sorted(in_db_not_csv)}")
             )
 
+        # 쿠폰 타입 / 활성 benefit 식당은 타입별로 따로 조회하지 않고 한 번에 읽는다
+        existing_type_codes = set(
+            CouponType.objects.filter(code__in=COUPON_TYPES_TO_SHOW).values_list("code", flat=True)
+        )
+        benefit_ids_by_type = defaultdict(set)
+        for ct_code, rid in (
+            RestaurantCouponBenefit.objects.using(benefit_alias)
+            .filter(
+                coupon_type__code__in=COUPON_TYPES_TO_SHOW,
+                restaurant_id__in=all_affiliate_ids,
+                active=True,
+            )
+            .values_list("coupon_type__code", "restaurant_id")
+            .distinct()
+        ):
+            benefit_ids_by_type[ct_code].add(rid)
+
         for ct_code in COUPON_TYPES_TO_SHOW:
-            try:
-                ct = CouponType.objects.get(code=ct_code)
-            except CouponType.DoesNotExist:
+            if ct_code not in existing_type_codes:
                 self.stdout.write(self.style.WARNING(f"\n[건너뜀] CouponType {ct_code} 없음"))
                 continue
 
@@ -157,12 +170,7 @@ class Command(BaseCommand):
 
             target_ids = [rid for rid in all_affiliate_ids if rid not in excluded]
 
-            benefit_restaurant_ids = set(
-                RestaurantCouponBenefit.objects.using(benefit_alias)
-                .filter(coupon_type=ct, restaurant_id__in=target_ids, active=True)
-                .values_list("restaurant_id", flat=True)
-                .distinct()
-            )
+            benefit_restaurant_ids = benefit_ids_by_type[ct_code]
             final_target = sorted(rid for rid in target_ids if rid in benefit_restaurant_ids)
 
             self.stdout.write(f"\n--- {ct_code} ---")
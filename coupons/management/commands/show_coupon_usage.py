@@ -5,11 +5,11 @@
 """
 
 from django.core.management.base import BaseCommand
-from django.db.models import Count, Q
 from django.db import router
 
-from coupons.models import Coupon
+from coupons.analytics import load_coupon_frame
 from restaurants.models import AffiliateRestaurant
+from wouldulike_backend.db_routers import prefer_replica
 
 
 class Command(BaseCommand):
@@ -33,29 +33,25 @@ class Command(BaseCommand):
             help="특정 상태의 쿠폰만 조회 (기본값: 전체)",
         )
 
+    @prefer_replica(force=True)
     def handle(self, *args, **options):
-        alias = router.db_for_read(Coupon)
         by_restaurant = options.get("by_restaurant", False)
         restaurant_id = options.get("restaurant_id")
         status_filter = options.get("status")
 
-        # 기본 쿼리셋
-        coupon_qs = Coupon.objects.using(alias)
-
-        # 상태 필터 적용
+        lookups = {}
         if status_filter:
-            coupon_qs = coupon_qs.filter(status=status_filter)
-
-        # 식당 ID 필터 적용
+            lookups["status"] = status_filter
         if restaurant_id:
-            coupon_qs = coupon_qs.filter(restaurant_id=restaurant_id)
+            lookups["restaurant_id"] = restaurant_id
+        # 한 번 스트리밍해서 전체/식당별 집계를 모두 계산
+        frame = load_coupon_frame(include_archive=True, **lookups)
 
         # 전체 통계
-        total_count = coupon_qs.count()
-        status_counts = (
-            coupon_qs.values("status")
-            .annotate(count=Count("id"))
-            .order_by("-count")
+        total_count = len(frame)
+        status_counts = sorted(
+            ((name, count) for name, count in frame.status_counts().items() if count),
+            key=lambda item: -item[1],
         )
 
         self.stdout.write(self.style.SUCCESS("\n=== 쿠폰 사용량 통계 ===\n"))
@@ -66,16 +62,14 @@ class Command(BaseCommand):
             self.stdout.write(f"필터: 식당 ID = {restaurant_id}")
 
         self.stdout.write("\n상태별 통계:")
-        for item in status_counts:
-            status_name = item["status"]
-            count = item["count"]
+        for status_name, count in status_counts:
             percentage = (count / total_count * 100) if total_count > 0 else 0
             self.stdout.write(
                 f"  - {status_name}: {count:,}개 ({percentage:.1f}%)"
             )
 
         # 사용된 쿠폰 (REDEEMED) 상세 정보
-        redeemed_count = coupon_qs.filter(status="REDEEMED").count()
+        redeemed_count = dict(status_counts).get("REDEEMED", 0)
         if redeemed_count > 0:
             self.stdout.write(f"\n사용된 쿠폰 (REDEEMED): {redeemed_count:,}개")
 
@@ -83,48 +77,22 @@ class Command(BaseCommand):
         if by_restaurant or restaurant_id:
             self.stdout.write("\n=== 식당별 쿠폰 통계 ===\n")
 
-            # 식당별 쿼리
-            restaurant_qs = coupon_qs.exclude(restaurant_id__isnull=True)
-
-            if restaurant_id:
-                # 특정 식당만 조회
-                restaurant_stats = (
-                    restaurant_qs.values("restaurant_id")
-                    .annotate(
-                        total=Count("id"),
-                        redeemed=Count("id", filter=Q(status="REDEEMED")),
-                        issued=Count("id", filter=Q(status="ISSUED")),
-                        expired=Count("id", filter=Q(status="EXPIRED")),
-                        canceled=Count("id", filter=Q(status="CANCELED")),
-                    )
-                    .order_by("-redeemed", "-total")
-                )
-            else:
-                # 모든 식당 조회
-                restaurant_stats = (
-                    restaurant_qs.values("restaurant_id")
-                    .annotate(
-                        total=Count("id"),
-                        redeemed=Count("id", filter=Q(status="REDEEMED")),
-                        issued=Count("id", filter=Q(status="ISSUED")),
-                        expired=Count("id", filter=Q(status="EXPIRED")),
-                        canceled=Count("id", filter=Q(status="CANCELED")),
-                    )
-                    .order_by("-redeemed", "-total")
-                )
+            restaurant_stats = sorted(
+                (row for row in frame.pivot(["restaurant"]) if row["restaurant"] is not None),
+                key=lambda row: (-row["redeemed"], -row["total"]),
+            )
 
             # 식당 이름 조회를 위한 캐시
             restaurant_alias = router.db_for_read(AffiliateRestaurant)
-            restaurant_ids = [item["restaurant_id"] for item in restaurant_stats]
+            restaurant_ids = [item["restaurant"] for item in restaurant_stats]
             restaurant_names = {}
             if restaurant_ids:
                 try:
-                    restaurants = AffiliateRestaurant.objects.using(restaurant_alias).filter(
-                        restaurant_id__in=restaurant_ids
+                    restaurant_names = dict(
+                        AffiliateRestaurant.objects.using(restaurant_alias)
+                        .filter(restaurant_id__in=restaurant_ids)
+                        .values_list("restaurant_id", "name")
                     )
-                    restaurant_names = {
-                        r.restaurant_id: r.name for r in restaurants
-                    }
                 except Exception:
                     pass
 
@@ -133,7 +101,7 @@ class Command(BaseCommand):
                 # 특정 식당 상세 정보
                 if restaurant_stats:
                     item = restaurant_stats[0]
-                    rid = item["restaurant_id"]
+                    rid = item["restaurant"]
                     name = restaurant_names.get(rid, "N/A")
                     self.stdout.write(f"식당 ID: {rid}")
                     self.stdout.write(f"식당명: {name}")
@@ -151,7 +119,7 @@ class Command(BaseCommand):
                 # 모든 식당 요약 정보
                 self.stdout.write("식당별 쿠폰 사용량 (사용된 쿠폰 수 기준 정렬):\n")
                 for idx, item in enumerate(restaurant_stats[:50], 1):  # 상위 50개만 표시
-                    rid = item["restaurant_id"]
+                    rid = item["restaurant"]
                     name = restaurant_names.get(rid, "N/A")
                     self.stdout.write(
                         f"{idx:3d}. 식당 ID {rid:4d} ({name[:30]:30s}) - "
@@ -167,4 +135,3 @@ class Command(BaseCommand):
                     self.stdout.write(f"\n... 외 {len(restaurant_stats) - 50}개 식당 더 있습니다.")
 
         self.stdout.write("")
-
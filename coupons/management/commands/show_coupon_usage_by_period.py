@@ -3,16 +3,19 @@
 
 각 식당별로 신규가입, 친구초대, 이벤트별, 스탬프 5개, 스탬프 10개 쿠폰의 발급량과 사용량을
 기간별로 확인할 수 있습니다.
+날짜는 KST 기준이며, 전체 기간의 쿠폰을 coupons.analytics 로 한 번만 읽어서 기간/식당/타입별로 나눠 집계합니다.
 """
 
-from datetime import datetime, timedelta
+from collections import defaultdict
+from datetime import datetime
 from django.core.management.base import BaseCommand
-from django.db.models import Count, Q, F
+from django.db.models import Q
 from django.db import router
-from django.utils import timezone
 
-from coupons.models import Coupon, CouponType, Campaign
+from coupons.analytics import kst_range, load_coupon_frame
+from coupons.models import Coupon, Campaign
 from restaurants.models import AffiliateRestaurant
+from wouldulike_backend.db_routers import prefer_replica
 
 
 class Command(BaseCommand):
@@ -52,6 +55,7 @@ class Command(BaseCommand):
             help="특정 쿠폰 타입 코드만 조회",
         )
 
+    @prefer_replica(force=True)
     def handle(self, *args, **options):
         year = options.get("year", 2024)
         month = options.get("month", 12)
@@ -113,6 +117,18 @@ class Command(BaseCommand):
                 )
             )
 
+        # 전체 기간을 덮는 쿠폰(발급 또는 사용)을 한 번만 스트리밍
+        range_start, range_end = kst_range(
+            min(p["start"] for p in periods), max(p["end"] for p in periods)
+        )
+        frame_filter = Q(issued_at__gte=range_start, issued_at__lt=range_end) | Q(
+            redeemed_at__gte=range_start, redeemed_at__lt=range_end
+        )
+        if restaurant_id:
+            frame_filter &= Q(restaurant_id=restaurant_id)
+        frame = load_coupon_frame(frame_filter, db_alias=alias, include_archive=True)
+        campaign_names = {code: name for code, name in frame.campaigns.values()}
+
         # 결과 출력
         self.stdout.write(self.style.SUCCESS("\n" + "=" * 100))
         self.stdout.write(
@@ -127,6 +143,10 @@ class Command(BaseCommand):
             )
             self.stdout.write("-" * 100)
 
+            span = (period["start"], period["end"])
+            issued_stats = self._counts_by_restaurant(frame.where(issued=span))
+            usage_stats = self._counts_by_restaurant(frame.where(status="REDEEMED", redeemed=span))
+
             # 각 식당별로 통계 출력
             for restaurant in restaurants:
                 rid = restaurant.restaurant_id
@@ -135,25 +155,20 @@ class Command(BaseCommand):
                 self.stdout.write(f"\n🍽️  식당 ID {rid}: {name}")
                 self.stdout.write("-" * 80)
 
+                issued_types, issued_campaigns = issued_stats.get(rid, ({}, {}))
+                used_types, used_campaigns = usage_stats.get(rid, ({}, {}))
+
                 # 각 쿠폰 타입 그룹별로 통계 출력
                 has_any_data = False
                 for group_name, type_codes_or_campaigns in coupon_type_groups.items():
                     if group_name == "이벤트별":
                         # 이벤트별은 Campaign으로 구분
-                        issued_count = self._get_event_issued_count(
-                            alias,
-                            rid,
-                            period["start"],
-                            period["end"],
-                            type_codes_or_campaigns,
-                        )
-                        usage_count = self._get_event_usage_count(
-                            alias,
-                            rid,
-                            period["start"],
-                            period["end"],
-                            type_codes_or_campaigns,
-                        )
+                        issued_count = {
+                            code: cnt for code, cnt in issued_campaigns.items() if code in type_codes_or_campaigns
+                        }
+                        usage_count = {
+                            code: cnt for code, cnt in used_campaigns.items() if code in type_codes_or_campaigns
+                        }
                         
                         if issued_count or usage_count:
                             has_any_data = True
@@ -162,13 +177,7 @@ class Command(BaseCommand):
                             for campaign_code in set(list(issued_count.keys()) + list(usage_count.keys())):
                                 issued = issued_count.get(campaign_code, 0)
                                 used = usage_count.get(campaign_code, 0)
-                                try:
-                                    campaign = Campaign.objects.using(alias).get(
-                                        code=campaign_code
-                                    )
-                                    campaign_name = campaign.name
-                                except Campaign.DoesNotExist:
-                                    campaign_name = campaign_code
+                                campaign_name = campaign_names.get(campaign_code, campaign_code)
                                 
                                 usage_rate = (used / issued * 100) if issued > 0 else 0
                                 campaign_details.append(
@@ -185,20 +194,8 @@ class Command(BaseCommand):
                             self.stdout.write(f"  {group_name}: (이벤트 없음)")
                     else:
                         # 일반 쿠폰 타입
-                        issued_count = self._get_coupon_type_issued_count(
-                            alias,
-                            rid,
-                            period["start"],
-                            period["end"],
-                            type_codes_or_campaigns,
-                        )
-                        usage_count = self._get_coupon_type_usage_count(
-                            alias,
-                            rid,
-                            period["start"],
-                            period["end"],
-                            type_codes_or_campaigns,
-                        )
+                        issued_count = sum(issued_types.get(code, 0) for code in type_codes_or_campaigns)
+                        usage_count = sum(used_types.get(code, 0) for code in type_codes_or_campaigns)
                         
                         if issued_count > 0 or usage_count > 0:
                             has_any_data = True
@@ -220,6 +217,16 @@ class Command(BaseCommand):
 
         self.stdout.write("\n" + "=" * 100 + "\n")
 
+    def _counts_by_restaurant(self, frame):
+        """식당별 (쿠폰 타입 코드별 건수, 캠페인 코드별 건수)"""
+        stats = defaultdict(lambda: ({}, {}))
+        for row in frame.pivot(["restaurant", "coupon_type"]):
+            stats[row["restaurant"]][0][row["coupon_type"]] = row["total"]
+        for row in frame.pivot(["restaurant", "campaign"]):
+            if row["campaign"]:
+                stats[row["restaurant"]][1][row["campaign"]] = row["total"]
+        return stats
+
     def _get_default_periods(self, year, month):
         """기본 기간 설정 (12월 주차별)"""
         periods = []
@@ -264,114 +271,11 @@ class Command(BaseCommand):
         ).values_list("code", flat=True)
         return list(event_campaigns)
 
-    def _get_coupon_type_issued_count(
-        self, alias, restaurant_id, start_date, end_date, coupon_type_codes
-    ):
-        """쿠폰 타입별 발급량 조회"""
-        start_datetime = timezone.make_aware(
-            datetime.combine(start_date, datetime.min.time())
-        )
-        end_datetime = timezone.make_aware(
-            datetime.combine(end_date, datetime.max.time())
-        )
-
-        count = (
-            Coupon.objects.using(alias)
-            .filter(
-                restaurant_id=restaurant_id,
-                coupon_type__code__in=coupon_type_codes,
-                issued_at__gte=start_datetime,
-                issued_at__lte=end_datetime,
-            )
-            .count()
-        )
-        return count
-
-    def _get_coupon_type_usage_count(
-        self, alias, restaurant_id, start_date, end_date, coupon_type_codes
-    ):
-        """쿠폰 타입별 사용량 조회"""
-        start_datetime = timezone.make_aware(
-            datetime.combine(start_date, datetime.min.time())
-        )
-        end_datetime = timezone.make_aware(
-            datetime.combine(end_date, datetime.max.time())
-        )
-
-        count = (
-            Coupon.objects.using(alias)
-            .filter(
-                restaurant_id=restaurant_id,
-                coupon_type__code__in=coupon_type_codes,
-                status="REDEEMED",
-                redeemed_at__gte=start_datetime,
-                redeemed_at__lte=end_datetime,
-            )
-            .count()
-        )
-        return count
-
-    def _get_event_issued_count(
-        self, alias, restaurant_id, start_date, end_date, campaign_codes
-    ):
-        """이벤트 Campaign별 발급량 조회"""
-        start_datetime = timezone.make_aware(
-            datetime.combine(start_date, datetime.min.time())
-        )
-        end_datetime = timezone.make_aware(
-            datetime.combine(end_date, datetime.max.time())
-        )
-
-        issued_by_campaign = (
-            Coupon.objects.using(alias)
-            .filter(
-                restaurant_id=restaurant_id,
-                campaign__code__in=campaign_codes,
-                issued_at__gte=start_datetime,
-                issued_at__lte=end_datetime,
-            )
-            .values("campaign__code")
-            .annotate(count=Count("id"))
-        )
-
-        return {item["campaign__code"]: item["count"] for item in issued_by_campaign}
-
-    def _get_event_usage_count(
-        self, alias, restaurant_id, start_date, end_date, campaign_codes
-    ):
-        """이벤트 Campaign별 사용량 조회"""
-        start_datetime = timezone.make_aware(
-            datetime.combine(start_date, datetime.min.time())
-        )
-        end_datetime = timezone.make_aware(
-            datetime.combine(end_date, datetime.max.time())
-        )
-
-        usage_by_campaign = (
-            Coupon.objects.using(alias)
-            .filter(
-                restaurant_id=restaurant_id,
-                campaign__code__in=campaign_codes,
-                status="REDEEMED",
-                redeemed_at__gte=start_datetime,
-                redeemed_at__lte=end_datetime,
-            )
-            .values("campaign__code")
-            .annotate(count=Count("id"))
-        )
-
-        return {item["campaign__code"]: item["count"] for item in usage_by_campaign}
-
     def _print_coupon_type_details(
         self, alias, restaurant_id, start_date, end_date, coupon_type_code
     ):
         """특정 쿠폰 타입의 상세 정보 출력"""
-        start_datetime = timezone.make_aware(
-            datetime.combine(start_date, datetime.min.time())
-        )
-        end_datetime = timezone.make_aware(
-            datetime.combine(end_date, datetime.max.time())
-        )
+        start_datetime, end_datetime = kst_range(start_date, end_date)
 
         coupons = (
             Coupon.objects.using(alias)
@@ -380,7 +284,7 @@ class Command(BaseCommand):
                 coupon_type__code=coupon_type_code,
                 status="REDEEMED",
                 redeemed_at__gte=start_datetime,
-                redeemed_at__lte=end_datetime,
+                redeemed_at__lt=end_datetime,
             )
             .select_related("coupon_type", "campaign", "user")
             .order_by("redeemed_at")
@@ -0,0 +1,60 @@
+# Generated by Django 4.2.6 on 2026-10-19 15:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coupons', '0092_sync_jonggang_benefits_from_csv_v2'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RestaurantDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('restaurant_id', models.IntegerField()),
+                ('day', models.DateField()),
+                ('stamps_earned', models.PositiveIntegerField(default=0)),
+                ('unique_visitors', models.PositiveIntegerField(default=0)),
+                ('coupons_redeemed', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='StatsRollupCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=40, unique=True)),
+                ('rolled_up_until', models.DateTimeField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='RestaurantUserVisitStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('restaurant_id', models.IntegerField()),
+                ('user_id', models.BigIntegerField()),
+                ('month', models.DateField(blank=True, null=True)),
+                ('visits', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['restaurant_id', 'month', 'visits'], name='ix_rest_user_visit_month')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='restaurantuservisitstats',
+            constraint=models.UniqueConstraint(condition=models.Q(('month__isnull', False)), fields=('restaurant_id', 'user_id', 'month'), name='uq_restaurant_user_visit_month'),
+        ),
+        migrations.AddConstraint(
+            model_name='restaurantuservisitstats',
+            constraint=models.UniqueConstraint(condition=models.Q(('month__isnull', True)), fields=('restaurant_id', 'user_id'), name='uq_restaurant_user_visit_total'),
+        ),
+        migrations.AddConstraint(
+            model_name='restaurantdailystats',
+            constraint=models.UniqueConstraint(fields=('restaurant_id', 'day'), name='uq_restaurant_daily_stats'),
+        ),
+    ]
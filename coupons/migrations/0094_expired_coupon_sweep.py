@@ -0,0 +1,47 @@
+# Generated by Django 4.2.6 on 2026-10-19 15:11
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coupons', '0093_dashboard_stats_rollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CouponArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_id', models.BigIntegerField(unique=True)),
+                ('code', models.CharField(max_length=20)),
+                ('user_id', models.BigIntegerField(db_index=True)),
+                ('status', models.CharField(choices=[('ISSUED', 'ISSUED'), ('REDEEMED', 'REDEEMED'), ('EXPIRED', 'EXPIRED'), ('CANCELED', 'CANCELED')], max_length=10)),
+                ('issued_at', models.DateTimeField()),
+                ('expires_at', models.DateTimeField()),
+                ('redeemed_at', models.DateTimeField(blank=True, null=True)),
+                ('restaurant_id', models.IntegerField(blank=True, null=True)),
+                ('benefit_snapshot', models.JSONField(blank=True, null=True)),
+                ('issue_key', models.CharField(blank=True, max_length=120, null=True)),
+                ('archive_reason', models.CharField(choices=[('EXPIRED_SWEEP', 'EXPIRED_SWEEP')], max_length=20)),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='coupon',
+            index=models.Index(condition=models.Q(('status__in', ['ISSUED', 'EXPIRED'])), fields=['expires_at', 'id'], name='ix_coupon_sweep_expires_at'),
+        ),
+        migrations.AddField(
+            model_name='couponarchive',
+            name='campaign',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='coupons.campaign'),
+        ),
+        migrations.AddField(
+            model_name='couponarchive',
+            name='coupon_type',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='coupons.coupontype'),
+        ),
+    ]
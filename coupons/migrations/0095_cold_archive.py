@@ -0,0 +1,65 @@
+# Generated by Django 4.2.6 on 2026-10-19 15:13
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+# 아카이브 테이블은 append-only 라 시간 컬럼과 물리 순서가 거의 일치한다.
+# PostgreSQL 에서는 BRIN 인덱스(수 페이지 크기)로 기간 조회를 처리한다.
+BRIN_INDEXES = (
+    ("ix_stamp_archive_created_brin", "coupons_stampeventarchive", "created_at"),
+    ("ix_coupon_archive_archived_brin", "coupons_couponarchive", "archived_at"),
+    ("ix_coupon_archive_issued_brin", "coupons_couponarchive", "issued_at"),
+)
+
+
+def create_brin_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, table, column in BRIN_INDEXES:
+        schema_editor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} USING brin ({column})")
+
+
+def drop_brin_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, _table, _column in BRIN_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coupons', '0094_expired_coupon_sweep'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StampEventArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_id', models.BigIntegerField(unique=True)),
+                ('user_id', models.BigIntegerField(db_index=True)),
+                ('restaurant_id', models.IntegerField()),
+                ('delta', models.SmallIntegerField()),
+                ('source', models.CharField(max_length=10)),
+                ('created_at', models.DateTimeField()),
+                ('metadata_json', models.JSONField(blank=True, default=dict)),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='couponarchive',
+            name='archive_reason',
+            field=models.CharField(choices=[('EXPIRED_SWEEP', 'EXPIRED_SWEEP'), ('AGED', 'AGED')], max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='couponarchive',
+            index=models.Index(fields=['restaurant_id', 'redeemed_at'], name='ix_coupon_archive_rest_redeem'),
+        ),
+        migrations.AddIndex(
+            model_name='stampeventarchive',
+            index=models.Index(fields=['restaurant_id', 'created_at'], name='ix_stamp_archive_rest_created'),
+        ),
+        migrations.RunPython(create_brin_indexes, drop_brin_indexes),
+    ]
@@ -102,11 +102,77 @@ class Coupon(models.Model):
                 name="uq_coupon_issue_guard",
             )
         ]
+        indexes = [
+            # 만료 쿠폰 배치 정리(coupons.expired_sweeper)용: 정리 대상 상태만 담는 부분 인덱스
+            models.Index(
+                fields=["expires_at", "id"],
+                condition=models.Q(status__in=["ISSUED", "EXPIRED"]),
+                name="ix_coupon_sweep_expires_at",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.code}({self.status})"
 
 
+class CouponArchive(models.Model):
+    """
+    hot 테이블(Coupon)에서 빠진 쿠폰 보관용 cold 테이블.
+    원본 컬럼을 그대로 복사하고, FK 는 제약 없이 id 만 유지한다.
+    """
+
+    REASON = (
+        ("EXPIRED_SWEEP", "EXPIRED_SWEEP"),  # 만료 미사용 쿠폰 정리
+        ("AGED", "AGED"),  # 사용/만료 후 보관 기간이 지난 쿠폰 (coupons.archiver)
+    )
+    # Coupon.values() 로 읽어 복사하는 컬럼
+    SOURCE_FIELDS = (
+        "id",
+        "code",
+        "user_id",
+        "coupon_type_id",
+        "campaign_id",
+        "status",
+        "issued_at",
+        "expires_at",
+        "redeemed_at",
+        "restaurant_id",
+        "benefit_snapshot",
+        "issue_key",
+    )
+    original_id = models.BigIntegerField(unique=True)
+    code = models.CharField(max_length=20)
+    user_id = models.BigIntegerField(db_index=True)
+    coupon_type = models.ForeignKey(
+        CouponType, on_delete=models.DO_NOTHING, db_constraint=False, related_name="+"
+    )
+    campaign = models.ForeignKey(
+        Campaign, on_delete=models.DO_NOTHING, null=True, blank=True, db_constraint=False, related_name="+"
+    )
+    status = models.CharField(max_length=10, choices=Coupon.STATUS)
+    issued_at = models.DateTimeField()
+    expires_at = models.DateTimeField()
+    redeemed_at = models.DateTimeField(null=True, blank=True)
+    restaurant_id = models.IntegerField(null=True, blank=True)
+    benefit_snapshot = models.JSONField(null=True, blank=True)
+    issue_key = models.CharField(max_length=120, null=True, blank=True)
+    archive_reason = models.CharField(max_length=20, choices=REASON)
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["restaurant_id", "redeemed_at"], name="ix_coupon_archive_rest_redeem"),
+        ]
+
+    def __str__(self):
+        return f"Archived:{self.code}({self.status})"
+
+    @classmethod
+    def from_values(cls, row: dict, *, reason: str, archived_at) -> "CouponArchive":
+        values = {field: row[field] for field in cls.SOURCE_FIELDS if field != "id"}
+        return cls(original_id=row["id"], archive_reason=reason, archived_at=archived_at, **values)
+
+
 class InviteCode(models.Model):
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="invite_codes", db_constraint=False
@@ -223,6 +289,34 @@ class StampEvent(models.Model):
         return f"StampEvent u={self.user_id} r={self.restaurant_id} d={self.delta} @ {self.created_at:%Y-%m-%d %H:%M:%S}"
 
 
+class StampEventArchive(models.Model):
+    """보관 기간이 지난 StampEvent 보관용 cold 테이블 (append-only, coupons.archiver)."""
+
+    SOURCE_FIELDS = ("id", "user_id", "restaurant_id", "delta", "source", "created_at", "metadata_json")
+
+    original_id = models.BigIntegerField(unique=True)
+    user_id = models.BigIntegerField(db_index=True)
+    restaurant_id = models.IntegerField()
+    delta = models.SmallIntegerField()
+    source = models.CharField(max_length=10)
+    created_at = models.DateTimeField()
+    metadata_json = models.JSONField(default=dict, blank=True)
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["restaurant_id", "created_at"], name="ix_stamp_archive_rest_created"),
+        ]
+
+    def __str__(self):
+        return f"ArchivedStampEvent u={self.user_id} r={self.restaurant_id} d={self.delta}"
+
+    @classmethod
+    def from_values(cls, row: dict, *, archived_at) -> "StampEventArchive":
+        values = {field: row[field] for field in cls.SOURCE_FIELDS if field != "id"}
+        return cls(original_id=row["id"], archived_at=archived_at, **values)
+
+
 class StampRewardRule(models.Model):
     """
     식당별 스탬프 보상 규칙.
@@ -271,3 +365,79 @@ class CouponRestaurantExclusion(models.Model):
 
     def __str__(self):
         return f"Exclude:{self.coupon_type.code}:{self.restaurant_id}"
+
+
+class RestaurantDailyStats(models.Model):
+    """
+    식당별 일 단위 대시보드 집계 (rollup_dashboard_stats 로 갱신).
+    - day: UTC 날짜 (대시보드 월 경계와 동일 기준)
+    """
+
+    restaurant_id = models.IntegerField()
+    day = models.DateField()
+    # delta>0 StampEvent 행 수
+    stamps_earned = models.PositiveIntegerField(default=0)
+    # 해당 일 스탬프 적립한 서로 다른 사용자 수
+    unique_visitors = models.PositiveIntegerField(default=0)
+    # redeemed_at 기준 사용 완료 쿠폰 수
+    coupons_redeemed = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["restaurant_id", "day"], name="uq_restaurant_daily_stats"
+            )
+        ]
+
+    def __str__(self):
+        return f"DailyStats:{self.restaurant_id}@{self.day}"
+
+
+class RestaurantUserVisitStats(models.Model):
+    """
+    식당×사용자 방문(스탬프 적립) 횟수 집계.
+    - month 가 있으면 해당 월(UTC, 1일) 방문 수, NULL 이면 전체 기간 누적 방문 수
+    """
+
+    restaurant_id = models.IntegerField()
+    user_id = models.BigIntegerField()
+    month = models.DateField(null=True, blank=True)
+    visits = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["restaurant_id", "user_id", "month"],
+                condition=models.Q(month__isnull=False),
+                name="uq_restaurant_user_visit_month",
+            ),
+            models.UniqueConstraint(
+                fields=["restaurant_id", "user_id"],
+                condition=models.Q(month__isnull=True),
+                name="uq_restaurant_user_visit_total",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["restaurant_id", "month", "visits"], name="ix_rest_user_visit_month"),
+        ]
+
+    def __str__(self):
+        scope = self.month or "total"
+        return f"Visits:{self.restaurant_id}:{self.user_id}({scope})={self.visits}"
+
+
+class StatsRollupCheckpoint(models.Model):
+    """
+    배치 작업별 진행 지점.
+    - dashboard_stats: rolled_up_until 이전 원천 데이터는 집계 테이블에 반영됨
+    - expired_coupon_sweep: rolled_up_until 이전에 만료된 쿠폰은 정리 완료
+    """
+
+    name = models.CharField(max_length=40, unique=True)
+    rolled_up_until = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Checkpoint:{self.name}@{self.rolled_up_until:%Y-%m-%d %H:%M:%S}"
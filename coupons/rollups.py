@@ -0,0 +1,414 @@
+"""
+점주 대시보드 핵심 지표 사전 집계 (RestaurantDailyStats / RestaurantUserVisitStats).
+
+DashboardStatsView 는 매 요청마다 StampEvent 전체를 GROUP BY 하던 대신
+- 체크포인트(rolled_up_until) 이전 구간은 집계 테이블에서 읽고
+- 체크포인트 이후의 짧은 꼬리 구간만 원천 테이블에서 실시간으로 더한다.
+
+집계는 rollup_dashboard_stats 커맨드로 주기적으로 갱신한다.
+- 증분 모드: 직전 체크포인트 ~ (now - ROLLUP_SETTLE_DELAY) 구간만 반영
+- 백필 모드: 지정 월(또는 전체)부터 집계 테이블을 다시 만든다
+
+날짜 경계는 기존 대시보드와 동일하게 UTC 기준이다.
+coupons.archiver 가 옮긴 오래된 행(StampEventArchive / CouponArchive)도 함께 더해서 집계한다.
+아카이브 기준 시각은 UTC 자정이라 하루치 이벤트가 두 테이블에 나뉘지 않는다.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+
+from django.db import router, transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate, TruncMonth
+from django.utils import timezone
+
+from .models import (
+    Coupon,
+    CouponArchive,
+    RestaurantDailyStats,
+    RestaurantUserVisitStats,
+    StampEvent,
+    StampEventArchive,
+    StatsRollupCheckpoint,
+)
+
+DASHBOARD_CHECKPOINT_NAME = "dashboard_stats"
+# 커밋이 늦게 끝나는 트랜잭션(created_at < 커밋 시각)을 놓치지 않도록 최근 구간은 집계하지 않음
+ROLLUP_SETTLE_DELAY = timedelta(minutes=2)
+
+REVISIT_MIN_VISITS = 2
+LOYAL_MIN_VISITS = 3
+
+_BULK_BATCH_SIZE = 1000
+
+
+def _month_start(value: datetime) -> datetime:
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _day_start(value: datetime) -> datetime:
+    return value.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _as_date(value) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+def _visit_events(db_alias: str):
+    return StampEvent.objects.using(db_alias).filter(delta__gt=0)
+
+
+def _visit_event_sources(db_alias: str):
+    """hot + 아카이브 방문 이벤트 (집계/백필용)."""
+    return (_visit_events(db_alias), StampEventArchive.objects.using(db_alias).filter(delta__gt=0))
+
+
+def _redeemed_coupon_sources(db_alias: str):
+    return tuple(
+        model.objects.using(db_alias).filter(status="REDEEMED", restaurant_id__isnull=False)
+        for model in (Coupon, CouponArchive)
+    )
+
+
+def _resolve_alias(db_alias: str | None) -> str:
+    return db_alias or router.db_for_write(StatsRollupCheckpoint)
+
+
+def _resolve_read_alias(db_alias: str | None) -> str:
+    # 대시보드 조회는 prefer_replica() 안에서 호출되면 복제본을 쓸 수 있다
+    return db_alias or router.db_for_read(StatsRollupCheckpoint)
+
+
+def get_checkpoint(db_alias: str | None = None) -> datetime | None:
+    db_alias = _resolve_alias(db_alias)
+    row = (
+        StatsRollupCheckpoint.objects.using(db_alias)
+        .filter(name=DASHBOARD_CHECKPOINT_NAME)
+        .values_list("rolled_up_until", flat=True)
+        .first()
+    )
+    return row
+
+
+def _rebuild_daily(start: datetime, until: datetime, db_alias: str) -> int:
+    """[start 일자, until) 구간의 일별 집계를 지우고 다시 만든다. start 는 UTC 자정."""
+    counts: dict[tuple[int, date], dict] = defaultdict(
+        lambda: {"stamps_earned": 0, "unique_visitors": 0, "coupons_redeemed": 0}
+    )
+
+    for events in _visit_event_sources(db_alias):
+        stamp_rows = (
+            events.filter(created_at__gte=start, created_at__lt=until)
+            .annotate(day=TruncDate("created_at", tzinfo=dt_timezone.utc))
+            .values("restaurant_id", "day")
+            .annotate(stamps=Count("id"), visitors=Count("user_id", distinct=True))
+        )
+        for row in stamp_rows:
+            bucket = counts[(row["restaurant_id"], _as_date(row["day"]))]
+            bucket["stamps_earned"] += row["stamps"]
+            bucket["unique_visitors"] += row["visitors"]
+
+    for coupons in _redeemed_coupon_sources(db_alias):
+        redeemed_rows = (
+            coupons.filter(redeemed_at__gte=start, redeemed_at__lt=until)
+            .annotate(day=TruncDate("redeemed_at", tzinfo=dt_timezone.utc))
+            .values("restaurant_id", "day")
+            .annotate(redeemed=Count("id"))
+        )
+        for row in redeemed_rows:
+            counts[(row["restaurant_id"], _as_date(row["day"]))]["coupons_redeemed"] += row["redeemed"]
+
+    RestaurantDailyStats.objects.using(db_alias).filter(day__gte=start.date()).delete()
+    RestaurantDailyStats.objects.using(db_alias).bulk_create(
+        [
+            RestaurantDailyStats(restaurant_id=restaurant_id, day=day, **values)
+            for (restaurant_id, day), values in counts.items()
+        ],
+        batch_size=_BULK_BATCH_SIZE,
+    )
+    return len(counts)
+
+
+def _add_visits(start: datetime | None, until: datetime, db_alias: str) -> int:
+    """[start, until) 구간 방문 수를 월별/누적 방문 집계에 더한다."""
+    deltas: dict[tuple[int, int, date | None], int] = defaultdict(int)
+    for events in _visit_event_sources(db_alias):
+        events = events.filter(created_at__lt=until)
+        if start is not None:
+            events = events.filter(created_at__gte=start)
+        rows = (
+            events.annotate(month=TruncMonth("created_at", tzinfo=dt_timezone.utc))
+            .values("restaurant_id", "user_id", "month")
+            .annotate(visits=Count("id"))
+        )
+        for row in rows:
+            restaurant_id, user_id = row["restaurant_id"], row["user_id"]
+            deltas[(restaurant_id, user_id, _as_date(row["month"]))] += row["visits"]
+            deltas[(restaurant_id, user_id, None)] += row["visits"]
+    if not deltas:
+        return 0
+
+    restaurant_ids = {key[0] for key in deltas}
+    user_ids = {key[1] for key in deltas}
+    months = {key[2] for key in deltas if key[2] is not None}
+    existing = {
+        (obj.restaurant_id, obj.user_id, obj.month): obj
+        for obj in RestaurantUserVisitStats.objects.using(db_alias).filter(
+            Q(month__in=months) | Q(month__isnull=True),
+            restaurant_id__in=restaurant_ids,
+            user_id__in=user_ids,
+        )
+    }
+
+    to_update, to_create = [], []
+    for (restaurant_id, user_id, month), visits in deltas.items():
+        obj = existing.get((restaurant_id, user_id, month))
+        if obj is None:
+            to_create.append(
+                RestaurantUserVisitStats(
+                    restaurant_id=restaurant_id, user_id=user_id, month=month, visits=visits
+                )
+            )
+        else:
+            obj.visits += visits
+            obj.updated_at = timezone.now()
+            to_update.append(obj)
+
+    manager = RestaurantUserVisitStats.objects.using(db_alias)
+    manager.bulk_create(to_create, batch_size=_BULK_BATCH_SIZE)
+    manager.bulk_update(to_update, ["visits", "updated_at"], batch_size=_BULK_BATCH_SIZE)
+    return len(deltas)
+
+
+def rollup_dashboard_stats(
+    *,
+    until: datetime | None = None,
+    db_alias: str | None = None,
+) -> dict:
+    """
+    증분 집계. 체크포인트 ~ until 구간만 집계 테이블에 반영하고 체크포인트를 옮긴다.
+    체크포인트가 없으면 전체 백필로 대신한다.
+    """
+    db_alias = _resolve_alias(db_alias)
+    until = until or (timezone.now() - ROLLUP_SETTLE_DELAY)
+    with transaction.atomic(using=db_alias):
+        checkpoint = (
+            StatsRollupCheckpoint.objects.using(db_alias)
+            .select_for_update()
+            .filter(name=DASHBOARD_CHECKPOINT_NAME)
+            .first()
+        )
+        if checkpoint is None:
+            return _backfill_locked(since=None, until=until, db_alias=db_alias)
+        start = checkpoint.rolled_up_until
+        if until <= start:
+            return {"mode": "noop", "from": start, "until": start, "daily_rows": 0, "visit_rows": 0}
+
+        daily_rows = _rebuild_daily(_day_start(start), until, db_alias)
+        visit_rows = _add_visits(start, until, db_alias)
+        checkpoint.rolled_up_until = until
+        checkpoint.save(update_fields=["rolled_up_until", "updated_at"])
+
+    return {
+        "mode": "incremental",
+        "from": start,
+        "until": until,
+        "daily_rows": daily_rows,
+        "visit_rows": visit_rows,
+    }
+
+
+def backfill_dashboard_stats(
+    *,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    db_alias: str | None = None,
+) -> dict:
+    """
+    백필. since 가 속한 달(미지정 시 전체)부터 집계 테이블을 다시 만든다.
+    월별 방문 수가 월 단위라 since 는 해당 월 1일로 내린다.
+    """
+    db_alias = _resolve_alias(db_alias)
+    until = until or (timezone.now() - ROLLUP_SETTLE_DELAY)
+    with transaction.atomic(using=db_alias):
+        # 증분 집계와 동시에 돌지 않도록 체크포인트 행을 잠근다
+        list(
+            StatsRollupCheckpoint.objects.using(db_alias)
+            .select_for_update()
+            .filter(name=DASHBOARD_CHECKPOINT_NAME)
+        )
+        return _backfill_locked(since=since, until=until, db_alias=db_alias)
+
+
+def _backfill_locked(*, since: datetime | None, until: datetime, db_alias: str) -> dict:
+    start = _month_start(since) if since is not None else None
+    visits = RestaurantUserVisitStats.objects.using(db_alias)
+
+    if start is None:
+        firsts = [
+            events.order_by("created_at").values_list("created_at", flat=True).first()
+            for events in _visit_event_sources(db_alias)
+        ]
+        firsts += [
+            coupons.filter(redeemed_at__isnull=False)
+            .order_by("redeemed_at")
+            .values_list("redeemed_at", flat=True)
+            .first()
+            for coupons in _redeemed_coupon_sources(db_alias)
+        ]
+        candidates = [value for value in firsts if value is not None]
+        daily_start = _day_start(min(candidates)) if candidates else _day_start(until)
+        visits.all().delete()
+    else:
+        daily_start = start
+        touched = list(
+            visits.filter(month__gte=start.date()).values_list("restaurant_id", "user_id").distinct()
+        )
+        visits.filter(month__gte=start.date()).delete()
+
+    daily_rows = _rebuild_daily(daily_start, until, db_alias)
+    visit_rows = _add_visits(start, until, db_alias)
+
+    if start is not None:
+        # 누적 방문 수는 월별 행의 합으로 다시 맞춘다 (since 이전 월 + 새로 만든 월)
+        touched_pairs = set(touched) | set(
+            visits.filter(month__gte=start.date()).values_list("restaurant_id", "user_id").distinct()
+        )
+        _resync_totals(touched_pairs, db_alias)
+
+    StatsRollupCheckpoint.objects.using(db_alias).update_or_create(
+        name=DASHBOARD_CHECKPOINT_NAME,
+        defaults={"rolled_up_until": until},
+    )
+    return {
+        "mode": "backfill",
+        "from": start or daily_start,
+        "until": until,
+        "daily_rows": daily_rows,
+        "visit_rows": visit_rows,
+    }
+
+
+def _resync_totals(pairs: set[tuple[int, int]], db_alias: str) -> None:
+    if not pairs:
+        return
+    manager = RestaurantUserVisitStats.objects.using(db_alias)
+    restaurant_ids = {pair[0] for pair in pairs}
+    user_ids = {pair[1] for pair in pairs}
+    sums = {
+        (row["restaurant_id"], row["user_id"]): row["total"]
+        for row in manager.filter(
+            month__isnull=False, restaurant_id__in=restaurant_ids, user_id__in=user_ids
+        )
+        .values("restaurant_id", "user_id")
+        .annotate(total=Sum("visits"))
+    }
+    manager.filter(month__isnull=True, restaurant_id__in=restaurant_ids, user_id__in=user_ids).delete()
+    manager.bulk_create(
+        [
+            RestaurantUserVisitStats(restaurant_id=restaurant_id, user_id=user_id, month=None, visits=total)
+            for (restaurant_id, user_id), total in sums.items()
+            if total
+        ],
+        batch_size=_BULK_BATCH_SIZE,
+    )
+
+
+def _count_crossing(base: dict[int, int], tail: dict[int, int], threshold: int) -> int:
+    """집계값만으로는 threshold 미만이었다가 꼬리 구간 방문을 더해 넘어서는 사용자 수."""
+    return sum(
+        1
+        for user_id, extra in tail.items()
+        if base.get(user_id, 0) < threshold <= base.get(user_id, 0) + extra
+    )
+
+
+def _tail_visits(restaurant_id: int, since: datetime, db_alias: str) -> dict[int, int]:
+    return {
+        row["user_id"]: row["visits"]
+        for row in _visit_events(db_alias)
+        .filter(restaurant_id=restaurant_id, created_at__gte=since)
+        .values("user_id")
+        .annotate(visits=Count("id"))
+    }
+
+
+def compute_live_dashboard_stats(restaurant_id: int, *, now: datetime, db_alias: str | None = None) -> dict:
+    """집계 테이블 없이 원천 테이블에서 바로 계산 (체크포인트가 아직 없을 때 사용)."""
+    db_alias = _resolve_read_alias(db_alias)
+    month_start = _month_start(now)
+    monthly = _visit_events(db_alias).filter(restaurant_id=restaurant_id, created_at__gte=month_start)
+    # 누적 방문은 아카이브된 과거 이벤트까지 사용자별로 합친다
+    lifetime: dict[int, int] = defaultdict(int)
+    for events in _visit_event_sources(db_alias):
+        for user_id, visits in (
+            events.filter(restaurant_id=restaurant_id)
+            .values("user_id")
+            .annotate(visits=Count("id"))
+            .values_list("user_id", "visits")
+        ):
+            lifetime[user_id] += visits
+    return {
+        "revisit_this_month": monthly.values("user_id")
+        .annotate(visits=Count("id"))
+        .filter(visits__gte=REVISIT_MIN_VISITS)
+        .count(),
+        "loyal_total": sum(1 for visits in lifetime.values() if visits >= LOYAL_MIN_VISITS),
+        "coupon_redeemed_this_month": Coupon.objects.using(db_alias)
+        .filter(restaurant_id=restaurant_id, status="REDEEMED", redeemed_at__gte=month_start)
+        .count(),
+        "stamp_earned_this_month": monthly.count(),
+    }
+
+
+def get_dashboard_stats(restaurant_id: int, *, now: datetime | None = None, db_alias: str | None = None) -> dict:
+    """
+    대시보드 핵심 지표 (revisit_this_month / loyal_total / coupon_redeemed_this_month /
+    stamp_earned_this_month). 집계 테이블 + 체크포인트 이후 꼬리 구간 합산.
+    """
+    db_alias = _resolve_read_alias(db_alias)
+    now = now or timezone.now()
+    checkpoint = get_checkpoint(db_alias)
+    if checkpoint is None:
+        return compute_live_dashboard_stats(restaurant_id, now=now, db_alias=db_alias)
+
+    month_start = _month_start(now)
+    month_key = month_start.date()
+    month_tail_from = max(checkpoint, month_start)
+
+    daily = RestaurantDailyStats.objects.using(db_alias).filter(
+        restaurant_id=restaurant_id, day__gte=month_key
+    ).aggregate(stamps=Sum("stamps_earned"), redeemed=Sum("coupons_redeemed"))
+
+    tail_stamps = _visit_events(db_alias).filter(
+        restaurant_id=restaurant_id, created_at__gte=month_tail_from
+    ).count()
+    tail_redeemed = Coupon.objects.using(db_alias).filter(
+        restaurant_id=restaurant_id, status="REDEEMED", redeemed_at__gte=month_tail_from
+    ).count()
+
+    visit_stats = RestaurantUserVisitStats.objects.using(db_alias).filter(restaurant_id=restaurant_id)
+
+    # 이번 달 재방문: 월별 집계 + 이번 달 꼬리 구간
+    month_tail = _tail_visits(restaurant_id, month_tail_from, db_alias)
+    month_base = dict(
+        visit_stats.filter(month=month_key, user_id__in=list(month_tail)).values_list("user_id", "visits")
+    )
+    revisit = visit_stats.filter(month=month_key, visits__gte=REVISIT_MIN_VISITS).count()
+    revisit += _count_crossing(month_base, month_tail, REVISIT_MIN_VISITS)
+
+    # 누적 단골: 누적 집계 + 체크포인트 이후 전체 꼬리 구간
+    total_tail = month_tail if month_tail_from == checkpoint else _tail_visits(restaurant_id, checkpoint, db_alias)
+    total_base = dict(
+        visit_stats.filter(month__isnull=True, user_id__in=list(total_tail)).values_list("user_id", "visits")
+    )
+    loyal = visit_stats.filter(month__isnull=True, visits__gte=LOYAL_MIN_VISITS).count()
+    loyal += _count_crossing(total_base, total_tail, LOYAL_MIN_VISITS)
+
+    return {
+        "revisit_this_month": revisit,
+        "loyal_total": loyal,
+        "coupon_redeemed_this_month": (daily["redeemed"] or 0) + tail_redeemed,
+        "stamp_earned_this_month": (daily["stamps"] or 0) + tail_stamps,
+    }
@@ -5,6 +5,7 @@ import os
 import json
 from collections import defaultdict
 from datetime import date, datetime, timedelta, time
+from django.conf import settings
 from django.db import transaction, IntegrityError, router, DatabaseError
 from django.db.models import Count, Sum
 from utils.db_locks import locked_get
@@ -29,6 +30,7 @@ from .models import (
     CouponRestaurantExclusion,
 )
 from .utils import make_coupon_code, redis_lock, idem_get, idem_set
+from wouldulike_backend.resilience import optional_work_allowed
 
 
 User = get_user_model()
@@ -2565,6 +2567,11 @@ def issue_app_open_coupon(user: User, *, include_standard: bool = True):
     issued: list[Coupon] = []
     alias = router.db_for_write(Coupon)
 
+    # 부가 작업: DB 장애(서킷 열림) 중이거나 이미 느린 요청이면 건너뛰고 다음 접속 때 발급한다
+    if not optional_work_allowed(alias):
+        logger.info("app-open coupon issuance skipped (degraded) user=%s", getattr(user, "id", None))
+        return issued
+
     if JUNGDUNBAM_FESTIVAL_WED_ENABLED:
         issued.extend(_issue_jungdunbam_festival_wed(user, db_alias=alias))
 
@@ -5193,7 +5200,8 @@ STAMP_LEGACY_REWARD_CODES = {
 REWARD_CAMPAIGN_CODE = "STAMP_REWARD"
 STAMP_DAILY_EARN_LIMIT = int(os.getenv("STAMP_DAILY_EARN_LIMIT", "5"))
 
-STAMP_DB_ALIAS = "cloudsql"
+# 운영은 cloudsql. cloudsql alias 가 없는 로컬 DB 모드에서만 settings 가 default 로 바꾼다
+STAMP_DB_ALIAS = getattr(settings, "STAMP_DB_ALIAS", "cloudsql")
 
 
 def _get_stamp_reward_rule(restaurant_id: int) -> StampRewardRule | None:
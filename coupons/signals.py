@@ -2,12 +2,23 @@ from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
 
-from .service import issue_signup_coupon, ensure_invite_code
-
 
 User = get_user_model()
 
 
+# coupons.service 는 크고 무거워서 앱 로딩(manage.py 명령 포함) 때가 아니라 가입 시점에 import 한다
+def ensure_invite_code(user):
+    from .service import ensure_invite_code as _ensure_invite_code
+
+    return _ensure_invite_code(user)
+
+
+def issue_signup_coupon(user):
+    from .service import issue_signup_coupon as _issue_signup_coupon
+
+    return _issue_signup_coupon(user)
+
+
 @receiver(post_save, sender=User)
 def on_user_created(sender, instance, created, **kwargs):
     if not created:
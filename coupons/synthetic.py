@@ -0,0 +1,368 @@
+"""
+부하 테스트 / 벤치마크용 합성 데이터 생성기.
+
+로컬 DB(SQLite: DJANGO_USE_LOCAL_SQLITE=1, 로컬 PostgreSQL: DJANGO_DISABLE_EXTERNAL_DBS=1)에
+운영과 비슷한 분포의 사용자·제휴 식당·쿠폰·스탬프 데이터를 만든다. 같은 seed 면 같은 데이터가 나온다.
+- 제휴 식당: 인기 순위를 따르는 분포(상위 식당에 적립/쿠폰이 몰림), 식당마다 STATIC PIN 과 쿠폰 혜택
+- 사용자: 모두 초대 코드를 가지고, 단골 식당 1~3곳에만 스탬프를 적립한다
+- 쿠폰: 최근 180일 동안 발급, ISSUED / REDEEMED / EXPIRED 비율은 대략 6:2.5:1.5
+만든 행은 접두어(username "lt_", 쿠폰 코드 "LT", 식당 id RESTAURANT_ID_BASE 이상)로 구분하고 reset() 으로 지운다.
+시나리오 실행기(wouldulike_backend.loadscenarios)가 쓰는 사용자 id / 초대 코드 / 식당 PIN 은 manifest 로 돌려준다.
+"""
+from __future__ import annotations
+
+import io
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.postgres.fields import ArrayField
+from django.core.management import call_command
+from django.db import connections, router, transaction
+from django.utils import timezone
+
+from accounts.models import User
+from restaurants.models import AffiliateRestaurant
+
+from .models import (
+    Campaign,
+    Coupon,
+    CouponType,
+    InviteCode,
+    MerchantPin,
+    RestaurantCouponBenefit,
+    StampEvent,
+    StampWallet,
+)
+
+logger = logging.getLogger(__name__)
+
+VOLUMES = {"users": 100_000, "coupons": 2_000_000, "affiliates": 300, "stamp_events": 1_000_000}
+
+USERNAME_PREFIX = "lt_"
+CODE_PREFIX = "LT"
+RESTAURANT_ID_BASE = 900_000
+# 가짜 Kakao API(wouldulike_backend.loadtest)가 돌려주는 kakao id 범위와 맞춘다
+KAKAO_ID_BASE = 9_000_000_000
+KAKAO_LOGIN_USERS = 1000
+
+BATCH_SIZE = 5000
+HISTORY_DAYS = 180
+MANIFEST_SAMPLE = 5000
+
+_LOCAL_HOSTS = {"", "localhost", "127.0.0.1", "::1"}
+
+
+@dataclass
+class SeedResult:
+    counts: dict = field(default_factory=dict)
+    elapsed_s: float = 0.0
+    manifest: dict = field(default_factory=dict)
+
+
+def scaled_volumes(scale: float) -> dict:
+    volumes = {name: max(1, int(count * scale)) for name, count in VOLUMES.items()}
+    volumes["affiliates"] = min(VOLUMES["affiliates"], max(volumes["affiliates"], 20))
+    return volumes
+
+
+def ensure_local_database(alias: str = "default") -> None:
+    """운영 DB 에 수백만 행을 넣지 않도록 로컬 DB 설정에서만 허용한다."""
+    db = settings.DATABASES[alias]
+    local_mode = getattr(settings, "USE_LOCAL_SQLITE", False) or getattr(settings, "DISABLE_EXTERNAL_DBS", False)
+    if not local_mode or (db["ENGINE"] != "django.db.backends.sqlite3" and db.get("HOST") not in _LOCAL_HOSTS):
+        raise RuntimeError(
+            "합성 데이터는 로컬 DB 에만 넣을 수 있습니다 "
+            "(DJANGO_USE_LOCAL_SQLITE=1 또는 DJANGO_DISABLE_EXTERNAL_DBS=1 + localhost PostgreSQL)."
+        )
+
+
+# --- 스키마 -----------------------------------------------------------
+
+
+def _create_affiliate_table(connection) -> None:
+    if connection.vendor == "postgresql":
+        with connection.schema_editor() as editor:
+            editor.create_model(AffiliateRestaurant)
+        return
+    # SQLite 는 배열 컬럼 타입이 없으므로 TEXT 로 만든다 (배열 컬럼은 NULL 로만 채운다)
+    quote = connection.ops.quote_name
+    columns = []
+    for f in AffiliateRestaurant._meta.local_fields:
+        db_type = "text" if isinstance(f, ArrayField) else f.db_type(connection)
+        columns.append(f"{quote(f.column)} {db_type}{' PRIMARY KEY' if f.primary_key else ''}")
+    with connection.cursor() as cursor:
+        cursor.execute(f"CREATE TABLE {quote(AffiliateRestaurant._meta.db_table)} ({', '.join(columns)})")
+
+
+def create_schema(alias: str = "default") -> list[str]:
+    """
+    빈 로컬 DB 에 테이블을 만든다 (migrate 는 CloudSQL 전용 RunPython 때문에 빈 DB 에서 실패한다).
+    이미 있는 테이블은 건너뛰고, 만든 테이블 이름을 돌려준다.
+    """
+    from django.apps import apps
+
+    connection = connections[alias]
+    existing = set(connection.introspection.table_names())
+    created = []
+    if AffiliateRestaurant._meta.db_table not in existing:
+        _create_affiliate_table(connection)
+        created.append(AffiliateRestaurant._meta.db_table)
+    missing = [
+        model
+        for model in apps.get_models()
+        if model._meta.managed
+        and not model._meta.proxy
+        and model._meta.db_table not in existing
+        and router.allow_migrate_model(alias, model)
+    ]
+    if missing:
+        with connection.schema_editor() as editor:
+            for model in missing:
+                editor.create_model(model)
+                created.append(model._meta.db_table)
+    return created
+
+
+# --- 생성 -------------------------------------------------------------
+
+
+def _popularity_weights(count: int) -> list[float]:
+    return [1.0 / (rank + 1) for rank in range(count)]
+
+
+def _bulk(model, rows, alias: str) -> int:
+    created = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            model.objects.using(alias).bulk_create(batch, batch_size=BATCH_SIZE)
+            created += len(batch)
+            batch = []
+    if batch:
+        model.objects.using(alias).bulk_create(batch, batch_size=BATCH_SIZE)
+        created += len(batch)
+    return created
+
+
+def restaurant_pin(restaurant_id: int) -> str:
+    return f"{restaurant_id % 10000:04d}"
+
+
+def _seed_affiliates(alias: str, count: int, rng: random.Random) -> list[int]:
+    restaurant_ids = [RESTAURANT_ID_BASE + i for i in range(count)]
+    zones = ["북문", "정문", "쪽문", "서문", "동성로"]
+    categories = ["한식", "중식", "일식", "양식", "분식", "카페", "주점"]
+    table = connections[alias].ops.quote_name(AffiliateRestaurant._meta.db_table)
+    # 배열 컬럼은 SQLite 에 넣을 수 없으므로 필요한 컬럼만 직접 INSERT 한다
+    with connections[alias].cursor() as cursor:
+        cursor.executemany(
+            f"INSERT INTO {table} (restaurant_id, name, is_affiliate, zone, category) VALUES (%s, %s, %s, %s, %s)",
+            [
+                (rid, f"부하테스트 식당 {rid - RESTAURANT_ID_BASE}", True, rng.choice(zones), rng.choice(categories))
+                for rid in restaurant_ids
+            ],
+        )
+    pins = (MerchantPin(restaurant_id=rid, algo="STATIC", secret=restaurant_pin(rid)) for rid in restaurant_ids)
+    _bulk(MerchantPin, pins, alias)
+    return restaurant_ids
+
+
+def _seed_benefits(alias: str, coupon_types: list[CouponType], restaurant_ids: list[int]) -> int:
+    return _bulk(
+        RestaurantCouponBenefit,
+        (
+            RestaurantCouponBenefit(
+                coupon_type=ct,
+                restaurant_id=rid,
+                title=f"{ct.title} 혜택",
+                benefit_json={"type": "fixed", "value": 3000},
+            )
+            for ct in coupon_types
+            for rid in restaurant_ids
+        ),
+        alias,
+    )
+
+
+def _seed_users(alias: str, count: int) -> list[int]:
+    def rows():
+        for n in range(count):
+            yield User(
+                username=f"{USERNAME_PREFIX}{n:07d}",
+                kakao_id=KAKAO_ID_BASE + n,
+                nickname_key=None,
+                is_active=True,
+            )
+
+    _bulk(User, rows(), alias)
+    return list(
+        User.objects.using(alias)
+        .filter(username__startswith=USERNAME_PREFIX)
+        .order_by("username")
+        .values_list("id", flat=True)
+    )
+
+
+def invite_code(n: int) -> str:
+    return f"{CODE_PREFIX}{n:07d}"
+
+
+def _seed_coupons(alias, count, user_ids, restaurant_ids, coupon_types, campaigns, rng, now) -> int:
+    weights = _popularity_weights(len(restaurant_ids))
+    statuses = ("ISSUED", "REDEEMED", "EXPIRED")
+    status_weights = (60, 25, 15)
+
+    def rows():
+        for i in range(count):
+            ct = rng.choice(coupon_types)
+            rid = rng.choices(restaurant_ids, weights)[0]
+            issued_at = now - timedelta(seconds=rng.uniform(0, HISTORY_DAYS * 86400))
+            status = rng.choices(statuses, status_weights)[0]
+            if status == "ISSUED":
+                expires_at = now + timedelta(days=rng.randint(1, 60))
+            else:
+                expires_at = issued_at + timedelta(days=30)
+            yield Coupon(
+                code=f"{CODE_PREFIX}{i:010d}",
+                user_id=rng.choice(user_ids),
+                coupon_type=ct,
+                campaign=rng.choice(campaigns),
+                status=status,
+                issued_at=issued_at,
+                expires_at=expires_at,
+                redeemed_at=issued_at + timedelta(days=rng.randint(0, 20)) if status == "REDEEMED" else None,
+                restaurant_id=rid,
+                benefit_snapshot={"title": ct.title, "subtitle": "", "benefit": {"type": "fixed", "value": 3000}},
+                issue_key=f"{CODE_PREFIX}:{i}",
+            )
+
+    return _bulk(Coupon, rows(), alias)
+
+
+def _seed_stamps(alias, count, user_ids, restaurant_ids, rng, now) -> tuple[int, int]:
+    weights = _popularity_weights(len(restaurant_ids))
+    regulars = [rng.choices(restaurant_ids, weights, k=rng.randint(1, 3)) for _ in user_ids]
+    wallets: dict[tuple[int, int], int] = {}
+
+    def events():
+        for _ in range(count):
+            index = rng.randrange(len(user_ids))
+            rid = rng.choice(regulars[index])
+            key = (user_ids[index], rid)
+            wallets[key] = wallets.get(key, 0) + 1
+            yield StampEvent(
+                user_id=key[0],
+                restaurant_id=rid,
+                delta=1,
+                source="PIN",
+                created_at=now - timedelta(seconds=rng.uniform(0, HISTORY_DAYS * 86400)),
+            )
+
+    created_events = _bulk(StampEvent, events(), alias)
+    created_wallets = _bulk(
+        StampWallet,
+        (StampWallet(user_id=uid, restaurant_id=rid, stamps=total % 10) for (uid, rid), total in wallets.items()),
+        alias,
+    )
+    return created_events, created_wallets
+
+
+def seed(*, scale: float = 1.0, seed: int = 42, alias: str = "default", progress=None) -> SeedResult:
+    """
+    합성 데이터를 만든다. 이미 만든 데이터가 있으면 먼저 reset() 해야 한다.
+    progress(message) 를 주면 단계마다 호출한다.
+    """
+    ensure_local_database(alias)
+    if User.objects.using(alias).filter(username__startswith=USERNAME_PREFIX).exists():
+        raise RuntimeError("이미 합성 데이터가 있습니다. reset 후 다시 실행하세요.")
+
+    report = progress or (lambda message: None)
+    volumes = scaled_volumes(scale)
+    rng = random.Random(seed)
+    now = timezone.now()
+    started = time.monotonic()
+    result = SeedResult()
+
+    call_command("init_coupon_seed", stdout=io.StringIO())
+    coupon_types = list(CouponType.objects.using(alias).order_by("code"))
+    campaigns = list(Campaign.objects.using(alias).order_by("code"))
+
+    with transaction.atomic(using=alias):
+        restaurant_ids = _seed_affiliates(alias, volumes["affiliates"], rng)
+        result.counts["affiliates"] = len(restaurant_ids)
+        result.counts["benefits"] = _seed_benefits(alias, coupon_types, restaurant_ids)
+    report(f"affiliates {len(restaurant_ids):,}")
+
+    with transaction.atomic(using=alias):
+        user_ids = _seed_users(alias, volumes["users"])
+        result.counts["users"] = len(user_ids)
+        result.counts["invite_codes"] = _bulk(
+            InviteCode, (InviteCode(user_id=uid, code=invite_code(n)) for n, uid in enumerate(user_ids)), alias
+        )
+    report(f"users {len(user_ids):,}")
+
+    with transaction.atomic(using=alias):
+        result.counts["coupons"] = _seed_coupons(
+            alias, volumes["coupons"], user_ids, restaurant_ids, coupon_types, campaigns, rng, now
+        )
+    report(f"coupons {result.counts['coupons']:,}")
+
+    with transaction.atomic(using=alias):
+        events, wallets = _seed_stamps(alias, volumes["stamp_events"], user_ids, restaurant_ids, rng, now)
+        result.counts["stamp_events"] = events
+        result.counts["stamp_wallets"] = wallets
+    report(f"stamp events {events:,}")
+
+    result.elapsed_s = time.monotonic() - started
+    result.manifest = build_manifest(user_ids, restaurant_ids, rng, seed=seed, scale=scale)
+    return result
+
+
+def build_manifest(user_ids: list[int], restaurant_ids: list[int], rng: random.Random, *, seed: int, scale: float) -> dict:
+    sample = sorted(rng.sample(range(len(user_ids)), min(MANIFEST_SAMPLE, len(user_ids))))
+    return {
+        "seed": seed,
+        "scale": scale,
+        "users": [{"id": user_ids[n], "invite_code": invite_code(n)} for n in sample],
+        "kakao_login_users": min(KAKAO_LOGIN_USERS, len(user_ids)),
+        "restaurants": [{"id": rid, "pin": restaurant_pin(rid)} for rid in restaurant_ids],
+    }
+
+
+def _delete(alias: str, model, where: str, params=()) -> int:
+    # ORM delete() 는 행마다 시그널/연쇄 삭제를 확인하므로 수백만 행은 SQL 로 바로 지운다
+    table = connections[alias].ops.quote_name(model._meta.db_table)
+    with connections[alias].cursor() as cursor:
+        cursor.execute(f"DELETE FROM {table} WHERE {where}", params)
+        return cursor.rowcount
+
+
+def reset(alias: str = "default") -> dict:
+    """seed() 가 만든 행과, 시나리오 실행 중 합성 사용자에게 생긴 행을 지운다."""
+    from .models import Referral
+
+    ensure_local_database(alias)
+    users_table = connections[alias].ops.quote_name(User._meta.db_table)
+    synthetic_users = f"IN (SELECT id FROM {users_table} WHERE username LIKE %s ESCAPE '!')"
+    user_pattern = (USERNAME_PREFIX.replace("_", "!_") + "%",)
+    restaurant = ("restaurant_id >= %s", (RESTAURANT_ID_BASE,))
+    deleted = {}
+    with transaction.atomic(using=alias):
+        for name, model, (where, params) in (
+            ("coupons", Coupon, (f"user_id {synthetic_users}", user_pattern)),
+            ("stamp_events", StampEvent, restaurant),
+            ("stamp_wallets", StampWallet, restaurant),
+            ("referrals", Referral, (f"referee_id {synthetic_users}", user_pattern)),
+            ("invite_codes", InviteCode, (f"user_id {synthetic_users}", user_pattern)),
+            ("benefits", RestaurantCouponBenefit, restaurant),
+            ("merchant_pins", MerchantPin, restaurant),
+            ("affiliates", AffiliateRestaurant, restaurant),
+            ("users", User, ("username LIKE %s ESCAPE '!'", user_pattern)),
+        ):
+            deleted[name] = _delete(alias, model, where, params)
+    return deleted
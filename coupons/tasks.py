@@ -1,13 +1,9 @@
 from celery import shared_task
-from django.utils import timezone
 
-from .models import Coupon
+from .expired_sweeper import sweep_expired_coupons
 
 
 @shared_task
 def expire_coupons():
-    now = timezone.now()
-    Coupon.objects.filter(
-        status__in=["ISSUED", "EXPIRED"],
-        expires_at__lt=now,
-    ).delete()
+    # 한 번에 전체 DELETE 하지 않고 배치로 정리 (한 번 실행당 최대 2분, 남은 건 다음 실행이 이어서)
+    return sweep_expired_coupons(time_budget_s=120)
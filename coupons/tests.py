@@ -1,4 +1,5 @@
 from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
 from datetime import timedelta
 
 from django.conf import settings
@@ -1462,3 +1463,482 @@ class JungdunbamFestivalWedTests(TestCase):
         )
         rewards = get_stamp_rewards_for_restaurant(JUNGDUNBAM_FESTIVAL_RESTAURANT_ID)
         self.assertEqual(rewards, [])
+
+
+class DashboardStatsRollupTests(TestCase):
+    """대시보드 지표: 사전 집계 + 꼬리 구간 합산 결과가 실시간 계산과 같아야 한다."""
+
+    RESTAURANT_ID = 9101
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user_model = get_user_model()
+        from coupons import signals as coupon_signals
+        post_save.disconnect(coupon_signals.on_user_created, sender=cls.user_model)
+        cls.addClassCleanup(post_save.connect, coupon_signals.on_user_created, sender=cls.user_model)
+
+    def setUp(self):
+        from datetime import datetime, timezone as dt_timezone
+
+        self.now = datetime(2026, 5, 20, 12, 0, tzinfo=dt_timezone.utc)
+        self.users = [
+            self.user_model.objects.create_user(kakao_id=91000 + idx, password="pass")
+            for idx in range(3)
+        ]
+
+    def _stamp(self, user, at, delta=1):
+        from coupons.models import StampEvent
+
+        return StampEvent.objects.create(
+            user=user, restaurant_id=self.RESTAURANT_ID, delta=delta, created_at=at
+        )
+
+    def test_rollup_plus_tail_matches_live_stats(self):
+        from coupons.rollups import (
+            backfill_dashboard_stats,
+            compute_live_dashboard_stats,
+            get_dashboard_stats,
+            rollup_dashboard_stats,
+        )
+
+        u1, u2, u3 = self.users
+        # 지난달 방문 (누적 단골 판정에만 반영)
+        self._stamp(u1, self.now - timedelta(days=40))
+        self._stamp(u1, self.now - timedelta(days=35))
+        self._stamp(u2, self.now - timedelta(days=38))
+        # 이번 달 방문
+        self._stamp(u1, self.now - timedelta(days=5))
+        self._stamp(u2, self.now - timedelta(days=3))
+        self._stamp(u3, self.now - timedelta(days=2))
+        self._stamp(u3, self.now - timedelta(days=2), delta=-1)  # 정정은 방문 아님
+        ct = CouponType.objects.create(code="ROLLUP_TEST", title="집계 테스트", benefit_json={})
+        Coupon.objects.create(
+            code="ROLLUP0001",
+            user=u1,
+            coupon_type=ct,
+            status="REDEEMED",
+            expires_at=self.now + timedelta(days=10),
+            redeemed_at=self.now - timedelta(days=4),
+            restaurant_id=self.RESTAURANT_ID,
+        )
+
+        backfill_dashboard_stats(until=self.now - timedelta(days=1))
+
+        # 체크포인트 이후 꼬리 구간: u2 재방문, u3 재방문
+        self._stamp(u2, self.now - timedelta(hours=6))
+        self._stamp(u3, self.now - timedelta(hours=3))
+
+        live = compute_live_dashboard_stats(self.RESTAURANT_ID, now=self.now)
+        self.assertEqual(
+            live,
+            {
+                "revisit_this_month": 2,
+                "loyal_total": 2,
+                "coupon_redeemed_this_month": 1,
+                "stamp_earned_this_month": 5,
+            },
+        )
+        self.assertEqual(get_dashboard_stats(self.RESTAURANT_ID, now=self.now), live)
+
+        # 증분 집계 후에도 동일, 재실행해도 중복 합산되지 않음
+        rollup_dashboard_stats(until=self.now - timedelta(hours=1))
+        result = rollup_dashboard_stats(until=self.now - timedelta(hours=1))
+        self.assertEqual(result["mode"], "noop")
+        self.assertEqual(get_dashboard_stats(self.RESTAURANT_ID, now=self.now), live)
+
+        # 월 단위 백필로 다시 만들어도 동일
+        backfill_dashboard_stats(since=self.now, until=self.now - timedelta(hours=1))
+        self.assertEqual(get_dashboard_stats(self.RESTAURANT_ID, now=self.now), live)
+
+
+class CouponAnalyticsTests(TestCase):
+    """coupons.analytics: 한 번 스트리밍한 프레임에서 피벗/식당별 리포트 집계."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user_model = get_user_model()
+        from coupons import signals as coupon_signals
+        post_save.disconnect(coupon_signals.on_user_created, sender=cls.user_model)
+        cls.addClassCleanup(post_save.connect, coupon_signals.on_user_created, sender=cls.user_model)
+
+    def setUp(self):
+        from datetime import datetime, timezone as dt_timezone
+
+        self.user = self.user_model.objects.create_user(kakao_id=92001, password="pass")
+        self.welcome = CouponType.objects.create(code="WELCOME_3000", title="신규가입", benefit_json={})
+        self.stamp5 = CouponType.objects.create(code="STAMP_REWARD_5", title="스탬프5", benefit_json={})
+        self.event = Campaign.objects.create(code="ANALYTICS_EVENT", name="분석 이벤트", type="FLASH")
+        # 2026-03-01 23:30 UTC = 2026-03-02 08:30 KST
+        issued_at = datetime(2026, 3, 1, 23, 30, tzinfo=dt_timezone.utc)
+        rows = [
+            ("A1", self.welcome, None, "REDEEMED", 101),
+            ("A2", self.welcome, None, "ISSUED", 101),
+            ("A3", self.stamp5, None, "EXPIRED", 101),
+            ("A4", self.welcome, self.event, "REDEEMED", 102),
+        ]
+        for idx, (code, ct, campaign, status_value, rid) in enumerate(rows):
+            Coupon.objects.create(
+                code=code,
+                user=self.user,
+                coupon_type=ct,
+                campaign=campaign,
+                status=status_value,
+                issued_at=issued_at,
+                expires_at=issued_at + timedelta(days=7),
+                redeemed_at=issued_at + timedelta(days=1) if status_value == "REDEEMED" else None,
+                restaurant_id=rid,
+                issue_key=f"analytics:{idx}",
+            )
+
+    def test_pivot_and_restaurant_reports(self):
+        from datetime import date
+
+        from coupons.analytics import load_coupon_frame, restaurant_type_reports
+
+        frame = load_coupon_frame()
+        self.assertEqual(len(frame), 4)
+        self.assertEqual(
+            frame.pivot(["restaurant", "coupon_type"]),
+            [
+                {"restaurant": 101, "coupon_type": "STAMP_REWARD_5", "total": 1, "issued": 0, "redeemed": 0, "expired": 1, "canceled": 0},
+                {"restaurant": 101, "coupon_type": "WELCOME_3000", "total": 2, "issued": 1, "redeemed": 1, "expired": 0, "canceled": 0},
+                {"restaurant": 102, "coupon_type": "WELCOME_3000", "total": 1, "issued": 0, "redeemed": 1, "expired": 0, "canceled": 0},
+            ],
+        )
+        # 발급일은 KST 기준
+        self.assertEqual([row["day"] for row in frame.pivot(["day"])], ["2026-03-02"])
+        self.assertEqual(len(frame.where(issued=(date(2026, 3, 1), date(2026, 3, 1)))), 0)
+        self.assertEqual(len(frame.where(status="REDEEMED", redeemed=(date(2026, 3, 3), date(2026, 3, 3)))), 2)
+
+        reports = restaurant_type_reports(frame)
+        self.assertEqual(reports[101].groups["신규가입"], (2, 1))
+        self.assertEqual(reports[101].groups["스탬프 5개"], (1, 0))
+        self.assertEqual(reports[102].events, [("ANALYTICS_EVENT", "분석 이벤트", 1, 1)])
+
+    def test_coupon_analytics_command_exports_json(self):
+        import json
+        from io import StringIO
+
+        from django.core.management import call_command
+
+        out = StringIO()
+        call_command("coupon_analytics", "--by", "campaign", "--format", "json", stdout=out)
+        self.assertEqual(
+            json.loads(out.getvalue()),
+            [
+                {"campaign": "", "total": 3, "issued": 1, "redeemed": 1, "expired": 1, "canceled": 0},
+                {"campaign": "ANALYTICS_EVENT", "total": 1, "issued": 0, "redeemed": 1, "expired": 0, "canceled": 0},
+            ],
+        )
+
+
+class ExpiredCouponSweeperTests(TestCase):
+    """만료 쿠폰 배치 정리: 배치 단위 삭제/아카이브, 체크포인트 이어가기."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user_model = get_user_model()
+        from coupons import signals as coupon_signals
+        post_save.disconnect(coupon_signals.on_user_created, sender=cls.user_model)
+        cls.addClassCleanup(post_save.connect, coupon_signals.on_user_created, sender=cls.user_model)
+
+    def setUp(self):
+        self.user = self.user_model.objects.create_user(kakao_id=93001, password="pass")
+        self.ct = CouponType.objects.create(code="SWEEP_TEST", title="정리 테스트", benefit_json={})
+        self.now = timezone.now()
+
+    def _coupon(self, code, *, status="ISSUED", expires_delta=timedelta(days=-1)):
+        return Coupon.objects.create(
+            code=code,
+            user=self.user,
+            coupon_type=self.ct,
+            status=status,
+            expires_at=self.now + expires_delta,
+            issue_key=code,
+        )
+
+    def test_sweeps_in_batches_and_archives(self):
+        from coupons.expired_sweeper import sweep_expired_coupons
+        from coupons.models import CouponArchive
+
+        for idx in range(5):
+            self._coupon(f"EXP{idx}", expires_delta=timedelta(hours=-(idx + 1)))
+        self._coupon("EXPIRED1", status="EXPIRED")
+        redeemed = self._coupon("USED1", status="REDEEMED")
+        alive = self._coupon("ALIVE1", expires_delta=timedelta(days=1))
+
+        first = sweep_expired_coupons(now=self.now, batch_size=2, max_batches=2, sleep_s=0, archive=True)
+        self.assertEqual((first["processed"], first["batches"], first["finished"]), (4, 2, False))
+
+        rest = sweep_expired_coupons(now=self.now, batch_size=2, sleep_s=0, archive=True)
+        self.assertEqual(rest["processed"], 2)
+        self.assertTrue(rest["finished"])
+
+        self.assertEqual(
+            set(Coupon.objects.values_list("id", flat=True)), {redeemed.id, alive.id}
+        )
+        self.assertEqual(CouponArchive.objects.filter(archive_reason="EXPIRED_SWEEP").count(), 6)
+
+    def test_my_coupons_hides_expired_without_deleting(self):
+        from rest_framework.test import APIRequestFactory, force_authenticate
+
+        from coupons.api.views import MyCouponsView
+
+        expired = self._coupon("HIDE1")
+        alive = self._coupon("SHOW1", expires_delta=timedelta(days=1))
+        request = APIRequestFactory().get("/api/coupons/my/")
+        force_authenticate(request, user=self.user)
+        with patch("coupons.api.views.issue_app_open_coupon", return_value=[]):
+            response = MyCouponsView.as_view()(request)
+
+        self.assertEqual(response.status_code, 200)
+        codes = [row["code"] for row in response.data]
+        self.assertEqual(codes, [alive.code])
+        self.assertTrue(Coupon.objects.filter(id=expired.id).exists())
+
+
+class ColdArchiveTests(TestCase):
+    """오래된 쿠폰/스탬프 이벤트 아카이브: 대상 조건, 통계/대시보드 합산."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user_model = get_user_model()
+        from coupons import signals as coupon_signals
+        post_save.disconnect(coupon_signals.on_user_created, sender=cls.user_model)
+        cls.addClassCleanup(post_save.connect, coupon_signals.on_user_created, sender=cls.user_model)
+
+    def setUp(self):
+        self.user = self.user_model.objects.create_user(kakao_id=93101, password="pass")
+        self.ct = CouponType.objects.create(code="ARCHIVE_TEST", title="아카이브 테스트", benefit_json={})
+        self.now = timezone.now()
+
+    def _coupon(self, code, *, status, days_ago, redeemed_days_ago=None):
+        return Coupon.objects.create(
+            code=code,
+            user=self.user,
+            coupon_type=self.ct,
+            status=status,
+            expires_at=self.now - timedelta(days=days_ago),
+            redeemed_at=None if redeemed_days_ago is None else self.now - timedelta(days=redeemed_days_ago),
+            restaurant_id=7,
+            issue_key=code,
+        )
+
+    def test_archives_aged_rows_and_reports_include_archive(self):
+        from coupons.analytics import load_coupon_frame
+        from coupons.archiver import archive_aged_coupons, archive_old_stamp_events
+        from coupons.models import CouponArchive, StampEvent, StampEventArchive
+
+        self._coupon("OLD_USED", status="REDEEMED", days_ago=120, redeemed_days_ago=150)
+        self._coupon("OLD_EXPIRED", status="EXPIRED", days_ago=100)
+        # 사용은 오래됐지만 만료일이 남아 있으면 issue_key 중복 방지를 위해 남긴다
+        self._coupon("USED_NOT_EXPIRED", status="REDEEMED", days_ago=-10, redeemed_days_ago=150)
+        self._coupon("RECENT_USED", status="REDEEMED", days_ago=10, redeemed_days_ago=20)
+        for days_ago in (200, 190, 1):
+            StampEvent.objects.create(
+                user=self.user, restaurant_id=7, created_at=self.now - timedelta(days=days_ago)
+            )
+
+        coupons = archive_aged_coupons(older_than_days=90, now=self.now, batch_size=1, sleep_s=0)
+        stamps = archive_old_stamp_events(older_than_days=180, now=self.now, batch_size=1, sleep_s=0)
+
+        self.assertEqual((coupons["moved"], coupons["finished"]), (2, True))
+        self.assertEqual(stamps["moved"], 2)
+        self.assertEqual(
+            set(Coupon.objects.values_list("code", flat=True)), {"USED_NOT_EXPIRED", "RECENT_USED"}
+        )
+        self.assertEqual(
+            set(CouponArchive.objects.values_list("code", flat=True)), {"OLD_USED", "OLD_EXPIRED"}
+        )
+        self.assertEqual(StampEvent.objects.count(), 1)
+        self.assertEqual(StampEventArchive.objects.count(), 2)
+
+        self.assertEqual(len(load_coupon_frame()), 2)
+        frame = load_coupon_frame(include_archive=True, coupon_type__code="ARCHIVE_TEST")
+        self.assertEqual(frame.status_counts()["REDEEMED"], 3)
+
+    def test_active_event_coupons_stay_hot_so_claim_guard_still_holds(self):
+        from coupons.archiver import archive_aged_coupons
+        from coupons.models import CouponArchive
+
+        ct, _ = CouponType.objects.get_or_create(
+            code="WORLD_CUP_EVENT_SPECIAL", defaults={"title": "월드컵", "benefit_json": {}, "per_user_limit": 1}
+        )
+        for i in range(3):
+            RestaurantCouponBenefit.objects.create(
+                coupon_type=ct, restaurant_id=971000 + i, title=f"혜택{i}", benefit_json={}, active=True
+            )
+        first = claim_world_cup_daily_code_coupon(self.user, "QFJXKRA")
+        self.assertEqual(first["total_issued"], 3)
+        # 오래전에 사용·만료된 것으로 돌려 아카이브 대상 기간에 넣는다
+        Coupon.objects.filter(user=self.user, coupon_type=ct).update(
+            status="REDEEMED",
+            redeemed_at=self.now - timedelta(days=200),
+            expires_at=self.now - timedelta(days=150),
+        )
+
+        result = archive_aged_coupons(older_than_days=90, now=self.now, sleep_s=0)
+        self.assertEqual(result["moved"], 0)
+        again = claim_world_cup_daily_code_coupon(self.user, "QFJXKRA")
+        self.assertTrue(again["already_issued"])
+        self.assertEqual(Coupon.objects.filter(user=self.user, coupon_type=ct).count(), 3)
+
+        # 이벤트가 끝나 캠페인을 내리면 옮긴다
+        Campaign.objects.filter(code=WORLD_CUP_DAILY_CODE_CAMPAIGN_CODE).update(active=False)
+        result = archive_aged_coupons(older_than_days=90, now=self.now, sleep_s=0)
+        self.assertEqual(result["moved"], 3)
+        self.assertEqual(CouponArchive.objects.filter(coupon_type=ct).count(), 3)
+
+    def test_dashboard_backfill_counts_archived_visits(self):
+        from coupons.archiver import archive_old_stamp_events
+        from coupons.models import StampEvent
+        from coupons.rollups import backfill_dashboard_stats, compute_live_dashboard_stats, get_dashboard_stats
+
+        for days_ago in (300, 250, 2):
+            StampEvent.objects.create(
+                user=self.user, restaurant_id=7, created_at=self.now - timedelta(days=days_ago)
+            )
+        archive_old_stamp_events(older_than_days=180, now=self.now, sleep_s=0)
+
+        live = compute_live_dashboard_stats(7, now=self.now)
+        self.assertEqual(live["loyal_total"], 1)
+        backfill_dashboard_stats(until=self.now)
+        self.assertEqual(get_dashboard_stats(7, now=self.now)["loyal_total"], 1)
+
+
+class _FakeLockClient:
+    def __init__(self, held_by=None):
+        self.values = {} if held_by is None else {"lock:test": held_by.encode()}
+        self.set_calls = 0
+        self.evals = 0
+
+    def set(self, name, value, nx, ex):
+        self.set_calls += 1
+        if name in self.values:
+            return False
+        self.values[name] = value.encode()
+        return True
+
+    def eval(self, script, numkeys, key, token):
+        self.evals += 1
+        if self.values.get(key) == token.encode():
+            del self.values[key]
+            return 1
+        return 0
+
+
+class RedisLockTests(TestCase):
+    def _patched(self, client):
+        fake_cache = MagicMock()
+        fake_cache.client.get_client.return_value = client
+        return patch("coupons.utils.cache", fake_cache)
+
+    def test_release_only_deletes_own_token(self):
+        from coupons.utils import redis_lock
+
+        client = _FakeLockClient()
+        with self._patched(client):
+            with redis_lock("lock:test"):
+                self.assertIn("lock:test", client.values)
+                client.values["lock:test"] = b"someone-else"  # TTL 만료 후 다른 요청이 잡은 상황
+        self.assertEqual(client.values["lock:test"], b"someone-else")
+        self.assertEqual(client.evals, 1)
+
+    def test_contended_lock_backs_off_and_times_out(self):
+        from coupons.utils import redis_lock
+
+        client = _FakeLockClient(held_by="other")
+        clock = [100.0]
+        delays = []
+
+        def fake_sleep(seconds):
+            delays.append(seconds)
+            clock[0] += seconds
+
+        with self._patched(client), patch("coupons.utils.time.sleep", side_effect=fake_sleep), patch(
+            "coupons.utils.time.monotonic", side_effect=lambda: clock[0]
+        ):
+            with self.assertRaises(TimeoutError):
+                with redis_lock("lock:test", spin=0.01, max_wait=0.5, max_spin=0.04):
+                    pass
+        self.assertTrue(all(delay <= 0.04 for delay in delays))
+        self.assertGreater(delays[-2], delays[0])
+        self.assertLess(client.set_calls, 40)  # spin 고정 간격이면 50번
+        self.assertEqual(client.evals, 0)  # 잡지 못한 락은 풀지 않는다
+
+
+class AppOpenDegradeTests(TestCase):
+    def test_app_open_issuance_is_skipped_while_degraded(self):
+        from coupons.service import issue_app_open_coupon
+
+        user = SimpleNamespace(id=1)
+        with patch("coupons.service.optional_work_allowed", return_value=False), \
+                patch("coupons.service._issue_app_open_legacy") as legacy:
+            self.assertEqual(issue_app_open_coupon(user), [])
+        legacy.assert_not_called()
+
+
+class SyntheticDataTests(TestCase):
+    def setUp(self):
+        from coupons import synthetic
+
+        self.synthetic = synthetic
+        synthetic.create_schema()
+
+    def test_seed_is_reproducible_and_reset_removes_rows(self):
+        first = self.synthetic.seed(scale=0.0005, seed=7)
+        self.assertEqual(first.counts["users"], 50)
+        self.assertEqual(first.counts["coupons"], 1000)
+        self.assertEqual(Coupon.objects.filter(code__startswith="LT").count(), 1000)
+        statuses = set(Coupon.objects.values_list("status", flat=True))
+        self.assertEqual(statuses, {"ISSUED", "REDEEMED", "EXPIRED"})
+
+        deleted = self.synthetic.reset()
+        self.assertEqual(deleted["coupons"], 1000)
+        self.assertFalse(get_user_model().objects.filter(username__startswith="lt_").exists())
+
+        second = self.synthetic.seed(scale=0.0005, seed=7)
+        self.assertEqual(first.counts, second.counts)
+        self.assertEqual(first.manifest["restaurants"], second.manifest["restaurants"])
+        self.assertEqual(
+            [u["invite_code"] for u in first.manifest["users"]],
+            [u["invite_code"] for u in second.manifest["users"]],
+        )
+
+    def test_refuses_non_local_database(self):
+        with self.settings(USE_LOCAL_SQLITE=False, DISABLE_EXTERNAL_DBS=False):
+            with self.assertRaises(RuntimeError):
+                self.synthetic.seed(scale=0.0005)
+
+
+class ServiceBenchmarkTests(TestCase):
+    def setUp(self):
+        from coupons import benchmarks, synthetic
+
+        self.benchmarks = benchmarks
+        synthetic.create_schema()
+        synthetic.seed(scale=0.0005, seed=7)
+
+    def test_hot_paths_stay_within_query_budget(self):
+        results = self.benchmarks.run_all(repeat=3, warmup=1)
+        self.assertEqual(set(results), set(self.benchmarks.BENCHMARKS))
+        self.assertEqual(self.benchmarks.over_budget(results), [])
+        for name in ("select_restaurant_for_coupon", "add_stamp", "redeem_coupon", "accept_referral.invite_code"):
+            self.assertEqual(results[name]["errors"], 0, name)
+        # 벤치마크가 만든 행은 롤백된다
+        self.assertFalse(Referral.objects.exists())
+
+    def test_compare_flags_query_and_time_regressions(self):
+        def report(queries, median):
+            return {"queries": queries, "time_ms": {"median": median}}
+
+        baseline = {"benchmarks": {"a": report(5, 10.0), "b": report(5, 0.2)}}
+        _, regressions = self.benchmarks.compare(baseline, {"a": report(6, 10.0), "b": report(5, 0.9)})
+        self.assertEqual(regressions, ["a: 쿼리 5→6"])
+        _, regressions = self.benchmarks.compare(baseline, {"a": report(5, 20.0), "b": report(5, 0.2)})
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith("a: median"))
@@ -1,4 +1,5 @@
 import logging
+import random
 import time
 import uuid
 from contextlib import contextmanager
@@ -36,20 +37,34 @@ def make_coupon_code(length: int = 12) -> str:
     return ulid.new().str[:length]
 
 
+# 토큰이 같을 때만 지운다 (GET 과 DEL 사이에 TTL 이 만료되어 다른 요청이 잡은 락을 지우지 않도록)
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
 @contextmanager
 def redis_lock(
     key: str,
     ttl: int = 5,
     spin: float = 0.02,
     max_wait: float = 2.0,
+    max_spin: float = 0.2,
 ) -> Generator[None, None, None]:
     """A simple Redis spin-lock using django-redis low-level client.
 
     Falls back to a no-op lock when Redis is unavailable so development
     environments without Redis do not raise 500 errors.
+
+    대기 간격은 spin 에서 시작해 max_spin 까지 지터를 섞어 늘린다. 같은 키를 기다리는 요청이 많을 때
+    (gevent 워커의 greenlet 수백 개 등) Redis 를 20ms 마다 두드리지 않게 한다.
+    time.sleep 을 호출 시점에 찾으므로 gevent 패치 후에는 다른 greenlet 에 양보한다.
     """
     token = str(uuid.uuid4())
-    deadline = time.time() + max_wait
+    deadline = time.monotonic() + max_wait
     acquired = False
 
     try:
@@ -62,16 +77,19 @@ def redis_lock(
         yield
         return
 
-    while time.time() < deadline:
+    delay = spin
+    while True:
         try:
             acquired = client.set(name=key, value=token, nx=True, ex=ttl)
         except Exception as exc:
             logger.warning("redis lock fell back to noop: %s", exc)
             client = None
             break
-        if acquired:
+        remaining = deadline - time.monotonic()
+        if acquired or remaining <= 0:
             break
-        time.sleep(spin)
+        time.sleep(min(remaining, delay * random.uniform(0.5, 1.0)))
+        delay = min(delay * 2, max_spin)
 
     if client is None:
         yield
@@ -82,12 +100,22 @@ def redis_lock(
             raise TimeoutError("lock timeout")
         yield
     finally:
-        try:
-            val: Optional[bytes] = client.get(key)
-            if val and (val.decode() == token):
-                client.delete(key)
-        except Exception:
-            pass
+        if acquired:
+            _release(client, key, token)
+
+
+def _release(client, key: str, token: str) -> None:
+    try:
+        client.eval(_RELEASE_SCRIPT, 1, key, token)
+        return
+    except Exception as exc:
+        logger.debug("redis lock release script failed, falling back to get/delete: %s", exc)
+    try:
+        val: Optional[bytes] = client.get(key)
+        if val and (val.decode() == token):
+            client.delete(key)
+    except Exception:
+        pass
 
 
 def idem_get(key: str) -> Any:
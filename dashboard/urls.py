@@ -1,4 +1,5 @@
 from django.urls import path
+from wouldulike_backend.async_support import IO, maybe_async
 from . import views
 
 urlpatterns = [
@@ -16,7 +17,7 @@ urlpatterns = [
     path("admin/verify-secondary/", views.AdminVerifySecondaryView.as_view()),
     path("admin/accounts/", views.AdminAccountView.as_view()),
     path("admin/accounts/<str:username>/", views.AdminAccountView.as_view()),
-    path("images/presign/", views.PresignedUploadView.as_view()),
+    path("images/presign/", maybe_async(views.PresignedUploadView.as_view(), pool=IO)),
     path("auth/verify-owner/", views.VerifyOwnerView.as_view()),
     path("auth/app-token/", views.AppTokenView.as_view()),
     path("auth/admin-login/", views.AdminLoginView.as_view()),
@@ -28,7 +29,8 @@ urlpatterns = [
     path("stamp-rule/", views.StampRewardRuleView.as_view()),
     path("admin/notifications/", views.AdminNotificationsView.as_view()),
     path("admin/notifications/<int:pk>/", views.AdminNotificationsView.as_view()),
-    path("admin/notifications/<int:pk>/send-now/", views.AdminNotificationSendNowView.as_view()),
+    # FCM 발송 대기가 대부분이라 I/O 풀에서 실행 (ASGI 모드)
+    path("admin/notifications/<int:pk>/send-now/", maybe_async(views.AdminNotificationSendNowView.as_view(), pool=IO)),
     # 식당 알림 예약
     path("owner/notification-schedule/", views.OwnerNotificationScheduleView.as_view()),
     path("owner/notification-schedule/<int:pk>/", views.OwnerNotificationScheduleView.as_view()),
@@ -1,31 +1,36 @@
-from django.db.models import Count
 from django.utils import timezone
 from django.contrib.auth import authenticate as django_authenticate
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from rest_framework_simplejwt.tokens import RefreshToken, AccessToken
+from rest_framework_simplejwt.tokens import AccessToken
 from rest_framework_simplejwt.exceptions import TokenError
 import logging
 
 import uuid
 import re
 from datetime import datetime
-import boto3
-from botocore.exceptions import ClientError
+from wouldulike_backend.lazy import lazy_module
 
-from coupons.models import MerchantPin, Coupon, StampEvent, CouponType, RestaurantCouponBenefit, StampRewardRule
+from accounts.tokens import RegistryRefreshToken
+from coupons.models import MerchantPin, CouponType, RestaurantCouponBenefit, StampRewardRule
+from coupons.rollups import compute_live_dashboard_stats, get_dashboard_stats
 from datetime import date as date_type, timedelta
 from notifications.models import Notification, RestaurantNotificationSchedule
 from accounts.models import UserRestaurantWishlist
 from notifications.utils import send_notification
 from guests.models import GuestUser
-from django.db import models as db_models
+from django.db import DatabaseError, models as db_models
 from django.db.models import Q
 from restaurants.models import AffiliateRestaurant
 from accounts.models import User
 from trends.models import Trend, PopupCampaign
+from wouldulike_backend.db_routers import prefer_replica
+
+# S3 를 쓰는 두 뷰에서만 필요하므로 처음 호출될 때 import 한다
+boto3 = lazy_module("boto3")
+botocore_exceptions = lazy_module("botocore.exceptions")
 from .models import OwnerProfile, AdminConfig, AdminAccount, RestaurantCampaignApplication, RestaurantCampaignWeekConfig, RestaurantPlanCampaignLimit
 
 logger = logging.getLogger(__name__)
@@ -100,7 +105,7 @@ class VerifyOwnerView(APIView):
         # 이미 점주 등록된 계정이면 재인증 불필요
         try:
             owner = request.user.owner_profile
-            refresh = RefreshToken.for_user(request.user)
+            refresh = RegistryRefreshToken.for_user(request.user)
             refresh["is_owner"] = True
             refresh["restaurant_id"] = owner.restaurant_id
             return Response({
@@ -151,7 +156,7 @@ class VerifyOwnerView(APIView):
             tier="FREE",
         )
 
-        refresh = RefreshToken.for_user(request.user)
+        refresh = RegistryRefreshToken.for_user(request.user)
         refresh["is_owner"] = True
         refresh["restaurant_id"] = owner.restaurant_id
 
@@ -192,7 +197,7 @@ class AppTokenView(APIView):
         if not owner.is_active:
             return Response({"is_owner": False}, status=status.HTTP_403_FORBIDDEN)
 
-        refresh = RefreshToken.for_user(user)
+        refresh = RegistryRefreshToken.for_user(user)
         refresh["is_owner"] = True
         refresh["restaurant_id"] = owner.restaurant_id
 
@@ -219,7 +224,7 @@ class AdminLoginView(APIView):
             kakao_id=0,
             defaults={"username": "0", "is_staff": True, "is_superuser": True},
         )
-        refresh = RefreshToken.for_user(user)
+        refresh = RegistryRefreshToken.for_user(user)
         refresh["is_owner"] = True
         refresh["is_admin"] = True
         refresh["is_superadmin"] = is_superadmin
@@ -626,7 +631,7 @@ class PresignedUploadView(APIView):
             )
             public_url = f"https://{bucket}.s3.{region}.amazonaws.com/{key}"
             return Response({"upload_url": upload_url, "public_url": public_url})
-        except ClientError as e:
+        except botocore_exceptions.ClientError as e:
             logger.error(f"PresignedUploadView error: {e}")
             return Response({"detail": "S3 URL 생성에 실패했습니다."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -973,7 +978,7 @@ class AdminBannerPopupS3ScanView(APIView):
                 ]
                 result[prefix.rstrip("/")] = urls
             return Response(result)
-        except ClientError as e:
+        except botocore_exceptions.ClientError as e:
             logger.error(f"AdminBannerPopupS3ScanView error: {e}")
             return Response({"detail": "S3 조회에 실패했습니다."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -1052,6 +1057,7 @@ class DashboardStatsView(APIView):
     """
     permission_classes = [IsAuthenticated]
 
+    @prefer_replica()
     def get(self, request):
         is_admin = bool(request.auth.get("is_admin", False))
 
@@ -1076,42 +1082,13 @@ class DashboardStatsView(APIView):
             tier = owner.tier
 
         now = timezone.now()
-        month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-
-        coupon_count = Coupon.objects.filter(
-            restaurant_id=restaurant_id,
-            status="REDEEMED",
-            redeemed_at__gte=month_start,
-        ).count()
-
-        stamp_count = StampEvent.objects.filter(
-            restaurant_id=restaurant_id,
-            delta__gt=0,
-            created_at__gte=month_start,
-        ).count()
-
-        revisit_count = (
-            StampEvent.objects.filter(
-                restaurant_id=restaurant_id,
-                delta__gt=0,
-                created_at__gte=month_start,
-            )
-            .values("user_id")
-            .annotate(visits=Count("id"))
-            .filter(visits__gte=2)
-            .count()
-        )
 
-        loyal_count = (
-            StampEvent.objects.filter(
-                restaurant_id=restaurant_id,
-                delta__gt=0,
-            )
-            .values("user_id")
-            .annotate(visits=Count("id"))
-            .filter(visits__gte=3)
-            .count()
-        )
+        # 체크포인트 이전은 사전 집계 테이블, 이후 꼬리 구간만 원천 테이블에서 합산
+        try:
+            stats = get_dashboard_stats(restaurant_id, now=now)
+        except DatabaseError:
+            logger.warning("dashboard rollup read failed, falling back to live stats", exc_info=True)
+            stats = compute_live_dashboard_stats(restaurant_id, now=now)
 
         try:
             wishlist_count = UserRestaurantWishlist.objects.filter(
@@ -1126,10 +1103,7 @@ class DashboardStatsView(APIView):
             "tier": tier,
             "month": now.strftime("%Y-%m"),
             "stats": {
-                "revisit_this_month": revisit_count,
-                "loyal_total": loyal_count,
-                "coupon_redeemed_this_month": coupon_count,
-                "stamp_earned_this_month": stamp_count,
+                **stats,
                 "wishlist_count": wishlist_count,
             },
         })
@@ -0,0 +1,212 @@
+"""
+유형 코드별 음식 추천.
+
+기존 get_unique_random_foods 는 요청마다 TypeCode 조회 → TypeCodeFood 전체 id 목록 → Redis LRANGE →
+파이썬 필터 → Food 조회 → RPUSH/LTRIM/EXPIRE 를 따로 실행했다. 여기서는
+- type_code → food_id 배열을 프로세스마다 한 번 읽어 MATRIX_TTL_S 동안 재사용하고
+  (만료 후 첫 요청 하나만 다시 읽고, 읽는 동안 다른 요청은 이전 값을 그대로 쓴다)
+  음식 정보는 type_description.catalog 의 카탈로그를 그대로 쓰며, 카탈로그가 바뀌면 배열도 다시 읽는다.
+- 최근 추천한 음식은 Redis sorted set(점수 = 추천 시각)에 두어 읽기 1회, 쓰기 1회(pipeline)로 처리한다.
+  RECENT_LIMIT 개를 넘으면 오래된 것부터 빠지므로 기존 리스트(LTRIM -80)와 같은 창을 유지한다.
+- Redis 클라이언트는 첫 사용 시 커넥션 풀과 함께 만든다 (import 시점에 연결 설정을 만들지 않음).
+Redis 를 쓸 수 없으면 중복 제거 없이 추천한다.
+"""
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from array import array
+from dataclasses import dataclass, field, replace
+from types import MappingProxyType
+from typing import Mapping
+
+from django.conf import settings
+
+from type_description.catalog import get_catalog
+
+from .models import TypeCode, TypeCodeFood
+
+logger = logging.getLogger(__name__)
+
+MATRIX_TTL_S = 300
+RECENT_LIMIT = 80
+RECENT_TTL_S = 600
+PICK_COUNT = 10
+REDIS_MAX_CONNECTIONS = 20
+REDIS_SOCKET_TIMEOUT_S = 0.5
+
+
+@dataclass(frozen=True)
+class RecommendationMatrix:
+    # type_code → food_id 배열 (array('l'), 중복 없음, DB 순서 유지)
+    foods_by_type: Mapping[str, array]
+    # food_id → 응답에 그대로 쓰는 음식 정보 (카탈로그와 같은 객체)
+    foods: Mapping[int, Mapping]
+    loaded_at: float = field(default_factory=time.monotonic)
+
+    @classmethod
+    def from_rows(cls, type_codes, type_code_foods, foods) -> "RecommendationMatrix":
+        """
+        type_codes: (type_code_id, type_code), type_code_foods: (type_code_id, food_id),
+        foods: food_id → 음식 정보.
+        음식 정보가 없는 food_id 는 추천할 수 없으므로 배열에서 뺀다.
+        """
+        codes = dict(type_codes)
+        ids_by_code: dict[str, dict[int, None]] = {}
+        for type_code_id, food_id in type_code_foods:
+            code = codes.get(type_code_id)
+            if code is not None and food_id in foods:
+                ids_by_code.setdefault(code, {})[food_id] = None
+        foods_by_type = {code: array("l", ids) for code, ids in ids_by_code.items()}
+        return cls(foods_by_type=MappingProxyType(foods_by_type), foods=foods)
+
+    def has_type(self, type_code: str) -> bool:
+        return type_code in self.foods_by_type
+
+    def pick(self, type_code: str, exclude=(), k: int = PICK_COUNT) -> list[int]:
+        """exclude 에 없는 food_id 중 최대 k 개를 무작위로 고른다."""
+        candidates = self.foods_by_type.get(type_code)
+        if not candidates:
+            return []
+        if exclude:
+            candidates = [fid for fid in candidates if fid not in exclude]
+        if not candidates:
+            return []
+        return random.sample(candidates, min(len(candidates), k))
+
+    def payload(self, food_ids) -> list[dict]:
+        # 배열을 다시 읽지 못한 채 카탈로그에서 빠진 음식은 건너뛴다
+        return [dict(self.foods[fid]) for fid in food_ids if fid in self.foods]
+
+
+_matrix: RecommendationMatrix | None = None
+_matrix_lock = threading.Lock()
+
+
+def load_matrix(foods: Mapping[int, Mapping]) -> RecommendationMatrix:
+    type_codes = TypeCode.objects.values_list("type_code_id", "type_code")
+    type_code_foods = TypeCodeFood.objects.values_list("type_code_id", "food_id")
+    return RecommendationMatrix.from_rows(list(type_codes), list(type_code_foods), foods)
+
+
+def get_matrix(*, force_refresh: bool = False) -> RecommendationMatrix:
+    global _matrix
+    current = _matrix
+    foods = get_catalog().foods
+    if (
+        current is not None
+        and not force_refresh
+        and current.foods is foods
+        and time.monotonic() - current.loaded_at < MATRIX_TTL_S
+    ):
+        return current
+    # 처음 읽을 때는 기다리고, 만료 후 다른 요청이 다시 읽는 중이면 이전 값을 쓴다
+    if not _matrix_lock.acquire(blocking=current is None or force_refresh):
+        return current
+    try:
+        if _matrix is not current and not force_refresh:
+            return _matrix
+        try:
+            _matrix = load_matrix(foods)
+        except Exception:
+            if current is None:
+                raise
+            logger.exception("food recommendation matrix refresh failed; keeping previous one")
+            # 실패 후 요청마다 다시 읽지 않도록 만료 시각을 미루고 음식 정보만 새 카탈로그로 바꾼다
+            _matrix = replace(current, foods=foods, loaded_at=time.monotonic())
+        return _matrix
+    finally:
+        _matrix_lock.release()
+
+
+def reset_matrix() -> None:
+    global _matrix
+    with _matrix_lock:
+        _matrix = None
+
+
+_redis = None
+_redis_lock = threading.Lock()
+
+
+def _redis_client():
+    """
+    REDIS_HOST(없으면 REDIS_URL)로 커넥션 풀을 가진 클라이언트를 한 번만 만든다. 설정이 없으면 None.
+    연결이 max_connections 개 모두 사용 중이면 오류 대신 socket timeout 만큼 빈 연결을 기다린다 (gevent 워커 대비).
+    """
+    global _redis
+    if _redis is not None:
+        return _redis
+    with _redis_lock:
+        if _redis is not None:
+            return _redis
+        from redis import BlockingConnectionPool, Redis
+
+        options = {
+            "decode_responses": True,
+            "max_connections": REDIS_MAX_CONNECTIONS,
+            "socket_timeout": REDIS_SOCKET_TIMEOUT_S,
+            "socket_connect_timeout": REDIS_SOCKET_TIMEOUT_S,
+            "timeout": REDIS_SOCKET_TIMEOUT_S,
+        }
+        host = getattr(settings, "REDIS_HOST", None)
+        url = getattr(settings, "REDIS_URL", None)
+        if host:
+            pool = BlockingConnectionPool(
+                host=host,
+                port=int(getattr(settings, "REDIS_PORT", None) or 6379),
+                db=0,
+                password=getattr(settings, "REDIS_PASSWORD", None),
+                **options,
+            )
+        elif url:
+            pool = BlockingConnectionPool.from_url(url, **options)
+        else:
+            return None
+        _redis = Redis(connection_pool=pool)
+        return _redis
+
+
+def _recent_key(user_uuid: str) -> str:
+    # 기존 리스트 키(user:{uuid}:recent_foods)와 이름을 달리해 배포 직후 ZSET 명령이 WRONGTYPE 으로 실패하지 않게 한다.
+    # 기존 키는 RECENT_TTL_S 안에 만료된다
+    return f"user:{user_uuid}:recent_foods:v2"
+
+
+def recently_shown(user_uuid: str) -> set[int]:
+    client = _redis_client()
+    if client is None:
+        return set()
+    try:
+        members = client.zrange(_recent_key(user_uuid), 0, -1)
+    except Exception as exc:
+        # 캐시 문제 시 중복 제거 없이 계속 진행
+        logger.warning("recent foods read failed (uuid=%s): %s", user_uuid, exc)
+        return set()
+    shown = set()
+    for member in members:
+        try:
+            shown.add(int(member))
+        except (TypeError, ValueError):
+            continue
+    return shown
+
+
+def remember_shown(user_uuid: str, food_ids) -> None:
+    client = _redis_client()
+    if client is None or not food_ids:
+        return
+    key = _recent_key(user_uuid)
+    now = time.time()
+    try:
+        pipe = client.pipeline(transaction=False)
+        # 같은 요청에서 고른 음식도 순서대로 점수를 달리해 잘릴 때 순서가 유지되게 한다
+        pipe.zadd(key, {str(fid): now + i * 1e-6 for i, fid in enumerate(food_ids)})
+        pipe.zremrangebyrank(key, 0, -(RECENT_LIMIT + 1))
+        pipe.expire(key, RECENT_TTL_S)
+        pipe.execute()
+    except Exception as exc:
+        # 캐시 업데이트 실패 시에도 추천은 반환
+        logger.warning("recent foods update failed (uuid=%s): %s", user_uuid, exc)
@@ -1,3 +1,81 @@
-from django.test import TestCase
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
 
-# Create your tests here.
+from django.test import RequestFactory, TestCase
+
+from food_by_type import recommender
+from food_by_type.recommender import RecommendationMatrix
+from food_by_type.views import get_unique_random_foods
+from guests.models import GuestUser
+
+
+def _matrix():
+    foods = {
+        fid: {"food_id": fid, "food_name": f"food-{fid}", "description": None, "food_image_url": None}
+        for fid in range(1, 13)
+    }
+    type_code_foods = [(1, fid) for fid in range(1, 13)] + [(2, 1), (2, 99)]
+    return RecommendationMatrix.from_rows([(1, "ISTJ"), (2, "ENFP")], type_code_foods, foods)
+
+
+class RecommendationMatrixTests(TestCase):
+    def test_from_rows_drops_foods_without_metadata(self):
+        matrix = _matrix()
+        self.assertEqual(list(matrix.foods_by_type["ENFP"]), [1])
+        self.assertEqual(len(matrix.foods_by_type["ISTJ"]), 12)
+
+    def test_pick_excludes_recent_and_caps_count(self):
+        matrix = _matrix()
+        picked = matrix.pick("ISTJ", exclude={1, 2, 3})
+        self.assertEqual(len(picked), 9)
+        self.assertFalse({1, 2, 3} & set(picked))
+        self.assertEqual(len(matrix.pick("ISTJ")), recommender.PICK_COUNT)
+        self.assertEqual(matrix.pick("ENFP", exclude={1}), [])
+
+    def test_get_matrix_keeps_previous_when_refresh_fails(self):
+        recommender.reset_matrix()
+        self.addCleanup(recommender.reset_matrix)
+        matrix = _matrix()
+        patcher = patch.object(recommender, "get_catalog", return_value=SimpleNamespace(foods=matrix.foods))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        with patch.object(recommender, "load_matrix", return_value=matrix) as load:
+            first = recommender.get_matrix()
+            self.assertIs(recommender.get_matrix(), first)
+            self.assertEqual(load.call_count, 1)
+        with patch.object(recommender, "load_matrix", side_effect=RuntimeError("db down")):
+            refreshed = recommender.get_matrix(force_refresh=True)
+        self.assertEqual(refreshed.foods_by_type, first.foods_by_type)
+
+
+class UniqueRandomFoodsViewTests(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.guest = GuestUser.objects.create(type_code="ISTJ")
+        patcher = patch("food_by_type.views.get_matrix", return_value=_matrix())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _get(self, **params):
+        return get_unique_random_foods(self.factory.get("/food-by-type/unique-random-foods/", params))
+
+    def test_returns_unseen_foods_and_records_them(self):
+        with patch("food_by_type.views.recently_shown", return_value=set(range(1, 10))), patch(
+            "food_by_type.views.remember_shown"
+        ) as remember:
+            response = self._get(uuid=str(self.guest.uuid))
+        self.assertEqual(response.status_code, 200)
+        ids = {food["food_id"] for food in json.loads(response.content)["random_foods"]}
+        self.assertEqual(ids, {10, 11, 12})
+        self.assertEqual(set(remember.call_args.args[1]), ids)
+
+    def test_all_foods_seen_returns_not_enough_food(self):
+        with patch("food_by_type.views.recently_shown", return_value=set(range(1, 13))):
+            response = self._get(uuid=str(self.guest.uuid))
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(json.loads(response.content)["error_code"], "NOT_ENOUGH_FOOD")
+
+    def test_unknown_or_malformed_uuid_returns_404(self):
+        self.assertEqual(self._get(uuid="not-a-uuid").status_code, 404)
+        self.assertEqual(self._get().status_code, 400)
@@ -0,0 +1,191 @@
+"""
+게스트 사용자 수명 관리.
+
+retrieve_guest_user 는 uuid 없이 호출될 때마다 GuestUser 를 새로 만들고 지금까지 지운 적이 없어
+테이블과 알림 대상 수집(게스트 토큰 + 사용자 토큰 중복 제거)이 계속 커졌다. 여기서는
+- last_seen_at: 요청 때마다 쓰지 않고 LAST_SEEN_RESOLUTION 보다 오래됐을 때만 UPDATE 한 번
+- merge_linked_guests: 로그인 계정(linked_user)에 연결된 지 오래된 게스트의 값을 계정에 합치고 게스트 행을 지운다
+  (계정에 없는 fcm_token/type_code 만 채운다. 찜 목록은 로그인 때 merge_guest_data 가 이미 옮겼고,
+  최근에 본 게스트는 앱이 아직 uuid 를 쓸 수 있어 남긴다)
+- purge_inactive_guests: 연결되지 않은 채 inactive_days 동안 활동이 없는 게스트를 지운다
+두 정리 작업 모두 id 순서로 batch_size 개씩 짧은 트랜잭션으로 처리하고, time_budget_s 로 끊으면 다음 실행이 이어서 한다.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from datetime import datetime, timedelta
+
+from django.db import router, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import GuestUser
+
+logger = logging.getLogger(__name__)
+
+LAST_SEEN_RESOLUTION = timedelta(hours=6)
+
+DEFAULT_INACTIVE_DAYS = 90
+DEFAULT_LINKED_GRACE_DAYS = 14
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_SLEEP_S = 0.05
+
+
+def touch_last_seen(guest: GuestUser, *, now: datetime | None = None) -> bool:
+    """last_seen_at 이 LAST_SEEN_RESOLUTION 보다 오래됐을 때만 갱신한다. 반환: 실제로 UPDATE 했는지."""
+    now = now or timezone.now()
+    if guest.last_seen_at is not None and now - guest.last_seen_at < LAST_SEEN_RESOLUTION:
+        return False
+    # save() 는 updated_at(auto_now)까지 바꾸므로 update() 로 이 컬럼만 쓴다
+    GuestUser.objects.filter(pk=guest.pk).update(last_seen_at=now)
+    guest.last_seen_at = now
+    return True
+
+
+def inactive_since_q(cutoff: datetime) -> Q:
+    """
+    cutoff 이후 활동이 없는 게스트.
+    last_seen_at 이 비어 있으면 활동 중으로 본다. 읽기 전용 엔드포인트는 updated_at 을 바꾸지 않아
+    updated_at 으로는 판단할 수 없다 (기존 행은 마이그레이션 0007 이 채운다).
+    """
+    return Q(last_seen_at__lt=cutoff)
+
+
+def _is_empty(value) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, str):
+        return value.strip() in ("", "[]", "{}", "null", "None")
+    return False
+
+
+def _merge_into_user(user, guests: list[GuestUser]) -> list[str]:
+    """게스트 값 중 계정에 비어 있는 것만 채운다. 반환: 바뀐 필드 목록."""
+    # 가장 최근에 쓰인 게스트 값을 우선한다
+    guests = sorted(guests, key=lambda g: g.last_seen_at or g.updated_at, reverse=True)
+    changed = []
+    for field in ("fcm_token", "type_code"):
+        if not _is_empty(getattr(user, field)):
+            continue
+        value = next((getattr(g, field) for g in guests if not _is_empty(getattr(g, field))), None)
+        if value is not None:
+            setattr(user, field, value)
+            changed.append(field)
+    return changed
+
+
+def merge_linked_guests(
+    *,
+    now: datetime | None = None,
+    grace_days: int = DEFAULT_LINKED_GRACE_DAYS,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_batches: int | None = None,
+    sleep_s: float = DEFAULT_SLEEP_S,
+    time_budget_s: float | None = None,
+    dry_run: bool = False,
+) -> dict:
+    """grace_days 동안 보이지 않은 연결 게스트를 계정에 합치고 지운다."""
+    from accounts.models import User
+
+    alias = router.db_for_write(GuestUser)
+    now = now or timezone.now()
+    cutoff = now - timedelta(days=grace_days)
+    started = time.monotonic()
+    after_id = 0
+    merged = users_updated = batches = 0
+    finished = False
+    base = GuestUser.objects.using(alias).filter(linked_user__isnull=False).filter(inactive_since_q(cutoff))
+    while max_batches is None or batches < max_batches:
+        if time_budget_s is not None and time.monotonic() - started >= time_budget_s:
+            break
+        with transaction.atomic(using=alias):
+            guests = list(
+                base.filter(id__gt=after_id)
+                .select_for_update(skip_locked=True)
+                .order_by("id")
+                .only("id", "linked_user_id", "fcm_token", "type_code", "last_seen_at", "updated_at")[:batch_size]
+            )
+            if not guests:
+                finished = True
+                break
+            after_id = guests[-1].id
+            by_user: dict[int, list[GuestUser]] = {}
+            for guest in guests:
+                by_user.setdefault(guest.linked_user_id, []).append(guest)
+            users = User.objects.using(router.db_for_write(User)).filter(id__in=by_user).only(
+                "id", "fcm_token", "type_code"
+            )
+            to_update = []
+            fields: set[str] = set()
+            for user in users:
+                changed = _merge_into_user(user, by_user[user.id])
+                if changed:
+                    to_update.append(user)
+                    fields.update(changed)
+            if not dry_run:
+                if to_update:
+                    User.objects.using(router.db_for_write(User)).bulk_update(to_update, sorted(fields))
+                GuestUser.objects.using(alias).filter(id__in=[g.id for g in guests]).delete()
+            merged += len(guests)
+            users_updated += len(to_update)
+        batches += 1
+        if len(guests) < batch_size:
+            finished = True
+            break
+        if sleep_s > 0:
+            time.sleep(sleep_s)
+    return {
+        "merged": merged,
+        "users_updated": users_updated,
+        "batches": batches,
+        "finished": finished,
+        "elapsed_s": round(time.monotonic() - started, 3),
+    }
+
+
+def purge_inactive_guests(
+    *,
+    now: datetime | None = None,
+    inactive_days: int = DEFAULT_INACTIVE_DAYS,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_batches: int | None = None,
+    sleep_s: float = DEFAULT_SLEEP_S,
+    time_budget_s: float | None = None,
+    dry_run: bool = False,
+) -> dict:
+    """연결되지 않은 채 inactive_days 동안 활동이 없는 게스트를 id 순서로 batch_size 개씩 지운다."""
+    alias = router.db_for_write(GuestUser)
+    now = now or timezone.now()
+    cutoff = now - timedelta(days=inactive_days)
+    started = time.monotonic()
+    after_id = 0
+    deleted = batches = 0
+    finished = False
+    base = GuestUser.objects.using(alias).filter(linked_user__isnull=True).filter(inactive_since_q(cutoff))
+    while max_batches is None or batches < max_batches:
+        if time_budget_s is not None and time.monotonic() - started >= time_budget_s:
+            break
+        ids = list(base.filter(id__gt=after_id).order_by("id").values_list("id", flat=True)[:batch_size])
+        if not ids:
+            finished = True
+            break
+        after_id = ids[-1]
+        if dry_run:
+            deleted += len(ids)
+        else:
+            with transaction.atomic(using=alias):
+                # 조회와 삭제 사이에 다시 활동한 게스트는 조건으로 한 번 더 거른다
+                deleted += base.filter(id__in=ids).delete()[0]
+        batches += 1
+        if len(ids) < batch_size:
+            finished = True
+            break
+        if sleep_s > 0:
+            time.sleep(sleep_s)
+    return {
+        "deleted": deleted,
+        "batches": batches,
+        "finished": finished,
+        "elapsed_s": round(time.monotonic() - started, 3),
+    }
@@ -0,0 +1,90 @@
+"""
+게스트 사용자(GuestUser)를 정리합니다.
+
+1) 로그인 계정에 연결된 뒤 --linked-grace-days 동안 보이지 않은 게스트: 계정에 없는 fcm_token/type_code 를 옮기고 삭제
+2) 연결되지 않은 채 --inactive-days 동안 활동이 없는 게스트: 삭제
+id 순서로 --batch-size 개씩 처리하므로 --time-budget 으로 끊어도 다음 실행이 이어서 정리합니다.
+
+사용 예:
+  python manage.py compact_guest_users --dry-run
+  python manage.py compact_guest_users --inactive-days 90 --time-budget 300
+  python manage.py compact_guest_users --skip-merge
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from guests.lifecycle import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_INACTIVE_DAYS,
+    DEFAULT_LINKED_GRACE_DAYS,
+    DEFAULT_SLEEP_S,
+    merge_linked_guests,
+    purge_inactive_guests,
+)
+
+
+class Command(BaseCommand):
+    help = "연결된 게스트를 계정에 합치고, 오래 활동이 없는 게스트를 배치 단위로 삭제합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--inactive-days",
+            type=int,
+            default=DEFAULT_INACTIVE_DAYS,
+            help=f"연결되지 않은 게스트를 지울 비활동 기간(일) (기본: {DEFAULT_INACTIVE_DAYS})",
+        )
+        parser.add_argument(
+            "--linked-grace-days",
+            type=int,
+            default=DEFAULT_LINKED_GRACE_DAYS,
+            help=f"연결된 게스트를 합치기 전 대기 기간(일) (기본: {DEFAULT_LINKED_GRACE_DAYS})",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f"배치당 처리 건수 (기본: {DEFAULT_BATCH_SIZE})",
+        )
+        parser.add_argument("--sleep", type=float, default=DEFAULT_SLEEP_S, help="배치 사이 대기 초")
+        parser.add_argument("--max-batches", type=int, default=None, help="단계별 최대 배치 수")
+        parser.add_argument("--time-budget", type=float, default=None, help="단계별 최대 소요 시간(초)")
+        parser.add_argument("--skip-merge", action="store_true", help="연결된 게스트 합치기를 건너뜀")
+        parser.add_argument("--skip-purge", action="store_true", help="비활동 게스트 삭제를 건너뜀")
+        parser.add_argument("--dry-run", action="store_true", help="삭제하지 않고 대상 건수만 확인")
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size 는 1 이상이어야 합니다.")
+        if options["inactive_days"] < 1 or options["linked_grace_days"] < 0:
+            raise CommandError("--inactive-days 는 1 이상, --linked-grace-days 는 0 이상이어야 합니다.")
+
+        common = {
+            "batch_size": options["batch_size"],
+            "max_batches": options["max_batches"],
+            "sleep_s": options["sleep"],
+            "time_budget_s": options["time_budget"],
+            "dry_run": options["dry_run"],
+        }
+        prefix = "[DRY-RUN] " if options["dry_run"] else ""
+        unfinished = False
+
+        if not options["skip_merge"]:
+            result = merge_linked_guests(grace_days=options["linked_grace_days"], **common)
+            unfinished |= not result["finished"]
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{prefix}연결 게스트 {result['merged']:,}건 정리, 계정 {result['users_updated']:,}건 보완 "
+                    f"({result['batches']}배치, {result['elapsed_s']}s)"
+                )
+            )
+
+        if not options["skip_purge"]:
+            result = purge_inactive_guests(inactive_days=options["inactive_days"], **common)
+            unfinished |= not result["finished"]
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{prefix}비활동 게스트 {result['deleted']:,}건 삭제 ({result['batches']}배치, {result['elapsed_s']}s)"
+                )
+            )
+
+        if unfinished:
+            self.stdout.write(self.style.WARNING("남은 대상이 있습니다. 다음 실행에서 이어서 처리합니다."))
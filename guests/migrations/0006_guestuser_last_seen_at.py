@@ -0,0 +1,18 @@
+# Generated by Django 4.2.6 on 2026-10-19 15:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('guests', '0005_guestuser_linked_user'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='guestuser',
+            name='last_seen_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
@@ -0,0 +1,44 @@
+"""
+Data migration: last_seen_at 이 비어 있는 기존 게스트를 마이그레이션 시각으로 채운다.
+
+retrieve_guest_user / get_unique_random_foods 같은 읽기 전용 엔드포인트는 updated_at 을 바꾸지 않았으므로
+updated_at 으로는 앱을 계속 쓰는 게스트와 떠난 게스트를 구분할 수 없다. 모두 지금 본 것으로 두고
+이후 요청의 touch_last_seen 으로 판단한다 (purge_inactive_guests 는 inactive_days 뒤부터 지운다).
+테이블이 크므로 id 순서로 나눠 짧은 트랜잭션으로 처리한다.
+"""
+
+from django.db import migrations, transaction
+from django.utils import timezone
+
+BATCH_SIZE = 5000
+
+
+def backfill_last_seen_at(apps, schema_editor):
+    GuestUser = apps.get_model("guests", "GuestUser")
+    alias = schema_editor.connection.alias
+    now = timezone.now()
+    last_id = 0
+    while True:
+        ids = list(
+            GuestUser.objects.using(alias)
+            .filter(id__gt=last_id, last_seen_at__isnull=True)
+            .order_by("id")
+            .values_list("id", flat=True)[:BATCH_SIZE]
+        )
+        if not ids:
+            break
+        with transaction.atomic(using=alias):
+            GuestUser.objects.using(alias).filter(id__in=ids, last_seen_at__isnull=True).update(last_seen_at=now)
+        last_id = ids[-1]
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("guests", "0006_guestuser_last_seen_at"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_last_seen_at, migrations.RunPython.noop),
+    ]
@@ -22,6 +22,8 @@ class GuestUser(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # 마지막 요청 시각. 매 요청마다 쓰지 않고 guests.lifecycle.LAST_SEEN_RESOLUTION 간격으로만 갱신한다.
+    last_seen_at = models.DateTimeField(null=True, blank=True, db_index=True)
 
     def __str__(self):
         # 객체를 문자열로 표현하는 방법 정의. 둘을 하나로 가져옴
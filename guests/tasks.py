@@ -0,0 +1,12 @@
+from celery import shared_task
+
+from .lifecycle import merge_linked_guests, purge_inactive_guests
+
+
+@shared_task
+def compact_guest_users():
+    # 연결 게스트 합치기 + 비활동 게스트 삭제 (단계별 최대 2분, 남은 건 다음 실행이 이어서)
+    return {
+        "merge": merge_linked_guests(time_budget_s=120),
+        "purge": purge_inactive_guests(time_budget_s=120),
+    }
@@ -1,3 +1,112 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save
 from django.test import TestCase
+from django.utils import timezone
+
+from guests.lifecycle import (
+    LAST_SEEN_RESOLUTION,
+    merge_linked_guests,
+    purge_inactive_guests,
+    touch_last_seen,
+)
+from guests.models import GuestUser
+
+
+class GuestLifecycleTests(TestCase):
+    """게스트 last_seen 갱신 / 연결 게스트 합치기 / 비활동 게스트 삭제 검증."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user_model = get_user_model()
+        from coupons import signals as coupon_signals
+        post_save.disconnect(coupon_signals.on_user_created, sender=cls.user_model)
+        cls.addClassCleanup(post_save.connect, coupon_signals.on_user_created, sender=cls.user_model)
+
+    def _guest(self, *, days_ago, last_seen=True, **fields):
+        guest = GuestUser.objects.create(**fields)
+        when = timezone.now() - timedelta(days=days_ago)
+        GuestUser.objects.filter(pk=guest.pk).update(
+            updated_at=when, last_seen_at=when if last_seen else None
+        )
+        return guest
+
+    def test_touch_last_seen_skips_recent_write(self):
+        guest = GuestUser.objects.create()
+        now = timezone.now()
+        self.assertTrue(touch_last_seen(guest, now=now))
+        self.assertFalse(touch_last_seen(guest, now=now + LAST_SEEN_RESOLUTION / 2))
+        self.assertTrue(touch_last_seen(guest, now=now + LAST_SEEN_RESOLUTION))
+        guest.refresh_from_db()
+        self.assertEqual(guest.last_seen_at, now + LAST_SEEN_RESOLUTION)
+
+    def test_merge_linked_guests_fills_empty_user_fields(self):
+        user = self.user_model.objects.create_user(kakao_id=9101, password="pass")
+        old = self._guest(days_ago=30, linked_user=user, fcm_token="guest-token", type_code="ISTJ")
+        recent = self._guest(days_ago=1, linked_user=user, fcm_token="recent-token")
+
+        result = merge_linked_guests(grace_days=14, sleep_s=0)
+
+        self.assertEqual(result["merged"], 1)
+        self.assertEqual(result["users_updated"], 1)
+        self.assertTrue(result["finished"])
+        user.refresh_from_db()
+        self.assertEqual(user.fcm_token, "guest-token")
+        self.assertEqual(user.type_code, "ISTJ")
+        self.assertFalse(GuestUser.objects.filter(pk=old.pk).exists())
+        self.assertTrue(GuestUser.objects.filter(pk=recent.pk).exists())
+
+    def test_merge_linked_guests_keeps_existing_user_values(self):
+        user = self.user_model.objects.create_user(kakao_id=9102, password="pass")
+        self.user_model.objects.filter(pk=user.pk).update(fcm_token="user-token")
+        self._guest(days_ago=30, linked_user=user, fcm_token="guest-token")
+
+        result = merge_linked_guests(grace_days=14, sleep_s=0)
+
+        self.assertEqual(result["users_updated"], 0)
+        user.refresh_from_db()
+        self.assertEqual(user.fcm_token, "user-token")
+        self.assertFalse(GuestUser.objects.filter(linked_user=user).exists())
+
+    def test_purge_inactive_guests_in_batches(self):
+        stale = [self._guest(days_ago=120) for _ in range(3)]
+        # last_seen_at 없는 기존 행은 updated_at 이 오래돼도 남긴다 (읽기 전용 요청은 updated_at 을 바꾸지 않음)
+        legacy = self._guest(days_ago=120, last_seen=False)
+        active = self._guest(days_ago=10)
+        user = self.user_model.objects.create_user(kakao_id=9103, password="pass")
+        linked = self._guest(days_ago=120, linked_user=user)
+
+        result = purge_inactive_guests(inactive_days=90, batch_size=2, sleep_s=0)
+
+        self.assertEqual(result["deleted"], 3)
+        self.assertEqual(result["batches"], 2)
+        self.assertTrue(result["finished"])
+        remaining = set(GuestUser.objects.values_list("pk", flat=True))
+        self.assertEqual(remaining, {legacy.pk, active.pk, linked.pk})
+        self.assertTrue(all(g.pk not in remaining for g in stale))
+
+    def test_backfill_migration_marks_existing_guests_seen(self):
+        import importlib
+
+        from django.apps import apps
+        from django.db import connection
+
+        migration = importlib.import_module("guests.migrations.0007_backfill_guestuser_last_seen_at")
+        legacy = self._guest(days_ago=120, last_seen=False)
+        seen = self._guest(days_ago=120)
+
+        migration.backfill_last_seen_at(apps, connection.schema_editor())
+
+        legacy.refresh_from_db()
+        seen.refresh_from_db()
+        self.assertGreater(legacy.last_seen_at, timezone.now() - timedelta(minutes=1))
+        self.assertLess(seen.last_seen_at, timezone.now() - timedelta(days=100))
+        self.assertEqual(purge_inactive_guests(inactive_days=90, sleep_s=0)["deleted"], 1)
 
-# Create your tests here.
+    def test_purge_inactive_guests_dry_run_deletes_nothing(self):
+        self._guest(days_ago=120)
+        result = purge_inactive_guests(inactive_days=90, sleep_s=0, dry_run=True)
+        self.assertEqual(result["deleted"], 1)
+        self.assertEqual(GuestUser.objects.count(), 1)
@@ -1,5 +1,7 @@
 # 게스트 사용자 뷰
 from django.http import JsonResponse
+from django.utils import timezone
+from .lifecycle import touch_last_seen
 from .models import GuestUser
 from restaurants.models import Restaurant
 from django.core.exceptions import ValidationError
@@ -11,11 +13,12 @@ def retrieve_guest_user(request):
     uuid = request.GET.get('uuid') # 요청에서 UUID 가져오기
     if not uuid:
         # 새 게스트 사용자 생성
-        guest_user = GuestUser.objects.create()
+        guest_user = GuestUser.objects.create(last_seen_at=timezone.now())
         return JsonResponse({'uuid': str(guest_user.uuid)}) # 생성된 게스트 사용자의 UUID를 반환
     try:
         # UUID로 게스트 사용자 검색
         guest_user = GuestUser.objects.get(uuid=uuid) # ORM으로 가져온 uuid에 맞는 객체 찾기
+        touch_last_seen(guest_user)
         return JsonResponse({
             'uuid': str(guest_user.uuid),
             'type_code': guest_user.type_code,
@@ -83,7 +86,8 @@ def update_guest_user_type_code(request):
 
         try:
             guest_user.type_code = type_code
-            guest_user.save(update_fields=['type_code'])
+            guest_user.last_seen_at = timezone.now()
+            guest_user.save(update_fields=['type_code', 'last_seen_at'])
             return JsonResponse({'status': 'success', 'message': '게스트 사용자 유형 코드 업데이트 성공'})
         except ValidationError as e:
             return JsonResponse({'status': 'error', 'message': f'유형 코드 업데이트 실패: {str(e)}'}, status=400)
@@ -139,6 +143,7 @@ def update_guest_user_favorite_restaurants(request):
 
         # 업데이트된 리스트를 JSON 형식으로 저장
         guest_user.favorite_restaurants = json.dumps(favorite_restaurants)
+        guest_user.last_seen_at = timezone.now()
         guest_user.save()
 
         return JsonResponse({'status': 'success', 'message': '게스트 사용자 찜 음식점 업데이트 성공', 'favorites': favorite_restaurants})
@@ -167,7 +172,8 @@ def update_guest_user_fcm_token(request):
 
         guest_user = GuestUser.objects.get(uuid=uuid)
         guest_user.fcm_token = fcm_token
-        guest_user.save(update_fields=['fcm_token'])
+        guest_user.last_seen_at = timezone.now()
+        guest_user.save(update_fields=['fcm_token', 'last_seen_at'])
 
         return JsonResponse({'status': 'success', 'message': 'FCM 토큰 업데이트 성공'})
 
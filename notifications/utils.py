@@ -1,11 +1,19 @@
 import json
 import logging
 import os
-from typing import Iterable, Optional, Tuple
+from typing import TYPE_CHECKING, Iterable, Optional, Tuple
 
 from django.conf import settings
-from google.auth.transport.requests import AuthorizedSession, Request
-from google.oauth2 import service_account
+
+from wouldulike_backend.green import release_db_connections
+from wouldulike_backend.lazy import lazy_module
+
+if TYPE_CHECKING:
+    from google.auth.transport.requests import AuthorizedSession
+
+# google.auth 는 실제로 알림을 보낼 때만 import 한다
+google_requests = lazy_module("google.auth.transport.requests")
+service_account = lazy_module("google.oauth2.service_account")
 
 logger = logging.getLogger(__name__)
 
@@ -58,7 +66,7 @@ def _load_service_account_credentials():
     return None
 
 
-def _build_authorized_session() -> Optional[Tuple[AuthorizedSession, str]]:
+def _build_authorized_session() -> Optional[Tuple["AuthorizedSession", str]]:
     credentials = _load_service_account_credentials()
     if not credentials:
         return None
@@ -75,12 +83,12 @@ def _build_authorized_session() -> Optional[Tuple[AuthorizedSession, str]]:
 
     # Ensure credentials have a valid access token.
     try:
-        credentials.refresh(Request())
+        credentials.refresh(google_requests.Request())
     except Exception:
         logger.exception("Failed to refresh Google credentials for FCM")
         return None
 
-    return AuthorizedSession(credentials), project_id
+    return google_requests.AuthorizedSession(credentials), project_id
 
 
 def _compose_notification_title_and_body(
@@ -257,6 +265,8 @@ def send_notification(
         logger.debug("Skipping FCM send: no tokens provided")
         return None
 
+    # 토큰 수만큼 FCM 을 순서대로 호출하므로 그동안 DB 연결을 쥐고 있지 않는다 (gevent 모드)
+    release_db_connections()
     session_with_project = _build_authorized_session()
     if not session_with_project:
         logger.warning("Skipping FCM send: could not build authorized session")
@@ -0,0 +1,187 @@
+"""
+식당 탭 일반식당(비제휴) 목록: keyset(커서) 페이지네이션과 캐시된 총 개수.
+
+- OFFSET 방식은 깊은 페이지일수록 앞 행을 모두 건너뛰어야 해서 느려진다.
+  restaurant_id(PK) 기준 ``restaurant_id > cursor`` 로 이어 읽으면 어느 페이지든 비용이 같다.
+- 총 개수(COUNT(*))는 페이지마다 다시 세지 않고 캐시해 둔 근사값을 쓴다.
+  soft TTL이 지나면 stale 값을 그대로 응답하고, 한 요청만 백그라운드 스레드에서 다시 센다.
+  (refresh_restaurant_tab_counts 커맨드로 주기적으로 미리 채울 수도 있다)
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+import time
+
+from django.core.cache import cache
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+GENERAL_DB_ALIAS = "cloudsql"
+
+_GENERAL_COUNT_CACHE_KEY = "restaurants:tab_general_count_v1:{digest}"
+_GENERAL_COUNT_REFRESH_LOCK_KEY = "restaurants:tab_general_count_refresh_v1:{digest}"
+# soft TTL 이후에는 stale 값을 응답하면서 백그라운드로 갱신
+GENERAL_COUNT_SOFT_TTL_S = 300
+# hard TTL 이후에는 캐시에서 사라져 요청 경로에서 동기 COUNT
+GENERAL_COUNT_HARD_TTL_S = 60 * 60 * 6
+_GENERAL_COUNT_REFRESH_LOCK_TTL_S = 60
+
+_GENERAL_ROW_SELECT = """
+    SELECT
+        restaurant_id,
+        name,
+        description,
+        address,
+        category,
+        zone,
+        phone_number,
+        url,
+        s3_image_urls
+    FROM restaurants_affiliate
+    WHERE (is_affiliate = FALSE OR is_affiliate IS NULL)
+"""
+
+
+def _keyword_filter(q: str) -> tuple[str, list]:
+    if not q:
+        return "", []
+    return " AND name ILIKE %s", [f"%{q}%"]
+
+
+def _count_cache_digest(q: str) -> str:
+    return hashlib.sha1((q or "").encode("utf-8")).hexdigest()[:16]
+
+
+def parse_general_cursor(value) -> int | None:
+    """커서는 직전 페이지 마지막 restaurant_id. 빈 값/잘못된 값이면 첫 페이지(None)."""
+    if value in (None, ""):
+        return None
+    try:
+        parsed = int(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+    return parsed if parsed >= 0 else None
+
+
+def count_general_restaurants(q: str = "", *, db_alias: str = GENERAL_DB_ALIAS) -> int:
+    where_keyword, params = _keyword_filter(q)
+    with connections[db_alias].cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT COUNT(*)
+            FROM restaurants_affiliate
+            WHERE (is_affiliate = FALSE OR is_affiliate IS NULL)
+            {where_keyword}
+            """,
+            params,
+        )
+        return cursor.fetchone()[0]
+
+
+def refresh_general_count(q: str = "", *, db_alias: str = GENERAL_DB_ALIAS) -> int:
+    """COUNT(*)를 다시 세서 캐시에 기록한다."""
+    total = count_general_restaurants(q, db_alias=db_alias)
+    try:
+        cache.set(
+            _GENERAL_COUNT_CACHE_KEY.format(digest=_count_cache_digest(q)),
+            {"count": total, "refreshed_at": time.time()},
+            GENERAL_COUNT_HARD_TTL_S,
+        )
+    except Exception:  # noqa: BLE001 — 캐시 장애는 응답에 영향 주지 않음
+        logger.warning("failed to cache general restaurant count (q=%r)", q, exc_info=True)
+    return total
+
+
+def _refresh_general_count_in_background(q: str, db_alias: str) -> None:
+    def _run():
+        try:
+            refresh_general_count(q, db_alias=db_alias)
+        except Exception:  # noqa: BLE001
+            logger.warning("background general count refresh failed (q=%r)", q, exc_info=True)
+        finally:
+            # 스레드 전용 DB 연결 정리 (요청 사이클 밖이라 Django가 닫아주지 않음)
+            connections.close_all()
+
+    threading.Thread(
+        target=_run,
+        name="restaurant-tab-count-refresh",
+        daemon=True,
+    ).start()
+
+
+def get_general_total_count(
+    q: str = "",
+    *,
+    db_alias: str = GENERAL_DB_ALIAS,
+) -> tuple[int, bool]:
+    """
+    일반식당 총 개수 (count, is_approximate).
+
+    캐시에 값이 있으면 그대로 쓰고(근사값), soft TTL이 지났으면 백그라운드 갱신을 한 번만 띄운다.
+    캐시에 없으면 동기로 세서 정확한 값을 돌려준다.
+    """
+    digest = _count_cache_digest(q)
+    try:
+        cached = cache.get(_GENERAL_COUNT_CACHE_KEY.format(digest=digest))
+    except Exception:  # noqa: BLE001
+        cached = None
+
+    if not cached:
+        return refresh_general_count(q, db_alias=db_alias), False
+
+    age = time.time() - float(cached.get("refreshed_at") or 0)
+    if age >= GENERAL_COUNT_SOFT_TTL_S:
+        try:
+            should_refresh = cache.add(
+                _GENERAL_COUNT_REFRESH_LOCK_KEY.format(digest=digest),
+                "1",
+                _GENERAL_COUNT_REFRESH_LOCK_TTL_S,
+            )
+        except Exception:  # noqa: BLE001
+            should_refresh = False
+        if should_refresh:
+            _refresh_general_count_in_background(q, db_alias)
+    return int(cached.get("count") or 0), True
+
+
+def fetch_general_rows_page(
+    *,
+    q: str = "",
+    limit: int,
+    cursor: int | None = None,
+    offset: int | None = None,
+    db_alias: str = GENERAL_DB_ALIAS,
+) -> tuple[list, bool]:
+    """
+    일반식당 한 페이지 (rows, has_more).
+
+    cursor가 주어지면 keyset(``restaurant_id > cursor``), 아니면 기존 OFFSET 방식.
+    limit+1 행을 읽어 다음 페이지 존재 여부를 COUNT 없이 판단한다.
+    """
+    where_keyword, params = _keyword_filter(q)
+    if cursor is not None:
+        where_keyword += " AND restaurant_id > %s"
+        params.append(cursor)
+        paging_sql = "LIMIT %s"
+        params.append(limit + 1)
+    else:
+        paging_sql = "LIMIT %s OFFSET %s"
+        params.extend([limit + 1, offset or 0])
+
+    with connections[db_alias].cursor() as db_cursor:
+        db_cursor.execute(
+            f"""
+            {_GENERAL_ROW_SELECT}
+            {where_keyword}
+            ORDER BY restaurant_id
+            {paging_sql}
+            """,
+            params,
+        )
+        rows = db_cursor.fetchall()
+
+    has_more = len(rows) > limit
+    return rows[:limit], has_more
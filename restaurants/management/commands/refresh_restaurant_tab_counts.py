@@ -0,0 +1,41 @@
+"""
+식당 탭 일반식당 총 개수 캐시를 미리 채웁니다.
+
+요청 경로에서는 캐시된 근사값을 쓰고 soft TTL이 지나면 백그라운드로 갱신하지만,
+Cloud Scheduler 등에서 주기적으로 돌려 두면 첫 요청도 COUNT(*) 없이 응답합니다.
+
+사용 예:
+  python manage.py refresh_restaurant_tab_counts
+  python manage.py refresh_restaurant_tab_counts --query 치킨 --query 국밥
+"""
+from django.core.management.base import BaseCommand
+
+from restaurants.general_listing import GENERAL_DB_ALIAS, refresh_general_count
+
+
+class Command(BaseCommand):
+    help = "식당 탭 일반식당 총 개수(COUNT) 캐시를 갱신합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--query",
+            action="append",
+            dest="queries",
+            default=None,
+            help="검색어별 개수도 함께 갱신 (여러 번 지정 가능, 미지정 시 전체만)",
+        )
+        parser.add_argument(
+            "--database",
+            type=str,
+            default=GENERAL_DB_ALIAS,
+            help="restaurants_affiliate DB alias (기본: cloudsql)",
+        )
+
+    def handle(self, *args, **options):
+        db_alias = options["database"]
+        queries = [""] + [q.strip() for q in (options.get("queries") or []) if q.strip()]
+        for q in queries:
+            total = refresh_general_count(q, db_alias=db_alias)
+            label = q or "(전체)"
+            self.stdout.write(f"{label}: {total}")
+        self.stdout.write(self.style.SUCCESS("일반식당 개수 캐시 갱신 완료"))
@@ -0,0 +1,131 @@
+import json
+import time
+from unittest.mock import patch
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import connection
+from django.test import RequestFactory, TestCase
+
+from coupons import synthetic
+from restaurants import general_listing
+from restaurants.views import get_restaurant_tab_list
+
+GENERAL_IDS = [3, 5, 8, 13, 21, 34, 55]
+AFFILIATE_IDS = [1, 40]
+
+
+def _insert_restaurants():
+    rows = [(rid, f"일반식당 {rid}", False) for rid in GENERAL_IDS]
+    rows += [(rid, f"제휴식당 {rid}", True) for rid in AFFILIATE_IDS]
+    rows.append((60, "미분류 식당", None))  # is_affiliate NULL 도 일반식당
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            "INSERT INTO restaurants_affiliate (restaurant_id, name, is_affiliate) VALUES (%s, %s, %s)",
+            rows,
+        )
+
+
+class GeneralListingTests(TestCase):
+    def setUp(self):
+        synthetic.create_schema()
+        _insert_restaurants()
+        self.cache = LocMemCache("restaurants-tests", {})
+        patcher = patch.object(general_listing, "cache", self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _page(self, **kwargs):
+        rows, has_more = general_listing.fetch_general_rows_page(db_alias="default", **kwargs)
+        return [row[0] for row in rows], has_more
+
+    def test_cursor_pages_continue_across_page_boundary(self):
+        first, has_more = self._page(limit=3)
+        self.assertEqual(first, [3, 5, 8])
+        self.assertTrue(has_more)
+
+        second, has_more = self._page(limit=3, cursor=first[-1])
+        self.assertEqual(second, [13, 21, 34])
+        self.assertTrue(has_more)
+
+        last, has_more = self._page(limit=3, cursor=second[-1])
+        self.assertEqual(last, [55, 60])
+        self.assertFalse(has_more)
+
+        # offset 방식과 같은 순서를 돌려준다
+        self.assertEqual(self._page(limit=3, offset=3), (second, True))
+
+    def test_last_page_exactly_at_limit_has_no_more(self):
+        rows, has_more = self._page(limit=2, cursor=34)
+        self.assertEqual(rows, [55, 60])
+        self.assertFalse(has_more)
+        self.assertEqual(self._page(limit=2, cursor=60), ([], False))
+
+    def test_invalid_cursor_falls_back_to_first_page(self):
+        for value in (None, "", "abc", "-1", "1.5"):
+            self.assertIsNone(general_listing.parse_general_cursor(value), value)
+        self.assertEqual(general_listing.parse_general_cursor(" 21 "), 21)
+
+    def test_count_is_exact_on_miss_then_cached(self):
+        self.assertEqual(general_listing.get_general_total_count(db_alias="default"), (8, False))
+        with patch.object(general_listing, "count_general_restaurants") as count:
+            self.assertEqual(general_listing.get_general_total_count(db_alias="default"), (8, True))
+        count.assert_not_called()
+
+    def test_stale_count_is_served_while_one_refresh_runs(self):
+        key = general_listing._GENERAL_COUNT_CACHE_KEY.format(digest=general_listing._count_cache_digest(""))
+        stale_at = time.time() - general_listing.GENERAL_COUNT_SOFT_TTL_S - 1
+        self.cache.set(key, {"count": 42, "refreshed_at": stale_at})
+
+        with patch.object(general_listing, "_refresh_general_count_in_background") as refresh:
+            self.assertEqual(general_listing.get_general_total_count(db_alias="default"), (42, True))
+            self.assertEqual(general_listing.get_general_total_count(db_alias="default"), (42, True))
+        # 갱신 잠금으로 백그라운드 갱신은 한 번만
+        refresh.assert_called_once_with("", "default")
+
+        general_listing.refresh_general_count(db_alias="default")
+        self.assertEqual(self.cache.get(key)["count"], 8)
+
+
+class RestaurantTabListViewTests(TestCase):
+    def setUp(self):
+        synthetic.create_schema()
+        _insert_restaurants()
+        self.factory = RequestFactory()
+        for target, value in (
+            ("restaurants.views.read_alias", lambda alias: "default"),
+            ("restaurants.views.get_general_total_count", lambda q: (42, True)),
+        ):
+            patcher = patch(target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _get(self, **params):
+        response = get_restaurant_tab_list(self.factory.get("/restaurants/tab-restaurants/", params))
+        self.assertEqual(response.status_code, 200)
+        return json.loads(response.content)
+
+    def test_cursor_mode_walks_all_general_restaurants(self):
+        seen = []
+        params = {"cursor": "", "limit": 3, "include_affiliates": "0"}
+        for _ in range(5):
+            body = self._get(**params)
+            pagination = body["general_pagination"]
+            self.assertEqual(pagination["mode"], "cursor")
+            # 식당 순서는 섞여도 다음 커서는 페이지의 가장 큰 id
+            ids = sorted(r["restaurant_id"] for r in body["general_restaurants"])
+            seen.extend(ids)
+            if not pagination["has_more"]:
+                self.assertIsNone(pagination["next_cursor"])
+                break
+            self.assertEqual(pagination["next_cursor"], ids[-1])
+            params["cursor"] = pagination["next_cursor"]
+        self.assertEqual(seen, GENERAL_IDS + [60])
+        self.assertEqual(pagination["total_count"], 42)
+        self.assertTrue(pagination["total_count_is_approximate"])
+
+    def test_invalid_cursor_returns_first_page(self):
+        body = self._get(cursor="abc", limit=3, include_affiliates="0")
+        pagination = body["general_pagination"]
+        self.assertIsNone(pagination["cursor"])
+        self.assertEqual(sorted(r["restaurant_id"] for r in body["general_restaurants"]), [3, 5, 8])
+        self.assertEqual(pagination["next_cursor"], 8)
@@ -1,4 +1,5 @@
 from django.urls import path
+from wouldulike_backend.async_support import maybe_async
 from .views import (
     get_random_restaurants,
     get_nearby_restaurants,
@@ -12,9 +13,9 @@ from .views import (
 urlpatterns = [
     path('get-random-restaurants/', get_random_restaurants, name='get_random_restaurants'),
     path('get-nearby-restaurants/', get_nearby_restaurants, name='get_nearby_restaurants'),
-    path('tab-restaurants/', get_restaurant_tab_list, name='get_restaurant_tab_list'),
-    path('affiliate-restaurants/', get_affiliate_restaurants, name='get_affiliate_restaurants'),
-    path('affiliate-restaurants/id-name/', get_affiliate_restaurant_id_name_list, name='get_affiliate_restaurant_id_name_list'),
-    path('affiliate-restaurants/active/', get_active_affiliate_restaurants, name='get_active_affiliate_restaurants'),
-    path('affiliate-restaurants/detail/', get_affiliate_restaurant_detail, name='get_affiliate_restaurant_detail'),
+    path('tab-restaurants/', maybe_async(get_restaurant_tab_list), name='get_restaurant_tab_list'),
+    path('affiliate-restaurants/', maybe_async(get_affiliate_restaurants), name='get_affiliate_restaurants'),
+    path('affiliate-restaurants/id-name/', maybe_async(get_affiliate_restaurant_id_name_list), name='get_affiliate_restaurant_id_name_list'),
+    path('affiliate-restaurants/active/', maybe_async(get_active_affiliate_restaurants), name='get_active_affiliate_restaurants'),
+    path('affiliate-restaurants/detail/', maybe_async(get_affiliate_restaurant_detail), name='get_affiliate_restaurant_detail'),
 ]
@@ -10,6 +10,7 @@ import json
 import random
 import logging
 
+from accounts.authentication import get_cached_user
 from coupons.festival_jungdunbam import RESTAURANT_ID as JUNGDUNBAM_FESTIVAL_RESTAURANT_ID
 from coupons.service import get_active_affiliate_restaurant_ids_for_user
 from restaurants.affiliate_order import (
@@ -17,6 +18,14 @@ from restaurants.affiliate_order import (
     order_rows_priority_first,
     shuffle_rows_priority_first,
 )
+from restaurants.general_listing import (
+    GENERAL_DB_ALIAS,
+    fetch_general_rows_page,
+    get_general_total_count,
+    parse_general_cursor,
+)
+from wouldulike_backend.db_routers import prefer_replica, read_alias
+from wouldulike_backend.resilience import query_budget
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
@@ -24,6 +33,9 @@ User = get_user_model()
 # 진행 식당 수가 적을 때 전체 제휴 목록을 돌려주는 분기에서 동일 쿼리 반복을 줄이기 위한 캐시
 _AFFILIATE_ALL_ROWS_CACHE_KEY = "restaurants:active_affiliate_all_rows_v4"
 _AFFILIATE_ALL_ROWS_CACHE_TTL = 120
+# DB 장애 / 쿼리 예산 초과 시 대신 돌려줄 마지막 목록 (오래돼도 빈 화면보다 낫다)
+_AFFILIATE_STALE_ROWS_CACHE_KEY = "restaurants:affiliate_all_rows_stale_v1"
+_AFFILIATE_STALE_ROWS_CACHE_TTL = 60 * 60 * 24
 
 _AFFILIATE_ROW_SELECT = """
     SELECT
@@ -47,14 +59,42 @@ def _load_all_affiliate_rows() -> list:
         with connections["cloudsql"].cursor() as cursor:
             cursor.execute(_AFFILIATE_ROW_SELECT)
             rows = cursor.fetchall()
-        cache.set(
-            _AFFILIATE_ALL_ROWS_CACHE_KEY,
-            rows,
-            _AFFILIATE_ALL_ROWS_CACHE_TTL,
-        )
+        _remember_affiliate_rows(rows)
     return list(rows)
 
 
+def _remember_affiliate_rows(rows) -> None:
+    cache.set(
+        _AFFILIATE_ALL_ROWS_CACHE_KEY,
+        rows,
+        _AFFILIATE_ALL_ROWS_CACHE_TTL,
+    )
+    cache.set(_AFFILIATE_STALE_ROWS_CACHE_KEY, rows, _AFFILIATE_STALE_ROWS_CACHE_TTL)
+
+
+def _stale_affiliate_listing(request, *args, **kwargs):
+    """query_budget fallback: 마지막으로 읽은 전체 제휴 식당 목록. 없으면 None (원래대로 처리)."""
+    try:
+        rows = cache.get(_AFFILIATE_STALE_ROWS_CACHE_KEY)
+    except Exception:
+        logger.warning("stale affiliate listing unavailable", exc_info=True)
+        return None
+    if rows is None:
+        return None
+    rows = shuffle_rows_priority_first(list(rows))
+    return JsonResponse(
+        {
+            'source': 'all',
+            'carousel_scope': 'all',
+            'priority_restaurant_id': JUNGDUNBAM_FESTIVAL_RESTAURANT_ID,
+            'restaurants': [_serialize_affiliate_restaurant(row) for row in rows],
+            'stale': True,
+        },
+        status=200,
+        json_dumps_params={'ensure_ascii': False},
+    )
+
+
 def _load_affiliate_rows_for_ids(restaurant_ids: list[int]) -> list:
     if not restaurant_ids:
         return []
@@ -196,7 +236,9 @@ def _get_user_from_bearer_token(request):
                 {'error_code': 'UNAUTHORIZED', 'message': 'Invalid token payload'},
                 status=401,
             )
-        user = User.objects.get(id=user_id)
+        user = get_cached_user(user_id)
+        if user is None:
+            raise User.DoesNotExist
         return user, None
     except (TokenError, User.DoesNotExist):
         return None, JsonResponse(
@@ -392,17 +434,29 @@ def get_nearby_restaurants(request):
 
 
 @require_http_methods(["GET"])
+@prefer_replica()
 def get_restaurant_tab_list(request):
     """
     Return restaurants for the restaurant tab:
     - affiliate_restaurants: always on top (optional include)
     - general_restaurants: paginated for infinite scroll
     Supports name search via query param `q`.
+
+    Pagination of general_restaurants:
+    - offset mode (default): `limit` / `offset`
+    - cursor mode: `cursor` (last restaurant_id of the previous page, empty for
+      the first page) or `pagination=cursor`. Deep pages cost the same as page one.
+    `total_count` is served from a cache refreshed in the background.
     """
     q = (request.GET.get('q') or '').strip()
     limit = _parse_positive_int(request.GET.get('limit'), default=20, max_value=50)
     offset = _parse_positive_int(request.GET.get('offset'), default=0)
     include_affiliates = _parse_bool(request.GET.get('include_affiliates'), default=True)
+    use_cursor = (
+        'cursor' in request.GET
+        or (request.GET.get('pagination') or '').strip().lower() == 'cursor'
+    )
+    general_cursor = parse_general_cursor(request.GET.get('cursor')) if use_cursor else None
 
     where_keyword = ""
     params = []
@@ -414,10 +468,9 @@ def get_restaurant_tab_list(request):
         affiliate_restaurants = []
         affiliate_rows = []
         general_restaurants = []
-        total_general_count = 0
 
-        with connections['cloudsql'].cursor() as cursor:
-            if include_affiliates:
+        if include_affiliates:
+            with connections[read_alias('cloudsql')].cursor() as cursor:
                 cursor.execute(
                     f"""
                     SELECT
@@ -438,52 +491,51 @@ def get_restaurant_tab_list(request):
                     params,
                 )
                 affiliate_rows = cursor.fetchall()
-                affiliate_rows = order_rows_priority_first(
-                    ensure_priority_affiliate_rows_included(affiliate_rows)
-                )
-                affiliate_restaurants = [
-                    _serialize_affiliate_restaurant(row) for row in affiliate_rows
-                ]
-
-            cursor.execute(
-                f"""
-                SELECT COUNT(*)
-                FROM restaurants_affiliate
-                WHERE (is_affiliate = FALSE OR is_affiliate IS NULL)
-                {where_keyword}
-                """,
-                params,
+            affiliate_rows = order_rows_priority_first(
+                ensure_priority_affiliate_rows_included(affiliate_rows)
             )
-            total_general_count = cursor.fetchone()[0]
-
-            general_query_params = [*params, limit, offset]
-            cursor.execute(
-                f"""
-                SELECT
-                    restaurant_id,
-                    name,
-                    description,
-                    address,
-                    category,
-                    zone,
-                    phone_number,
-                    url,
-                    s3_image_urls
-                FROM restaurants_affiliate
-                WHERE (is_affiliate = FALSE OR is_affiliate IS NULL)
-                {where_keyword}
-                ORDER BY restaurant_id
-                LIMIT %s OFFSET %s
-                """,
-                general_query_params,
-            )
-            general_rows = cursor.fetchall()
-            # 일반식당은 고정 순서 대신 요청마다 한 번 섞어서 반환
-            random.shuffle(general_rows)
-            general_restaurants = [_serialize_general_restaurant(row) for row in general_rows]
+            affiliate_restaurants = [
+                _serialize_affiliate_restaurant(row) for row in affiliate_rows
+            ]
 
-        has_more = offset + len(general_restaurants) < total_general_count
-        next_offset = offset + len(general_restaurants) if has_more else None
+        general_rows, has_more = fetch_general_rows_page(
+            q=q,
+            limit=limit,
+            cursor=general_cursor,
+            offset=None if use_cursor else offset,
+            db_alias=read_alias(GENERAL_DB_ALIAS),
+        )
+        # 다음 커서는 섞기 전 마지막(가장 큰) restaurant_id
+        next_cursor = general_rows[-1][0] if (use_cursor and has_more and general_rows) else None
+        # 일반식당은 고정 순서 대신 요청마다 한 번 섞어서 반환
+        random.shuffle(general_rows)
+        general_restaurants = [_serialize_general_restaurant(row) for row in general_rows]
+
+        total_general_count, total_is_approximate = get_general_total_count(q)
+
+        if use_cursor:
+            general_pagination = {
+                'mode': 'cursor',
+                'limit': limit,
+                'cursor': general_cursor,
+                'next_cursor': next_cursor,
+                'returned_count': len(general_restaurants),
+                'total_count': total_general_count,
+                'total_count_is_approximate': total_is_approximate,
+                'has_more': has_more,
+            }
+        else:
+            next_offset = offset + len(general_restaurants) if has_more else None
+            general_pagination = {
+                'mode': 'offset',
+                'limit': limit,
+                'offset': offset,
+                'next_offset': next_offset,
+                'returned_count': len(general_restaurants),
+                'total_count': total_general_count,
+                'total_count_is_approximate': total_is_approximate,
+                'has_more': has_more,
+            }
 
         carousel_rows = (
             shuffle_rows_priority_first(affiliate_rows) if include_affiliates else []
@@ -498,14 +550,7 @@ def get_restaurant_tab_list(request):
                     _serialize_affiliate_restaurant(row) for row in carousel_rows
                 ],
                 'general_restaurants': general_restaurants,
-                'general_pagination': {
-                    'limit': limit,
-                    'offset': offset,
-                    'next_offset': next_offset,
-                    'returned_count': len(general_restaurants),
-                    'total_count': total_general_count,
-                    'has_more': has_more,
-                },
+                'general_pagination': general_pagination,
                 'search_query': q,
             },
             status=200,
@@ -519,11 +564,13 @@ def get_restaurant_tab_list(request):
         )
 
 
+@query_budget("affiliate_restaurants", max_queries=5, max_ms=5000, fallback=_stale_affiliate_listing, alias="cloudsql")
 @require_http_methods(["GET"])
+@prefer_replica()
 def get_affiliate_restaurants(request):
     """Return all affiliate restaurants with key details."""
     try:
-        with connections['cloudsql'].cursor() as cursor:
+        with connections[read_alias('cloudsql')].cursor() as cursor:
             cursor.execute(
                 """
                 SELECT
@@ -622,6 +669,13 @@ def get_affiliate_restaurant_id_name_list(request):
         )
 
 
+@query_budget(
+    "active_affiliate_restaurants",
+    max_queries=20,
+    max_ms=5000,
+    fallback=_stale_affiliate_listing,
+    alias="cloudsql",
+)
 @require_http_methods(["GET"])
 def get_active_affiliate_restaurants(request):
     """Return affiliate restaurants where user has active coupon or stamp progress."""
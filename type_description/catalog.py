@@ -0,0 +1,195 @@
+"""
+유형 설명 / 음식 정보 정적 카탈로그.
+
+TypeDescription(16개 유형)과 Food 는 운영 중 거의 바뀌지 않고 admin 에서도 읽기 전용이라
+요청마다 cloudsql 을 조회할 필요가 없다. 여기서는
+- 두 테이블을 한 번에 읽어 불변 dict(MappingProxyType)로 프로세스에 올리고
+- 유형 설명 응답은 JsonResponse 와 같은 방식(DjangoJSONEncoder)으로 미리 직렬화한 bytes 로 들고 있다.
+- 데이터를 바꾼 뒤 `python manage.py refresh_static_catalog` 로 Redis 의 버전 키를 올리면
+  각 워커가 VERSION_CHECK_INTERVAL_S 안에 버전 차이를 보고 다시 읽는다.
+  Redis 를 쓸 수 없으면 MAX_AGE_S 마다 다시 읽는다.
+다시 읽는 동안 다른 요청은 이전 카탈로그를 그대로 쓴다.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Mapping
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import TypeDescription
+
+logger = logging.getLogger(__name__)
+
+CATALOG_VERSION_KEY = "static_catalog:version"
+VERSION_CHECK_INTERVAL_S = 30
+MAX_AGE_S = 3600
+
+FOOD_FIELDS = ("food_id", "food_name", "description", "food_image_url")
+
+
+def _render(data: dict) -> bytes:
+    # JsonResponse(data) 와 같은 바이트가 나오도록 같은 인코더를 쓴다
+    return json.dumps(data, cls=DjangoJSONEncoder).encode("utf-8")
+
+
+def _summary(row: TypeDescription) -> dict:
+    return {
+        "type_code": row.type_code,
+        "description": row.description_detail,
+        "created_at": row.created_at,
+        "updated_at": row.updated_at,
+    }
+
+
+def _detail(row: TypeDescription) -> dict:
+    return {
+        "type_code": row.type_code,
+        "type_name": row.type_name,
+        "description_detail": row.description_detail,  # 유형 설명
+        "menu_and_mbti": row.menu_and_mbti,  # 어울리는 메뉴와 MBTI
+        "meal_example": row.meal_example,  # 식사 경우 (예시)
+        "matching_type": row.matching_type,  # 잘 어울리는 유형
+        "non_matching_type": row.non_matching_type,  # 안 어울리는 유형
+        "type_summary": row.type_summary,  # 유형 설명 종합
+        "created_at": row.created_at,
+        "updated_at": row.updated_at,
+    }
+
+
+@dataclass(frozen=True)
+class StaticCatalog:
+    version: int | None
+    # type_code → 미리 직렬화한 응답 본문
+    summaries: Mapping[str, bytes]
+    details: Mapping[str, bytes]
+    # food_id → 음식 정보 (food_by_type.recommender 가 같이 쓴다)
+    foods: Mapping[int, dict]
+    loaded_at: float = field(default_factory=time.monotonic)
+
+    @classmethod
+    def build(cls, descriptions, foods, *, version: int | None = None) -> "StaticCatalog":
+        summaries: dict[str, bytes] = {}
+        details: dict[str, bytes] = {}
+        for row in descriptions:
+            # 같은 type_code 가 여러 행이면 id 가 가장 작은 행을 쓴다 (descriptions 는 id 순)
+            if row.type_code in summaries:
+                continue
+            summaries[row.type_code] = _render(_summary(row))
+            details[row.type_code] = _render(_detail(row))
+        food_map = {
+            item["food_id"]: MappingProxyType({name: item.get(name) for name in FOOD_FIELDS}) for item in foods
+        }
+        return cls(
+            version=version,
+            summaries=MappingProxyType(summaries),
+            details=MappingProxyType(details),
+            foods=MappingProxyType(food_map),
+        )
+
+
+_catalog: StaticCatalog | None = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def _remote_version() -> int | None:
+    try:
+        value = cache.get(CATALOG_VERSION_KEY)
+    except Exception as exc:
+        logger.debug("static catalog version check failed: %s", exc)
+        return None
+    try:
+        return int(value) if value is not None else 0
+    except (TypeError, ValueError):
+        return 0
+
+
+def load_catalog(version: int | None = None) -> StaticCatalog:
+    from food_by_type.models import Food
+
+    descriptions = list(TypeDescription.objects.order_by("id"))
+    foods = list(Food.objects.values(*FOOD_FIELDS))
+    return StaticCatalog.build(descriptions, foods, version=version)
+
+
+def _is_stale(current: StaticCatalog, remote: int | None, now: float) -> bool:
+    if remote is not None and remote != current.version:
+        return True
+    return now - current.loaded_at >= MAX_AGE_S
+
+
+def get_catalog(*, force_refresh: bool = False) -> StaticCatalog:
+    global _catalog, _checked_at
+    current = _catalog
+    now = time.monotonic()
+    if current is not None and not force_refresh:
+        if now - _checked_at < VERSION_CHECK_INTERVAL_S:
+            return current
+        remote = _remote_version()
+        _checked_at = now
+        if not _is_stale(current, remote, now):
+            return current
+    else:
+        remote = _remote_version()
+
+    # 처음 읽을 때는 기다리고, 다른 요청이 다시 읽는 중이면 이전 카탈로그를 쓴다
+    if not _lock.acquire(blocking=current is None or force_refresh):
+        return current
+    try:
+        if _catalog is not current and not force_refresh:
+            return _catalog
+        try:
+            _catalog = load_catalog(remote)
+        except Exception:
+            if current is None:
+                raise
+            logger.exception("static catalog refresh failed; keeping previous one")
+            return current
+        _checked_at = time.monotonic()
+        logger.info(
+            "static catalog loaded: version=%s types=%d foods=%d",
+            remote,
+            len(_catalog.summaries),
+            len(_catalog.foods),
+        )
+        return _catalog
+    finally:
+        _lock.release()
+
+
+def bump_catalog_version() -> int | None:
+    """모든 워커가 카탈로그를 다시 읽도록 버전을 올린다. 반환: 새 버전 (Redis 를 쓸 수 없으면 None)."""
+    global _checked_at
+    _checked_at = 0.0
+    try:
+        try:
+            return cache.incr(CATALOG_VERSION_KEY)
+        except ValueError:
+            cache.set(CATALOG_VERSION_KEY, 1, timeout=None)
+            return 1
+    except Exception as exc:
+        logger.warning("static catalog version bump failed: %s", exc)
+        return None
+
+
+def warm_catalog() -> StaticCatalog | None:
+    """워커 시작 시 미리 읽어 둔다. 실패해도 첫 요청에서 다시 시도하므로 예외를 올리지 않는다."""
+    try:
+        return get_catalog()
+    except Exception:
+        logger.exception("static catalog warm-up failed")
+        return None
+
+
+def reset_catalog() -> None:
+    global _catalog, _checked_at
+    with _lock:
+        _catalog = None
+        _checked_at = 0.0
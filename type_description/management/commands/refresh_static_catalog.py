@@ -0,0 +1,41 @@
+"""
+유형 설명 / 음식 정보 정적 카탈로그의 버전을 올려 모든 워커가 다시 읽게 합니다.
+
+TypeDescription 이나 Food 데이터를 바꾼 뒤 실행합니다. 각 워커는 최대
+VERSION_CHECK_INTERVAL_S 안에 새 버전을 보고 카탈로그를 다시 읽습니다.
+--check 를 주면 이 프로세스에서 카탈로그를 읽어 건수만 확인합니다 (버전은 그대로).
+
+사용 예:
+  python manage.py refresh_static_catalog
+  python manage.py refresh_static_catalog --check
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from type_description.catalog import VERSION_CHECK_INTERVAL_S, bump_catalog_version, load_catalog
+
+
+class Command(BaseCommand):
+    help = "유형 설명 / 음식 정보 정적 카탈로그의 버전을 올려 모든 워커가 다시 읽게 합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--check", action="store_true", help="버전을 올리지 않고 카탈로그만 읽어 확인")
+
+    def handle(self, *args, **options):
+        try:
+            catalog = load_catalog()
+        except Exception as exc:
+            raise CommandError(f"카탈로그를 읽지 못했습니다: {exc}") from exc
+        summary = f"유형 {len(catalog.summaries):,}개, 음식 {len(catalog.foods):,}개"
+        if options["check"]:
+            self.stdout.write(self.style.SUCCESS(f"카탈로그 확인: {summary}"))
+            return
+
+        version = bump_catalog_version()
+        if version is None:
+            raise CommandError("Redis 에 버전을 쓰지 못했습니다. 워커는 최대 1시간 안에 다시 읽습니다.")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"카탈로그 버전을 {version} 으로 올렸습니다 ({summary}). "
+                f"워커는 {VERSION_CHECK_INTERVAL_S}초 안에 다시 읽습니다."
+            )
+        )
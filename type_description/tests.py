@@ -1,3 +1,88 @@
-from django.test import TestCase
+import json
+from datetime import datetime, timezone as dt_timezone
+from types import SimpleNamespace
+from unittest.mock import patch
 
-# Create your tests here.
+from django.core.cache.backends.locmem import LocMemCache
+from django.http import Http404, JsonResponse
+from django.test import RequestFactory, SimpleTestCase
+
+from type_description import catalog as catalog_module
+from type_description.catalog import StaticCatalog
+from type_description.views import get_all_type_descriptions, get_type_descriptions
+
+
+def _row(pk, type_code, **fields):
+    stamp = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+    values = {
+        "id": pk,
+        "type_code": type_code,
+        "type_name": f"{type_code} 유형",
+        "description_detail": "설명",
+        "menu_and_mbti": None,
+        "meal_example": None,
+        "matching_type": None,
+        "non_matching_type": None,
+        "type_summary": None,
+        "created_at": stamp,
+        "updated_at": stamp,
+    }
+    values.update(fields)
+    return SimpleNamespace(**values)
+
+
+FOODS = [{"food_id": 1, "food_name": "김치찌개", "description": None, "food_image_url": None}]
+
+
+class StaticCatalogTests(SimpleTestCase):
+    def setUp(self):
+        catalog_module.reset_catalog()
+        self.addCleanup(catalog_module.reset_catalog)
+        self.cache = LocMemCache("static-catalog-tests", {})
+        self.cache.clear()
+        patcher = patch.object(catalog_module, "cache", self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.factory = RequestFactory()
+
+    def test_prerendered_body_matches_json_response(self):
+        row = _row(1, "ISTJ", type_summary="요약")
+        catalog = StaticCatalog.build([row, _row(2, "ISTJ", type_name="중복")], FOODS)
+        expected = JsonResponse(
+            {
+                "type_code": "ISTJ",
+                "description": "설명",
+                "created_at": row.created_at,
+                "updated_at": row.updated_at,
+            }
+        ).content
+        self.assertEqual(catalog.summaries["ISTJ"], expected)
+        self.assertEqual(json.loads(catalog.details["ISTJ"])["type_name"], "ISTJ 유형")
+        self.assertEqual(catalog.foods[1]["food_name"], "김치찌개")
+
+    def test_views_serve_catalog_without_db(self):
+        catalog = StaticCatalog.build([_row(1, "ENFP")], FOODS)
+        with patch.object(catalog_module, "load_catalog", return_value=catalog):
+            response = get_all_type_descriptions(self.factory.get("/"), "ENFP")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response["Content-Type"], "application/json")
+            self.assertEqual(json.loads(response.content)["type_code"], "ENFP")
+            with self.assertRaises(Http404):
+                get_type_descriptions(self.factory.get("/"), "XXXX")
+
+    def test_version_bump_triggers_reload(self):
+        first = StaticCatalog.build([_row(1, "ENFP")], FOODS)
+        second = StaticCatalog.build([_row(1, "ENFP"), _row(2, "INTJ")], FOODS)
+        with patch.object(catalog_module, "load_catalog", side_effect=[first, second]) as load:
+            self.assertIs(catalog_module.get_catalog(), first)
+            self.assertIs(catalog_module.get_catalog(), first)
+            self.assertEqual(catalog_module.bump_catalog_version(), 1)
+            self.assertIs(catalog_module.get_catalog(), second)
+            self.assertEqual(load.call_count, 2)
+            self.assertEqual(load.call_args.args, (1,))
+
+    def test_failed_refresh_keeps_previous_catalog(self):
+        first = StaticCatalog.build([_row(1, "ENFP")], FOODS)
+        with patch.object(catalog_module, "load_catalog", side_effect=[first, RuntimeError("db down")]):
+            catalog_module.get_catalog()
+            self.assertIs(catalog_module.get_catalog(force_refresh=True), first)
@@ -9,8 +9,31 @@ https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'wouldulike_backend.settings')
+# ASGI 로 띄우면 외부 I/O 엔드포인트를 async 뷰로 처리한다 (wouldulike_backend.async_support)
+os.environ.setdefault('ASYNC_VIEWS_ENABLED', '1')
 
-application = get_asgi_application()
+# get_asgi_application() 과 같지만, 나머지 sync 뷰도 워커당 스레드 하나가 아닌 ORM 풀에서 돌린다
+django.setup(set_prefix=False)
+
+from wouldulike_backend.async_support import PooledASGIHandler  # noqa: E402
+
+application = PooledASGIHandler()
+
+# WSGI 의 WhiteNoise 대신 정적 파일(관리자 페이지 등)을 여기서 서빙한다
+from django.contrib.staticfiles.handlers import ASGIStaticFilesHandler  # noqa: E402
+
+application = ASGIStaticFilesHandler(application)
+
+# DB 쿼리 결과를 서킷 브레이커에 기록하고 뷰별 쿼리 예산을 확인한다
+from wouldulike_backend import resilience  # noqa: E402
+
+resilience.install()
+
+if os.getenv('WORKER_WARMUP', '1') == '1':
+    from wouldulike_backend.warmup import install_fork_hook, warm_up
+
+    warm_up()
+    install_fork_hook()
@@ -0,0 +1,119 @@
+"""
+ASGI 모드용 async 뷰 어댑터.
+
+gunicorn sync 워커(4개)에서는 Kakao/Apple/FCM/S3 호출이나 원격 DB 왕복이 끝날 때까지 워커 하나가 묶인다.
+ASGI 모드(asgi.py 가 ASYNC_VIEWS_ENABLED=1 로 켠다)에서는 외부 I/O 가 많은 엔드포인트를 async 뷰로 감싸
+이벤트 루프는 계속 다른 요청을 받고, 블로킹 작업만 크기가 정해진 스레드 풀에서 돌린다.
+- ORM 풀 (ASYNC_ORM_THREADS, 기본 DB_POOL_MAX_SIZE): DB 를 쓰는 뷰 본문.
+  스레드 수를 DB 연결 풀 크기에 맞춰 연결을 기다리며 노는 스레드가 쌓이지 않게 한다.
+- I/O 풀 (ASYNC_IO_THREADS, 기본 32): 외부 HTTP 호출처럼 대부분 소켓을 기다리는 작업.
+외부 호출은 기존 클라이언트(requests 세션 / 서킷 브레이커 / 캐시)를 sync 경로와 그대로 공유한다.
+나머지 sync 뷰(쿠폰, 스탬프, 토큰 갱신, 대시보드 등)도 PooledASGIHandler 가 ORM 풀로 보낸다.
+Django 기본 ASGI 핸들러는 sync 뷰를 sync_to_async(thread_sensitive=True), 즉 워커당 스레드 하나에서 돌려
+그런 엔드포인트를 한 번에 하나씩만 처리하기 때문이다.
+작업이 끝나면 그 스레드의 DB 연결을 닫아(풀 사용 시 반납) 다음 작업까지 쥐고 있지 않는다.
+"""
+from __future__ import annotations
+
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.db import connections
+
+from .db_routers import attach_write_detector
+
+logger = logging.getLogger(__name__)
+
+ORM = "orm"
+IO = "io"
+
+_executors: dict[str, ThreadPoolExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def _pool_size(kind: str) -> int:
+    if kind == ORM:
+        return int(getattr(settings, "ASYNC_ORM_THREADS", 5))
+    return int(getattr(settings, "ASYNC_IO_THREADS", 32))
+
+
+def get_executor(kind: str) -> ThreadPoolExecutor:
+    if kind not in (ORM, IO):
+        raise ValueError(f"unknown executor: {kind}")
+    executor = _executors.get(kind)
+    if executor is not None:
+        return executor
+    with _executors_lock:
+        executor = _executors.get(kind)
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=_pool_size(kind), thread_name_prefix=f"async-{kind}")
+            _executors[kind] = executor
+        return executor
+
+
+def _run(func: Callable, args: tuple, kwargs: dict):
+    try:
+        # 요청의 read-your-writes 추적(ReplicaStickinessMiddleware)이 이 스레드 연결에도 걸리도록
+        with attach_write_detector():
+            return func(*args, **kwargs)
+    finally:
+        connections.close_all()
+
+
+async def run_in_pool(kind: str, func: Callable, *args, **kwargs):
+    """func 를 kind 스레드 풀에서 실행하고 결과를 기다린다 (contextvars 는 복사되어 전달된다)."""
+    runner = sync_to_async(_run, thread_sensitive=False, executor=get_executor(kind))
+    return await runner(func, args, kwargs)
+
+
+def async_view(view: Callable, *, pool: str = ORM, prefetch: Callable | None = None) -> Callable:
+    """
+    sync 뷰를 async 뷰로 감싼다. csrf_exempt 등 뷰 속성은 그대로 유지한다.
+
+    pool: 뷰 본문을 돌릴 풀 (ORM / IO)
+    prefetch: 뷰보다 먼저 I/O 풀에서 실행할 함수 f(request). 외부 호출 결과를 request 에 붙여 두면
+              뷰 본문이 ORM 풀 스레드를 쥔 채 외부 응답을 기다리지 않는다. 실패해도 뷰는 그대로 실행한다.
+    """
+    get_executor(pool)  # 잘못된 풀 이름은 URL 로딩 시점에 드러나게 한다
+
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if prefetch is not None:
+            try:
+                await run_in_pool(IO, prefetch, request)
+            except Exception:
+                logger.warning("async prefetch failed for %s", request.path, exc_info=True)
+        return await run_in_pool(pool, view, request, *args, **kwargs)
+
+    return wrapper
+
+
+def maybe_async(view: Callable, **options) -> Callable:
+    """ASYNC_VIEWS_ENABLED 일 때만 async_view 로 감싼다 (WSGI 에서는 원래 sync 뷰를 쓴다)."""
+    if not getattr(settings, "ASYNC_VIEWS_ENABLED", False):
+        return view
+    return async_view(view, **options)
+
+
+class PooledASGIHandler(ASGIHandler):
+    """async 로 감싸지 않은 sync 뷰도 공유 스레드 하나 대신 ORM 풀에서 돌리는 ASGI 핸들러 (asgi.py 가 쓴다)."""
+
+    def make_view_atomic(self, view):
+        view = super().make_view_atomic(view)
+        if iscoroutinefunction(view):
+            return view
+        return async_view(view)
+
+
+def shutdown_executors() -> None:
+    with _executors_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=False)
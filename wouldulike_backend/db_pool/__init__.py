@@ -0,0 +1,6 @@
+"""
+연결 풀을 쓰는 PostgreSQL 백엔드.
+
+DATABASES[alias]["ENGINE"] 를 "wouldulike_backend.db_pool" 로 두고 "POOL" 에 풀 설정을 넣으면
+Django 가 연결을 닫을 때(CONN_MAX_AGE=0 이면 요청 끝마다) 실제로 끊지 않고 풀에 돌려준다.
+"""
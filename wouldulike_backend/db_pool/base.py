@@ -0,0 +1,45 @@
+import psycopg2
+from django.db.backends.postgresql.base import DatabaseWrapper as PostgresDatabaseWrapper
+from django.db.backends.postgresql.base import IsolationLevel
+
+from ..resilience import breaker_for
+from .pool import get_pool
+
+
+class DatabaseWrapper(PostgresDatabaseWrapper):
+    """get_new_connection / _close 만 풀을 거치고 나머지는 기본 PostgreSQL 백엔드와 같다."""
+
+    @property
+    def pool(self):
+        return get_pool(self.alias, self.settings_dict.get("POOL") or {})
+
+    def get_new_connection(self, conn_params):
+        created = []
+
+        def connect():
+            created.append(True)
+            return super(DatabaseWrapper, self).get_new_connection(conn_params)
+
+        try:
+            connection = self.pool.acquire(connect)
+        except psycopg2.OperationalError:
+            # 연결 실패 / connect_timeout / 풀 대기 초과도 서버 장애 신호로 센다
+            breaker_for(self.alias).record_failure()
+            raise
+        if not created:
+            # 새로 연결할 때 get_new_connection 이 정하는 값을 재사용 연결에도 맞춘다
+            isolation_level = self.settings_dict["OPTIONS"].get("isolation_level")
+            self.isolation_level = (
+                IsolationLevel(isolation_level) if isolation_level is not None else IsolationLevel.READ_COMMITTED
+            )
+        return connection
+
+    def _close(self):
+        if self.connection is None:
+            return
+        with self.wrap_database_errors:
+            if self.in_atomic_block:
+                # close() 뒤에도 이 wrapper 가 연결을 들고 있으므로 다른 스레드에 넘기지 않는다
+                self.pool.discard(self.connection)
+            else:
+                self.pool.release(self.connection)
@@ -0,0 +1,336 @@
+"""
+프로세스 단위 DB 연결 풀.
+
+CONN_MAX_AGE=0 은 요청마다 연결을 닫아 동시 연결 수는 줄이지만, 원격 Postgres 에 매번
+TCP+TLS+인증을 다시 해야 한다 (default/cloudsql 두 곳을 쓰는 요청은 두 번).
+여기서는 alias 마다 최대 max_size 개의 연결을 프로세스에 두고 돌려 쓴다.
+- 빌리기: 최근에 반납된 연결부터 (LIFO). idle 이 ping_after_s 보다 길면 SELECT 1 로 확인(pre-ping)
+- 반납: 트랜잭션이 남아 있으면 ROLLBACK, 끊겼거나 max_lifetime_s 를 넘긴 연결은 닫는다
+- 빌리거나 반납할 때 max_idle_s 동안 쓰이지 않은 연결을 닫는다 (idle reaping)
+- 모두 사용 중이면 timeout_s 동안 기다리고, 그래도 없으면 PoolTimeout
+fork 된 자식 프로세스는 부모의 연결을 쓰지 않고 새로 연다.
+gevent 워커에서는 풀을 첫 연결 때 만들므로 조건 변수가 패치된 threading 으로 생성되어, 빈 연결을 기다리는
+greenlet 은 워커를 막지 않고 양보한다 (wouldulike_backend.green).
+"""
+from __future__ import annotations
+
+import contextvars
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable
+
+import psycopg2
+from psycopg2 import extensions
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeout(psycopg2.OperationalError):
+    """풀의 연결이 모두 사용 중이라 timeout_s 안에 빌리지 못함 (Django 에서는 OperationalError)."""
+
+
+@dataclass
+class _PooledConnection:
+    connection: object
+    created_at: float
+    last_used_at: float
+
+
+@dataclass
+class PoolStats:
+    size: int = 0
+    idle: int = 0
+    in_use: int = 0
+    max_size: int = 0
+    created: int = 0
+    closed: int = 0
+    reused: int = 0
+    waits: int = 0
+    wait_s_total: float = 0.0
+    wait_s_max: float = 0.0
+    timeouts: int = 0
+    ping_failures: int = 0
+
+
+@dataclass
+class _RequestStats:
+    wait_s: float = 0.0
+    acquired: int = 0
+    created: int = 0
+    aliases: set = field(default_factory=set)
+
+
+# 요청 하나 동안의 풀 사용량 (RequestLifecycleLoggingMiddleware 가 읽는다)
+_request_stats: contextvars.ContextVar[_RequestStats | None] = contextvars.ContextVar(
+    "db_pool_request_stats", default=None
+)
+
+
+def begin_request_stats() -> contextvars.Token:
+    return _request_stats.set(_RequestStats())
+
+
+def end_request_stats(token: contextvars.Token) -> _RequestStats | None:
+    stats = _request_stats.get()
+    _request_stats.reset(token)
+    return stats
+
+
+class ConnectionPool:
+    def __init__(
+        self,
+        alias: str,
+        *,
+        max_size: int = 5,
+        timeout_s: float = 5.0,
+        max_lifetime_s: float = 1800.0,
+        max_idle_s: float = 300.0,
+        ping_after_s: float = 5.0,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be >= 1")
+        self.alias = alias
+        self.max_size = max_size
+        self.timeout_s = timeout_s
+        self.max_lifetime_s = max_lifetime_s
+        self.max_idle_s = max_idle_s
+        self.ping_after_s = ping_after_s
+        self._cond = threading.Condition(threading.Lock())
+        self._idle: deque[_PooledConnection] = deque()
+        self._in_use: dict[int, _PooledConnection] = {}
+        self._size = 0
+        self._pid = os.getpid()
+        self._stats = PoolStats(max_size=max_size)
+
+    # --- 빌리기 / 반납 -------------------------------------------------
+
+    def acquire(self, connect: Callable[[], object]) -> object:
+        """풀에서 연결을 빌린다. 남는 자리가 있으면 connect() 로 새로 연다."""
+        started = time.monotonic()
+        deadline = started + self.timeout_s
+        waited = False
+        while True:
+            candidate = None
+            create = False
+            with self._cond:
+                self._check_fork()
+                expired = self._pop_expired_idle(time.monotonic())
+                while True:
+                    if self._idle:
+                        candidate = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1
+                        create = True
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats.timeouts += 1
+                        request = _request_stats.get()
+                        if request is not None:
+                            request.wait_s += time.monotonic() - started
+                        self._close_quietly(expired)
+                        raise PoolTimeout(
+                            f"DB pool '{self.alias}' exhausted ({self.max_size} connections in use)"
+                        )
+                    waited = True
+                    self._cond.wait(remaining)
+            self._close_quietly(expired)
+
+            if create:
+                try:
+                    conn = connect()
+                except BaseException:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+                now = time.monotonic()
+                candidate = _PooledConnection(conn, created_at=now, last_used_at=now)
+                with self._cond:
+                    self._stats.created += 1
+                    self._checkout(candidate)
+                    self._record_wait(started, waited, created=True)
+                return conn
+
+            if self._is_healthy(candidate):
+                with self._cond:
+                    self._stats.reused += 1
+                    self._checkout(candidate)
+                    self._record_wait(started, waited)
+                return candidate.connection
+            # 죽은 연결은 버리고 다시 시도
+            self._discard(candidate)
+
+    def release(self, conn) -> None:
+        """빌린 연결을 반납한다. 재사용할 수 없는 상태면 닫는다."""
+        with self._cond:
+            if os.getpid() != self._pid:
+                return
+            pooled = self._in_use.pop(id(conn), None)
+        if pooled is None:
+            # 풀에서 빌리지 않은 연결 (fork 이전 연결 등)
+            self._close_quietly([conn])
+            return
+        now = time.monotonic()
+        if not self._reset(conn) or now - pooled.created_at >= self.max_lifetime_s:
+            self._discard(pooled)
+            return
+        pooled.last_used_at = now
+        with self._cond:
+            self._idle.append(pooled)
+            expired = self._pop_expired_idle(now)
+            self._cond.notify()
+        self._close_quietly(expired)
+
+    def discard(self, conn) -> None:
+        """빌린 연결을 풀에 돌려주지 않고 닫는다 (트랜잭션 중 close 등)."""
+        with self._cond:
+            pooled = self._in_use.pop(id(conn), None)
+        if pooled is None:
+            self._close_quietly([conn])
+            return
+        self._discard(pooled)
+
+    def close_all(self) -> None:
+        """쉬고 있는 연결을 모두 닫는다 (fork 전 정리용). 사용 중인 연결은 반납 시 닫히지 않고 풀로 돌아온다."""
+        with self._cond:
+            idle = [pooled.connection for pooled in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+            self._stats.closed += len(idle)
+            self._cond.notify_all()
+        self._close_quietly(idle)
+
+    def stats(self) -> PoolStats:
+        with self._cond:
+            snapshot = PoolStats(**vars(self._stats))
+            snapshot.size = self._size
+            snapshot.idle = len(self._idle)
+            snapshot.in_use = len(self._in_use)
+        return snapshot
+
+    # --- 내부 ---------------------------------------------------------
+
+    def _checkout(self, pooled: _PooledConnection) -> None:
+        self._in_use[id(pooled.connection)] = pooled
+
+    def _record_wait(self, started: float, waited: bool, *, created: bool = False) -> None:
+        elapsed = time.monotonic() - started if waited else 0.0
+        if waited:
+            self._stats.waits += 1
+            self._stats.wait_s_total += elapsed
+            self._stats.wait_s_max = max(self._stats.wait_s_max, elapsed)
+        request = _request_stats.get()
+        if request is not None:
+            request.wait_s += elapsed
+            request.acquired += 1
+            request.created += int(created)
+            request.aliases.add(self.alias)
+
+    def _pop_expired_idle(self, now: float) -> list:
+        expired = []
+        kept = deque()
+        for pooled in self._idle:
+            if now - pooled.last_used_at >= self.max_idle_s or now - pooled.created_at >= self.max_lifetime_s:
+                expired.append(pooled.connection)
+            else:
+                kept.append(pooled)
+        if expired:
+            self._idle = kept
+            self._size -= len(expired)
+            self._stats.closed += len(expired)
+            self._cond.notify(len(expired))
+        return expired
+
+    def _is_healthy(self, pooled: _PooledConnection) -> bool:
+        conn = pooled.connection
+        if getattr(conn, "closed", 0):
+            return False
+        if time.monotonic() - pooled.last_used_at < self.ping_after_s:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            if not conn.autocommit:
+                conn.rollback()
+            return True
+        except Exception as exc:
+            logger.info("DB pool '%s' pre-ping failed: %s", self.alias, exc)
+            with self._cond:
+                self._stats.ping_failures += 1
+            return False
+
+    def _reset(self, conn) -> bool:
+        if getattr(conn, "closed", 0):
+            return False
+        try:
+            status = conn.info.transaction_status
+            if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+                return False
+            if status != extensions.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+            return True
+        except Exception as exc:
+            logger.info("DB pool '%s' reset failed: %s", self.alias, exc)
+            return False
+
+    def _discard(self, pooled: _PooledConnection) -> None:
+        self._close_quietly([pooled.connection])
+        with self._cond:
+            self._size -= 1
+            self._stats.closed += 1
+            self._cond.notify()
+
+    def _check_fork(self) -> None:
+        # 부모 프로세스의 소켓을 자식이 닫거나 쓰면 부모 쪽 세션이 깨지므로 참조만 버린다
+        pid = os.getpid()
+        if pid == self._pid:
+            return
+        _orphaned.extend(pooled.connection for pooled in self._idle)
+        _orphaned.extend(pooled.connection for pooled in self._in_use.values())
+        self._idle.clear()
+        self._in_use.clear()
+        self._size = 0
+        self._pid = pid
+        self._stats = PoolStats(max_size=self.max_size)
+
+    @staticmethod
+    def _close_quietly(connections) -> None:
+        for conn in connections:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+
+# fork 이전 연결은 GC 로 닫히지 않도록 참조를 남겨 둔다
+_orphaned: list = []
+
+_pools: dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias: str, options: dict) -> ConnectionPool:
+    pool = _pools.get(alias)
+    if pool is not None:
+        return pool
+    with _pools_lock:
+        pool = _pools.get(alias)
+        if pool is None:
+            pool = ConnectionPool(alias, **options)
+            _pools[alias] = pool
+        return pool
+
+
+def pool_stats() -> dict[str, PoolStats]:
+    return {alias: pool.stats() for alias, pool in list(_pools.items())}
+
+
+def close_all_pools() -> None:
+    for pool in list(_pools.values()):
+        pool.close_all()
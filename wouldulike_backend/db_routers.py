@@ -1,4 +1,244 @@
+"""
+DB 라우터.
+
+앱별 alias 선택은 TypeDescriptionRouter 가 하고, 읽기 전용 복제본(settings.DATABASE_REPLICAS)이
+설정된 경우 아래 조건을 모두 만족하는 읽기만 복제본으로 보낸다.
+- prefer_replica() 안에서 실행 중 (읽기 위주 뷰/리포팅 명령어가 명시적으로 표시)
+- 원본 alias 의 트랜잭션(atomic) 안이 아님
+- 복제 지연이 REPLICA_MAX_LAG_SECONDS 이하 (ReplicaLagMonitor 가 REPLICA_LAG_CHECK_SECONDS 마다 확인)
+- read-your-writes: 이번 요청에서 쓰기(INSERT/UPDATE/DELETE/SELECT ... FOR UPDATE)를 했거나,
+  최근 REPLICA_STICKY_SECONDS 안에 쓰기를 한 사용자(ReplicaStickinessMiddleware 가 남기는
+  쿠키 또는 Redis 키)가 아님
+prefer_replica(force=True) 는 리포팅 명령어용으로 stickiness/지연 조건 없이 복제본을 쓴다
+(복제본에 연결할 수 없을 때만 원본으로 돌아간다).
+"""
+from __future__ import annotations
+
+import contextvars
+import logging
+import threading
+import time
+from contextlib import ContextDecorator, ExitStack, contextmanager
+from dataclasses import dataclass
+
 from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+STICKY_COOKIE_NAME = "db_rw"
+
+# 복제본이 원본과 같은 WAL 위치면 0, 아니면 마지막 재생 시각 기준 지연(초)
+_LAG_SQL = """
+SELECT CASE
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+"""
+
+
+def _replicas_for(alias: str) -> list[str]:
+    return list((getattr(settings, "DATABASE_REPLICAS", None) or {}).get(alias) or ())
+
+
+def replica_aliases() -> set[str]:
+    replicas = getattr(settings, "DATABASE_REPLICAS", None) or {}
+    return {replica for aliases in replicas.values() for replica in aliases}
+
+
+def sticky_key(user_id) -> str:
+    return f"db:rw:{user_id}"
+
+
+# --- 복제본 사용 범위 -------------------------------------------------
+
+
+@dataclass(frozen=True)
+class _ReplicaScope:
+    force: bool = False
+    max_lag_s: float | None = None
+
+
+_replica_scope: contextvars.ContextVar[_ReplicaScope | None] = contextvars.ContextVar(
+    "db_replica_scope", default=None
+)
+
+
+class prefer_replica(ContextDecorator):
+    """
+    이 범위 안의 읽기를 복제본으로 보낼 수 있게 표시한다. with 문과 데코레이터 모두 가능.
+
+    force=True: 리포팅용. 쓰기 이후 stickiness/지연 조건을 무시한다.
+    max_lag_s: 이 범위에서 허용할 복제 지연 (기본: REPLICA_MAX_LAG_SECONDS)
+    """
+
+    def __init__(self, *, force: bool = False, max_lag_s: float | None = None):
+        self.scope = _ReplicaScope(force=force, max_lag_s=max_lag_s)
+        self._token = None
+
+    def _recreate_cm(self):
+        # 데코레이터로 쓸 때 호출마다 새 인스턴스를 써서 token 이 스레드끼리 섞이지 않게 한다
+        return type(self)(force=self.scope.force, max_lag_s=self.scope.max_lag_s)
+
+    def __enter__(self):
+        self._token = _replica_scope.set(self.scope)
+        return self
+
+    def __exit__(self, *exc):
+        _replica_scope.reset(self._token)
+        return False
+
+
+# --- read-your-writes -------------------------------------------------
+
+
+class _RequestState:
+    def __init__(self, request):
+        self.request = request
+        self.wrote = False
+        self._sticky: bool | None = None
+
+    def is_sticky(self) -> bool:
+        if self.wrote:
+            return True
+        if self._sticky is not None:
+            return self._sticky
+        if self.request.COOKIES.get(STICKY_COOKIE_NAME):
+            self._sticky = True
+            return True
+        user_id = known_user_id(self.request)
+        if user_id is None:
+            # 아직 인증 전이면 다음 읽기에서 다시 확인한다
+            return False
+        try:
+            self._sticky = bool(cache.get(sticky_key(user_id)))
+        except Exception as exc:
+            logger.debug("replica stickiness lookup failed: %s", exc)
+            self._sticky = True  # 확인할 수 없으면 원본에서 읽는다
+        return self._sticky
+
+
+_request_state: contextvars.ContextVar[_RequestState | None] = contextvars.ContextVar(
+    "db_replica_request_state", default=None
+)
+
+
+def known_user_id(request):
+    """인증이 이미 끝난 경우의 사용자 id. 지연 객체(SimpleLazyObject)는 평가하지 않는다."""
+    from django.utils.functional import SimpleLazyObject
+
+    user = request.__dict__.get("user")
+    if user is None or isinstance(user, SimpleLazyObject):
+        return None
+    if not getattr(user, "is_authenticated", False):
+        return None
+    return getattr(user, "pk", None)
+
+
+def _write_detector(execute, sql, params, many, context):
+    # db_for_write 는 조회 경로에서도 alias 확인용으로 자주 불리므로 실제로 실행된 SQL 로 쓰기를 판단한다
+    state = _request_state.get()
+    if state is not None and not state.wrote:
+        head = sql.lstrip()[:6].upper()
+        if head in ("INSERT", "UPDATE", "DELETE") or "FOR UPDATE" in sql:
+            state.wrote = True
+    return execute(sql, params, many, context)
+
+
+@contextmanager
+def attach_write_detector():
+    """
+    현재 스레드의 연결(복제본이 있는 alias)에 쓰기 감지를 건다. track_request 밖이면 아무것도 하지 않는다.
+    async 뷰가 ORM 작업을 다른 스레드에서 돌릴 때 그 스레드에서도 다시 건다.
+    """
+    with ExitStack() as stack:
+        if _request_state.get() is not None:
+            for alias in getattr(settings, "DATABASE_REPLICAS", None) or {}:
+                stack.enter_context(connections[alias].execute_wrapper(_write_detector))
+        yield
+
+
+@contextmanager
+def track_request(request):
+    """요청 동안 복제본이 있는 DB 의 쓰기를 감지한다. 반환한 상태의 wrote 로 쓰기 여부를 알 수 있다."""
+    state = _RequestState(request)
+    token = _request_state.set(state)
+    try:
+        with attach_write_detector():
+            yield state
+    finally:
+        _request_state.reset(token)
+
+
+# --- 복제 지연 --------------------------------------------------------
+
+
+class ReplicaLagMonitor:
+    """복제본별 지연을 check_interval_s 마다 한 번만 조회한다. 조회 실패 시 None (사용 불가)."""
+
+    def __init__(self):
+        self._lag: dict[str, tuple[float | None, float]] = {}
+        self._lock = threading.Lock()
+
+    def lag(self, alias: str) -> float | None:
+        interval = float(getattr(settings, "REPLICA_LAG_CHECK_SECONDS", 5))
+        cached = self._lag.get(alias)
+        now = time.monotonic()
+        if cached is not None and now - cached[1] < interval:
+            return cached[0]
+        # 다른 스레드가 조회 중이면 이전 값을 쓴다 (처음이면 원본으로)
+        if not self._lock.acquire(blocking=False):
+            return cached[0] if cached else None
+        try:
+            lag = self._query(alias)
+            self._lag[alias] = (lag, time.monotonic())
+            return lag
+        finally:
+            self._lock.release()
+
+    def _query(self, alias: str) -> float | None:
+        try:
+            with connections[alias].cursor() as cursor:
+                cursor.execute(_LAG_SQL)
+                row = cursor.fetchone()
+            return float(row[0]) if row and row[0] is not None else 0.0
+        except Exception as exc:
+            logger.warning("replica lag check failed for %s: %s", alias, exc)
+            return None
+
+    def reset(self) -> None:
+        with self._lock:
+            self._lag.clear()
+
+
+lag_monitor = ReplicaLagMonitor()
+
+
+def read_alias(primary: str) -> str:
+    """primary 대신 읽을 alias. 위 조건을 만족하지 않으면 primary 그대로."""
+    replicas = _replicas_for(primary)
+    if not replicas:
+        return primary
+    scope = _replica_scope.get()
+    if scope is None:
+        return primary
+    if connections[primary].in_atomic_block:
+        return primary
+    if not scope.force:
+        state = _request_state.get()
+        if state is not None and state.is_sticky():
+            return primary
+    max_lag = scope.max_lag_s
+    if max_lag is None:
+        max_lag = float(getattr(settings, "REPLICA_MAX_LAG_SECONDS", 5))
+    for replica in replicas:
+        lag = lag_monitor.lag(replica)
+        if lag is None:
+            continue
+        if scope.force or lag <= max_lag:
+            return replica
+    return primary
 
 
 class TypeDescriptionRouter:
@@ -6,8 +246,7 @@ class TypeDescriptionRouter:
     def _use_cloudsql_unified() -> bool:
         return getattr(settings, "USE_CLOUDSQL_UNIFIED", False)
 
-    def db_for_read(self, model, **hints):
-        """Choose the database for read operations."""
+    def _primary_alias(self, model, hints) -> str:
         if self._use_cloudsql_unified():
             return "default"
 
@@ -29,28 +268,13 @@ class TypeDescriptionRouter:
             return "cloudsql"
         return "default"
 
+    def db_for_read(self, model, **hints):
+        """Choose the database for read operations."""
+        return read_alias(self._primary_alias(model, hints))
+
     def db_for_write(self, model, **hints):
         """Choose the database for write operations."""
-        if self._use_cloudsql_unified():
-            return "default"
-
-        instance = hints.get("instance")
-        if (
-            instance is not None
-            and getattr(instance._meta, "app_label", None) == "coupons"
-            and getattr(model._meta, "app_label", None) == "accounts"
-        ):
-            return "default"
-        if model._meta.app_label in {"type_description", "food_by_type"}:
-            return "cloudsql"
-        if model._meta.app_label in {
-            "coupons",
-            "campus_restaurants",
-            "restaurants",
-            "trends",
-        }:
-            return "cloudsql"
-        return "default"
+        return self._primary_alias(model, hints)
 
     def allow_relation(self, obj1, obj2, **hints):
         """Allow relations between objects from any database."""
@@ -58,6 +282,9 @@ class TypeDescriptionRouter:
 
     def allow_migrate(self, db, app_label, model_name=None, **hints):
         """Control where migrations run for each app."""
+        if db in replica_aliases():
+            return False
+
         if self._use_cloudsql_unified():
             if app_label == "campus_restaurants":
                 return False
@@ -0,0 +1,129 @@
+"""
+gevent 워커 모드 soak 테스트.
+
+greenlet 수백 개가 동시에 느린 요청을 흉내 낸다:
+request_started → DB 쿼리 → 느린 외부 호출(--delay-ms 동안 sleep) → DB 쿼리 → request_finished.
+끝난 뒤 아래를 확인해 JSON 으로 출력하고, 하나라도 어긋나면 종료 코드 1 을 낸다.
+- 요청이 서로를 막지 않았다 (요청 수 x 지연 / 전체 시간 >= --min-concurrency)
+- 풀 타임아웃 등 오류가 없다
+- 요청이 끝난 greenlet 이 DB 연결을 들고 있지 않다
+- 연결 풀(DB_POOL_ENABLED)을 쓰면 빌려 간 연결이 모두 돌아왔고 alias 별 연결 수가 max_size 를 넘지 않았다
+
+사용 예:
+    python -m wouldulike_backend.gevent_soak --requests 300 --delay-ms 500
+    DJANGO_USE_LOCAL_SQLITE=1 python -m wouldulike_backend.gevent_soak --requests 300 --database default
+"""
+from wouldulike_backend.green import patch
+
+patch()
+
+import argparse  # noqa: E402
+import json  # noqa: E402
+import os  # noqa: E402
+import sys  # noqa: E402
+import time  # noqa: E402
+from collections import Counter  # noqa: E402
+
+
+def run(*, requests: int, delay_s: float, alias: str) -> dict:
+    import gevent
+    from django.core.signals import request_finished, request_started
+    from django.db import connections
+
+    from wouldulike_backend.db_pool.pool import pool_stats
+    from wouldulike_backend.green import release_db_connections, safety_report
+
+    errors: Counter = Counter()
+    held_after_request = 0
+    peak_in_use = 0
+    running = True
+
+    def sample_pools():
+        nonlocal peak_in_use
+        while running:
+            in_use = sum(stats.in_use for stats in pool_stats().values())
+            peak_in_use = max(peak_in_use, in_use)
+            gevent.sleep(0.01)
+
+    def fake_request(n: int) -> None:
+        nonlocal held_after_request
+        request_started.send(sender=None)
+        try:
+            with connections[alias].cursor() as cursor:
+                cursor.execute("SELECT 1")
+            release_db_connections()
+            time.sleep(delay_s)  # 패치된 sleep: 외부 API 응답을 기다리는 동안 다른 greenlet 이 돈다
+            with connections[alias].cursor() as cursor:
+                cursor.execute("SELECT 1")
+        except Exception as exc:
+            errors[type(exc).__name__] += 1
+        finally:
+            request_finished.send(sender=None)
+            if connections[alias].connection is not None:
+                held_after_request += 1
+
+    sampler = gevent.spawn(sample_pools)
+    started = time.monotonic()
+    gevent.joinall([gevent.spawn(fake_request, n) for n in range(requests)])
+    elapsed_s = time.monotonic() - started
+    running = False
+    sampler.join()
+
+    pools = {
+        name: {"size": stats.size, "in_use": stats.in_use, "max_size": stats.max_size, "created": stats.created,
+               "timeouts": stats.timeouts, "wait_s_max": round(stats.wait_s_max, 3)}
+        for name, stats in pool_stats().items()
+    }
+    return {
+        "requests": requests,
+        "delay_ms": int(delay_s * 1000),
+        "elapsed_s": round(elapsed_s, 3),
+        "concurrency_factor": round(requests * delay_s / elapsed_s, 1) if elapsed_s > 0 else 0.0,
+        "errors": dict(errors),
+        "held_after_request": held_after_request,
+        "peak_pool_in_use": peak_in_use,
+        "pools": pools,
+        "safety": safety_report(),
+    }
+
+
+def failures(result: dict, *, min_concurrency: float) -> list[str]:
+    problems = []
+    if result["errors"]:
+        problems.append(f"errors: {result['errors']}")
+    if result["concurrency_factor"] < min_concurrency:
+        problems.append(f"concurrency_factor {result['concurrency_factor']} < {min_concurrency}")
+    if result["held_after_request"]:
+        problems.append(f"{result['held_after_request']} greenlets kept a DB connection after the request")
+    for name, stats in result["pools"].items():
+        if stats["in_use"]:
+            problems.append(f"pool {name}: {stats['in_use']} connections not returned")
+        if stats["size"] > stats["max_size"]:
+            problems.append(f"pool {name}: size {stats['size']} > max_size {stats['max_size']}")
+    return problems
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="gevent 모드 동시 요청 soak 테스트")
+    parser.add_argument("--requests", type=int, default=300, help="동시에 띄울 요청(greenlet) 수")
+    parser.add_argument("--delay-ms", type=float, default=500, help="요청마다 흉내 낼 외부 호출 지연(ms)")
+    parser.add_argument("--database", default="default", help="쿼리할 DB alias")
+    parser.add_argument("--min-concurrency", type=float, default=10.0, help="통과 기준 동시성 배수")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "wouldulike_backend.settings")
+    import django
+
+    django.setup()
+
+    result = run(requests=args.requests, delay_s=args.delay_ms / 1000, alias=args.database)
+    problems = failures(result, min_concurrency=args.min_concurrency)
+    result["ok"] = not problems
+    result["problems"] = problems
+    json.dump(result, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write("\n")
+    return 0 if result["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,13 @@
+"""
+gevent 워커용 WSGI 진입점.
+
+    gunicorn wouldulike_backend.gevent_wsgi:application -k gevent --worker-connections=200 --preload ...
+
+--preload 면 마스터가 fork 전에 이 모듈을 읽으므로, 다른 어떤 모듈보다 먼저 gevent/psycogreen 패치를
+적용한 뒤 기존 wsgi 애플리케이션을 불러온다 (wouldulike_backend.green 참고).
+"""
+from wouldulike_backend.green import patch
+
+patch()
+
+from wouldulike_backend.wsgi import application  # noqa: E402,F401
@@ -0,0 +1,94 @@
+"""
+gevent(green thread) 워커 모드.
+
+sync 워커는 Kakao/FCM 응답이나 DB 왕복을 기다리는 동안 프로세스 전체가 멈추지만, gevent 워커는
+소켓을 기다리는 동안 다른 요청(greenlet)으로 넘어간다. 그러려면 Django/psycopg2/redis 를 import 하기 전에
+- gevent.monkey.patch_all(): socket/ssl/time.sleep/threading 을 협조적으로 바꾼다
+- psycogreen.gevent.patch_psycopg(): psycopg2(C 확장)가 쿼리 응답을 기다리는 동안 양보하게 한다
+를 먼저 실행해야 한다. 늦게 패치하면 import 때 만든 threading.Lock/local 이 진짜 OS 락/스레드 로컬로 남아
+greenlet 끼리 같은 DB 연결을 나눠 쓰거나 한 스레드 안에서 서로를 막는다.
+wouldulike_backend.gevent_wsgi 가 이 순서를 보장하는 진입점이다.
+
+이 모듈은 패치 전에 import 되므로 최상위에서 Django 나 threading 을 쓰는 모듈을 import 하지 않는다.
+"""
+import os
+import sys
+
+_patched = False
+_late_modules: tuple = ()
+
+
+def patch() -> None:
+    """gevent/psycogreen 패치를 적용한다. 여러 번 불러도 한 번만 적용된다."""
+    global _patched, _late_modules
+    if _patched:
+        return
+    # 이미 올라와 있으면 모듈 수준 락/스레드 로컬이 패치 전 객체로 남는다 (psycogreen 이 psycopg2 를 import 하기 전에 확인)
+    late = tuple(name for name in ("django.db", "redis", "psycopg2") if name in sys.modules)
+    try:
+        from gevent import monkey
+        from psycogreen.gevent import patch_psycopg
+    except ImportError as exc:
+        raise RuntimeError(
+            "gevent 워커 모드에는 gevent 와 psycogreen 이 필요합니다 (requirements.txt 참고)"
+        ) from exc
+
+    _late_modules = late
+    monkey.patch_all()
+    patch_psycopg()
+    os.environ.setdefault("GEVENT_MODE", "1")
+    _patched = True
+
+    if _late_modules:
+        import logging
+
+        logging.getLogger(__name__).warning(
+            "gevent patched after %s was imported; patch earlier (wouldulike_backend.gevent_wsgi)",
+            ", ".join(_late_modules),
+        )
+
+
+def is_patched() -> bool:
+    """현재 프로세스의 socket 이 gevent 로 패치됐는지 (gunicorn -k gevent 가 직접 패치한 경우 포함)."""
+    if "gevent" not in sys.modules:
+        return False
+    from gevent import monkey
+
+    return monkey.is_module_patched("socket")
+
+
+def safety_report() -> dict:
+    """greenlet 마다 DB 연결이 분리되는지 확인하는 데 쓰는 진단 정보."""
+    report = {"patched": is_patched(), "late_imports": list(_late_modules)}
+    if not report["patched"]:
+        return report
+    from gevent import monkey
+
+    report["threading_patched"] = monkey.is_module_patched("threading")
+    report["psycopg_wait_callback"] = _psycopg_wait_callback_installed()
+    return report
+
+
+def _psycopg_wait_callback_installed() -> bool:
+    try:
+        from psycopg2 import extensions
+    except ImportError:
+        return False
+    return extensions.get_wait_callback() is not None
+
+
+def release_db_connections() -> None:
+    """
+    gevent 모드에서 느린 외부 호출 직전에 부른다. 트랜잭션 밖에 있는 이 greenlet 의 DB 연결을 닫아
+    (풀 사용 시 반납) 외부 응답을 기다리는 동안 다른 greenlet 이 쓰게 한다. 다음 쿼리 때 다시 빌린다.
+    sync 워커에서는 아무것도 하지 않는다.
+    """
+    from django.conf import settings
+
+    if not getattr(settings, "GEVENT_MODE", False):
+        return
+    from django.db import connections
+
+    for conn in connections.all(initialized_only=True):
+        if conn.connection is not None and not conn.in_atomic_block:
+            conn.close()
@@ -0,0 +1,137 @@
+"""
+모듈 import 비용 측정 (python -X importtime).
+
+새 프로세스에서 대상 단계(target)까지 import 한 뒤 모듈별 self / cumulative 시간과 전체 시간을 모은다.
+- setup: django.setup() 까지 (manage.py 명령이 시작될 때 치르는 비용)
+- urls: setup + URLConf 로딩 (모든 뷰 import, Cloud Run 새 인스턴스의 첫 요청 전 비용)
+- wsgi: wouldulike_backend.wsgi import (warm-up 제외)
+
+BUDGETS 는 단계별 회귀 기준이다. 무거운 선택 의존성(HEAVY_MODULES)이 다시 시작 시점에 import 되거나
+전체 시간이 total_ms 를 넘으면 check_budget() 이 문제를 돌려준다 (python manage.py profile_imports --check, 테스트).
+"""
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from dataclasses import dataclass, field
+
+# 시작 시점에 import 되면 안 되는 무거운 모듈 (wouldulike_backend.lazy 로 처음 쓸 때 import)
+HEAVY_MODULES = ("boto3", "botocore", "google.auth", "google.oauth2", "sqlalchemy", "sqlalchemy_redshift")
+
+BUDGETS = {
+    "setup": {"total_ms": 1500, "forbidden": HEAVY_MODULES + ("coupons.service",)},
+    "urls": {"total_ms": 4000, "forbidden": HEAVY_MODULES},
+    "wsgi": {"total_ms": 4500, "forbidden": HEAVY_MODULES},
+}
+
+_SETUP = "import django; django.setup()"
+_TARGET_CODE = {
+    "setup": _SETUP,
+    "urls": _SETUP + "; from django.urls import get_resolver; get_resolver().url_patterns",
+    "wsgi": "import os; os.environ['WORKER_WARMUP'] = '0'; import wouldulike_backend.wsgi",
+}
+
+# 측정 대상 코드 실행 시간과 끝난 시점에 올라와 있는 무거운 모듈을 stdout 으로 돌려준다
+_RUNNER = """
+import json, sys, time
+started = time.perf_counter()
+{code}
+wall_ms = (time.perf_counter() - started) * 1000
+print(json.dumps({{"wall_ms": wall_ms, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+@dataclass
+class ModuleCost:
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class ImportProfile:
+    target: str
+    wall_ms: float
+    modules: list[ModuleCost] = field(default_factory=list)
+    loaded_heavy: list[str] = field(default_factory=list)
+
+    @property
+    def total_ms(self) -> float:
+        """최상위 import 들의 cumulative 합 (측정 대상 코드가 직접 import 한 것 전체)."""
+        return sum(m.cumulative_us for m in self.modules if m.depth == 0) / 1000
+
+    def top(self, *, sort: str = "cumulative", limit: int = 30, prefix: str | None = None) -> list[ModuleCost]:
+        key = (lambda m: m.self_us) if sort == "self" else (lambda m: m.cumulative_us)
+        modules = [m for m in self.modules if prefix is None or m.name.startswith(prefix)]
+        return sorted(modules, key=key, reverse=True)[:limit]
+
+    def as_dict(self, *, sort: str = "cumulative", limit: int = 30, prefix: str | None = None) -> dict:
+        return {
+            "target": self.target,
+            "wall_ms": round(self.wall_ms, 1),
+            "total_ms": round(self.total_ms, 1),
+            "module_count": len(self.modules),
+            "loaded_heavy": self.loaded_heavy,
+            "modules": [
+                {"name": m.name, "self_ms": round(m.self_us / 1000, 2), "cumulative_ms": round(m.cumulative_us / 1000, 2)}
+                for m in self.top(sort=sort, limit=limit, prefix=prefix)
+            ],
+        }
+
+
+def parse_importtime(stderr: str) -> list[ModuleCost]:
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # 머리줄 "self [us] | cumulative | imported package"
+        raw_name = parts[2][1:]
+        name = raw_name.lstrip(" ")
+        modules.append(
+            ModuleCost(
+                name=name,
+                self_us=int(parts[0]),
+                cumulative_us=int(parts[1]),
+                depth=(len(raw_name) - len(name)) // 2,
+            )
+        )
+    return modules
+
+
+def profile(target: str = "urls", *, env: dict | None = None, timeout: float = 120) -> ImportProfile:
+    if target not in _TARGET_CODE:
+        raise ValueError(f"unknown target {target!r} (choices: {', '.join(_TARGET_CODE)})")
+    run_env = dict(os.environ if env is None else env)
+    run_env.setdefault("DJANGO_SETTINGS_MODULE", "wouldulike_backend.settings")
+    code = _RUNNER.format(code=_TARGET_CODE[target], heavy=HEAVY_MODULES)
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env=run_env,
+        timeout=timeout,
+    )
+    if completed.returncode != 0:
+        errors = [line for line in completed.stderr.splitlines() if not line.startswith("import time:")]
+        raise RuntimeError(f"import of target {target!r} failed:\n" + "\n".join(errors[-20:]))
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    return ImportProfile(
+        target=target,
+        wall_ms=result["wall_ms"],
+        modules=parse_importtime(completed.stderr),
+        loaded_heavy=result["loaded"],
+    )
+
+
+def check_budget(result: ImportProfile, budget: dict | None = None) -> list[str]:
+    budget = BUDGETS[result.target] if budget is None else budget
+    loaded = {m.name for m in result.modules}
+    problems = [f"{name} imported at {result.target}" for name in budget.get("forbidden", ()) if name in loaded]
+    if "total_ms" in budget and result.total_ms > budget["total_ms"]:
+        problems.append(f"{result.target} imports took {result.total_ms:.0f}ms > {budget['total_ms']}ms")
+    return problems
@@ -0,0 +1,44 @@
+"""
+무거운 선택 의존성을 처음 쓸 때 import 하는 모듈 프록시.
+
+boto3/botocore(S3 presign), google.auth(FCM) 는 import 만으로 수십 ms 가 걸리지만 일부 엔드포인트와 명령에서만 쓴다.
+모듈 최상단에서 `boto3 = lazy_module("boto3")` 로 받아 두면 속성에 처음 접근할 때 실제로 import 한다.
+import 비용은 `python manage.py profile_imports` 로 확인한다.
+"""
+import importlib
+import threading
+
+
+class LazyModule:
+    def __init__(self, name: str):
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+        self.__dict__["_lock"] = threading.Lock()
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            with self.__dict__["_lock"]:
+                module = self.__dict__["_module"]
+                if module is None:
+                    module = importlib.import_module(self.__dict__["_name"])
+                    self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        # mock.patch("...boto3.client") 같은 패치는 실제 모듈에 적용한다
+        setattr(self._load(), attr, value)
+
+    def __delattr__(self, attr):
+        delattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__["_module"] is not None else "not loaded"
+        return f"<lazy module {self.__dict__['_name']!r} ({state})>"
+
+
+def lazy_module(name: str) -> LazyModule:
+    return LazyModule(name)
@@ -0,0 +1,271 @@
+"""
+시나리오 부하 테스트 (합성 데이터 기준, 엔드포인트별 p50/p95/p99).
+
+coupons.synthetic 으로 만든 로컬 DB 에 대해 실제 앱 사용 흐름을 흉내 낸다. 가상 사용자(concurrency 개)가
+시나리오의 세션(요청 몇 개의 묶음)을 반복하고, 요청마다 엔드포인트 이름으로 지연/상태 코드를 모은다.
+- login_storm   : 카카오 로그인(+앱 접속 쿠폰 발급) 폭주 뒤 쿠폰함 조회
+- wallet_browse : 쿠폰함 / 전체 스탬프 / 식당별 스탬프 / 내 초대 코드 조회
+- lunch_rush    : 인기 식당 몇 곳에 스탬프 적립이 몰리는 점심 시간
+- referral_burst: 코드 입력 폭주 (대부분 틀린 코드 = 코드 추측, 일부는 실제 초대 코드)
+세션마다 다른 X-Forwarded-For 를 보내 IP 별 요청 수 제한도 실제처럼 나뉘게 한다.
+결과는 커밋끼리 diff 할 수 있도록 키를 정렬한 JSON 으로 쓰고, compare() 로 p50/p95/p99 변화를 보여준다.
+요청 인증은 실행기 프로세스가 같은 SECRET_KEY 로 access token 을 만들어 붙인다 (manage.py 명령으로 실행).
+"""
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import requests
+
+from wouldulike_backend.loadtest import summarize
+
+
+@dataclass(frozen=True)
+class Call:
+    endpoint: str
+    method: str
+    path: str
+    user_id: int | None = None
+    body: dict | None = None
+    headers: dict | None = None
+
+
+def _client_ip(rng: random.Random) -> str:
+    return f"10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(1, 255)}"
+
+
+def _hot_restaurants(manifest: dict, count: int = 10) -> list[dict]:
+    # 합성 데이터의 식당 순서가 인기 순위다
+    return manifest["restaurants"][:count]
+
+
+def login_storm(manifest: dict, rng: random.Random, n: int) -> list[Call]:
+    # 가짜 Kakao 가 토큰을 kakao_login_users 명 안의 kakao id 로 바꿔 주므로 기존 사용자 로그인이 된다
+    user = rng.choice(manifest["users"])
+    return [
+        Call("auth.kakao", "POST", "/api/auth/kakao", body={"access_token": f"load-{n}"}),
+        Call("coupons.my", "GET", "/api/coupons/my/", user_id=user["id"]),
+    ]
+
+
+def wallet_browse(manifest: dict, rng: random.Random, n: int) -> list[Call]:
+    user = rng.choice(manifest["users"])
+    restaurant = rng.choice(manifest["restaurants"])
+    return [
+        Call("coupons.my", "GET", "/api/coupons/my/", user_id=user["id"]),
+        Call("stamps.my_all", "GET", "/api/coupons/stamps/my/all/", user_id=user["id"]),
+        Call("stamps.my", "GET", f"/api/coupons/stamps/my/?restaurant_id={restaurant['id']}", user_id=user["id"]),
+        Call("invite.my", "GET", "/api/coupons/invite/my/", user_id=user["id"]),
+    ]
+
+
+def lunch_rush(manifest: dict, rng: random.Random, n: int) -> list[Call]:
+    user = rng.choice(manifest["users"])
+    restaurant = rng.choice(_hot_restaurants(manifest))
+    body = {
+        "restaurant_id": restaurant["id"],
+        "pin": restaurant["pin"],
+        "idem_key": uuid.UUID(int=rng.getrandbits(128)).hex,
+    }
+    return [
+        Call("stamps.add", "POST", "/api/coupons/stamps/add/", user_id=user["id"], body=body),
+        Call("stamps.my", "GET", f"/api/coupons/stamps/my/?restaurant_id={restaurant['id']}", user_id=user["id"]),
+    ]
+
+
+def referral_burst(manifest: dict, rng: random.Random, n: int) -> list[Call]:
+    referee = rng.choice(manifest["users"])
+    if rng.random() < 0.3:
+        code = rng.choice(manifest["users"])["invite_code"]
+    else:
+        code = "".join(rng.choices("ABCDEFGHJKLMNPQRSTUVWXYZ23456789", k=8))
+    body = {"ref_code": code}
+    return [Call("referrals.accept", "POST", "/api/coupons/referrals/accept/", user_id=referee["id"], body=body)]
+
+
+SCENARIOS = {
+    "login_storm": login_storm,
+    "wallet_browse": wallet_browse,
+    "lunch_rush": lunch_rush,
+    "referral_burst": referral_burst,
+}
+
+
+# --- 실행 -------------------------------------------------------------
+
+
+def access_token(user_id: int) -> str:
+    from rest_framework_simplejwt.settings import api_settings
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    token = AccessToken()
+    token[api_settings.USER_ID_CLAIM] = user_id
+    return str(token)
+
+
+def run_scenario(
+    scenario: str,
+    manifest: dict,
+    *,
+    url: str,
+    concurrency: int = 20,
+    duration_s: float | None = 30.0,
+    sessions: int | None = None,
+    seed: int = 42,
+    timeout_s: float = 30.0,
+) -> dict:
+    build = SCENARIOS[scenario]
+    deadline = time.monotonic() + duration_s if duration_s else None
+    counter = itertools.count()
+    lock = threading.Lock()
+    latencies: dict[str, list[float]] = defaultdict(list)
+    statuses: dict[str, Counter] = defaultdict(Counter)
+    tokens: dict[int, str] = {}
+
+    def token_for(user_id: int) -> str:
+        token = tokens.get(user_id)
+        if token is None:
+            token = tokens[user_id] = access_token(user_id)
+        return token
+
+    def next_session() -> int | None:
+        with lock:
+            n = next(counter)
+        if sessions is not None and n >= sessions:
+            return None
+        if deadline is not None and time.monotonic() >= deadline:
+            return None
+        return n
+
+    def worker() -> None:
+        session = requests.Session()
+        while (n := next_session()) is not None:
+            rng = random.Random(f"{seed}:{scenario}:{n}")
+            client_headers = {"X-Forwarded-For": _client_ip(rng)}
+            for call in build(manifest, rng, n):
+                headers = dict(client_headers, **(call.headers or {}))
+                if call.user_id is not None:
+                    headers["Authorization"] = f"Bearer {token_for(call.user_id)}"
+                started = time.perf_counter()
+                try:
+                    response = session.request(
+                        call.method, url.rstrip("/") + call.path, json=call.body, headers=headers, timeout=timeout_s
+                    )
+                    status = response.status_code
+                except requests.RequestException:
+                    status = "error"
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                with lock:
+                    latencies[call.endpoint].append(elapsed_ms)
+                    statuses[call.endpoint][status] += 1
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix=f"load-{scenario}") as executor:
+        for future in [executor.submit(worker) for _ in range(concurrency)]:
+            future.result()
+    elapsed_s = time.monotonic() - started
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    all_statuses = sum(statuses.values(), Counter())
+    return {
+        "overall": summarize(all_latencies, all_statuses, elapsed_s, concurrency),
+        "endpoints": {
+            endpoint: summarize(latencies[endpoint], statuses[endpoint], elapsed_s, concurrency)
+            for endpoint in sorted(latencies)
+        },
+    }
+
+
+# --- 로컬 대역 (앱 서버, Kakao, Redis) ---------------------------------
+
+
+def start_fake_redis(port: int):
+    try:
+        from fakeredis import TcpFakeServer
+    except ImportError as exc:
+        raise RuntimeError("--fake-redis-port 는 fakeredis 패키지가 필요합니다 (pip install fakeredis).") from exc
+    server = TcpFakeServer(("127.0.0.1", port))
+    threading.Thread(target=server.serve_forever, name="fake-redis", daemon=True).start()
+    return server
+
+
+def _wait_for_port(port: int, process: subprocess.Popen, timeout_s: float) -> None:
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"app server exited with code {process.returncode} before listening on port {port}")
+        with socket.socket() as sock:
+            if sock.connect_ex(("127.0.0.1", port)) == 0:
+                return
+        time.sleep(0.2)
+    raise RuntimeError(f"app server did not start on port {port} within {timeout_s:.0f}s")
+
+
+def boot_server(port: int, *, workers: int = 4, env: dict | None = None, timeout_s: float = 60.0) -> subprocess.Popen:
+    """Procfile 과 같은 gunicorn 설정(--preload)으로 앱을 띄운다."""
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "gunicorn", "wouldulike_backend.wsgi:application",
+            "--bind", f"127.0.0.1:{port}", f"--workers={workers}", "--preload", "--log-level=warning",
+        ],
+        env=dict(os.environ, **(env or {})),
+    )
+    try:
+        _wait_for_port(port, process, timeout_s)
+    except RuntimeError:
+        process.terminate()
+        raise
+    return process
+
+
+# --- 결과 비교 ---------------------------------------------------------
+
+
+def compare(baseline: dict, current: dict) -> list[str]:
+    """두 결과 파일의 시나리오/엔드포인트별 처리량과 p50/p95/p99 변화."""
+    lines = []
+    for scenario, result in sorted(current.get("scenarios", {}).items()):
+        base = baseline.get("scenarios", {}).get(scenario)
+        if base is None:
+            continue
+        rows = [("(overall)", base["overall"], result["overall"])]
+        rows += [
+            (endpoint, base["endpoints"][endpoint], summary)
+            for endpoint, summary in sorted(result["endpoints"].items())
+            if endpoint in base["endpoints"]
+        ]
+        for endpoint, old, new in rows:
+            changes = [f"rps {old['rps']}→{new['rps']}"]
+            for key in ("p50", "p95", "p99"):
+                before, after = old["latency_ms"][key], new["latency_ms"][key]
+                delta = f"{(after - before) / before * 100:+.0f}%" if before else "n/a"
+                changes.append(f"{key} {before}→{after}ms ({delta})")
+            lines.append(f"{scenario:<15} {endpoint:<18} " + ", ".join(changes))
+    return lines
+
+
+def write_report(path: str, report: dict) -> None:
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, ensure_ascii=False, indent=2, sort_keys=True)
+        fh.write("\n")
+
+
+def git_revision() -> str | None:
+    try:
+        completed = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return completed.stdout.strip() or None
+
@@ -0,0 +1,198 @@
+"""
+HTTP 부하 테스트 (sync 워커 / ASGI 모드 동시 처리량 비교용).
+
+실행 중인 서버에 concurrency 개의 동시 연결로 요청을 보내고 지연 분포(p50/p95/p99)와 처리량을 JSON 으로 출력한다.
+--fake-kakao-port 를 주면 응답을 --fake-kakao-delay-ms 만큼 늦게 주는 가짜 Kakao API 를 같이 띄운다.
+서버를 KAKAO_API_BASE_URL=http://127.0.0.1:<port> 로 띄우면 느린 외부 API 상황을 재현할 수 있다.
+body 의 {n} 은 요청 번호로 바뀐다 (매번 다른 access_token 으로 프로필 캐시를 피할 때).
+
+사용 예:
+    python -m wouldulike_backend.loadtest --url http://127.0.0.1:8000 \\
+        --path /restaurants/affiliate-restaurants/ --concurrency 50 --requests 2000
+    python -m wouldulike_backend.loadtest --url http://127.0.0.1:8000 --method POST \\
+        --path /api/auth/kakao --body '{"access_token": "load-{n}"}' \\
+        --fake-kakao-port 9100 --fake-kakao-delay-ms 300 --concurrency 64 --duration 30
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import math
+import sys
+import threading
+import time
+import zlib
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def summarize(latencies_ms: list[float], statuses: Counter, elapsed_s: float, concurrency: int) -> dict:
+    ordered = sorted(latencies_ms)
+    total = sum(statuses.values())
+    errors = sum(count for status, count in statuses.items() if status == "error" or int(status) >= 500)
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed_s, 3),
+        "rps": round(total / elapsed_s, 1) if elapsed_s > 0 else 0.0,
+        "errors": errors,
+        "status": {str(status): count for status, count in sorted(statuses.items(), key=lambda item: str(item[0]))},
+        "latency_ms": {
+            "p50": round(percentile(ordered, 50), 1),
+            "p95": round(percentile(ordered, 95), 1),
+            "p99": round(percentile(ordered, 99), 1),
+            "max": round(ordered[-1], 1) if ordered else 0.0,
+        },
+    }
+
+
+# --- 가짜 Kakao API ------------------------------------------------------
+
+
+def _fake_kakao_handler(delay_s: float):
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self, payload: dict) -> None:
+            time.sleep(delay_s)
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json;charset=UTF-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):  # /v2/user/me
+            token = self.headers.get("Authorization", "").removeprefix("Bearer ")
+            # 사용자 수가 끝없이 늘지 않도록 토큰을 1000명 안으로 모은다
+            kakao_id = 9_000_000_000 + zlib.crc32(token.encode("utf-8")) % 1000
+            self._reply({"id": kakao_id, "kakao_account": {"profile": {"nickname": f"load{kakao_id % 1000}"}}})
+
+        def do_POST(self):  # /oauth/token
+            self._reply({"access_token": f"load-{time.time_ns()}"})
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def start_fake_kakao(port: int, delay_ms: float) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", port), _fake_kakao_handler(delay_ms / 1000))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="fake-kakao", daemon=True).start()
+    return server
+
+
+# --- 부하 발생 -----------------------------------------------------------
+
+
+def run(
+    *,
+    url: str,
+    paths: list[str],
+    method: str = "GET",
+    body: str | None = None,
+    headers: dict | None = None,
+    concurrency: int = 20,
+    total_requests: int | None = None,
+    duration_s: float | None = None,
+    timeout_s: float = 30.0,
+) -> dict:
+    counter = itertools.count()
+    deadline = time.monotonic() + duration_s if duration_s else None
+    lock = threading.Lock()
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+    local = threading.local()
+
+    def next_index() -> int | None:
+        n = next(counter)
+        if total_requests is not None and n >= total_requests:
+            return None
+        if deadline is not None and time.monotonic() >= deadline:
+            return None
+        return n
+
+    def worker() -> None:
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+        while (n := next_index()) is not None:
+            target = url.rstrip("/") + paths[n % len(paths)]
+            data = body.replace("{n}", str(n)).encode("utf-8") if body else None
+            started = time.perf_counter()
+            try:
+                response = session.request(method, target, data=data, headers=headers, timeout=timeout_s)
+                status = response.status_code
+            except requests.RequestException:
+                status = "error"
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            with lock:
+                latencies.append(elapsed_ms)
+                statuses[status] += 1
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="load") as executor:
+        for future in [executor.submit(worker) for _ in range(concurrency)]:
+            future.result()
+    return summarize(latencies, statuses, time.monotonic() - started, concurrency)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="HTTP 부하 테스트 (p50/p95/p99, 처리량)")
+    parser.add_argument("--url", required=True, help="서버 주소 (예: http://127.0.0.1:8000)")
+    parser.add_argument("--path", action="append", required=True, help="요청 경로 (여러 번 주면 번갈아 호출)")
+    parser.add_argument("--method", default="GET")
+    parser.add_argument("--body", help="요청 본문 ({n} 은 요청 번호로 바뀜)")
+    parser.add_argument("--header", action="append", default=[], help="'이름: 값' 형식 헤더")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--requests", type=int, help="총 요청 수")
+    parser.add_argument("--duration", type=float, help="실행 시간(초). --requests 와 함께 주면 먼저 끝나는 쪽")
+    parser.add_argument("--timeout", type=float, default=30.0, help="요청 타임아웃(초)")
+    parser.add_argument("--fake-kakao-port", type=int, help="가짜 Kakao API 포트")
+    parser.add_argument("--fake-kakao-delay-ms", type=float, default=300.0, help="가짜 Kakao 응답 지연(ms)")
+    args = parser.parse_args(argv)
+
+    if args.requests is None and args.duration is None:
+        parser.error("--requests 또는 --duration 중 하나는 필요합니다.")
+
+    headers = {}
+    for raw in args.header:
+        name, _, value = raw.partition(":")
+        headers[name.strip()] = value.strip()
+    if args.body and "Content-Type" not in headers:
+        headers["Content-Type"] = "application/json"
+
+    fake = start_fake_kakao(args.fake_kakao_port, args.fake_kakao_delay_ms) if args.fake_kakao_port else None
+    try:
+        result = run(
+            url=args.url,
+            paths=args.path,
+            method=args.method.upper(),
+            body=args.body,
+            headers=headers,
+            concurrency=args.concurrency,
+            total_requests=args.requests,
+            duration_s=args.duration,
+            timeout_s=args.timeout,
+        )
+    finally:
+        if fake is not None:
+            fake.shutdown()
+    json.dump(result, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,10 @@ import logging
 import time
 import uuid
 
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+
+from .db_pool.pool import begin_request_stats, end_request_stats
+
 
 logger = logging.getLogger(__name__)
 
@@ -11,12 +15,38 @@ class RequestLifecycleLoggingMiddleware:
     Log request start/end so hung endpoints can be identified even without access logs.
     """
 
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started_at = self._start(request)
+        pool_token = begin_request_stats()
+        try:
+            response = self.get_response(request)
+        finally:
+            pool = end_request_stats(pool_token)
+        self._finish(request, response, started_at, pool)
+        return response
+
+    async def __acall__(self, request):
+        started_at = self._start(request)
+        pool_token = begin_request_stats()
+        try:
+            response = await self.get_response(request)
+        finally:
+            pool = end_request_stats(pool_token)
+        self._finish(request, response, started_at, pool)
+        return response
+
+    def _start(self, request) -> float:
         request_id = uuid.uuid4().hex[:10]
-        started_at = time.perf_counter()
         request._request_id = request_id
 
         logger.info(
@@ -25,18 +55,72 @@ class RequestLifecycleLoggingMiddleware:
             request.method,
             request.get_full_path(),
         )
+        return time.perf_counter()
 
-        response = self.get_response(request)
-
+    def _finish(self, request, response, started_at, pool) -> None:
         elapsed_ms = int((time.perf_counter() - started_at) * 1000)
         level = logging.WARNING if elapsed_ms >= 5000 else logging.INFO
+        # db_pool_*: 이 요청이 풀에서 빌린 연결 수 / 새로 연 연결 수 / 빈 연결을 기다린 시간
         logger.log(
             level,
-            "[req:%s] END %s %s status=%s elapsed_ms=%s",
-            request_id,
+            "[req:%s] END %s %s status=%s elapsed_ms=%s db_pool_acquired=%s db_pool_new=%s db_pool_wait_ms=%s",
+            request._request_id,
             request.method,
             request.get_full_path(),
             getattr(response, "status_code", "unknown"),
             elapsed_ms,
+            pool.acquired,
+            pool.created,
+            int(pool.wait_s * 1000),
         )
+
+
+class ReplicaStickinessMiddleware:
+    """
+    read-your-writes: 복제본이 있는 DB 에 쓰기를 한 요청 뒤 REPLICA_STICKY_SECONDS 동안은
+    같은 클라이언트(쿠키)·사용자(Redis 키)의 읽기를 원본 DB 로 보낸다 (db_routers.read_alias 참고).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        from .db_routers import track_request
+
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with track_request(request) as state:
+            response = self.get_response(request)
+        if state.wrote:
+            self._mark_sticky(request, response)
         return response
+
+    async def __acall__(self, request):
+        from .db_routers import track_request
+
+        # 쓰기 감지는 async_support 가 뷰를 실행하는 스레드의 연결에도 다시 건다
+        with track_request(request) as state:
+            response = await self.get_response(request)
+        if state.wrote:
+            await sync_to_async(self._mark_sticky, thread_sensitive=False)(request, response)
+        return response
+
+    def _mark_sticky(self, request, response) -> None:
+        from django.conf import settings
+        from django.core.cache import cache
+
+        from .db_routers import STICKY_COOKIE_NAME, known_user_id, sticky_key
+
+        sticky_s = int(getattr(settings, "REPLICA_STICKY_SECONDS", 10))
+        response.set_cookie(STICKY_COOKIE_NAME, "1", max_age=sticky_s, httponly=True, samesite="Lax")
+        user_id = known_user_id(request)
+        if user_id is not None:
+            try:
+                cache.set(sticky_key(user_id), 1, sticky_s)
+            except Exception as exc:
+                logger.debug("replica stickiness write failed: %s", exc)
@@ -0,0 +1,288 @@
+"""
+DB 장애 대응.
+
+CloudSQL 이 느려지면 요청이 gunicorn timeout(120초)까지 워커를 붙잡고, 뒤따르는 요청이 쌓여 전체가 멈춘다.
+- statement_timeout / connect_timeout (settings): 쿼리 하나, 연결 하나가 기다릴 수 있는 상한.
+  statement_timeout 은 install() 이 웹 프로세스의 연결 옵션에만 건다 (관리 명령, Celery 작업은 제외).
+- query_budget(): 뷰별 쿼리 수 / 시간 예산. 넘으면 다음 쿼리를 실행하지 않고 503(또는 fallback 응답)으로 끝낸다.
+  degrade_after_ms 가 지나면 앱 접속 쿠폰 발급 같은 부가 작업(optional_work_allowed)을 건너뛴다.
+- CircuitBreaker: DB 서버(호스트/포트/이름)마다 OperationalError(연결 실패, statement timeout 등)가
+  window_s 안에 failure_threshold 번 나면 reset_s 동안 열린다. 열린 동안 부가 작업은 건너뛰고,
+  fallback 이 있는 뷰(제휴 식당 목록 등)는 DB 를 기다리지 않고 마지막으로 캐시한 목록을 돌려준다.
+  reset_s 가 지나면 요청 하나만 시험 삼아 보내고(half-open), 성공하면 닫힌다.
+브레이커는 워커 프로세스마다 따로 동작한다 (Redis 장애와 무관하게 판단하도록).
+
+쿼리 결과 기록과 예산 확인은 install() 뒤 모든 연결에 걸리는 execute wrapper(_db_guard)가 하고,
+연결 자체의 실패(connect_timeout, 풀 대기 초과)는 db_pool 백엔드가 기록한다.
+"""
+from __future__ import annotations
+
+import contextvars
+import functools
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.db import DatabaseError, InterfaceError, OperationalError, connections
+from django.db.backends.signals import connection_created
+from django.http import JsonResponse
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class QueryBudgetExceeded(DatabaseError):
+    """뷰의 쿼리 수 / 시간 예산을 넘겨 다음 쿼리를 실행하지 않았다."""
+
+
+# --- 서킷 브레이커 ----------------------------------------------------
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, *, failure_threshold: int = 5, window_s: float = 30.0, reset_s: float = 30.0,
+                 clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.window_s = window_s
+        self.reset_s = reset_s
+        self._clock = clock
+        self._failures: deque[float] = deque()
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and self._clock() - self._opened_at >= self.reset_s:
+                return HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """부가 작업을 해도 되는지. 열린 뒤 reset_s 가 지나면 시험 요청 하나만 허용한다."""
+        if self._state == CLOSED:
+            return True
+        with self._lock:
+            if self._state == OPEN:
+                if self._clock() - self._opened_at < self.reset_s:
+                    return False
+                self._state = HALF_OPEN
+                self._probing = False
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        if self._state == CLOSED and not self._failures:
+            return
+        with self._lock:
+            if self._state == HALF_OPEN:
+                logger.info("circuit %s closed", self.name)
+            self._state = CLOSED
+            self._probing = False
+            self._failures.clear()
+
+    def record_failure(self) -> None:
+        now = self._clock()
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._open(now)
+                return
+            self._failures.append(now)
+            while self._failures and now - self._failures[0] > self.window_s:
+                self._failures.popleft()
+            if self._state == CLOSED and len(self._failures) >= self.failure_threshold:
+                self._open(now)
+
+    def _open(self, now: float) -> None:
+        self._state = OPEN
+        self._opened_at = now
+        self._probing = False
+        self._failures.clear()
+        logger.warning("circuit %s opened for %.0fs after repeated DB errors", self.name, self.reset_s)
+
+
+_breakers: dict[tuple, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def _server_key(alias: str) -> tuple:
+    # 통합 모드처럼 여러 alias 가 같은 서버를 가리키면 브레이커 하나를 같이 쓴다
+    db = settings.DATABASES.get(alias) or {}
+    if db.get("HOST"):
+        return (db.get("HOST"), str(db.get("PORT") or ""), db.get("NAME"))
+    return (alias,)
+
+
+def breaker_for(alias: str) -> CircuitBreaker:
+    key = _server_key(alias)
+    breaker = _breakers.get(key)
+    if breaker is not None:
+        return breaker
+    with _breakers_lock:
+        breaker = _breakers.get(key)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                alias,
+                failure_threshold=int(getattr(settings, "DB_CIRCUIT_FAILURES", 5)),
+                window_s=float(getattr(settings, "DB_CIRCUIT_WINDOW_SECONDS", 30)),
+                reset_s=float(getattr(settings, "DB_CIRCUIT_RESET_SECONDS", 30)),
+            )
+            _breakers[key] = breaker
+        return breaker
+
+
+def reset_breakers() -> None:
+    with _breakers_lock:
+        _breakers.clear()
+
+
+def _is_outage(exc: BaseException) -> bool:
+    # 제약 위반 / SQL 오류는 서버 상태와 무관하므로 세지 않는다
+    return isinstance(exc, (OperationalError, InterfaceError)) and not isinstance(exc, QueryBudgetExceeded)
+
+
+# --- 뷰별 쿼리 예산 ---------------------------------------------------
+
+
+@dataclass
+class _Budget:
+    name: str
+    max_queries: int | None
+    max_ms: float | None
+    degrade_after_ms: float | None
+    started: float = field(default_factory=time.monotonic)
+    queries: int = 0
+    exceeded: str | None = None
+
+    def elapsed_ms(self) -> float:
+        return (time.monotonic() - self.started) * 1000
+
+    def charge(self) -> None:
+        self.queries += 1
+        if self.max_queries is not None and self.queries > self.max_queries:
+            self.exceeded = f"{self.queries} queries > {self.max_queries}"
+        elif self.max_ms is not None and self.elapsed_ms() > self.max_ms:
+            self.exceeded = f"{self.elapsed_ms():.0f}ms > {self.max_ms:.0f}ms"
+        if self.exceeded:
+            raise QueryBudgetExceeded(f"query budget '{self.name}' exceeded: {self.exceeded}")
+
+
+_current_budget: contextvars.ContextVar[_Budget | None] = contextvars.ContextVar("query_budget", default=None)
+
+
+def _db_guard(execute, sql, params, many, context):
+    budget = _current_budget.get()
+    if budget is not None:
+        budget.charge()
+    try:
+        result = execute(sql, params, many, context)
+    except Exception as exc:
+        if _is_outage(exc):
+            breaker_for(context["connection"].alias).record_failure()
+        raise
+    breaker_for(context["connection"].alias).record_success()
+    return result
+
+
+def _install_on_connection(sender, connection, **kwargs):
+    if _db_guard not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _db_guard)
+
+
+def install_statement_timeouts() -> None:
+    """
+    settings.DB_STATEMENT_TIMEOUTS 의 alias 별 statement_timeout 을 연결 옵션에 더한다. 이후 새로 여는 연결부터 적용된다.
+    이미 옵션에 있으면 (DB_STATEMENT_TIMEOUT_ALL_PROCESSES=1) 그대로 둔다.
+    """
+    for alias, timeout_ms in getattr(settings, "DB_STATEMENT_TIMEOUTS", {}).items():
+        if alias not in connections.settings:
+            continue
+        options = connections.settings[alias].setdefault("OPTIONS", {})
+        current = options.get("options", "")
+        if "statement_timeout=" not in current:
+            options["options"] = f"{current} -c statement_timeout={timeout_ms}".strip()
+
+
+def install() -> None:
+    """
+    웹 프로세스 설정. 이후 열리는 모든 DB 연결(모든 스레드)에 _db_guard 와 statement_timeout 을 건다.
+    wsgi.py / asgi.py 가 부른다.
+    """
+    install_statement_timeouts()
+    connection_created.connect(_install_on_connection, dispatch_uid="wouldulike_backend.resilience")
+
+
+def optional_work_allowed(alias: str) -> bool:
+    """
+    부가 작업(앱 접속 쿠폰 발급 등)을 해도 되는지.
+    alias 의 브레이커가 열려 있거나, 현재 뷰가 degrade_after_ms 를 이미 넘겼으면 False.
+    """
+    budget = _current_budget.get()
+    if budget is not None and budget.degrade_after_ms is not None and budget.elapsed_ms() > budget.degrade_after_ms:
+        return False
+    return breaker_for(alias).allow()
+
+
+def _budget_exceeded_response() -> JsonResponse:
+    response = JsonResponse(
+        {"error_code": "SERVICE_DEGRADED", "message": "요청이 많아 잠시 후 다시 시도해주세요."},
+        status=503,
+    )
+    response["Retry-After"] = "1"
+    return response
+
+
+def query_budget(name: str, *, max_queries: int | None = None, max_ms: float | None = None,
+                 degrade_after_ms: float | None = None, fallback=None, alias: str | None = None):
+    """
+    뷰의 쿼리 수(max_queries) / 시간(max_ms) 예산. 넘으면 다음 쿼리 대신 QueryBudgetExceeded 를 던지고
+    fallback(request, ...) 응답이나 503 으로 끝낸다 (뷰가 예외를 삼켜도 fallback 이 있으면 fallback 으로 바꾼다).
+    alias 를 주면 그 DB 의 브레이커가 열려 있을 때 뷰를 실행하지 않고 바로 fallback 을 쓴다.
+    fallback 이 None 을 돌려주면 (예: 캐시한 목록이 없음) 원래대로 처리한다.
+    함수 뷰에는 그대로, 클래스 뷰 메서드에는 method_decorator 로 붙인다.
+    """
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapped(request, *args, **kwargs):
+            if not getattr(settings, "QUERY_BUDGETS_ENABLED", True):
+                return view(request, *args, **kwargs)
+            if fallback is not None and alias is not None and not breaker_for(alias).allow():
+                response = fallback(request, *args, **kwargs)
+                if response is not None:
+                    logger.info("[%s] circuit open for %s, served fallback", name, alias)
+                    return response
+
+            budget = _Budget(name, max_queries, max_ms, degrade_after_ms)
+            token = _current_budget.set(budget)
+            try:
+                response = view(request, *args, **kwargs)
+            except QueryBudgetExceeded:
+                response = None
+            finally:
+                _current_budget.reset(token)
+
+            if budget.exceeded is None:
+                return response
+            logger.warning("[%s] query budget exceeded: %s", name, budget.exceeded)
+            if fallback is not None:
+                degraded = fallback(request, *args, **kwargs)
+                if degraded is not None:
+                    return degraded
+            # 뷰가 예외를 받아 정상 응답을 만들었으면 그대로 두고, 아니면 503 으로 바꾼다
+            if response is not None and response.status_code < 500:
+                return response
+            return _budget_exceeded_response()
+
+        return wrapped
+
+    return decorator
@@ -128,6 +128,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'wouldulike_backend.middleware.RequestLifecycleLoggingMiddleware',
+    'wouldulike_backend.middleware.ReplicaStickinessMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -172,6 +173,7 @@ _CLOUDSQL_DATABASE = {
     "HOST": os.getenv("cloudsql_db_host"),
     "PORT": os.getenv("cloudsql_db_port"),
     # CONN_MAX_AGE=0: 요청 종료 후 즉시 연결 반환 → 동시 연결 수 절감
+    # (DB_POOL_ENABLED=1 이면 끊지 않고 워커별 풀로 반환, 아래 _DB_POOL 참고)
     "CONN_MAX_AGE": 0,
     "OPTIONS": {
         "options": "-c client_encoding=utf8",
@@ -226,7 +228,7 @@ if USE_LOCAL_SQLITE:
     DATABASES = {
         "default": {
             "ENGINE": "django.db.backends.sqlite3",
-            "NAME": os.path.join(BASE_DIR, "local.sqlite3"),
+            "NAME": os.getenv("DJANGO_SQLITE_PATH") or os.path.join(BASE_DIR, "local.sqlite3"),
         }
     }
 elif DISABLE_EXTERNAL_DBS:
@@ -234,6 +236,97 @@ elif DISABLE_EXTERNAL_DBS:
         "default": DEFAULT_DB_CONFIG,
     }
 
+# 스탬프 적립/조회 DB (coupons.service). 로컬 DB 모드에는 cloudsql alias 가 없어 default 를 쓴다
+STAMP_DB_ALIAS = "default" if (USE_LOCAL_SQLITE or DISABLE_EXTERNAL_DBS) else "cloudsql"
+
+# 읽기 전용 복제본 (선택): cloudsql_replica_db_host 를 설정하면 prefer_replica() 로 표시한 읽기만
+# 복제 지연/read-your-writes 조건을 확인한 뒤 복제본으로 보낸다 (wouldulike_backend/db_routers.py)
+DATABASE_REPLICAS = {}
+_cloudsql_replica_host = (os.getenv("cloudsql_replica_db_host") or "").strip()
+if _cloudsql_replica_host and not (USE_LOCAL_SQLITE or DISABLE_EXTERNAL_DBS):
+    DATABASES["cloudsql_replica"] = {
+        **_CLOUDSQL_DATABASE,
+        "HOST": _cloudsql_replica_host,
+        "PORT": os.getenv("cloudsql_replica_db_port") or _CLOUDSQL_DATABASE["PORT"],
+        "OPTIONS": dict(_CLOUDSQL_DATABASE["OPTIONS"]),
+        "TEST": {"MIRROR": "cloudsql"},
+    }
+    _replicated = ("default", "cloudsql", "rds") if USE_CLOUDSQL_UNIFIED else ("cloudsql",)
+    DATABASE_REPLICAS = {alias: ["cloudsql_replica"] for alias in _replicated}
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+REPLICA_LAG_CHECK_SECONDS = float(os.getenv("REPLICA_LAG_CHECK_SECONDS", "5"))
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", "10"))
+
+# DB 가 느려질 때 요청이 gunicorn timeout(120초)까지 워커를 붙잡지 않도록 쿼리/연결 대기 상한을 둔다.
+# DB_STATEMENT_TIMEOUT_MS_<ALIAS> (예: DB_STATEMENT_TIMEOUT_MS_CLOUDSQL) 로 alias 별로 바꿀 수 있고 0 이면 끈다.
+# statement_timeout 은 웹 프로세스(wsgi.py / asgi.py 의 resilience.install())에만 건다. 마이그레이션, 만료 정리,
+# 아카이브 같은 관리 명령과 Celery 작업은 오래 걸리는 게 정상이므로 기본으로 빠지고,
+# 이들에도 걸려면 DB_STATEMENT_TIMEOUT_ALL_PROCESSES=1 로 실행한다.
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "15000"))
+DB_STATEMENT_TIMEOUT_ALL_PROCESSES = os.getenv("DB_STATEMENT_TIMEOUT_ALL_PROCESSES", "0") == "1"
+DB_CONNECT_TIMEOUT_SECONDS = int(os.getenv("DB_CONNECT_TIMEOUT_SECONDS", "5"))
+DB_STATEMENT_TIMEOUTS = {}
+for _alias, _db in DATABASES.items():
+    if _db.get("ENGINE") != "django.db.backends.postgresql":
+        continue
+    # 통합 모드의 alias 들은 OPTIONS dict 를 공유하므로 alias 마다 새로 만든다
+    _options = dict(_db.get("OPTIONS") or {})
+    if DB_CONNECT_TIMEOUT_SECONDS > 0:
+        _options.setdefault("connect_timeout", DB_CONNECT_TIMEOUT_SECONDS)
+    _statement_timeout_ms = int(os.getenv(f"DB_STATEMENT_TIMEOUT_MS_{_alias.upper()}", str(DB_STATEMENT_TIMEOUT_MS)))
+    if _statement_timeout_ms > 0:
+        DB_STATEMENT_TIMEOUTS[_alias] = _statement_timeout_ms
+        if DB_STATEMENT_TIMEOUT_ALL_PROCESSES:
+            _options["options"] = f"{_options.get('options', '')} -c statement_timeout={_statement_timeout_ms}".strip()
+    _db["OPTIONS"] = _options
+
+# DB 서킷 브레이커 / 뷰별 쿼리 예산 (wouldulike_backend/resilience.py)
+DB_CIRCUIT_FAILURES = int(os.getenv("DB_CIRCUIT_FAILURES", "5"))
+DB_CIRCUIT_WINDOW_SECONDS = float(os.getenv("DB_CIRCUIT_WINDOW_SECONDS", "30"))
+DB_CIRCUIT_RESET_SECONDS = float(os.getenv("DB_CIRCUIT_RESET_SECONDS", "30"))
+QUERY_BUDGETS_ENABLED = os.getenv("QUERY_BUDGETS_ENABLED", "1") == "1"
+
+# 쓰기/발급 엔드포인트 요청 수 제한 (wouldulike_backend/throttling.py, 뷰의 throttle_scope)
+# scope -> {"user": 규칙들, "ip": 규칙들}, 규칙은 "횟수/기간(s|m|h|d)". user 규칙은 로그인한 요청에만 적용한다.
+RATE_LIMITS_ENABLED = os.getenv("RATE_LIMITS_ENABLED", "1") == "1"
+RATE_LIMITS = {
+    # 이벤트/추천 코드 입력: 코드 추측 방지
+    "coupon_code": {"user": ("5/m", "30/h"), "ip": ("20/m",)},
+    "stamp": {"user": ("10/m",), "ip": ("60/m",)},
+    "redeem": {"user": ("10/m",), "ip": ("60/m",)},
+    "claim": {"user": ("10/m", "60/h"), "ip": ("60/m",)},
+    # 카카오/애플 토큰 검증 로그인. 캠퍼스 Wi-Fi·통신사 NAT 뒤 학생들이 IP 하나를 나눠 쓰므로 IP 한도를 넉넉히 둔다
+    "login": {"ip": ("120/m", "3000/h")},
+    # refresh token 으로 하는 앱 접속 로그인: 토큰의 사용자 기준 (IP 로 묶지 않음)
+    "token_refresh": {"user": ("10/m", "100/h")},
+}
+
+# PostgreSQL alias 별 연결 풀 (워커 프로세스당 alias 마다 최대 DB_POOL_MAX_SIZE 개)
+# 요청마다 TCP+TLS+인증을 다시 하지 않으면서 Cloud Run 인스턴스당 연결 수 상한은 유지한다.
+DB_POOL_ENABLED = os.getenv("DB_POOL_ENABLED", "1") == "1"
+_DB_POOL = {
+    "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "5")),
+    "timeout_s": float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "5")),
+    "max_lifetime_s": float(os.getenv("DB_POOL_MAX_LIFETIME_SECONDS", "1800")),
+    "max_idle_s": float(os.getenv("DB_POOL_MAX_IDLE_SECONDS", "300")),
+    "ping_after_s": float(os.getenv("DB_POOL_PING_AFTER_SECONDS", "5")),
+}
+if DB_POOL_ENABLED:
+    for _db in DATABASES.values():
+        if _db.get("ENGINE") == "django.db.backends.postgresql":
+            _db["ENGINE"] = "wouldulike_backend.db_pool"
+            _db["POOL"] = dict(_DB_POOL)
+
+# ASGI 모드 (asgi.py 가 ASYNC_VIEWS_ENABLED=1 로 켬): 외부 I/O 가 많은 엔드포인트를 async 뷰로 처리
+# ORM 작업 스레드는 DB 풀 크기, 외부 호출 스레드는 ASYNC_IO_THREADS 로 제한한다 (async_support 참고).
+ASYNC_VIEWS_ENABLED = os.getenv("ASYNC_VIEWS_ENABLED", "0") == "1"
+ASYNC_ORM_THREADS = int(os.getenv("ASYNC_ORM_THREADS", str(_DB_POOL["max_size"])))
+ASYNC_IO_THREADS = int(os.getenv("ASYNC_IO_THREADS", "32"))
+if ASYNC_VIEWS_ENABLED:
+    # WhiteNoise 미들웨어는 sync 전용이라 체인에 있으면 요청마다 스레드를 하나씩 잡는다.
+    # ASGI 에서는 asgi.py 의 ASGIStaticFilesHandler 가 정적 파일을 대신 서빙한다.
+    MIDDLEWARE = [m for m in MIDDLEWARE if m != 'whitenoise.middleware.WhiteNoiseMiddleware']
+
 if USE_LOCAL_SQLITE or DISABLE_EXTERNAL_DBS:
     DATABASE_ROUTERS = []
 else:
@@ -250,6 +343,18 @@ CACHES = {
     }
 }
 
+# gevent 워커 모드 (wouldulike_backend.gevent_wsgi 가 GEVENT_MODE=1 로 켬)
+GEVENT_MODE = os.getenv("GEVENT_MODE", "0") == "1"
+if GEVENT_MODE:
+    # greenlet 수백 개가 각자 Redis 연결을 만들지 않도록 풀 크기를 제한하고, 빈 연결은 (협조적으로) 기다린다
+    CACHES["default"]["OPTIONS"].update({
+        "CONNECTION_POOL_CLASS": "redis.BlockingConnectionPool",
+        "CONNECTION_POOL_KWARGS": {
+            "max_connections": int(os.getenv("REDIS_MAX_CONNECTIONS", "50")),
+            "timeout": float(os.getenv("REDIS_POOL_TIMEOUT_SECONDS", "5")),
+        },
+    })
+
 # CACHES = {
 #     "default": {
 #         "BACKEND": "django_redis.cache.RedisCache",
@@ -325,6 +430,8 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
+    # X-Forwarded-For 에서 클라이언트 IP 를 고를 때 믿을 프록시 수 (Cloud Run 로드밸런서 1개)
+    'NUM_PROXIES': int(os.getenv('TRUSTED_PROXY_HOPS', '1')),
 }
 
 from datetime import timedelta
@@ -0,0 +1,123 @@
+"""
+새 워커의 첫 요청 시간(TTFR) 측정.
+
+gunicorn --preload 처럼 마스터가 WSGI 애플리케이션을 한 번 로드한 뒤 워커를 하나씩 fork 하고,
+각 워커가 fork 직후 받은 첫 요청과 두 번째 요청의 응답 시간을 잰다. warm-up(WORKER_WARMUP) 을 켠 경우와
+끈 경우(--no-warmup)를 비교하면 워커 교체(--max-requests) 때마다 첫 사용자가 치르는 비용이 보인다.
+
+사용 예:
+    python -m wouldulike_backend.startup_bench --workers 20 --path /type-descriptions/type-descriptions/ISTJ/
+    python -m wouldulike_backend.startup_bench --workers 20 --no-warmup
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from wouldulike_backend.loadtest import percentile
+
+
+def _call(application, path: str, host: str) -> tuple[int, float]:
+    from wsgiref.util import setup_testing_defaults
+
+    environ = {"PATH_INFO": path, "REQUEST_METHOD": "GET", "HTTP_HOST": host, "SERVER_NAME": host}
+    setup_testing_defaults(environ)
+    status = []
+    started = time.perf_counter()
+    body = application(environ, lambda s, headers, exc_info=None: status.append(s))
+    try:
+        for _ in body:
+            pass
+    finally:
+        close = getattr(body, "close", None)
+        if close is not None:
+            close()
+    return int(status[0].split()[0]), (time.perf_counter() - started) * 1000
+
+
+def _worker(application, path: str, host: str, write_fd: int) -> None:
+    try:
+        first_status, first_ms = _call(application, path, host)
+        _, second_ms = _call(application, path, host)
+        payload = {"status": first_status, "first_ms": first_ms, "second_ms": second_ms}
+    except Exception as exc:
+        payload = {"error": f"{type(exc).__name__}: {exc}"}
+    os.write(write_fd, json.dumps(payload).encode())
+    os.close(write_fd)
+
+
+def _fork_worker(application, path: str, host: str) -> dict:
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        code = 0
+        try:
+            _worker(application, path, host, write_fd)
+        except BaseException:
+            code = 1
+        os._exit(code)
+    os.close(write_fd)
+    chunks = []
+    while True:
+        chunk = os.read(read_fd, 65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    os.close(read_fd)
+    os.waitpid(pid, 0)
+    return json.loads(b"".join(chunks) or b'{"error": "worker exited without result"}')
+
+
+def run(*, workers: int, path: str, host: str, warmup: bool) -> dict:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "wouldulike_backend.settings")
+    os.environ["WORKER_WARMUP"] = "1" if warmup else "0"
+
+    started = time.perf_counter()
+    from wouldulike_backend.wsgi import application
+
+    boot_ms = (time.perf_counter() - started) * 1000
+
+    results = [_fork_worker(application, path, host) for _ in range(workers)]
+    ok = [r for r in results if "error" not in r]
+    first = sorted(r["first_ms"] for r in ok)
+    second = sorted(r["second_ms"] for r in ok)
+
+    def summary(values):
+        if not values:
+            return {}
+        return {"p50": round(percentile(values, 50), 1), "p99": round(percentile(values, 99), 1),
+                "max": round(values[-1], 1)}
+
+    statuses: dict[str, int] = {}
+    for r in ok:
+        statuses[str(r["status"])] = statuses.get(str(r["status"]), 0) + 1
+    return {
+        "warmup": warmup,
+        "path": path,
+        "workers": workers,
+        "master_boot_ms": round(boot_ms, 1),
+        "first_request_ms": summary(first),
+        "second_request_ms": summary(second),
+        "status": statuses,
+        "errors": [r["error"] for r in results if "error" in r],
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="새 워커의 첫 요청 시간(TTFR) 측정")
+    parser.add_argument("--workers", type=int, default=10, help="차례로 fork 할 워커 수")
+    parser.add_argument("--path", default="/type-descriptions/type-descriptions/ISTJ/", help="첫 요청 경로")
+    parser.add_argument("--host", default="localhost", help="Host 헤더 (ALLOWED_HOSTS 에 있어야 함)")
+    parser.add_argument("--no-warmup", action="store_true", help="WORKER_WARMUP=0 으로 비교 측정")
+    args = parser.parse_args(argv)
+
+    result = run(workers=args.workers, path=args.path, host=args.host, warmup=not args.no_warmup)
+    json.dump(result, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write("\n")
+    return 0 if not result["errors"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,6 +16,9 @@ INSTALLED_APPS = [app for app in INSTALLED_APPS if app != "trends"]  # noqa: F40
 # URLConf도 trends를 import하지 않도록 테스트 전용으로 교체
 ROOT_URLCONF = "wouldulike_backend.test_urls"
 
+# 요청 수 제한은 프로세스 안 카운터를 테스트끼리 공유하므로 기본으로 끄고, 필요한 테스트에서만 켠다
+RATE_LIMITS_ENABLED = False
+
 # 로컬 SQLite 테스트: CloudSQL 전용 RunPython 마이그레이션을 건너뛰고 모델 스키마만 동기화
 if os.getenv("DJANGO_USE_LOCAL_SQLITE", "0") == "1":
 
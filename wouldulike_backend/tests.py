@@ -0,0 +1,640 @@
+import asyncio
+import importlib.util
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+from asgiref.sync import async_to_sync
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import IntegrityError, OperationalError, connections
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.views.decorators.csrf import csrf_exempt
+from psycopg2 import extensions
+
+from wouldulike_backend import async_support, db_routers, green, importprof, resilience, throttling, warmup
+from wouldulike_backend.db_pool import pool as pool_module
+from wouldulike_backend.db_pool.pool import ConnectionPool, PoolTimeout
+from wouldulike_backend.db_routers import prefer_replica
+from wouldulike_backend.lazy import lazy_module
+from wouldulike_backend.middleware import ReplicaStickinessMiddleware
+
+
+class _FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql):
+        if self.conn.broken:
+            raise RuntimeError("server closed the connection")
+        self.conn.pings += 1
+
+
+class _FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.autocommit = True
+        self.broken = False
+        self.pings = 0
+        self.rollbacks = 0
+        self.info = SimpleNamespace(transaction_status=extensions.TRANSACTION_STATUS_IDLE)
+
+    def cursor(self):
+        return _FakeCursor(self)
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.info.transaction_status = extensions.TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = 1
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    def _pool(self, **options):
+        options.setdefault("max_size", 2)
+        options.setdefault("timeout_s", 0.05)
+        return ConnectionPool("test", **options)
+
+    def test_released_connection_is_reused(self):
+        pool = self._pool()
+        first = pool.acquire(_FakeConnection)
+        pool.release(first)
+        self.assertIs(pool.acquire(_FakeConnection), first)
+        stats = pool.stats()
+        self.assertEqual((stats.created, stats.reused, stats.in_use, stats.size), (1, 1, 1, 1))
+
+    def test_exhausted_pool_times_out(self):
+        pool = self._pool(max_size=1)
+        pool.acquire(_FakeConnection)
+        with self.assertRaises(PoolTimeout):
+            pool.acquire(_FakeConnection)
+        self.assertEqual(pool.stats().timeouts, 1)
+
+    def test_waiter_gets_released_connection(self):
+        pool = self._pool(max_size=1, timeout_s=2)
+        conn = pool.acquire(_FakeConnection)
+        timer = threading.Timer(0.05, pool.release, args=(conn,))
+        timer.start()
+        self.assertIs(pool.acquire(_FakeConnection), conn)
+        timer.join()
+        self.assertEqual(pool.stats().waits, 1)
+
+    def test_open_transaction_is_rolled_back_on_release(self):
+        pool = self._pool()
+        conn = pool.acquire(_FakeConnection)
+        conn.info.transaction_status = extensions.TRANSACTION_STATUS_INTRANS
+        pool.release(conn)
+        self.assertEqual(conn.rollbacks, 1)
+        self.assertEqual(pool.stats().idle, 1)
+
+    def test_broken_connection_is_replaced_after_failed_ping(self):
+        pool = self._pool(ping_after_s=0)
+        conn = pool.acquire(_FakeConnection)
+        pool.release(conn)
+        conn.broken = True
+        replacement = pool.acquire(_FakeConnection)
+        self.assertIsNot(replacement, conn)
+        self.assertTrue(conn.closed)
+        stats = pool.stats()
+        self.assertEqual((stats.ping_failures, stats.size), (1, 1))
+
+    def test_idle_and_expired_connections_are_reaped(self):
+        clock = [1000.0]
+        with patch.object(pool_module.time, "monotonic", side_effect=lambda: clock[0]):
+            pool = self._pool(max_idle_s=60, max_lifetime_s=600)
+            idle = pool.acquire(_FakeConnection)
+            old = pool.acquire(_FakeConnection)
+            pool.release(idle)
+            clock[0] += 61
+            pool.release(old)  # 반납하면서 61초 쉰 idle 연결을 닫는다
+            self.assertTrue(idle.closed)
+            self.assertFalse(old.closed)
+            self.assertEqual(pool.stats().size, 1)
+
+            conn = pool.acquire(_FakeConnection)
+            clock[0] += 600
+            pool.release(conn)  # 수명을 넘긴 연결은 풀로 돌아오지 않는다
+            self.assertTrue(conn.closed)
+            self.assertEqual(pool.stats().size, 0)
+
+    def test_request_stats_track_wait_and_new_connections(self):
+        pool = self._pool()
+        token = pool_module.begin_request_stats()
+        conn = pool.acquire(_FakeConnection)
+        pool.release(conn)
+        pool.acquire(_FakeConnection)
+        stats = pool_module.end_request_stats(token)
+        self.assertEqual((stats.acquired, stats.created), (2, 1))
+        self.assertEqual(stats.aliases, {"test"})
+
+
+@override_settings(DATABASE_REPLICAS={"default": ["default_replica"]}, REPLICA_MAX_LAG_SECONDS=5)
+class ReplicaRoutingTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.lag = 1.0
+        patcher = patch.object(db_routers.lag_monitor, "lag", side_effect=lambda alias: self.lag)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_reads_stay_on_primary_without_prefer_replica(self):
+        self.assertEqual(db_routers.read_alias("default"), "default")
+        with prefer_replica():
+            self.assertEqual(db_routers.read_alias("default"), "default_replica")
+            self.assertEqual(db_routers.read_alias("cloudsql"), "cloudsql")  # 복제본 없는 alias
+
+    def test_lagging_or_unreachable_replica_falls_back_to_primary(self):
+        with prefer_replica():
+            self.lag = 10.0
+            self.assertEqual(db_routers.read_alias("default"), "default")
+            self.lag = None
+            self.assertEqual(db_routers.read_alias("default"), "default")
+        with prefer_replica(force=True):
+            self.lag = 10.0
+            self.assertEqual(db_routers.read_alias("default"), "default_replica")
+
+    def test_write_in_request_pins_reads_to_primary(self):
+        with db_routers.track_request(self.factory.get("/")) as state, prefer_replica():
+            db_routers._write_detector(lambda *args: None, "SELECT 1", None, False, {})
+            self.assertEqual(db_routers.read_alias("default"), "default_replica")
+            db_routers._write_detector(lambda *args: None, 'UPDATE "coupons" SET x = 1', None, False, {})
+            self.assertTrue(state.wrote)
+            self.assertEqual(db_routers.read_alias("default"), "default")
+            with prefer_replica(force=True):
+                self.assertEqual(db_routers.read_alias("default"), "default_replica")
+
+    def test_sticky_cookie_and_user_key_pin_reads(self):
+        request = self.factory.get("/")
+        request.COOKIES[db_routers.STICKY_COOKIE_NAME] = "1"
+        with db_routers.track_request(request), prefer_replica():
+            self.assertEqual(db_routers.read_alias("default"), "default")
+
+        cache = LocMemCache("replica-routing-tests", {})
+        cache.clear()
+        cache.set(db_routers.sticky_key(7), 1, 10)
+        request = self.factory.get("/")
+        request.user = SimpleNamespace(is_authenticated=True, pk=7)
+        with patch.object(db_routers, "cache", cache), db_routers.track_request(request), prefer_replica():
+            self.assertEqual(db_routers.read_alias("default"), "default")
+
+    def test_middleware_marks_writer_sticky(self):
+        cache = LocMemCache("replica-routing-tests", {})
+        cache.clear()
+
+        def view(request):
+            request.user = SimpleNamespace(is_authenticated=True, pk=7)
+            db_routers._write_detector(lambda *args: None, "INSERT INTO t VALUES (1)", None, False, {})
+            return HttpResponse("ok")
+
+        with patch("django.core.cache.cache", cache):
+            response = ReplicaStickinessMiddleware(view)(self.factory.post("/"))
+        self.assertIn(db_routers.STICKY_COOKIE_NAME, response.cookies)
+        self.assertEqual(cache.get(db_routers.sticky_key(7)), 1)
+
+    def test_replicas_are_never_migrated(self):
+        router = db_routers.TypeDescriptionRouter()
+        self.assertFalse(router.allow_migrate("default_replica", "accounts"))
+        self.assertTrue(router.allow_migrate("default", "accounts"))
+
+
+class AsyncViewTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.addCleanup(async_support.shutdown_executors)
+
+    def test_view_runs_in_bounded_pool_and_keeps_attributes(self):
+        @csrf_exempt
+        def view(request, pk):
+            return HttpResponse(f"{pk}:{threading.current_thread().name}")
+
+        wrapped = async_support.async_view(view)
+        self.assertTrue(asyncio.iscoroutinefunction(wrapped))
+        self.assertTrue(wrapped.csrf_exempt)
+        response = async_to_sync(wrapped)(self.factory.get("/"), pk=3)
+        self.assertTrue(response.content.decode().startswith("3:async-orm"))
+
+    def test_prefetch_runs_on_io_pool_and_failure_does_not_block_view(self):
+        def prefetch(request):
+            request.prefetched = threading.current_thread().name
+
+        def view(request):
+            return HttpResponse(getattr(request, "prefetched", "none"))
+
+        response = async_to_sync(async_support.async_view(view, prefetch=prefetch))(self.factory.get("/"))
+        self.assertTrue(response.content.decode().startswith("async-io"))
+
+        def broken(request):
+            raise RuntimeError("upstream down")
+
+        with self.assertLogs("wouldulike_backend.async_support", "WARNING"):
+            response = async_to_sync(async_support.async_view(view, prefetch=broken))(self.factory.get("/"))
+        self.assertEqual(response.content, b"none")
+
+    @override_settings(DATABASE_REPLICAS={"default": ["default_replica"]})
+    def test_write_detection_follows_view_into_pool_thread(self):
+        def view(request):
+            return HttpResponse(str(db_routers._write_detector in connections["default"].execute_wrappers))
+
+        with db_routers.track_request(self.factory.post("/")):
+            response = async_to_sync(async_support.async_view(view))(self.factory.post("/"))
+        self.assertEqual(response.content, b"True")
+
+    def test_asgi_handler_runs_plain_sync_views_in_orm_pool(self):
+        def view(request):
+            return HttpResponse(threading.current_thread().name)
+
+        async def native(request):
+            return HttpResponse("native")
+
+        handler = async_support.PooledASGIHandler()
+        wrapped = handler.make_view_atomic(view)
+        self.assertTrue(asyncio.iscoroutinefunction(wrapped))
+        self.assertTrue(async_to_sync(wrapped)(self.factory.get("/")).content.startswith(b"async-orm"))
+        self.assertIs(handler.make_view_atomic(native), native)
+
+    def test_maybe_async_is_noop_unless_enabled(self):
+        def view(request):
+            return HttpResponse("ok")
+
+        with override_settings(ASYNC_VIEWS_ENABLED=False):
+            self.assertIs(async_support.maybe_async(view), view)
+        with override_settings(ASYNC_VIEWS_ENABLED=True):
+            self.assertTrue(asyncio.iscoroutinefunction(async_support.maybe_async(view)))
+
+
+class _FakeDjangoConnection:
+    def __init__(self, in_atomic_block=False):
+        self.connection = object()
+        self.in_atomic_block = in_atomic_block
+
+    def close(self):
+        self.connection = None
+
+
+class GeventModeTests(SimpleTestCase):
+    def test_release_db_connections_only_in_gevent_mode_and_outside_transactions(self):
+        idle, in_transaction = _FakeDjangoConnection(), _FakeDjangoConnection(in_atomic_block=True)
+        with patch("django.db.connections.all", return_value=[idle, in_transaction]):
+            with override_settings(GEVENT_MODE=False):
+                green.release_db_connections()
+            self.assertIsNotNone(idle.connection)
+            with override_settings(GEVENT_MODE=True):
+                green.release_db_connections()
+        self.assertIsNone(idle.connection)
+        self.assertIsNotNone(in_transaction.connection)
+
+    @unittest.skipUnless(
+        importlib.util.find_spec("gevent") and importlib.util.find_spec("psycogreen"),
+        "gevent/psycogreen not installed",
+    )
+    def test_soak_hundreds_of_slow_requests(self):
+        # 몽키패치가 테스트 프로세스 전체에 퍼지지 않도록 별도 프로세스로 돌린다
+        env = dict(os.environ, DJANGO_USE_LOCAL_SQLITE="1", SECRET_KEY=os.environ.get("SECRET_KEY", "soak"))
+        completed = subprocess.run(
+            [sys.executable, "-m", "wouldulike_backend.gevent_soak", "--requests", "300", "--delay-ms", "200"],
+            capture_output=True,
+            text=True,
+            env=env,
+            timeout=120,
+        )
+        result = json.loads(completed.stdout)
+        self.assertTrue(result["ok"], result["problems"])
+        self.assertEqual(result["held_after_request"], 0)
+
+
+class WorkerWarmupTests(SimpleTestCase):
+    def test_failing_step_does_not_stop_later_steps(self):
+        def broken():
+            raise RuntimeError("db down")
+
+        registry = {"broken": broken, "fine": lambda: "3 things"}
+        results = warmup.run_steps(["broken", "fine", "missing"], registry)
+        self.assertEqual([(r.name, r.ok) for r in results], [("broken", False), ("fine", True), ("missing", False)])
+        self.assertEqual(results[0].detail, "db down")
+        self.assertEqual(results[1].detail, "3 things")
+
+    def test_urls_and_orm_steps_run_without_database(self):
+        results = warmup.warm_up(steps=("urls", "serializers", "orm"))
+        self.assertTrue(all(r.ok for r in results), results)
+
+    def test_prime_pools_leaves_idle_connections_in_pool(self):
+        pool = ConnectionPool("test", max_size=2, timeout_s=0.05)
+        wrapper = SimpleNamespace(
+            pool=pool,
+            get_connection_params=dict,
+            get_new_connection=lambda params: pool.acquire(_FakeConnection),
+        )
+        with patch.object(warmup, "_pooled_aliases", return_value=["test"]), \
+                patch("django.db.connections", {"test": wrapper}):
+            self.assertEqual(warmup.prime_pools(count=5), 2)
+        stats = pool.stats()
+        self.assertEqual((stats.size, stats.in_use), (2, 0))
+
+
+class ImportBudgetTests(SimpleTestCase):
+    def test_parse_importtime_reads_self_cumulative_and_depth(self):
+        stderr = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   botocore.compat\n"
+            "import time:      2500 |      40000 | boto3\n"
+            "some other stderr line\n"
+        )
+        modules = importprof.parse_importtime(stderr)
+        self.assertEqual([(m.name, m.self_us, m.cumulative_us, m.depth) for m in modules],
+                         [("botocore.compat", 120, 120, 1), ("boto3", 2500, 40000, 0)])
+
+    def test_lazy_module_imports_on_first_attribute_access(self):
+        sys.modules.pop("colorsys", None)
+        colorsys = lazy_module("colorsys")
+        self.assertNotIn("colorsys", sys.modules)
+        self.assertEqual(colorsys.rgb_to_hsv(0, 0, 0), (0, 0, 0))
+        self.assertIn("colorsys", sys.modules)
+
+    def test_startup_imports_stay_within_budget(self):
+        env = dict(os.environ, DJANGO_USE_LOCAL_SQLITE="1", SECRET_KEY=os.environ.get("SECRET_KEY", "imports"))
+        env.pop("DJANGO_SETTINGS_MODULE", None)
+        for target in ("setup", "urls"):
+            with self.subTest(target=target):
+                result = importprof.profile(target, env=env)
+                self.assertEqual(importprof.check_budget(result), [])
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    def setUp(self):
+        resilience.reset_breakers()
+        self.addCleanup(resilience.reset_breakers)
+
+    def test_opens_after_repeated_failures_and_closes_after_successful_probe(self):
+        clock = _Clock()
+        breaker = resilience.CircuitBreaker("db", failure_threshold=3, window_s=10, reset_s=30, clock=clock)
+        for _ in range(3):
+            breaker.record_failure()
+        self.assertEqual(breaker.state, resilience.OPEN)
+        self.assertFalse(breaker.allow())
+
+        clock.now = 31
+        self.assertTrue(breaker.allow())  # half-open: 시험 요청 하나만
+        self.assertFalse(breaker.allow())
+        breaker.record_success()
+        self.assertEqual(breaker.state, resilience.CLOSED)
+        self.assertTrue(breaker.allow())
+
+    def test_failures_outside_window_do_not_trip(self):
+        clock = _Clock()
+        breaker = resilience.CircuitBreaker("db", failure_threshold=3, window_s=10, reset_s=30, clock=clock)
+        for step in range(6):
+            clock.now = step * 6
+            breaker.record_failure()
+        self.assertEqual(breaker.state, resilience.CLOSED)
+
+    @override_settings(DB_CIRCUIT_FAILURES=2)
+    def test_guard_counts_only_outage_errors(self):
+        context = {"connection": SimpleNamespace(alias="default")}
+
+        def failing(exc):
+            def execute(sql, params, many, context):
+                raise exc
+            return execute
+
+        for exc in (IntegrityError("dup"), IntegrityError("dup"), OperationalError("timeout")):
+            with self.assertRaises(type(exc)):
+                resilience._db_guard(failing(exc), "SELECT 1", None, False, context)
+        self.assertTrue(resilience.optional_work_allowed("default"))
+        with self.assertRaises(OperationalError):
+            resilience._db_guard(failing(OperationalError("timeout")), "SELECT 1", None, False, context)
+        self.assertFalse(resilience.optional_work_allowed("default"))
+
+
+class StatementTimeoutTests(SimpleTestCase):
+    @override_settings(DB_STATEMENT_TIMEOUTS={"default": 15000, "cloudsql": 30000, "missing": 1000})
+    def test_install_adds_timeout_to_web_connections_only_once(self):
+        databases = {
+            "default": {"OPTIONS": {"connect_timeout": 5}},
+            "cloudsql": {"OPTIONS": {"options": "-c statement_timeout=5000"}},
+        }
+        with patch.object(connections, "settings", databases):
+            resilience.install_statement_timeouts()
+            resilience.install_statement_timeouts()
+        self.assertEqual(databases["default"]["OPTIONS"]["options"], "-c statement_timeout=15000")
+        # DB_STATEMENT_TIMEOUT_ALL_PROCESSES=1 로 settings 에서 이미 건 값은 그대로 둔다
+        self.assertEqual(databases["cloudsql"]["OPTIONS"]["options"], "-c statement_timeout=5000")
+
+
+class QueryBudgetTests(SimpleTestCase):
+    def setUp(self):
+        resilience.reset_breakers()
+        self.addCleanup(resilience.reset_breakers)
+        self.request = RequestFactory().get("/")
+
+    def _query(self):
+        context = {"connection": SimpleNamespace(alias="default")}
+        return resilience._db_guard(lambda *args: "row", "SELECT 1", None, False, context)
+
+    def test_exceeding_query_count_fails_fast_with_503(self):
+        executed = []
+
+        @resilience.query_budget("test", max_queries=2)
+        def view(request):
+            for _ in range(5):
+                executed.append(self._query())
+            return HttpResponse("ok")
+
+        response = view(self.request)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(len(executed), 2)
+
+    def test_view_swallowing_budget_error_is_replaced_by_fallback(self):
+        def view(request):
+            try:
+                for _ in range(5):
+                    self._query()
+            except Exception:
+                return HttpResponse(status=500)
+            return HttpResponse("ok")
+
+        guarded = resilience.query_budget("test", max_queries=1, fallback=lambda request: HttpResponse("stale"))(view)
+        self.assertEqual(guarded(self.request).content, b"stale")
+
+    @override_settings(DB_CIRCUIT_FAILURES=1)
+    def test_open_circuit_serves_fallback_without_running_view(self):
+        resilience.breaker_for("default").record_failure()
+        view = resilience.query_budget(
+            "test", alias="default", fallback=lambda request: HttpResponse("stale")
+        )(lambda request: self.fail("view should not run"))
+        self.assertEqual(view(self.request).content, b"stale")
+
+    def test_slow_request_skips_optional_work(self):
+        seen = []
+
+        @resilience.query_budget("test", degrade_after_ms=0)
+        def view(request):
+            time.sleep(0.001)
+            seen.append(resilience.optional_work_allowed("default"))
+            return HttpResponse("ok")
+
+        view(self.request)
+        self.assertEqual(seen, [False])
+        self.assertTrue(resilience.optional_work_allowed("default"))
+
+
+class RateLimitTests(SimpleTestCase):
+    def test_local_limiter_allows_burst_then_refills_one_per_interval(self):
+        clock = _Clock()
+        local = throttling.LocalLimiter(clock=clock)
+        rules = [throttling.Rule("rl:t:ip:1:60", 3, 60)]
+        remaining = [local.check(rules)[2] for _ in range(3)]
+        self.assertEqual(remaining, [2, 1, 0])
+        allowed, _, _, retry_after_ms, _ = local.check(rules)
+        self.assertEqual(allowed, 0)
+        self.assertAlmostEqual(retry_after_ms, 20000)
+
+        clock.now = 20
+        self.assertEqual(local.check(rules)[0], 1)
+        self.assertEqual(local.check(rules)[0], 0)
+
+    def test_rejected_request_is_not_recorded_on_other_rules(self):
+        clock = _Clock()
+        local = throttling.LocalLimiter(clock=clock)
+        minute = throttling.Rule("rl:t:user:1:60", 1, 60)
+        hour = throttling.Rule("rl:t:user:1:3600", 10, 3600)
+        local.check([minute, hour])
+        for _ in range(5):
+            self.assertEqual(local.check([minute, hour])[0], 0)
+        clock.now = 60
+        allowed, tightest, remaining, _, _ = local.check([minute, hour])
+        self.assertEqual((allowed, tightest, remaining), (1, 1, 0))
+        self.assertEqual(local.check([hour])[2], 7)
+
+    def test_redis_error_falls_back_to_local_counters_without_retrying_each_request(self):
+        limiter = throttling.RateLimiter()
+        client = SimpleNamespace(eval=Mock(side_effect=ConnectionError("down")))
+        rules = [throttling.Rule("rl:t:ip:1:60", 1, 60)]
+        fake_cache = SimpleNamespace(client=SimpleNamespace(get_client=lambda write: client))
+        with patch.object(throttling, "cache", fake_cache):
+            self.assertTrue(limiter.check(rules).allowed)
+            self.assertFalse(limiter.check(rules).allowed)
+        self.assertEqual(client.eval.call_count, 1)
+
+    @override_settings(RATE_LIMITS_ENABLED=True, RATE_LIMITS={"test": {"user": ("5/m",), "ip": ("2/m",)}})
+    def test_view_returns_429_with_quota_headers(self):
+        from rest_framework.permissions import AllowAny
+        from rest_framework.response import Response
+        from rest_framework.test import APIRequestFactory
+        from rest_framework.views import APIView
+
+        class View(throttling.RateLimitedMixin, APIView):
+            authentication_classes = []
+            permission_classes = [AllowAny]
+            throttle_scope = "test"
+            calls = 0
+
+            def post(self, request):
+                View.calls += 1
+                return Response({"ok": True})
+
+        factory = APIRequestFactory()
+        view = View.as_view()
+        with patch.object(throttling, "limiter", throttling.RateLimiter()) as limiter:
+            limiter._redis_retry_at = float("inf")
+            first = view(factory.post("/", REMOTE_ADDR="10.0.0.1"))
+            view(factory.post("/", REMOTE_ADDR="10.0.0.1"))
+            blocked = view(factory.post("/", REMOTE_ADDR="10.0.0.1"))
+            other_ip = view(factory.post("/", REMOTE_ADDR="10.0.0.2"))
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual((first["X-RateLimit-Limit"], first["X-RateLimit-Remaining"]), ("2", "1"))
+        self.assertEqual(blocked.status_code, 429)
+        self.assertEqual(blocked["Retry-After"], "30")
+        self.assertEqual(blocked["X-RateLimit-Remaining"], "0")
+        self.assertEqual(other_ip.status_code, 200)
+        self.assertEqual(View.calls, 3)
+
+
+class LoadScenarioTests(SimpleTestCase):
+    manifest = {
+        "users": [{"id": 1, "invite_code": "LT0000000"}, {"id": 2, "invite_code": "LT0000001"}],
+        "restaurants": [{"id": 900000, "pin": "0000"}, {"id": 900001, "pin": "0001"}],
+    }
+
+    def _serve(self):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        seen = []
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self):
+                seen.append((self.command, self.path, self.headers.get("Authorization", "")[:7]))
+                self.send_response(201 if self.command == "POST" else 200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def do_GET(self):
+                self._reply()
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                self._reply()
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.shutdown)
+        return f"http://127.0.0.1:{server.server_address[1]}", seen
+
+    def test_reports_each_endpoint_of_the_scenario(self):
+        from wouldulike_backend import loadscenarios
+
+        url, seen = self._serve()
+        result = loadscenarios.run_scenario(
+            "wallet_browse", self.manifest, url=url, concurrency=2, duration_s=None, sessions=5
+        )
+        self.assertEqual(
+            sorted(result["endpoints"]), ["coupons.my", "invite.my", "stamps.my", "stamps.my_all"]
+        )
+        self.assertEqual(result["overall"]["requests"], 20)
+        self.assertTrue(all(summary["requests"] == 5 for summary in result["endpoints"].values()))
+        self.assertTrue(all(auth == "Bearer " for _, _, auth in seen))
+
+    def test_sessions_are_reproducible_for_a_seed(self):
+        from wouldulike_backend import loadscenarios
+
+        def calls(seed):
+            return [loadscenarios.referral_burst(self.manifest, random.Random(f"{seed}:{n}"), n) for n in range(20)]
+
+        self.assertEqual(calls(1), calls(1))
+        self.assertNotEqual(calls(1), calls(2))
+
+    def test_compare_shows_percentile_change(self):
+        from wouldulike_backend import loadscenarios
+
+        def report(p95):
+            summary = {"rps": 10.0, "latency_ms": {"p50": 10.0, "p95": p95, "p99": 40.0}}
+            return {"scenarios": {"lunch_rush": {"overall": summary, "endpoints": {"stamps.add": summary}}}}
+
+        lines = loadscenarios.compare(report(20.0), report(30.0))
+        self.assertEqual(len(lines), 2)
+        self.assertIn("p95 20.0→30.0ms (+50%)", lines[1])
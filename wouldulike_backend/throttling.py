@@ -0,0 +1,242 @@
+"""
+쓰기/발급 엔드포인트 요청 수 제한 (GCRA).
+
+이벤트 코드 입력(AcceptReferralView), 스탬프 적립, 쿠폰 사용, 이벤트 쿠폰 받기, 로그인을 스크립트로 두드리면
+코드 추측(WORLD_CUP_DAILY_CODES 등)이나 비싼 발급 경로로 DB 를 괴롭힐 수 있다. 뷰에 scope 를 선언하면
+
+    class AddStampView(RateLimitedMixin, APIView):
+        throttle_scope = "stamp"
+
+settings.RATE_LIMITS[scope] 의 규칙(사용자별 / IP별, 규칙마다 여러 구간)을 DRF 인증 직후, 뷰 본문(DB 작업) 전에 확인한다.
+- 규칙 하나는 "횟수/기간" (예: "10/m", "100/h"). 기간 안에 횟수만큼 몰아서 보낼 수 있고, 그 뒤로는 기간/횟수마다 하나씩 풀린다.
+- Redis 에서는 scope 의 모든 규칙을 Lua 스크립트 하나로 확인/기록한다 (하나라도 넘으면 아무것도 기록하지 않음).
+  시각은 Redis 서버 시계를 쓰므로 워커 간 시계 차이가 없다.
+- Redis 가 안 되면 REDIS_RETRY_S 동안 워커 프로세스 안의 같은 알고리즘으로 대신 센다 (워커별로 따로 세므로 느슨해진다).
+- 응답에는 가장 빡빡한 규칙 기준 X-RateLimit-Limit / Remaining / Reset(초) 헤더를 붙이고,
+  넘으면 429 와 Retry-After 를 돌려준다 (DRF Throttled).
+IP 는 DRF get_ident 로 구하므로 REST_FRAMEWORK["NUM_PROXIES"](TRUSTED_PROXY_HOPS)가 실제 프록시 수와 맞아야 한다.
+"""
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.throttling import BaseThrottle
+
+logger = logging.getLogger(__name__)
+
+REDIS_RETRY_S = 5.0
+_LOCAL_MAX_KEYS = 10000
+
+_PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+# KEYS: 규칙별 키, ARGV: 규칙별 (emission_ms, tolerance_ms)
+# 반환: {허용 여부, 가장 빡빡한 규칙 번호(1부터), 그 규칙의 남은 횟수, retry_after_ms, reset_ms}
+_GCRA_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local allowed = 1
+local tightest, tightest_remaining, retry_after, reset = 1, nil, 0, 0
+local new_tats = {}
+for i, key in ipairs(KEYS) do
+    local emission = tonumber(ARGV[2 * i - 1])
+    local tolerance = tonumber(ARGV[2 * i])
+    local tat = tonumber(redis.call('GET', key) or now)
+    if tat < now then tat = now end
+    local remaining
+    if now < tat - tolerance then
+        allowed = 0
+        remaining = 0
+        retry_after = math.max(retry_after, tat - tolerance - now)
+        reset = math.max(reset, tat - now)
+    else
+        new_tats[i] = tat + emission
+        remaining = math.floor((now + tolerance - new_tats[i]) / emission) + 1
+        reset = math.max(reset, new_tats[i] - now)
+    end
+    if tightest_remaining == nil or remaining < tightest_remaining then
+        tightest, tightest_remaining = i, remaining
+    end
+end
+if allowed == 1 then
+    for i, key in ipairs(KEYS) do
+        redis.call('SET', key, new_tats[i], 'PX', math.max(math.ceil(new_tats[i] - now), 1))
+    end
+end
+return {allowed, tightest, tightest_remaining, retry_after, reset}
+"""
+
+
+def parse_rate(rate: str) -> tuple[int, int]:
+    """"10/m" -> (10, 60). 기간 앞에 숫자를 붙일 수 있다 ("5/10m" -> (5, 600))."""
+    num, period = rate.split("/")
+    unit = period[-1]
+    multiplier = int(period[:-1] or 1)
+    return int(num), multiplier * _PERIODS[unit]
+
+
+@dataclass(frozen=True)
+class Rule:
+    key: str
+    limit: int
+    period_s: int
+
+    @property
+    def emission_ms(self) -> float:
+        return self.period_s * 1000 / self.limit
+
+    @property
+    def tolerance_ms(self) -> float:
+        return self.period_s * 1000 - self.emission_ms
+
+
+@dataclass(frozen=True)
+class Decision:
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after_s: float
+    reset_s: float
+
+
+class LocalLimiter:
+    """Redis 가 안 될 때 쓰는 프로세스 내 GCRA (Redis 스크립트와 같은 계산)."""
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._tats: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def check(self, rules: list[Rule]) -> tuple:
+        now = self._clock() * 1000
+        with self._lock:
+            if len(self._tats) > _LOCAL_MAX_KEYS:
+                self._tats = {key: tat for key, tat in self._tats.items() if tat > now}
+            allowed, tightest, tightest_remaining, retry_after, reset = 1, 1, None, 0.0, 0.0
+            new_tats = []
+            for i, rule in enumerate(rules, start=1):
+                tat = max(self._tats.get(rule.key, now), now)
+                if now < tat - rule.tolerance_ms:
+                    allowed, remaining = 0, 0
+                    retry_after = max(retry_after, tat - rule.tolerance_ms - now)
+                    reset = max(reset, tat - now)
+                else:
+                    new_tat = tat + rule.emission_ms
+                    new_tats.append((rule.key, new_tat))
+                    remaining = math.floor((now + rule.tolerance_ms - new_tat) / rule.emission_ms) + 1
+                    reset = max(reset, new_tat - now)
+                if tightest_remaining is None or remaining < tightest_remaining:
+                    tightest, tightest_remaining = i, remaining
+            if allowed:
+                self._tats.update(new_tats)
+            return allowed, tightest, tightest_remaining, retry_after, reset
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tats.clear()
+
+
+class RateLimiter:
+    def __init__(self):
+        self.local = LocalLimiter()
+        self._redis_retry_at = 0.0
+
+    def check(self, rules: list[Rule]) -> Decision:
+        raw = None
+        if time.monotonic() >= self._redis_retry_at:
+            try:
+                client = cache.client.get_client(True)  # type: ignore[attr-defined]
+                args = [value for rule in rules for value in (rule.emission_ms, rule.tolerance_ms)]
+                raw = client.eval(_GCRA_SCRIPT, len(rules), *[rule.key for rule in rules], *args)
+            except Exception as exc:
+                logger.warning("rate limit falling back to in-process counters for %.0fs: %s", REDIS_RETRY_S, exc)
+                self._redis_retry_at = time.monotonic() + REDIS_RETRY_S
+        if raw is None:
+            raw = self.local.check(rules)
+        allowed, tightest, remaining, retry_after_ms, reset_ms = raw
+        return Decision(
+            allowed=bool(int(allowed)),
+            limit=rules[int(tightest) - 1].limit,
+            remaining=max(int(remaining), 0),
+            retry_after_s=float(retry_after_ms) / 1000,
+            reset_s=float(reset_ms) / 1000,
+        )
+
+
+limiter = RateLimiter()
+
+
+def rules_for(scope: str, *, user_id=None, ip: str | None = None) -> list[Rule]:
+    config = (getattr(settings, "RATE_LIMITS", None) or {}).get(scope) or {}
+    idents = {"user": user_id, "ip": ip}
+    rules = []
+    for kind, rates in config.items():
+        ident = idents.get(kind)
+        if ident is None:
+            continue
+        for rate in (rates,) if isinstance(rates, str) else rates:
+            limit, period_s = parse_rate(rate)
+            rules.append(Rule(f"rl:{scope}:{kind}:{ident}:{period_s}", limit, period_s))
+    return rules
+
+
+def _authenticated_user_id(request):
+    user = getattr(request, "user", None)
+    return user.pk if getattr(user, "is_authenticated", False) else None
+
+
+class ScopedRateLimit(BaseThrottle):
+    """view 의 scope(get_throttle_scope() 또는 throttle_scope) 에 해당하는 RATE_LIMITS 규칙을 확인한다."""
+
+    decision: Decision | None = None
+
+    def allow_request(self, request, view):
+        if not getattr(settings, "RATE_LIMITS_ENABLED", True):
+            return True
+        get_scope = getattr(view, "get_throttle_scope", None)
+        scope = get_scope(request) if get_scope else getattr(view, "throttle_scope", None)
+        if not scope:
+            return True
+        get_user_id = getattr(view, "get_throttle_user_id", None)
+        user_id = get_user_id(request) if get_user_id else _authenticated_user_id(request)
+        rules = rules_for(scope, user_id=user_id, ip=self.get_ident(request))
+        if not rules:
+            return True
+        self.decision = limiter.check(rules)
+        request._request.rate_limit = self.decision
+        if not self.decision.allowed:
+            logger.info("rate limited scope=%s user=%s ip=%s", scope, user_id, self.get_ident(request))
+        return self.decision.allowed
+
+    def wait(self):
+        return self.decision.retry_after_s if self.decision else None
+
+
+class RateLimitedMixin:
+    """
+    APIView 에 섞어 쓴다. throttle_scope 를 선언하고, 응답에 남은 횟수 헤더를 붙인다.
+    요청 내용에 따라 scope 나 사용자 식별이 달라지는 뷰는 get_throttle_scope / get_throttle_user_id 를 덮어쓴다.
+    """
+
+    throttle_classes = [ScopedRateLimit]
+    throttle_scope: str | None = None
+
+    def get_throttle_scope(self, request) -> str | None:
+        return self.throttle_scope
+
+    def get_throttle_user_id(self, request):
+        return _authenticated_user_id(request)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        decision = getattr(request._request, "rate_limit", None)
+        if decision is not None:
+            response["X-RateLimit-Limit"] = str(decision.limit)
+            response["X-RateLimit-Remaining"] = str(decision.remaining)
+            response["X-RateLimit-Reset"] = str(math.ceil(decision.reset_s))
+        return response
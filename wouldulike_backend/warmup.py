@@ -0,0 +1,224 @@
+"""
+워커 warm-up.
+
+Procfile 은 --preload 에 --max-requests=500 이라 워커가 자주 교체되고, 새 워커는 첫 요청에서
+URLConf 로딩(모든 views / coupons.service import), DRF 시리얼라이저 필드 구성, ORM 메타데이터/SQL 컴파일,
+빈 카탈로그를 한꺼번에 치른다. wsgi.py / asgi.py 가 로드될 때(--preload 면 fork 전 마스터에서 한 번)
+warm_up() 으로 이 비용을 미리 치러 두고, fork 된 워커는 그 결과를 copy-on-write 로 물려받는다.
+
+단계 (WORKER_WARMUP_STEPS 로 고를 수 있음, 각 단계 실패는 로그만 남기고 다음 단계로 넘어간다)
+- urls: URLConf 와 모든 뷰 모듈 import, reverse 테이블 구성
+- serializers: import 된 DRF 시리얼라이저의 필드 구성
+- orm: 모든 모델의 관계 메타데이터와 기본 SELECT 컴파일 (DB 연결 없이)
+- catalog: 유형 설명 / 음식 정보 카탈로그와 추천 매트릭스 (STATIC_CATALOG_WARM=0 이면 건너뜀)
+- affiliates: 제휴 식당 전체 목록 캐시
+마스터에서 연 DB 연결은 fork 전에 모두 닫는다. 워커는 fork 직후 백그라운드에서
+alias 마다 DB_POOL_WARM_CONNECTIONS 개 연결을 미리 열어 풀에 넣는다 (prime_pools).
+"""
+from __future__ import annotations
+
+import importlib
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STEPS = ("urls", "serializers", "orm", "catalog", "affiliates")
+
+
+@dataclass
+class StepResult:
+    name: str
+    ok: bool
+    elapsed_ms: float
+    detail: str = ""
+
+
+def _iter_patterns(patterns):
+    for pattern in patterns:
+        nested = getattr(pattern, "url_patterns", None)
+        if nested is not None:
+            yield from _iter_patterns(nested)
+        else:
+            yield pattern
+
+
+def warm_urls() -> str:
+    from django.urls import get_resolver
+
+    resolver = get_resolver()
+    views = list(_iter_patterns(resolver.url_patterns))
+    resolver.reverse_dict  # noqa: B018 - reverse 테이블을 미리 채운다
+    return f"{len(views)} routes"
+
+
+def _all_subclasses(cls):
+    for sub in cls.__subclasses__():
+        yield sub
+        yield from _all_subclasses(sub)
+
+
+def warm_serializers() -> str:
+    from rest_framework import serializers
+
+    importlib.import_module("coupons.api.serializers")
+    built = 0
+    for cls in set(_all_subclasses(serializers.Serializer)):
+        # 프로젝트 시리얼라이저만 (DRF / simplejwt 내부 클래스는 제외)
+        if cls.__module__.split(".")[0] in ("rest_framework", "rest_framework_simplejwt"):
+            continue
+        try:
+            cls().fields  # noqa: B018
+            built += 1
+        except Exception as exc:  # 컨텍스트가 필요한 시리얼라이저 등
+            logger.debug("warm-up skipped serializer %s: %s", cls.__name__, exc)
+    return f"{built} serializers"
+
+
+def warm_orm() -> str:
+    from django.apps import apps
+
+    compiled = 0
+    for model in apps.get_models():
+        model._meta.get_fields()
+        try:
+            # str(query) 는 SQL 만 만들고 실행하지 않는다
+            str(model._default_manager.all().query)
+            compiled += 1
+        except Exception as exc:
+            logger.debug("warm-up skipped model %s: %s", model._meta.label, exc)
+    return f"{compiled} models"
+
+
+def warm_catalogs() -> str:
+    if os.getenv("STATIC_CATALOG_WARM", "1") != "1":
+        return "skipped (STATIC_CATALOG_WARM=0)"
+    from food_by_type.recommender import get_matrix
+    from type_description.catalog import warm_catalog
+
+    catalog = warm_catalog()
+    if catalog is None:
+        raise RuntimeError("static catalog unavailable")
+    matrix = get_matrix()
+    return f"{len(catalog.summaries)} types, {len(catalog.foods)} foods, {len(matrix.foods_by_type)} matrix types"
+
+
+def warm_affiliates() -> str:
+    from restaurants.views import _load_all_affiliate_rows
+
+    return f"{len(_load_all_affiliate_rows())} affiliates"
+
+
+STEPS: dict[str, Callable[[], str]] = {
+    "urls": warm_urls,
+    "serializers": warm_serializers,
+    "orm": warm_orm,
+    "catalog": warm_catalogs,
+    "affiliates": warm_affiliates,
+}
+
+
+def configured_steps() -> tuple[str, ...]:
+    raw = os.getenv("WORKER_WARMUP_STEPS")
+    if not raw:
+        return DEFAULT_STEPS
+    return tuple(step.strip() for step in raw.split(",") if step.strip())
+
+
+def run_steps(steps, registry: dict[str, Callable[[], str]] | None = None) -> list[StepResult]:
+    registry = STEPS if registry is None else registry
+    results = []
+    for name in steps:
+        func = registry.get(name)
+        started = time.perf_counter()
+        if func is None:
+            results.append(StepResult(name, False, 0.0, "unknown step"))
+            continue
+        try:
+            detail = func() or ""
+            ok = True
+        except Exception as exc:
+            logger.warning("warm-up step %s failed: %s", name, exc)
+            detail, ok = str(exc), False
+        results.append(StepResult(name, ok, (time.perf_counter() - started) * 1000, detail))
+    return results
+
+
+def warm_up(steps=None) -> list[StepResult]:
+    """마스터(또는 단일 프로세스)에서 한 번 실행한다. 끝나면 이 프로세스의 DB 연결을 모두 닫는다."""
+    from django.db import connections
+
+    from wouldulike_backend.db_pool.pool import close_all_pools
+
+    started = time.perf_counter()
+    results = run_steps(configured_steps() if steps is None else steps)
+    # fork 된 워커가 마스터의 소켓을 같이 쓰지 않도록 닫는다
+    connections.close_all()
+    close_all_pools()
+    logger.info(
+        "worker warm-up finished in %dms: %s",
+        (time.perf_counter() - started) * 1000,
+        ", ".join(f"{r.name}={'ok' if r.ok else 'failed'}({r.elapsed_ms:.0f}ms)" for r in results),
+    )
+    return results
+
+
+# --- fork 이후 -----------------------------------------------------------
+
+
+def _pooled_aliases() -> list[str]:
+    from django.conf import settings
+
+    return [alias for alias, db in settings.DATABASES.items() if db.get("ENGINE") == "wouldulike_backend.db_pool"]
+
+
+def prime_pools(count: int | None = None) -> int:
+    """풀을 쓰는 alias 마다 연결을 count 개 열어 풀에 넣는다. 반환: 연 연결 수."""
+    from django.db import connections
+
+    if count is None:
+        count = int(os.getenv("DB_POOL_WARM_CONNECTIONS", "1"))
+    opened = 0
+    for alias in _pooled_aliases():
+        # 이 스레드 전용 wrapper 로 연결만 만들고 wrapper.connection 에는 두지 않는다
+        wrapper = connections[alias]
+        pool = wrapper.pool
+        raw = []
+        try:
+            params = wrapper.get_connection_params()
+            for _ in range(min(count, pool.max_size)):
+                raw.append(wrapper.get_new_connection(params))
+                opened += 1
+        except Exception as exc:
+            logger.warning("DB pool warm-up for %s failed: %s", alias, exc)
+        finally:
+            for conn in raw:
+                pool.release(conn)
+    return opened
+
+
+def _prime_pools_in_background() -> None:
+    threading.Thread(target=_prime_quietly, name="db-pool-warmup", daemon=True).start()
+
+
+def _prime_quietly() -> None:
+    try:
+        prime_pools()
+    except Exception:
+        logger.exception("DB pool warm-up failed")
+
+
+_fork_hook_registered = False
+
+
+def install_fork_hook() -> None:
+    """fork 된 자식(gunicorn 워커)이 시작하자마자 연결 풀을 채우도록 등록한다. 여러 번 불러도 한 번만 등록한다."""
+    global _fork_hook_registered
+    if _fork_hook_registered or not hasattr(os, "register_at_fork"):
+        return
+    os.register_at_fork(after_in_child=_prime_pools_in_background)
+    _fork_hook_registered = True
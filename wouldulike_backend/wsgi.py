@@ -15,3 +15,16 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'wouldulike_backend.settings')
 
 application = get_wsgi_application()
 application = WhiteNoise(application)
+
+# DB 쿼리 결과를 서킷 브레이커에 기록하고 뷰별 쿼리 예산을 확인한다
+from wouldulike_backend import resilience  # noqa: E402
+
+resilience.install()
+
+# 뷰 import, 카탈로그, ORM 메타데이터 등을 첫 요청 전에 준비한다 (WORKER_WARMUP=0 이면 건너뜀).
+# gunicorn --preload 면 fork 전 마스터에서 한 번 실행되고 워커는 fork 직후 연결 풀을 채운다.
+if os.getenv('WORKER_WARMUP', '1') == '1':
+    from wouldulike_backend.warmup import install_fork_hook, warm_up
+
+    warm_up()
+    install_fork_hook()